@@ -0,0 +1,63 @@
+"""분별 잔고 minute_bucket 컬럼 추가 (기존 행 채우기, 분당 중복 정리, 계좌+분 유니크 제약)
+
+Revision ID: 3f2a9c1d4e70
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+새 DB 는 initial_data(create_all)가 모델대로 테이블을 만들므로 이 리비전은 아무것도 하지 않는다.
+컬럼이 없는 기존 테이블에만 적용한다:
+  1. minute_bucket 을 NULL 허용으로 추가하고 date_trunc('minute', timestamp) 로 채움
+  2. 계좌+분이 같은 행은 가장 늦은 timestamp 1건만 남기고 삭제
+  3. NOT NULL, uq_*_minutely_balances_account_minute 제약 추가
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d4e70'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLES = {
+    "kis_minutely_balance": "uq_kis_minutely_balances_account_minute",
+    "ls_minutely_balance": "uq_ls_minutely_balances_account_minute",
+}
+
+
+def _needs_column(inspector, table: str) -> bool:
+    if not inspector.has_table(table):
+        return False
+    return "minute_bucket" not in {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table, constraint in TABLES.items():
+        if not _needs_column(inspector, table):
+            continue
+        op.add_column(table, sa.Column("minute_bucket", sa.TIMESTAMP(timezone=True), nullable=True))
+        op.execute(f"UPDATE {table} SET minute_bucket = date_trunc('minute', COALESCE(timestamp, CURRENT_TIMESTAMP))")
+        op.execute(f"""
+            DELETE FROM {table} AS t
+            USING (
+                SELECT id, row_number() OVER (
+                    PARTITION BY account_id, minute_bucket ORDER BY timestamp DESC NULLS LAST, id DESC
+                ) AS rank
+                FROM {table}
+            ) AS ranked
+            WHERE t.id = ranked.id AND ranked.rank > 1
+        """)
+        op.alter_column(table, "minute_bucket", nullable=False)
+        op.create_unique_constraint(constraint, table, ["account_id", "minute_bucket"])
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table, constraint in TABLES.items():
+        if not inspector.has_table(table):
+            continue
+        if "minute_bucket" in {column["name"] for column in inspector.get_columns(table)}:
+            op.drop_constraint(constraint, table, type_="unique")
+            op.drop_column(table, "minute_bucket")
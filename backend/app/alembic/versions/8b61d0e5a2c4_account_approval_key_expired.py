@@ -0,0 +1,33 @@
+"""계좌 웹소켓 접속키 재발급 예정일시(approval_key_expired) 컬럼 추가
+
+Revision ID: 8b61d0e5a2c4
+Revises: 3f2a9c1d4e70
+Create Date: 2026-10-19 10:00:00.000000
+
+기존 접속키는 만료 시각을 알 수 없으므로 NULL 로 두어 다음 실시간 세션 연결 때 재발급한다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b61d0e5a2c4'
+down_revision = '3f2a9c1d4e70'
+branch_labels = None
+depends_on = None
+
+
+def _has_column(inspector, table: str, column: str) -> bool:
+    return column in {existing["name"] for existing in inspector.get_columns(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("account") and not _has_column(inspector, "account", "approval_key_expired"):
+        op.add_column("account", sa.Column("approval_key_expired", sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("account") and _has_column(inspector, "account", "approval_key_expired"):
+        op.drop_column("account", "approval_key_expired")
@@ -0,0 +1,37 @@
+"""LS 거래내역 매수/매도 구분 재동기화 준비
+
+Revision ID: a9e4c2b7d150
+Revises: f2c8a6d1e3b7
+Create Date: 2026-10-19 14:00:00.000000
+
+이전에는 거래수량(TrdQty) 부호로 매수/매도를 구분해 모든 LS 체결이 매수로 저장되었다.
+저장된 행은 거래구분명이 없어 바로잡을 수 없으므로 거래유형을 '미확인'으로 바꿔 체결 재생에서 제외하고,
+그 체결로 계산된 LS 계좌의 로트/실현손익/체크포인트/포지션 스냅샷을 지운다.
+재동기화 기간 안의 거래는 다음 동기화에서 거래구분명(TpCodeNm) 기준으로 다시 채워지고,
+그 이전 거래는 해당 기간을 다시 동기화할 때까지 손익/포지션 계산에서 빠진다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9e4c2b7d150'
+down_revision = 'f2c8a6d1e3b7'
+branch_labels = None
+depends_on = None
+
+LEDGER_TABLES = ("position_lot", "realized_pnl", "pnl_checkpoint", "position_snapshot")
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("ls_trade"):
+        op.execute("UPDATE ls_trade SET trade_type = '미확인', updated_at = CURRENT_TIMESTAMP")
+    for table in LEDGER_TABLES:
+        if inspector.has_table(table):
+            op.execute(f"DELETE FROM {table} WHERE account_id IN (SELECT id FROM account WHERE upper(broker) = 'LS')")
+
+
+def downgrade():
+    # 잘못 구분된 매수/매도는 되돌리지 않음 (재동기화로만 복구)
+    pass
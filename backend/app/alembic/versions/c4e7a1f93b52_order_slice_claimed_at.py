@@ -0,0 +1,34 @@
+"""분할 주문 자식주문 전송 담당 시각(claimed_at) 컬럼 추가
+
+Revision ID: c4e7a1f93b52
+Revises: 8b61d0e5a2c4
+Create Date: 2026-10-19 11:00:00.000000
+
+자식주문은 pending → sending(claimed_at 기록) → 결과 상태로 바뀐다.
+기존 행은 sending 상태가 없으므로 NULL 로 둔다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a1f93b52'
+down_revision = '8b61d0e5a2c4'
+branch_labels = None
+depends_on = None
+
+
+def _has_column(inspector, table: str, column: str) -> bool:
+    return column in {existing["name"] for existing in inspector.get_columns(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("order_slice") and not _has_column(inspector, "order_slice", "claimed_at"):
+        op.add_column("order_slice", sa.Column("claimed_at", sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("order_slice") and _has_column(inspector, "order_slice", "claimed_at"):
+        op.drop_column("order_slice", "claimed_at")
@@ -0,0 +1,34 @@
+"""LS 거래내역 거래번호(trade_no) 컬럼 추가
+
+Revision ID: e1b9d4c7a630
+Revises: c4e7a1f93b52
+Create Date: 2026-10-19 12:00:00.000000
+
+같은 시각/종목/수량의 체결을 구분하기 위해 CDPCQ04700 거래번호를 저장한다.
+기존 행은 번호를 알 수 없으므로 NULL 로 두고, 같은 날짜를 다시 동기화할 때 번호와 함께 다시 저장된다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1b9d4c7a630'
+down_revision = 'c4e7a1f93b52'
+branch_labels = None
+depends_on = None
+
+
+def _has_column(inspector, table: str, column: str) -> bool:
+    return column in {existing["name"] for existing in inspector.get_columns(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("ls_trade") and not _has_column(inspector, "ls_trade", "trade_no"):
+        op.add_column("ls_trade", sa.Column("trade_no", sa.String(length=20), nullable=True))
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("ls_trade") and _has_column(inspector, "ls_trade", "trade_no"):
+        op.drop_column("ls_trade", "trade_no")
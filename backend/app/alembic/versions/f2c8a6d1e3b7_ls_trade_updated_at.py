@@ -0,0 +1,38 @@
+"""LS 거래내역 수정일시(updated_at) 컬럼 추가
+
+Revision ID: f2c8a6d1e3b7
+Revises: e1b9d4c7a630
+Create Date: 2026-10-19 13:00:00.000000
+
+LS 체결을 (거래일자, 거래번호)로 식별해 재동기화 시 그 자리에서 갱신하므로,
+실현손익/포지션 원장이 과거 체결의 수정을 알아챌 수 있도록 KIS 일별체결과 같은 수정일시를 둔다.
+기존 행은 마이그레이션 시각으로 채워지므로 LS 계좌는 다음 동기화에서 한 번 전체 재계산된다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c8a6d1e3b7'
+down_revision = 'e1b9d4c7a630'
+branch_labels = None
+depends_on = None
+
+
+def _has_column(inspector, table: str, column: str) -> bool:
+    return column in {existing["name"] for existing in inspector.get_columns(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("ls_trade") and not _has_column(inspector, "ls_trade", "updated_at"):
+        op.add_column(
+            "ls_trade",
+            sa.Column("updated_at", sa.TIMESTAMP(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("ls_trade") and _has_column(inspector, "ls_trade", "updated_at"):
+        op.drop_column("ls_trade", "updated_at")
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import accounts, items, login, private, users, utils, broker_api
+from app.api.routes import accounts, items, login, private, users, utils, broker_api, portfolio, orders, scheduler
 from app.core.config import settings
 
 api_router = APIRouter()
@@ -10,5 +10,8 @@ api_router.include_router(utils.router)
 api_router.include_router(items.router)
 api_router.include_router(accounts.router)
 api_router.include_router(broker_api.router)
+api_router.include_router(portfolio.router)
+api_router.include_router(orders.router)
+api_router.include_router(scheduler.router)
 if settings.ENVIRONMENT == "local":
     api_router.include_router(private.router)
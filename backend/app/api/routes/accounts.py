@@ -1,52 +1,47 @@
 import uuid
-from typing import Any
+from typing import Any, Optional
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select, Session
-from sqlalchemy.orm import joinedload
+from sqlmodel import func, Session
 
 from app.api.deps import CurrentUser, SessionDep
 from app.models import (
     Account, Account_Create, Account_Public, Accounts_Public, 
-    Account_Update, Message
+    Account_Update, Message, User
 )
 from app.api.services.kis_api import get_access_token_KIS   
 # LS API 서비스 import 필요
 from app.api.services.ls_api import get_access_token_LS
+from app.api.services.portfolio_service import remove_account_contribution
+from app.api.services.listing_service import count_rows, fetch_page
+from app.core.json_codec import Timed_JSON_Response, Timed_Route
 
-router = APIRouter(prefix="/accounts", tags=["accounts"])
+router = APIRouter(
+    prefix="/accounts",
+    tags=["accounts"],
+    default_response_class=Timed_JSON_Response,
+    route_class=Timed_Route,
+)
 
 @router.get("/", response_model=Accounts_Public)
 def read_accounts(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
-    """계정 목록 조회"""
-    if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Account)
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Account)
-            .options(joinedload(Account.owner))
-            .offset(skip)
-            .limit(limit)
-        )
-        accounts = session.exec(statement).all()
-    else:
-        count_statement = (
-            select(func.count())
-            .select_from(Account)
-            .where(Account.owner_id == current_user.id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Account)
-            .options(joinedload(Account.owner))
-            .where(Account.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        accounts = session.exec(statement).all()
-    
-    return Accounts_Public(data=accounts, count=count)
+    """계정 목록 조회 (다음 페이지는 응답의 next_cursor 를 cursor 로 전달)"""
+    criteria = [] if current_user.is_superuser else [Account.owner_id == current_user.id]
+    count = count_rows(session, Account, *criteria)
+
+    # 계좌 공개 컬럼과 소유자 이름만 조회 (ORM 객체/관계 로딩 없이)
+    columns = [getattr(Account, name) for name in Account_Public.model_fields if name != "owner_name"]
+    owner_name = func.coalesce(func.nullif(User.full_name, ""), User.email).label("owner_name")
+    accounts, next_cursor = fetch_page(
+        session, Account, [*columns, owner_name], limit, cursor,
+        criteria=criteria, joins=[(User, User.id == Account.owner_id)], skip=skip,
+    )
+    return Accounts_Public(data=accounts, count=count, next_cursor=next_cursor)
 
 @router.get("/{account_id}", response_model=Account_Public)
 def read_account(session: SessionDep, current_user: CurrentUser, account_id: uuid.UUID) -> Any:
@@ -169,6 +164,10 @@ def update_account(
     for field, value in account_data.items():
         setattr(account, field, value)
 
+    # 비활성화된 계좌는 더 이상 잔고가 갱신되지 않으므로 통합 포트폴리오에서 제외
+    if not account.is_active:
+        remove_account_contribution(session, account)
+
     session.add(account)
     session.commit()
     session.refresh(account)
@@ -185,6 +184,7 @@ def delete_account(
     if not current_user.is_superuser and (account.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
+    remove_account_contribution(session, account)
     session.delete(account)
     session.commit()
     return Message(message="Account deleted successfully")
@@ -1,21 +1,42 @@
+import asyncio
+import json
 from datetime import datetime, timedelta
+import time
 import uuid
 from typing import Any, List, Optional, Union
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
 from sqlmodel import Session
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import CurrentUser, SessionDep, get_current_user
+from app.core.db import engine
 from app.models.account import Account
-from app.models.kis import Kis_Daily_Trade, Kis_Daily_Trade_Base, Kis_Minutely_Balance, Kis_Daily_Trade_Response, Kis_Balance_Response
-from app.models.ls import Ls_Daily_Trade, Ls_Minutely_Balance, Ls_Balance_Response, Ls_Daily_Trade_Response, Ls_Daily_Trade_Base
+from app.models.user import User
+from app.models.kis import Kis_Daily_Trade_Base, Kis_Minutely_Balance, Kis_Daily_Trade_Response, Kis_Balance_Response
+from app.models.ls import Ls_Minutely_Balance, Ls_Balance_Response, Ls_Daily_Trade_Response, Ls_Daily_Trade_Base
+from app.models.analytics import Portfolio_Analytics_Response
+from app.models.ledger import Realized_Pnl_Response, Positions_Response, Position_Drift_Response
 from app.api.services.kis_api import get_access_token_KIS, inquire_balance_from_KIS, inquire_daily_ccld_from_KIS
 from app.api.services.ls_api import get_access_token_LS, inquire_balance_from_LS, inquire_daily_ccld_from_LS
 from app.api.services.background_tasks import start_background_tasks, stop_background_tasks, should_refresh_token
 from app.api.services.kis_trade_service import process_trade_data_KIS, update_account_daily_trades_KIS
 from app.api.services.ls_trade_service import process_trade_data_LS, update_account_daily_trades_LS
-from app.constants import KST
+from app.api.services.archive_service import load_minutely_history
+from app.api.services.analytics_service import get_last_snapshot_time, get_portfolio_analytics
+from app.api.services.fill_service import fee_basis
+from app.api.services.lot_matching_service import LOT_METHODS, FIFO, get_realized_pnl
+from app.api.services.position_ledger_service import reconstruct_positions, check_position_drift
+from app.api.services.realtime_service import Subscription, realtime_manager
+from app.api.services.history_cache import history_cache
+from app.api.services.poll_policy import poll_policy
+from app.core.json_codec import Serialized_JSON_Response, Timed_JSON_Response, Timed_Route, dumps
+from app.constants import KST, ANALYTICS_ROLLING_WINDOW, REALTIME_AUTH_TIMEOUT_SECONDS
 
-router = APIRouter(prefix="/broker", tags=["broker-api"])
+router = APIRouter(
+    prefix="/broker",
+    tags=["broker-api"],
+    default_response_class=Timed_JSON_Response,
+    route_class=Timed_Route,
+)
 
 # 시작/종료 이벤트 핸들러는 그대로 유지
 @router.on_event("startup")
@@ -26,7 +47,8 @@ async def startup_event():
 @router.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 백그라운드 태스크 중지"""
-    stop_background_tasks()
+    await stop_background_tasks()
+    await realtime_manager.close()
 
 def refresh_token_if_needed_kis(account: Account) -> None:
     """계정의 토큰이 만료되어가는 경우 갱신"""
@@ -251,7 +273,11 @@ async def get_minutely_balance(
         else:
             raise HTTPException(status_code=400, detail="Unsupported broker")
 
-@router.get("/{broker}/{account_id}/trades/minutely", response_model=Union[List[Kis_Daily_Trade], List[Ls_Daily_Trade]])
+@router.get(
+    "/{broker}/{account_id}/trades/minutely",
+    response_model=Union[List[Kis_Minutely_Balance], List[Ls_Minutely_Balance]],
+    response_class=Serialized_JSON_Response,
+)
 async def get_minutely_trades(
     broker: str,
     account_id: uuid.UUID,
@@ -266,35 +292,198 @@ async def get_minutely_trades(
         raise HTTPException(status_code=404, detail="Account not found")
     if not current_user.is_superuser and (account.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
+    poll_policy.record_view(account_id, session)  # 조회 중인 계좌는 잔고를 최소 주기로 조회
 
-    # 기본값으로 오늘 데이터 조회
+    # 기본값으로 오늘 데이터 조회 (종료 시각을 다음 분으로 올려 같은 분 안의 조회는 캐시를 공유)
     if not end_time:
-        end_time = datetime.now(KST)
+        end_time = (datetime.now(KST) + timedelta(minutes=1)).replace(second=0, microsecond=0)
     if not start_time:
         start_time = end_time.replace(hour=9, minute=0, second=0, microsecond=0)
         if end_time.hour >= 15 and end_time.minute >= 30:
             end_time = end_time.replace(hour=15, minute=30, second=0, microsecond=0)
 
-    # 브로커별 쿼리 생성
-    if broker.upper() == "KIS":
-        query = session.query(Kis_Minutely_Balance).filter(
-            Kis_Minutely_Balance.account_id == account_id,
-            Kis_Minutely_Balance.timestamp >= start_time,
-            Kis_Minutely_Balance.timestamp <= end_time
-        )
-    elif broker.upper() == "LS":
-        query = session.query(Ls_Minutely_Balance).filter(
-            Ls_Minutely_Balance.account_id == account_id,
-            Ls_Minutely_Balance.timestamp >= start_time,
-            Ls_Minutely_Balance.timestamp <= end_time
-        )
-    else:
+    if broker.upper() not in ("KIS", "LS"):
         raise HTTPException(status_code=400, detail="Unsupported broker")
 
-    # 정렬 및 실행
-    balances = query.order_by(
-        Kis_Minutely_Balance.timestamp.asc() if broker.upper() == "KIS" 
-        else Ls_Minutely_Balance.timestamp.asc()
-    ).all()
-    
-    return balances 
\ No newline at end of file
+    # 캐시는 프로세스별이므로 마지막 분별 잔고 시각을 키에 포함 (다른 프로세스가 저장한 잔고도 바로 반영)
+    last_snapshot = get_last_snapshot_time(session, broker.upper(), account_id)
+    cache_key = (broker.upper(), start_time, end_time, last_snapshot)
+    body = history_cache.get(account_id, cache_key)
+    if body is not None:
+        return Serialized_JSON_Response(body, cache_hit=True)
+
+    # DB(최근 데이터)와 아카이브(보존기간 경과 데이터)를 합쳐 시간순으로 조회
+    # (Parquet 읽기가 이벤트 루프를 막지 않도록 작업 스레드에서 실행)
+    balances = await asyncio.to_thread(load_minutely_history, session, broker.upper(), account_id, start_time, end_time)
+
+    started = time.perf_counter()
+    body = dumps(balances)
+    serialization_ms = (time.perf_counter() - started) * 1000
+    history_cache.put(account_id, cache_key, body)
+    return Serialized_JSON_Response(body, serialization_ms=serialization_ms)
+
+@router.get("/{broker}/{account_id}/analytics", response_model=Portfolio_Analytics_Response)
+def get_account_analytics(
+    broker: str,
+    account_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+    window: int = ANALYTICS_ROLLING_WINDOW,
+) -> Any:
+    """계좌 성과 분석 (수익률, 최대낙폭, 변동성, 샤프지수)"""
+    account = session.get(Account, account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if not current_user.is_superuser and (account.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    poll_policy.record_view(account_id, session)
+
+    if broker.upper() != account.broker.upper():
+        raise HTTPException(status_code=400, detail=f"Account broker mismatch. Expected: {account.broker}, Got: {broker.upper()}")
+    if broker.upper() not in ("KIS", "LS"):
+        raise HTTPException(status_code=400, detail="Unsupported broker")
+
+    return get_portfolio_analytics(
+        session, broker.upper(), account_id,
+        start_time=start_time, end_time=end_time, window=window
+    )
+
+@router.get("/{broker}/{account_id}/pnl", response_model=Realized_Pnl_Response)
+def get_account_realized_pnl(
+    broker: str,
+    account_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    method: str = FIFO,
+) -> Any:
+    """종목별 실현손익 및 미청산 로트 조회 (fifo/average)"""
+    account = session.get(Account, account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if not current_user.is_superuser and (account.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+    if broker.upper() != account.broker.upper():
+        raise HTTPException(status_code=400, detail=f"Account broker mismatch. Expected: {account.broker}, Got: {broker.upper()}")
+    if method not in LOT_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unsupported method. Expected one of: {', '.join(LOT_METHODS)}")
+
+    return {**get_realized_pnl(session, account_id, method), "fee_basis": fee_basis(account.broker)}
+
+@router.get("/{broker}/{account_id}/positions", response_model=Positions_Response)
+def get_account_positions(
+    broker: str,
+    account_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    at: datetime | None = None,
+) -> Any:
+    """체결 내역으로 재구성한 특정 시점의 종목별 포지션 조회 (기본: 현재)"""
+    account = session.get(Account, account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if not current_user.is_superuser and (account.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    poll_policy.record_view(account_id, session)
+
+    if broker.upper() != account.broker.upper():
+        raise HTTPException(status_code=400, detail=f"Account broker mismatch. Expected: {account.broker}, Got: {broker.upper()}")
+
+    return reconstruct_positions(session, account, at)
+
+@router.get("/{broker}/{account_id}/positions/drift", response_model=Position_Drift_Response)
+def get_account_position_drift(
+    broker: str,
+    account_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> Any:
+    """원장 포지션과 마지막 브로커 잔고의 보유수량 비교"""
+    account = session.get(Account, account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if not current_user.is_superuser and (account.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+    if broker.upper() != account.broker.upper():
+        raise HTTPException(status_code=400, detail=f"Account broker mismatch. Expected: {account.broker}, Got: {broker.upper()}")
+    if broker.upper() not in ("KIS", "LS"):
+        raise HTTPException(status_code=400, detail="Unsupported broker")
+
+    return check_position_drift(session, account)
+
+def _authenticate_token(token: str) -> Optional[User]:
+    with Session(engine) as session:
+        try:
+            return get_current_user(session, token)
+        except HTTPException:
+            return None
+
+async def _websocket_token(websocket: WebSocket) -> Optional[str]:
+    """Authorization: Bearer 헤더, 없으면 연결 직후 첫 메시지 {"token": "..."} 에서 토큰을 읽음
+
+    토큰을 쿼리 문자열에 두면 접근 로그/프록시에 남으므로 받지 않는다.
+    """
+    scheme, _, token = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token
+    try:
+        message = await asyncio.wait_for(websocket.receive_json(), timeout=REALTIME_AUTH_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, json.JSONDecodeError, KeyError, WebSocketDisconnect):
+        return None
+    return message.get("token") if isinstance(message, dict) else None
+
+async def _send_ticks(websocket: WebSocket, subscription: Subscription) -> None:
+    async for tick in subscription:
+        await websocket.send_json({
+            "stock_code": tick.stock_code,
+            "price": tick.price,
+            "change_rate": tick.change_rate,
+            "volume": tick.volume,
+            "accumulated_volume": tick.accumulated_volume,
+            "traded_at": tick.traded_at.isoformat()
+        })
+
+async def _receive_until_closed(websocket: WebSocket) -> None:
+    """클라이언트 메시지를 읽어 버리며 연결 종료(close 프레임/끊김)를 감지"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+@router.websocket("/realtime")
+async def realtime_quotes(websocket: WebSocket, codes: str):
+    """실시간 체결가 구독 (codes: 쉼표로 구분한 종목코드)
+
+    인증은 Authorization 헤더 또는 첫 메시지 {"token": "..."} 로 한다 (브라우저는 헤더를 못 붙이므로 메시지 방식).
+    브로커 세션은 공용 계좌가 지정되어 있으면 전체 사용자가, 아니면 같은 사용자의 연결끼리 공유한다.
+    체결 전송과 클라이언트 수신을 함께 돌려 어느 한쪽이 끝나면 바로 구독을 해제한다.
+    """
+    await websocket.accept()
+    token = await _websocket_token(websocket)
+    user = await asyncio.to_thread(_authenticate_token, token) if token else None
+    if user is None:
+        await websocket.close(code=1008)
+        return
+
+    stock_codes = {code.strip() for code in codes.split(",") if code.strip()}
+    try:
+        subscription = await realtime_manager.subscribe(user.id, stock_codes)
+    except HTTPException as e:
+        await websocket.close(code=1013, reason=e.detail)
+        return
+
+    sender = asyncio.create_task(_send_ticks(websocket, subscription))
+    receiver = asyncio.create_task(_receive_until_closed(websocket))
+    try:
+        done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            # 전송 중 끊김(WebSocketDisconnect/RuntimeError)은 정상 종료로 봄
+            task.exception()
+    finally:
+        await subscription.close()
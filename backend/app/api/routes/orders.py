@@ -0,0 +1,119 @@
+import uuid
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlmodel import func, select
+
+from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.models.account import Account
+from app.models.order import (
+    Order, Order_Create, Order_Public, Orders_Public, Order_Latency_Stats,
+    Basket_Create, Basket_Job, Basket_Job_Public,
+    Parent_Order, Parent_Order_Create, Parent_Order_Public
+)
+from app.api.services.order_service import get_order_latency_stats, place_order
+from app.api.services.basket_service import create_basket_job, get_basket_job, start_basket_job
+from app.api.services.order_schedule_service import (
+    cancel_parent_order, create_parent_order, get_parent_order, slice_scheduler
+)
+
+router = APIRouter(prefix="/orders", tags=["orders"])
+
+def get_owned_account(session: SessionDep, current_user: CurrentUser, account_id: uuid.UUID) -> Account:
+    account = session.get(Account, account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if not current_user.is_superuser and (account.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return account
+
+@router.get("/latency", response_model=Order_Latency_Stats, dependencies=[Depends(get_current_active_superuser)])
+def read_order_latency() -> Any:
+    """최근 주문 전송 지연시간 통계 (p50/p90/p99, 전체 계좌 합산이라 관리자 전용)"""
+    return get_order_latency_stats()
+
+@router.post("/baskets", response_model=Basket_Job_Public)
+async def create_basket(basket_in: Basket_Create, session: SessionDep, current_user: CurrentUser) -> Any:
+    """여러 계좌에 바스켓 주문 생성 후 계좌별 동시 전송 (진행 상황은 작업 ID로 조회)"""
+    if not basket_in.targets:
+        raise HTTPException(status_code=400, detail="Basket has no targets")
+    accounts = {
+        target.account_id: get_owned_account(session, current_user, target.account_id)
+        for target in basket_in.targets
+    }
+    job, plans = create_basket_job(session, current_user.id, basket_in, accounts)
+    start_basket_job(job.id, plans)
+    return get_basket_job(session, job.id)
+
+@router.get("/baskets/{job_id}", response_model=Basket_Job_Public)
+def read_basket(job_id: uuid.UUID, session: SessionDep, current_user: CurrentUser) -> Any:
+    """바스켓 주문 작업 및 주문별 상태 조회"""
+    job = session.get(Basket_Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Basket job not found")
+    if not current_user.is_superuser and (job.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return get_basket_job(session, job_id)
+
+def get_owned_parent_order(session: SessionDep, current_user: CurrentUser, parent_id: uuid.UUID) -> Parent_Order:
+    parent = session.get(Parent_Order, parent_id)
+    if not parent:
+        raise HTTPException(status_code=404, detail="Parent order not found")
+    get_owned_account(session, current_user, parent.account_id)
+    return parent
+
+@router.post("/schedules", response_model=Parent_Order_Public)
+async def create_schedule(parent_in: Parent_Order_Create, session: SessionDep, current_user: CurrentUser) -> Any:
+    """TWAP/VWAP 분할 주문 생성 (자식주문은 예정 시각에 스케줄러가 전송)"""
+    account = get_owned_account(session, current_user, parent_in.account_id)
+    parent = create_parent_order(session, account, parent_in)
+    slice_scheduler.load_pending(session, parent.id)
+    return get_parent_order(session, parent.id)
+
+@router.get("/schedules/{parent_id}", response_model=Parent_Order_Public)
+def read_schedule(parent_id: uuid.UUID, session: SessionDep, current_user: CurrentUser) -> Any:
+    """분할 주문 진행 상황 및 슬리피지 조회"""
+    get_owned_parent_order(session, current_user, parent_id)
+    return get_parent_order(session, parent_id)
+
+@router.post("/schedules/{parent_id}/cancel", response_model=Parent_Order_Public)
+def cancel_schedule(parent_id: uuid.UUID, session: SessionDep, current_user: CurrentUser) -> Any:
+    """미전송 자식주문 취소"""
+    parent = get_owned_parent_order(session, current_user, parent_id)
+    cancel_parent_order(session, parent)
+    return get_parent_order(session, parent_id)
+
+@router.post("/{account_id}", response_model=Order_Public)
+def create_order(
+    account_id: uuid.UUID,
+    order_in: Order_Create,
+    session: SessionDep,
+    current_user: CurrentUser,
+    idempotency_key: Optional[str] = Header(default=None, max_length=64),
+) -> Any:
+    """주문 전송 (Idempotency-Key 헤더 또는 본문의 키로 재시도 시 중복 주문 방지)"""
+    account = get_owned_account(session, current_user, account_id)
+    if idempotency_key and not order_in.idempotency_key:
+        order_in.idempotency_key = idempotency_key
+    return place_order(session, account, order_in)
+
+@router.get("/{account_id}", response_model=Orders_Public)
+def read_orders(
+    account_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """계좌 주문 내역 조회 (최근 순)"""
+    get_owned_account(session, current_user, account_id)
+    count = session.exec(
+        select(func.count()).select_from(Order).where(Order.account_id == account_id)
+    ).one()
+    orders = session.exec(
+        select(Order)
+        .where(Order.account_id == account_id)
+        .order_by(Order.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    return Orders_Public(data=orders, count=count)
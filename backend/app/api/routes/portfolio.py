@@ -0,0 +1,27 @@
+import uuid
+from typing import Any
+from fastapi import APIRouter, HTTPException
+
+from app.api.deps import CurrentUser, SessionDep
+from app.models.portfolio import User_Portfolio_Public
+from app.api.services.portfolio_service import get_user_portfolio, rebuild_user_portfolio
+
+router = APIRouter(prefix="/portfolio", tags=["portfolio"])
+
+@router.get("/", response_model=User_Portfolio_Public)
+def read_my_portfolio(session: SessionDep, current_user: CurrentUser) -> Any:
+    """전체 계좌 통합 포트폴리오 조회 (잔고 저장 시 증분 갱신된 결과)"""
+    return get_user_portfolio(session, current_user.id)
+
+@router.get("/{user_id}", response_model=User_Portfolio_Public)
+def read_user_portfolio(user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser) -> Any:
+    """사용자 통합 포트폴리오 조회"""
+    if not current_user.is_superuser and user_id != current_user.id:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return get_user_portfolio(session, user_id)
+
+@router.post("/rebuild", response_model=User_Portfolio_Public)
+def rebuild_my_portfolio(session: SessionDep, current_user: CurrentUser) -> Any:
+    """계좌별 반영분으로 통합 포트폴리오 재합산"""
+    rebuild_user_portfolio(session, current_user.id)
+    return get_user_portfolio(session, current_user.id)
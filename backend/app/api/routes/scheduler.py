@@ -0,0 +1,59 @@
+import uuid
+from typing import Any, Optional
+from fastapi import APIRouter, Depends
+
+from app.api.deps import SessionDep, get_current_active_superuser
+from app.models.scheduler import Job_Trigger_Response, Scheduled_Job_Status, Scheduled_Jobs_Public, Shard_Status, Poll_Intervals_Public
+from app.api.services.scheduler import job_scheduler
+from app.api.services.sharding_service import shard_membership
+from app.api.services.poll_policy import poll_policy
+
+router = APIRouter(
+    prefix="/scheduler",
+    tags=["scheduler"],
+    dependencies=[Depends(get_current_active_superuser)],
+)
+
+@router.get("/jobs", response_model=Scheduled_Jobs_Public)
+def read_jobs(session: SessionDep) -> Any:
+    """모든 워커의 백그라운드 작업 목록 (다음 실행 시각, 마지막 순회 시간/오류, 대기 중인 즉시 실행 수)
+
+    다른 워커의 상태는 DB 에 보고된 값이라 최대 SCHEDULER_SYNC_SECONDS 늦을 수 있다.
+    """
+    jobs = job_scheduler.reports(session, shard_membership.node_id)
+    return Scheduled_Jobs_Public(data=jobs, count=len(jobs))
+
+@router.get("/jobs/{name}", response_model=Scheduled_Jobs_Public)
+def read_job(session: SessionDep, name: str) -> Any:
+    """워커별 작업 상태와 계좌별 처리 상태"""
+    jobs = job_scheduler.reports(session, shard_membership.node_id, name, include_accounts=True)
+    return Scheduled_Jobs_Public(data=jobs, count=len(jobs))
+
+@router.post("/jobs/{name}/pause", response_model=Scheduled_Job_Status)
+def pause_job(session: SessionDep, name: str) -> Any:
+    """작업 일시정지 (진행 중인 순회는 끝까지 실행하고 다음 대기부터 멈춤, 다른 워커는 다음 동기화에서 반영)"""
+    job = job_scheduler.set_paused(session, name, True)
+    return {**job.status(), "node_id": shard_membership.node_id}
+
+@router.post("/jobs/{name}/resume", response_model=Scheduled_Job_Status)
+def resume_job(session: SessionDep, name: str) -> Any:
+    """일시정지한 작업 재개 (다른 워커는 다음 동기화에서 반영)"""
+    job = job_scheduler.set_paused(session, name, False)
+    return {**job.status(), "node_id": shard_membership.node_id}
+
+@router.post("/jobs/{name}/run", response_model=Job_Trigger_Response, status_code=202)
+def run_job(session: SessionDep, name: str, account_id: Optional[uuid.UUID] = None) -> Any:
+    """계좌 1개(미지정 시 모든 활성 계좌)에 대해 작업 즉시 실행 요청 (워커 하나가 가져가 실행, 일시정지 중에도 실행)"""
+    triggered = job_scheduler.request_run(session, name, account_id)
+    return Job_Trigger_Response(job=name, triggered=triggered)
+
+@router.get("/nodes", response_model=Shard_Status)
+def read_nodes() -> Any:
+    """스케줄러 노드 분산 상태 (살아 있는 노드, 현재 노드의 리더 여부)"""
+    return shard_membership.status()
+
+@router.get("/poll-intervals", response_model=Poll_Intervals_Public)
+def read_poll_intervals() -> Any:
+    """계좌별 적응형 잔고 조회 주기와 활동 점수"""
+    intervals = sorted(poll_policy.status(), key=lambda item: item["interval_seconds"])
+    return Poll_Intervals_Public(data=intervals, count=len(intervals))
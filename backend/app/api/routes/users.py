@@ -2,7 +2,7 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from sqlmodel import col, delete
 
 from app import crud
 from app.api.deps import (
@@ -24,6 +24,7 @@ from app.models import (
     User_Update,
     User_Update_Me,
 )
+from app.api.services.listing_service import count_rows, fetch_page
 from app.utils import generate_new_account_email, send_email
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -34,18 +35,17 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=Users_Public,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+    session: SessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None
+) -> Any:
     """
-    Retrieve users.
+    Retrieve users (pass next_cursor back as cursor for the next page).
     """
+    count = count_rows(session, User)
+    columns = [getattr(User, name) for name in User_Public.model_fields]
+    users, next_cursor = fetch_page(session, User, columns, limit, cursor, skip=skip)
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
-
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
-
-    return Users_Public(data=users, count=count)
+    return Users_Public(data=users, count=count, next_cursor=next_cursor)
 
 
 @router.post(
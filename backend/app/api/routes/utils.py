@@ -1,7 +1,10 @@
+from typing import Any
+
 from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
+from app.core.json_codec import get_serialization_stats
 from app.models import Message
 from app.utils import generate_test_email, send_email
 
@@ -26,6 +29,17 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/serialization-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def serialization_stats() -> dict[str, dict[str, Any]]:
+    """
+    Recent response serialization time per route.
+    """
+    return get_serialization_stats()
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
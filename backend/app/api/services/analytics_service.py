@@ -0,0 +1,203 @@
+import math
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+import pyarrow as pa
+from numpy.lib.stride_tricks import sliding_window_view
+from sqlmodel import Session, func, select
+
+from app.constants import (
+    KST,
+    ANALYTICS_DEFAULT_LOOKBACK_DAYS,
+    ANALYTICS_ROLLING_WINDOW,
+    ANALYTICS_CASH_FLOW_THRESHOLD,
+    ANALYTICS_TRADING_SECONDS_PER_YEAR,
+    ANALYTICS_CACHE_SIZE
+)
+from app.core.metrics import record_cache
+from app.api.services.archive_service import (
+    MINUTELY_BALANCE_MODELS,
+    get_retention_cutoff,
+    read_archived_columns
+)
+
+# 분석 결과 캐시: (broker, account_id, start, end, window) -> (마지막 스냅샷 시각, 결과)
+_analytics_cache: "OrderedDict[tuple, tuple[Optional[datetime], dict[str, Any]]]" = OrderedDict()
+
+
+def load_balance_series(
+    session: Session,
+    broker: str,
+    account_id: uuid.UUID,
+    start_time: datetime,
+    end_time: datetime,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """분별 잔고에서 (timestamp[us], total_assets, profit_loss) 배열을 시간순으로 로드"""
+    model = MINUTELY_BALANCE_MODELS[broker]
+    rows = session.exec(
+        select(model.timestamp, model.total_assets, model.profit_loss)
+        .where(
+            model.account_id == account_id,
+            model.timestamp >= start_time,
+            model.timestamp <= end_time,
+        )
+        .order_by(model.timestamp)
+    ).all()
+
+    count = len(rows)
+    timestamps = np.fromiter(
+        (int(row[0].timestamp()) * 1_000_000 + row[0].microsecond for row in rows), dtype=np.int64, count=count
+    )
+    total_assets = np.fromiter((row[1] for row in rows), dtype=np.float64, count=count)
+    profit_loss = np.fromiter((row[2] for row in rows), dtype=np.float64, count=count)
+
+    # 보존기간 이전 구간은 아카이브에서 컬럼 단위로 로드
+    if start_time < get_retention_cutoff():
+        archived = read_archived_columns(
+            broker, account_id, start_time, end_time,
+            columns=["timestamp", "total_assets", "profit_loss"],
+        )
+        if archived.num_rows:
+            archived_timestamps = archived["timestamp"].cast(pa.int64()).to_numpy()
+            timestamps = np.concatenate([timestamps, archived_timestamps])
+            total_assets = np.concatenate([total_assets, archived["total_assets"].to_numpy()])
+            profit_loss = np.concatenate([profit_loss, archived["profit_loss"].to_numpy()])
+
+            # 시간순 정렬 + 중복 시각 제거 (먼저 나온 DB 값 우선)
+            timestamps, keep = np.unique(timestamps, return_index=True)
+            total_assets, profit_loss = total_assets[keep], profit_loss[keep]
+
+    return timestamps, total_assets, profit_loss
+
+
+def compute_portfolio_metrics(
+    timestamps: np.ndarray,
+    total_assets: np.ndarray,
+    profit_loss: np.ndarray,
+    window: int = ANALYTICS_ROLLING_WINDOW,
+    risk_free_rate: float = 0.0,
+) -> dict[str, Any]:
+    """총평가금액/평가손익 시계열로 수익률·위험 지표를 벡터 연산으로 계산
+
+    입출금은 스냅샷 간 (총평가금액 변동 - 평가손익 변동), 즉 원금 변동분 중
+    직전 총평가금액 대비 ANALYTICS_CASH_FLOW_THRESHOLD 이상인 변동으로 추정하며,
+    구간 말에 발생한 것으로 보고 시간가중수익률에서 제외한다.
+    """
+    count = len(timestamps)
+    result: dict[str, Any] = {
+        "sample_count": count,
+        "time_weighted_return": 0.0,
+        "total_profit_loss_change": 0.0,
+        "net_cash_flow": 0.0,
+        "max_drawdown": 0.0,
+        "volatility": 0.0,
+        "sharpe_ratio": None,
+        "equity_index": [1.0] * count,
+        "drawdown": [0.0] * count,
+        "rolling_volatility": [None] * count,
+    }
+    if count < 2:
+        return result
+
+    previous = total_assets[:-1]
+    capital_change = np.diff(total_assets) - np.diff(profit_loss)
+    flows = np.where(
+        np.abs(capital_change) >= ANALYTICS_CASH_FLOW_THRESHOLD * np.abs(previous),
+        capital_change,
+        0.0,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(previous > 0, (total_assets[1:] - flows) / previous - 1.0, 0.0)
+
+    equity_index = np.concatenate(([1.0], np.cumprod(1.0 + returns)))
+    drawdown = equity_index / np.maximum.accumulate(equity_index) - 1.0
+
+    # 스냅샷 간격의 중앙값으로 연환산 계수 추정
+    intervals = np.diff(timestamps) / 1_000_000
+    positive_intervals = intervals[intervals > 0]
+    periods_per_year = (
+        ANALYTICS_TRADING_SECONDS_PER_YEAR / float(np.median(positive_intervals))
+        if positive_intervals.size else 0.0
+    )
+    annualizer = math.sqrt(periods_per_year)
+
+    volatility = float(returns.std(ddof=1)) * annualizer if returns.size > 1 else 0.0
+    rolling_volatility: list[Optional[float]] = [None] * count
+    if window > 1 and returns.size >= window:
+        rolling = sliding_window_view(returns, window).std(axis=1, ddof=1) * annualizer
+        rolling_volatility[window:] = rolling.tolist()
+
+    result.update(
+        time_weighted_return=float(equity_index[-1] - 1.0),
+        total_profit_loss_change=float(profit_loss[-1] - profit_loss[0]),
+        net_cash_flow=float(flows.sum()),
+        max_drawdown=float(drawdown.min()),
+        volatility=volatility,
+        sharpe_ratio=(
+            (float(returns.mean()) * periods_per_year - risk_free_rate) / volatility
+            if volatility > 0 else None
+        ),
+        equity_index=equity_index.tolist(),
+        drawdown=drawdown.tolist(),
+        rolling_volatility=rolling_volatility,
+    )
+    return result
+
+
+def get_last_snapshot_time(session: Session, broker: str, account_id: uuid.UUID) -> Optional[datetime]:
+    """계좌의 마지막 분별 잔고 시각"""
+    model = MINUTELY_BALANCE_MODELS[broker]
+    return session.exec(
+        select(func.max(model.timestamp)).where(model.account_id == account_id)
+    ).one()
+
+
+def get_portfolio_analytics(
+    session: Session,
+    broker: str,
+    account_id: uuid.UUID,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    window: int = ANALYTICS_ROLLING_WINDOW,
+) -> dict[str, Any]:
+    """계좌 성과 분석 (마지막 스냅샷 시각이 바뀌지 않았으면 캐시 결과 반환)"""
+    last_snapshot = get_last_snapshot_time(session, broker, account_id)
+    cache_key = (broker, account_id, start_time, end_time, window)
+    cached = _analytics_cache.get(cache_key)
+    hit = bool(cached) and cached[0] == last_snapshot
+    record_cache("analytics", hit)
+    if hit:
+        _analytics_cache.move_to_end(cache_key)
+        return cached[1]
+
+    # 기본 구간은 마지막 스냅샷 기준으로 계산해 캐시 키가 시각에 따라 흔들리지 않도록 함
+    if end_time is None:
+        end_time = last_snapshot or datetime.now(KST)
+    elif end_time.tzinfo is None:
+        end_time = KST.localize(end_time)
+    if start_time is None:
+        start_time = end_time - timedelta(days=ANALYTICS_DEFAULT_LOOKBACK_DAYS)
+    elif start_time.tzinfo is None:
+        start_time = KST.localize(start_time)
+
+    timestamps, total_assets, profit_loss = load_balance_series(
+        session, broker, account_id, start_time, end_time
+    )
+    result = compute_portfolio_metrics(timestamps, total_assets, profit_loss, window=window)
+    snapshot_times = [
+        datetime.fromtimestamp(ts / 1_000_000, KST) for ts in timestamps.tolist()
+    ]
+    result.update(
+        account_id=account_id,
+        start_time=snapshot_times[0] if snapshot_times else None,
+        end_time=snapshot_times[-1] if snapshot_times else None,
+        timestamps=snapshot_times,
+    )
+
+    _analytics_cache[cache_key] = (last_snapshot, result)
+    while len(_analytics_cache) > ANALYTICS_CACHE_SIZE:
+        _analytics_cache.popitem(last=False)
+    return result
@@ -0,0 +1,267 @@
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlmodel import Session, delete, select
+
+from app.constants import (
+    KST,
+    UTC,
+    MINUTELY_RETENTION_DAYS,
+    MINUTELY_ARCHIVE_COMPRESSION
+)
+from app.core.config import settings
+from app.models.kis import Kis_Minutely_Balance
+from app.models.ls import Ls_Minutely_Balance
+
+logger = logging.getLogger(__name__)
+
+Minutely_Balance = Union[Kis_Minutely_Balance, Ls_Minutely_Balance]
+
+# 브로커별 분별 잔고 테이블
+MINUTELY_BALANCE_MODELS = {
+    "KIS": Kis_Minutely_Balance,
+    "LS": Ls_Minutely_Balance,
+}
+
+# 분별 잔고 수치 컬럼
+NUMERIC_FIELDS = (
+    "total_balance",
+    "available_balance",
+    "total_assets",
+    "purchase_amount",
+    "eval_amount",
+    "profit_loss",
+    "profit_loss_rate",
+    "asset_change_amount",
+    "asset_change_rate",
+)
+
+# 아카이브 파일 스키마 (timestamp 는 UTC 로 저장)
+ARCHIVE_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        *[(field, pa.float64()) for field in NUMERIC_FIELDS],
+        ("holdings", pa.string()),
+    ]
+)
+
+
+def get_retention_cutoff(retention_days: int = MINUTELY_RETENTION_DAYS) -> datetime:
+    """DB 보존기간 경계 시각 (이 시각 이전 데이터는 아카이브 대상)"""
+    today = datetime.now(KST).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=retention_days)
+
+
+def get_archive_path(broker: str, account_id: uuid.UUID, year: int, month: int) -> Path:
+    """계좌/월별 아카이브 파일 경로"""
+    return (
+        Path(settings.MINUTELY_ARCHIVE_DIR)
+        / broker.lower()
+        / str(account_id)
+        / f"{year:04d}-{month:02d}.parquet"
+    )
+
+
+def _iter_months(start: datetime, end: datetime) -> list[tuple[int, int]]:
+    """start ~ end 구간에 걸친 (연, 월) 목록"""
+    start, end = start.astimezone(KST), end.astimezone(KST)
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _as_kst(timestamp: datetime) -> datetime:
+    """시간대 없이 돌려받은 DB 값(SQLite 등)은 한국 시간으로 간주"""
+    return KST.localize(timestamp) if timestamp.tzinfo is None else timestamp
+
+
+def _rows_to_table(rows: list[Minutely_Balance]) -> pa.Table:
+    """분별 잔고 레코드를 아카이브 테이블로 변환"""
+    columns = {
+        "id": [str(row.id) for row in rows],
+        "timestamp": [_as_kst(row.timestamp).astimezone(UTC) for row in rows],
+        "holdings": [
+            json.dumps(row.holdings, ensure_ascii=False) if row.holdings is not None else None
+            for row in rows
+        ],
+    }
+    for field in NUMERIC_FIELDS:
+        columns[field] = [getattr(row, field) for row in rows]
+    return pa.Table.from_pydict(columns, schema=ARCHIVE_SCHEMA)
+
+
+def _write_month(path: Path, table: pa.Table) -> int:
+    """월별 파일에 병합 저장 (이미 아카이브된 시각은 건너뜀)"""
+    if path.exists():
+        existing = pq.read_table(path, memory_map=True)
+        is_new = pc.invert(pc.is_in(table["timestamp"], value_set=existing["timestamp"]))
+        table = table.filter(is_new)
+        if table.num_rows == 0:
+            return 0
+        merged = pa.concat_tables([existing, table])
+    else:
+        merged = table
+
+    merged = merged.sort_by("timestamp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    pq.write_table(merged, tmp_path, compression=MINUTELY_ARCHIVE_COMPRESSION)
+    os.replace(tmp_path, path)
+    return table.num_rows
+
+
+def archive_account_balances(
+    session: Session, broker: str, account_id: uuid.UUID, cutoff: datetime
+) -> int:
+    """계좌의 보존기간 경과 분별 잔고를 월별 Parquet 파일로 옮기고 DB에서 삭제"""
+    model = MINUTELY_BALANCE_MODELS[broker]
+    rows = session.exec(
+        select(model)
+        .where(model.account_id == account_id, model.timestamp < cutoff)
+        .order_by(model.timestamp)
+    ).all()
+    if not rows:
+        return 0
+
+    # 월별로 묶어서 저장
+    by_month: dict[tuple[int, int], list[Minutely_Balance]] = {}
+    for row in rows:
+        ts = _as_kst(row.timestamp).astimezone(KST)
+        by_month.setdefault((ts.year, ts.month), []).append(row)
+
+    for (year, month), month_rows in by_month.items():
+        _write_month(get_archive_path(broker, account_id, year, month), _rows_to_table(month_rows))
+
+    # 파일 저장이 끝난 뒤에만 원본 삭제
+    session.exec(
+        delete(model)
+        .where(model.account_id == account_id, model.timestamp < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return len(rows)
+
+
+def archive_minutely_balances(
+    session: Session, retention_days: int = MINUTELY_RETENTION_DAYS
+) -> int:
+    """보존기간이 지난 모든 계좌의 분별 잔고를 아카이브"""
+    cutoff = get_retention_cutoff(retention_days)
+    archived_count = 0
+
+    for broker, model in MINUTELY_BALANCE_MODELS.items():
+        account_ids = session.exec(
+            select(model.account_id).where(model.timestamp < cutoff).distinct()
+        ).all()
+
+        for account_id in account_ids:
+            try:
+                archived_count += archive_account_balances(session, broker, account_id, cutoff)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"분별 잔고 아카이브 실패 - 계좌: {account_id}, 에러: {str(e)}")
+                continue
+
+    return archived_count
+
+
+def read_archived_columns(
+    broker: str,
+    account_id: uuid.UUID,
+    start_time: datetime,
+    end_time: datetime,
+    columns: list[str] | None = None,
+) -> pa.Table:
+    """아카이브 파일에서 구간 내 컬럼 조회 (메모리 맵 사용)"""
+    start_utc, end_utc = start_time.astimezone(UTC), end_time.astimezone(UTC)
+    schema = ARCHIVE_SCHEMA if columns is None else pa.schema([ARCHIVE_SCHEMA.field(c) for c in columns])
+    tables = []
+
+    for year, month in _iter_months(start_time, end_time):
+        path = get_archive_path(broker, account_id, year, month)
+        if not path.exists():
+            continue
+
+        tables.append(
+            pq.read_table(
+                path,
+                columns=columns,
+                memory_map=True,
+                filters=[("timestamp", ">=", start_utc), ("timestamp", "<=", end_utc)],
+            )
+        )
+
+    return pa.concat_tables(tables) if tables else schema.empty_table()
+
+
+def read_archived_balances(
+    broker: str, account_id: uuid.UUID, start_time: datetime, end_time: datetime
+) -> list[Minutely_Balance]:
+    """아카이브 파일에서 구간 내 분별 잔고 조회"""
+    model = MINUTELY_BALANCE_MODELS[broker]
+    balances = []
+
+    for row in read_archived_columns(broker, account_id, start_time, end_time).to_pylist():
+        holdings = row.pop("holdings")
+        row["id"] = uuid.UUID(row["id"])
+        row["timestamp"] = row["timestamp"].astimezone(KST)
+        balances.append(
+            model(
+                **row,
+                account_id=account_id,
+                holdings=json.loads(holdings) if holdings is not None else None,
+            )
+        )
+
+    return balances
+
+
+def load_minutely_history(
+    session: Session,
+    broker: str,
+    account_id: uuid.UUID,
+    start_time: datetime,
+    end_time: datetime,
+) -> list[Minutely_Balance]:
+    """DB와 아카이브를 합쳐 구간 내 분별 잔고를 시간순으로 조회"""
+    model = MINUTELY_BALANCE_MODELS[broker]
+    # 시간대 정보가 없는 조회 조건은 한국 시간으로 간주
+    if start_time.tzinfo is None:
+        start_time = KST.localize(start_time)
+    if end_time.tzinfo is None:
+        end_time = KST.localize(end_time)
+    balances = list(
+        session.exec(
+            select(model)
+            .where(
+                model.account_id == account_id,
+                model.timestamp >= start_time,
+                model.timestamp <= end_time,
+            )
+            .order_by(model.timestamp)
+        ).all()
+    )
+
+    # 보존기간 이전 구간만 아카이브 조회
+    if start_time < get_retention_cutoff():
+        archived = read_archived_balances(broker, account_id, start_time, end_time)
+        if archived:
+            hot_timestamps = {_as_kst(balance.timestamp) for balance in balances}
+            balances.extend(
+                balance for balance in archived if balance.timestamp not in hot_timestamps
+            )
+            balances.sort(key=lambda balance: _as_kst(balance.timestamp))
+
+    return balances
@@ -1,7 +1,8 @@
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union
 from pytz import timezone
 from zoneinfo import ZoneInfo
 from fastapi import HTTPException
@@ -11,6 +12,7 @@ from sqlmodel import select, Session
 from app.constants import (
     TOKEN_REFRESH_THRESHOLD_MINUTES,
     TOKEN_CHECK_INTERVAL_SECONDS,
+    TOKEN_ISSUE_RATE_PER_SECOND,
     BALANCE_CHECK_INTERVAL_SECONDS,
     LOG_FORMAT,
     LOG_DATE_FORMAT,
@@ -19,16 +21,39 @@ from app.constants import (
     KST,
     UTC,
     MARKET_START_TIME,
-    MARKET_END_TIME
+    MARKET_END_TIME,
+    MINUTELY_ARCHIVE_HOUR,
+    QUOTE_REFRESH_INTERVAL_SECONDS,
+    ORDER_KEEPALIVE_SECONDS,
+    SCHEDULER_HEARTBEAT_SECONDS,
+    SCHEDULER_SYNC_SECONDS,
+    SHUTDOWN_DRAIN_SECONDS
 )
+from app.core.config import settings
 from app.core.db import engine
+from app.core.metrics import record_sweep
+from app.core.tracing import flush_tracing, traced
 from app.models.account import Account
+from app.models.common import minute_bucket
 from app.models.kis import Kis_Minutely_Balance
-from app.models.ls import Ls_Minutely_Balance, Ls_Trade
+from app.models.ls import Ls_Minutely_Balance
 from app.api.services.kis_api import get_access_token_KIS, inquire_balance_from_KIS, inquire_daily_ccld_from_KIS
-from app.api.services.ls_api import get_access_token_LS, inquire_balance_from_LS, inquire_daily_ccld_from_LS
+from app.api.services.ls_api import get_access_token_LS, inquire_balance_from_LS
 from app.api.services.kis_trade_service import process_trade_data_KIS, update_account_daily_trades_KIS
 from app.api.services.ls_trade_service import process_trade_data_LS, update_account_daily_trades_LS
+from app.api.services.archive_service import archive_minutely_balances
+from app.api.services.lot_matching_service import update_account_realized_pnl
+from app.api.services.position_ledger_service import update_position_snapshots, check_position_drift
+from app.api.services.portfolio_service import apply_balance_snapshot
+from app.api.services.field_mapping import upsert_row
+from app.api.services.history_cache import history_cache
+from app.api.services.quote_service import refresh_quotes
+from app.api.services.order_service import Rate_Limiter, warm_up_order_sessions
+from app.api.services.order_schedule_service import slice_scheduler
+from app.api.services.paper_broker import load_price_feed, paper_engine
+from app.api.services.scheduler import job_scheduler, load_poll_state, save_poll_state
+from app.api.services.sharding_service import shard_membership
+from app.api.services.poll_policy import phase_offset, poll_policy
 
 # 로깅 설정
 logging.basicConfig(
@@ -38,11 +63,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# 백그라운드 태스크 상태 관리
-background_tasks = set()
+# 백그라운드 태스크 상태 관리 (작업별 실행 상태는 job_scheduler)
 last_balance_check = {}  # 계정별 마지막 잔고 체크 시간 저장
 last_token_check = {}    # 계정별 마지막 토큰 체크 시간 저장
 last_token_task_time = datetime.now(KST)  # 마지막 토큰 체크 작업 시간
+token_issue_limiter = Rate_Limiter(TOKEN_ISSUE_RATE_PER_SECOND, burst=1)  # 토큰 발급 속도 제한 (전체 계좌 공유)
+warm_up_complete = asyncio.Event()  # 시작 준비(토큰 확인) 완료 전에는 토큰/잔고 루프 대기
 last_balance_task_time = datetime.now(KST)  # 마지막 잔고 체크 작업 시간
 
 def should_refresh_token(expires_at: Optional[datetime]) -> bool:
@@ -54,83 +80,161 @@ def should_refresh_token(expires_at: Optional[datetime]) -> bool:
     now = datetime.now(KST)
     return now + threshold >= expires_at
 
+def _first_check(account_id: str, interval: float, now: datetime) -> datetime:
+    """처음 보는 계좌의 가상 마지막 체크 시각 (첫 체크가 계좌별 위상만큼 뒤로 분산됨)"""
+    return now - timedelta(seconds=interval - phase_offset(account_id, interval))
+
 def should_check_token(account_id: str) -> bool:
     """토큰 체크가 필요한지 확인"""
     now = datetime.now(KST)
     last_check = last_token_check.get(account_id)
     
     if not last_check:
-        return True
+        last_check = last_token_check[account_id] = _first_check(account_id, TOKEN_CHECK_INTERVAL_SECONDS, now)
     
     # 마지막 체크로부터 60초 이상 지났는지 확인
     return (now - last_check).total_seconds() >= TOKEN_CHECK_INTERVAL_SECONDS
 
+def is_market_open(now: datetime) -> bool:
+    """평일 장 시간 여부"""
+    return MARKET_START_TIME <= now.time() <= MARKET_END_TIME and now.weekday() < 5
+
 def should_check_balance(account_id: str) -> bool:
-    """잔고 체크가 필요한지 확인"""
+    """잔고 체크가 필요한지 확인 (장중에는 분별 잔고 수집 주기를 넘지 않음)"""
     now = datetime.now(KST)
     last_check = last_balance_check.get(account_id)
+    interval = poll_policy.interval(account_id)
+    if is_market_open(now):
+        interval = min(interval, BALANCE_CHECK_INTERVAL_SECONDS)
     
     if not last_check:
-        return True
+        last_check = last_balance_check[account_id] = _first_check(account_id, interval, now)
     
-    # 마지막 체크로부터 60초 이상 지났는지 확인
-    return (now - last_check).total_seconds() >= BALANCE_CHECK_INTERVAL_SECONDS
+    # 마지막 체크로부터 계좌별 적응형 주기 이상 지났는지 확인
+    return (now - last_check).total_seconds() >= interval
+
+async def refresh_account_token(session: Session, account: Account) -> bool:
+    """만료가 임박한 토큰 갱신 (commit 은 호출자) → 갱신 여부"""
+    if not should_refresh_token(account.access_token_expired):
+        return False
+
+    await asyncio.sleep(token_issue_limiter.reserve())
+    if account.broker.upper() == "KIS":
+        access_token, expires_at = get_access_token_KIS(
+            app_key=account.app_key,
+            app_secret=account.app_secret,
+            acnt_type=account.acnt_type
+        )
+    elif account.broker.upper() == "LS":
+        access_token, expires_at = get_access_token_LS(
+            app_key=account.app_key,
+            app_secret=account.app_secret,
+            acnt_type=account.acnt_type
+        )
+    else:
+        raise ValueError(f"지원하지 않는 브로커: {account.broker}")
+
+    account.access_token = access_token
+    account.access_token_expired = expires_at
+    session.add(account)
+    return True
+
+def restore_poll_state(session: Session, account_ids: List) -> None:
+    """이전 종료 시 저장한 계좌별 체크 시각 복원 (주기가 남은 계좌는 바로 다시 조회하지 않음)"""
+    for state in load_poll_state(session, account_ids):
+        if state.last_token_check:
+            last_token_check.setdefault(state.account_id, state.last_token_check)
+        if state.last_balance_check:
+            last_balance_check.setdefault(state.account_id, state.last_balance_check)
+
+async def warm_up_accounts():
+    """시작 준비: 저장된 토큰은 그대로 쓰고 만료(임박)된 토큰만 발급 속도 제한에 맞춰 갱신
+
+    첫 토큰 체크/잔고 조회 시점은 should_check_token/should_check_balance 에서 계좌별 위상으로 분산된다.
+    """
+    try:
+        # 노드 분산 사용 시 첫 heartbeat 후 맡은 계좌만 준비
+        while shard_membership.enabled and not shard_membership.ready:
+            await warm_up_job.sleep(1)
+
+        warm_up_job.sweep_started()
+        with Session(engine) as session:
+            statement = select(Account).where(Account.is_active == True)
+            accounts = shard_membership.assigned(session.exec(statement).all())
+            restore_poll_state(session, [account.id for account in accounts])
+
+            reused, refreshed, failed_accounts = 0, 0, []
+            for account in accounts:
+                if warm_up_job.stopping:
+                    break
+                try:
+                    if await refresh_account_token(session, account):
+                        session.commit()
+                        refreshed += 1
+                    else:
+                        reused += 1
+                    warm_up_job.record_account(account.id)
+                except Exception as e:
+                    session.rollback()
+                    failed_accounts.append((account.acnt_name, str(e)))
+                    warm_up_job.record_account(account.id, str(e))
+
+        warm_up_job.sweep_finished()
+        logger.info(f"시작 준비 완료 - 저장된 토큰 사용 {reused}개, 갱신 {refreshed}개, 실패 {len(failed_accounts)}개")
+        for acnt_name, error in failed_accounts:
+            logger.error(f"시작 시 토큰 갱신 실패 - 계정: {acnt_name}, 에러: {error}")
+
+    except Exception as e:
+        warm_up_job.sweep_finished(e)
+        logger.error(f"시작 준비 중 오류 발생: {str(e)}")
+
+    finally:
+        warm_up_complete.set()
 
 async def check_and_refresh_tokens():
     """모든 활성 계정의 토큰을 주기적으로 체크하고 갱신"""
     global last_token_task_time
     
+    await token_job.wait_for(warm_up_complete)
     while True:
         try:
             current_time = datetime.now(KST)
             time_diff = (current_time - last_token_task_time).total_seconds()
             
             if time_diff < TOKEN_CHECK_INTERVAL:
-                await asyncio.sleep(1)
+                await token_job.sleep(TOKEN_CHECK_INTERVAL - time_diff)
                 continue
 
+            token_job.sweep_started()
+            started = time.perf_counter()
             with Session(engine) as session:
                 # 활성 계정 조회
                 statement = select(Account).where(Account.is_active == True)
-                accounts = session.exec(statement).all()
+                accounts = shard_membership.assigned(session.exec(statement).all())
                 
                 refresh_count = 0
                 check_count = 0
                 failed_accounts = []
                 
-                for account in accounts:
-                    if not should_check_token(account.id):
-                        continue
+                with traced("sweep.token", accounts=len(accounts)):
+                    for account in accounts:
+                        if token_job.stopping:
+                            break
+                        if not should_check_token(account.id):
+                            continue
                         
-                    try:
-                        if should_refresh_token(account.access_token_expired):
-                            if account.broker.upper() == "KIS":
-                                access_token, expires_at = get_access_token_KIS(
-                                    app_key=account.app_key,
-                                    app_secret=account.app_secret,
-                                    acnt_type=account.acnt_type
-                                )
-                            elif account.broker.upper() == "LS":
-                                access_token, expires_at = get_access_token_LS(
-                                    app_key=account.app_key,
-                                    app_secret=account.app_secret,
-                                    acnt_type=account.acnt_type
-                                )
-                            else:
-                                logger.warning(f"지원하지 않는 브로커: {account.broker}")
-                                continue
-                                
-                            account.access_token = access_token
-                            account.access_token_expired = expires_at
-                            session.add(account)
-                            refresh_count += 1
+                        try:
+                            if await refresh_account_token(session, account):
+                                refresh_count += 1
                         
-                        last_token_check[account.id] = current_time
-                        check_count += 1
+                            last_token_check[account.id] = current_time
+                            check_count += 1
+                            token_job.record_account(account.id)
                         
-                    except Exception as e:
-                        failed_accounts.append((account.acnt_name, str(e)))
-                        continue
+                        except Exception as e:
+                            failed_accounts.append((account.acnt_name, str(e)))
+                            token_job.record_account(account.id, str(e))
+                            continue
                 
                 if refresh_count > 0:
                     session.commit()
@@ -144,72 +248,83 @@ async def check_and_refresh_tokens():
                     for acnt_name, error in failed_accounts:
                         logger.error(f"토큰 갱신 실패 - 계정: {acnt_name}, 에러: {error}")
                 
+                record_sweep("token", started, time_diff - TOKEN_CHECK_INTERVAL, check_count, len(failed_accounts))
+                token_job.sweep_finished()
                 last_token_task_time = current_time
                 
         except Exception as e:
+            token_job.sweep_finished(e)
             logger.error(f"토큰 체크 중 오류 발생: {str(e)}")
         
-        await asyncio.sleep(1)
+        await token_job.sleep(1)
+
+async def collect_account_balance(session: Session, account: Account) -> None:
+    """계좌 1개의 잔고 조회 및 분별 잔고 저장"""
+    if account.broker.upper() == "KIS":
+        balance_data = await inquire_balance_from_KIS(account)
+        await process_and_save_kis_balance(account, balance_data, session)
+    elif account.broker.upper() == "LS":
+        balance_data = await inquire_balance_from_LS(account)
+        await process_and_save_ls_balance(account, balance_data, session)
+
+async def save_account_balance(session: Session, account: Account) -> None:
+    """토큰 만료 시 갱신 후 잔고 조회/저장"""
+    if await refresh_account_token(session, account):
+        session.commit()
+    await collect_account_balance(session, account)
+
+async def sweep_balances(session: Session, accounts: List[Account], current_time: datetime) -> Tuple[int, list]:
+    """잔고 조회 1회 순회 (토큰 만료 시 갱신 후 조회/저장) → (성공 계좌 수, 실패 목록)"""
+    success_count = 0
+    failed_accounts = []
+    poll_policy.update_order_counts(session)
+    poll_policy.update_views(session)
+    
+    for account in accounts:
+        if balance_job.stopping:
+            break
+        if not should_check_balance(account.id):
+            continue
+            
+        try:
+            with traced("balance.account", account):
+                await save_account_balance(session, account)
+                success_count += 1
+                last_balance_check[account.id] = current_time
+                balance_job.record_account(account.id)
+                
+        except Exception as e:
+            failed_accounts.append((account.acnt_name, str(e)))
+            balance_job.record_account(account.id, str(e))
+            continue
+
+    return success_count, failed_accounts
 
 async def check_and_save_balances():
     """모든 활성 계정의 잔고를 주기적으로 체크하고 저장"""
     global last_balance_task_time
     
+    await balance_job.wait_for(warm_up_complete)
     while True:
         try:
             current_time = datetime.now(KST)
             time_diff = (current_time - last_balance_task_time).total_seconds()
             
             if time_diff < BALANCE_CHECK_INTERVAL:
-                await asyncio.sleep(1)
+                await balance_job.sleep(BALANCE_CHECK_INTERVAL - time_diff)
                 continue
 
+            balance_job.sweep_started()
+            started = time.perf_counter()
             with Session(engine) as session:
                 # 활성 계정 조회
                 statement = select(Account).where(Account.is_active == True)
-                accounts = session.exec(statement).all()
+                accounts = shard_membership.assigned(session.exec(statement).all())
                 
-                success_count = 0
-                failed_accounts = []
-                
-                for account in accounts:
-                    if not should_check_balance(account.id):
-                        continue
-                        
-                    try:
-                        # 토큰 갱신이 필요한 경우 갱신
-                        if should_refresh_token(account.access_token_expired):
-                            if account.broker.upper() == "KIS":
-                                access_token, expires_at = get_access_token_KIS(
-                                    app_key=account.app_key,
-                                    app_secret=account.app_secret,
-                                    acnt_type=account.acnt_type
-                                )
-                            elif account.broker.upper() == "LS":
-                                access_token, expires_at = get_access_token_LS(
-                                    app_key=account.app_key,
-                                    app_secret=account.app_secret,
-                                    acnt_type=account.acnt_type
-                                )
-                            account.access_token = access_token
-                            account.access_token_expired = expires_at
-                            session.add(account)
-                            session.commit()
-                        
-                        # 잔고 조회 및 저장
-                        if account.broker.upper() == "KIS":
-                            balance_data = await inquire_balance_from_KIS(account)
-                            await process_and_save_kis_balance(account, balance_data, session)
-                        elif account.broker.upper() == "LS":
-                            balance_data = await inquire_balance_from_LS(account)
-                            await process_and_save_ls_balance(account, balance_data, session)
-                        
-                        success_count += 1
-                        last_balance_check[account.id] = current_time
-                            
-                    except Exception as e:
-                        failed_accounts.append((account.acnt_name, str(e)))
-                        continue
+                with traced("sweep.balance", accounts=len(accounts)):
+                    success_count, failed_accounts = await sweep_balances(session, accounts, current_time)
+                record_sweep("balance", started, time_diff - BALANCE_CHECK_INTERVAL, success_count, len(failed_accounts))
+                balance_job.sweep_finished()
                 
                 if success_count > 0:
                     logger.info(f"잔고 저장 완료 - 총 {success_count}개 계좌")
@@ -222,9 +337,47 @@ async def check_and_save_balances():
                 last_balance_task_time = current_time
                 
         except Exception as e:
+            balance_job.sweep_finished(e)
             logger.error(f"잔고 체크 중 오류 발생: {str(e)}")
         
-        await asyncio.sleep(1)
+        await balance_job.sleep(1)
+
+async def sync_account_trades(session: Session, account: Account, start_date: str, end_date: str) -> Tuple[int, list]:
+    """계좌 1개의 거래 내역 동기화 후 실현손익/포지션 스냅샷 갱신 및 잔고 대사"""
+    success_count, failed_accounts = 0, []
+    if account.broker.upper() == "KIS":
+        success_count, failed_accounts = await update_account_daily_trades_KIS(
+            account_id=account.id,
+            start_date=start_date,
+            end_date=end_date,
+            session=session
+        )
+    elif account.broker.upper() == "LS":
+        success_count, failed_accounts = await update_account_daily_trades_LS(
+            account_id=account.id,
+            start_date=start_date,
+            end_date=end_date,
+            session=session
+        )
+
+    # 확정된 체결로 실현손익/로트 갱신
+    update_account_realized_pnl(session, account)
+
+    # 포지션 스냅샷 갱신 후 브로커 잔고와 대사
+    update_position_snapshots(session, account)
+    drift = check_position_drift(session, account)
+    if not drift["in_sync"]:
+        logger.warning(
+            f"포지션 불일치 - 계정: {account.acnt_name}, "
+            f"종목: {', '.join(item['stock_code'] for item in drift['data'])}"
+        )
+    return success_count, failed_accounts
+
+async def sync_recent_trades(session: Session, account: Account) -> Tuple[int, list]:
+    """최근 7일치 거래 내역 동기화"""
+    end_date = datetime.now(KST).strftime("%Y-%m-%d")
+    start_date = (datetime.now(KST) - timedelta(days=7)).strftime("%Y-%m-%d")
+    return await sync_account_trades(session, account, start_date, end_date)
 
 async def update_daily_trades():
     """한국 시간 오전 3시에 모든 계정의 일별 거래 내역을 업데이트"""
@@ -239,44 +392,40 @@ async def update_daily_trades():
             
             # 다음 실행까지 대기
             wait_seconds = (next_run - now).total_seconds()
-            await asyncio.sleep(wait_seconds)
+            await daily_trades_job.sleep(wait_seconds)
             
+            daily_trades_job.sweep_started()
+            started = time.perf_counter()
+            lag_seconds = (datetime.now(KST) - next_run).total_seconds()
             # 활성 계정 조회
             with Session(engine) as session:
                 statement = select(Account).where(Account.is_active == True)
-                accounts = session.exec(statement).all()
+                accounts = shard_membership.assigned(session.exec(statement).all())
                 
                 total_success_count = 0
                 all_failed_accounts = []
                 
-                for account in accounts:
-                    try:
-                        # 7일치 데이터 업데이트
-                        end_date = datetime.now(KST).strftime("%Y-%m-%d")
-                        start_date = (datetime.now(KST) - timedelta(days=7)).strftime("%Y-%m-%d")
-                        
-                        if account.broker.upper() == "KIS":
-                            success_count, failed_accounts = await update_account_daily_trades_KIS(
-                                account_id=account.id,
-                                start_date=start_date,
-                                end_date=end_date,
-                                session=session
-                            )
-                        elif account.broker.upper() == "LS":
-                            success_count, failed_accounts = await update_account_daily_trades_LS(
-                                account_id=account.id,
-                                start_date=start_date,
-                                end_date=end_date,
-                                session=session
-                            )
-                        
-                        total_success_count += success_count
-                        all_failed_accounts.extend(failed_accounts)
+                with traced("sweep.daily_trades", accounts=len(accounts)):
+                    for account in accounts:
+                        if daily_trades_job.stopping:
+                            break
+                        try:
+                            with traced("trades.account", account):
+                                # 7일치 데이터 업데이트
+                                success_count, failed_accounts = await sync_recent_trades(session, account)
+                                total_success_count += success_count
+                                all_failed_accounts.extend(failed_accounts)
+                                daily_trades_job.record_account(
+                                    account.id, "; ".join(error for _, error in failed_accounts) or None
+                                )
                         
-                    except Exception as e:
-                        all_failed_accounts.append((account.acnt_name, str(e)))
-                        continue
+                        except Exception as e:
+                            all_failed_accounts.append((account.acnt_name, str(e)))
+                            daily_trades_job.record_account(account.id, str(e))
+                            continue
                 
+                record_sweep("daily_trades", started, lag_seconds, max(len(accounts) - len(all_failed_accounts), 0), len(all_failed_accounts))
+                daily_trades_job.sweep_finished()
                 if total_success_count > 0:
                     logger.info(f"일별 거래 내역 업데이트 완료 - 총 {total_success_count}개 거래")
                 
@@ -285,76 +434,186 @@ async def update_daily_trades():
                         logger.error(f"일별 거래 내역 업데이트 실패 - 계정: {acnt_name}, 에러: {error}")
                 
         except Exception as e:
+            daily_trades_job.sweep_finished(e)
             logger.error(f"일별 거래 내역 업데이트 중 오류 발생: {str(e)}")
         
-        await asyncio.sleep(60)  # 1분 대기 후 다음 체크
+        await daily_trades_job.sleep(60)  # 1분 대기 후 다음 체크
 
-async def check_and_save_minutely_data():
-    """모든 활성 계정의 분별 데이터를 수집하고 저장"""
+async def refresh_quote_cache():
+    """장 시간 중 보유 종목 시세를 주기적으로 갱신 (잔고 조회 사이 평가금액 재평가용)
+
+    앱키별 요청 제한을 노드끼리 나눠 쓰지 않도록 리더 노드에서만 조회한다.
+    """
     while True:
         try:
-            current_time = datetime.now(KST)
-            
-            # 장 시간 중에만 실행
-            if (current_time.time() >= MARKET_START_TIME and 
-                current_time.time() <= MARKET_END_TIME and
-                current_time.weekday() < 5):  # 평일만
-                
+            if is_market_open(datetime.now(KST)) and shard_membership.is_leader:
+                quote_job.sweep_started()
                 with Session(engine) as session:
-                    statement = select(Account).where(Account.is_active == True)
-                    accounts = session.exec(statement).all()
-                    
-                    for account in accounts:
-                        try:
-                            if account.broker.upper() == "KIS":
-                                balance_data = await inquire_balance_from_KIS(account)
-                                await process_and_save_kis_balance(account, balance_data, session)
-                            elif account.broker.upper() == "LS":
-                                balance_data = await inquire_balance_from_LS(account)
-                                await process_and_save_ls_balance(account, balance_data, session)
-                            
-                            session.commit()
-                            
-                        except Exception as e:
-                            logger.error(f"분별 데이터 수집 실패 - 계정: {account.acnt_name}, 에러: {str(e)}")
-                            continue
-            
-            await asyncio.sleep(60)
-            
+                    await refresh_quotes(session)
+                quote_job.sweep_finished()
+
+        except Exception as e:
+            quote_job.sweep_finished(e)
+            logger.error(f"시세 갱신 중 오류 발생: {str(e)}")
+
+        await quote_job.sleep(QUOTE_REFRESH_INTERVAL_SECONDS)
+
+async def archive_old_minutely_balances():
+    """한국 시간 오전 4시에 보존기간이 지난 분별 잔고를 아카이브"""
+    while True:
+        try:
+            now = datetime.now(KST)
+
+            # 다음 실행 시간 계산
+            next_run = now.replace(hour=MINUTELY_ARCHIVE_HOUR, minute=0, second=0, microsecond=0)
+            if now.hour >= MINUTELY_ARCHIVE_HOUR:
+                next_run += timedelta(days=1)
+
+            # 다음 실행까지 대기
+            wait_seconds = (next_run - now).total_seconds()
+            await archive_job.sleep(wait_seconds)
+            if not shard_membership.is_leader:
+                continue
+
+            archive_job.sweep_started()
+            with Session(engine) as session:
+                archived_count = await asyncio.to_thread(archive_minutely_balances, session)
+            archive_job.sweep_finished()
+
+            if archived_count > 0:
+                logger.info(f"분별 잔고 아카이브 완료 - 총 {archived_count}건")
+
         except Exception as e:
-            logger.error(f"분별 데이터 수집 중 오류 발생: {str(e)}")
-            await asyncio.sleep(60)
+            archive_job.sweep_finished(e)
+            logger.error(f"분별 잔고 아카이브 중 오류 발생: {str(e)}")
+
+        await archive_job.sleep(60)  # 1분 대기 후 다음 체크
+
+async def keep_order_connections_warm():
+    """주문용 keep-alive 연결이 끊기지 않도록 주기적으로 유지 요청"""
+    while True:
+        try:
+            order_connection_job.sweep_started()
+            with Session(engine) as session:
+                await asyncio.to_thread(warm_up_order_sessions, session)
+            order_connection_job.sweep_finished()
+
+        except Exception as e:
+            order_connection_job.sweep_finished(e)
+            logger.error(f"주문 연결 유지 중 오류 발생: {str(e)}")
+
+        await order_connection_job.sleep(ORDER_KEEPALIVE_SECONDS)
+
+async def maintain_shard_membership():
+    """노드 heartbeat 기록 및 살아 있는 노드 목록 갱신 (SCHEDULER_SHARDING_ENABLED 사용 시)"""
+    while True:
+        try:
+            membership_job.sweep_started()
+            with Session(engine) as session:
+                shard_membership.heartbeat(session)
+            membership_job.sweep_finished()
+
+        except Exception as e:
+            membership_job.sweep_finished(e)
+            logger.error(f"스케줄러 노드 heartbeat 중 오류 발생: {str(e)}")
+
+        await membership_job.sleep(SCHEDULER_HEARTBEAT_SECONDS)
+
+async def sync_scheduler_state():
+    """일시정지 상태 반영, 작업 상태 보고, 즉시 실행 요청 처리 (관리 API 가 어느 워커로 가도 같은 결과)"""
+    while True:
+        try:
+            scheduler_sync_job.sweep_started()
+            with Session(engine) as session:
+                triggered = job_scheduler.sync(session, shard_membership.node_id)
+            if triggered:
+                logger.info(f"즉시 실행 요청 처리 - {triggered}건")
+            scheduler_sync_job.sweep_finished()
+
+        except Exception as e:
+            scheduler_sync_job.sweep_finished(e)
+            logger.error(f"스케줄러 상태 동기화 중 오류 발생: {str(e)}")
+
+        await scheduler_sync_job.sleep(SCHEDULER_SYNC_SECONDS)
+
+async def replay_paper_price_feed():
+    """모의 체결 엔진에 시세 CSV 재생 (PAPER_TRADING_SIMULATOR 사용 시)"""
+    try:
+        ticks = await asyncio.to_thread(load_price_feed, settings.PAPER_TRADING_PRICE_FEED)
+        logger.info(f"모의 시세 재생 시작 - {len(ticks)}건")
+        filled = await paper_engine.run_replay(ticks)
+        logger.info(f"모의 시세 재생 완료 - 체결 {filled}건")
+
+    except Exception as e:
+        logger.error(f"모의 시세 재생 중 오류 발생: {str(e)}")
+
+# 스케줄러 작업 (루프 함수는 start_background_tasks 에서 연결)
+warm_up_job = job_scheduler.register("warm_up", "시작 시 토큰 확인 (만료 토큰만 속도 제한 갱신)", pausable=False)
+token_job = job_scheduler.register("token", "토큰 체크/갱신", run_account=refresh_account_token)
+balance_job = job_scheduler.register("balance", "잔고 조회/분별 잔고 저장 (계좌별 적응형 주기, 장중에는 분별 수집 주기 이내)", run_account=save_account_balance)
+daily_trades_job = job_scheduler.register("daily_trades", "일별 거래 내역 동기화 (오전 3시)", run_account=sync_recent_trades)
+archive_job = job_scheduler.register("archive", "보존기간 지난 분별 잔고 아카이브")
+quote_job = job_scheduler.register("quote", "보유 종목 시세 캐시 갱신")
+order_connection_job = job_scheduler.register("order_connections", "주문 keep-alive 연결 유지")
+slice_job = job_scheduler.register("order_slices", "분할 주문 스케줄러", pausable=False, cooperative=False)
+paper_feed_job = job_scheduler.register("paper_feed", "모의 체결 엔진 시세 재생", pausable=False, cooperative=False)
+membership_job = job_scheduler.register("membership", "스케줄러 노드 heartbeat (일시정지 시 노드 이탈)")
+scheduler_sync_job = job_scheduler.register("scheduler_sync", "일시정지/상태/즉시 실행 요청 DB 동기화 (워커 간 공유)", pausable=False)
 
 def start_background_tasks():
     """백그라운드 태스크 시작"""
     logger.info("백그라운드 작업 시작")
-    loop = asyncio.get_event_loop()
-    
-    # 토큰 체크 태스크 시작
-    token_task = loop.create_task(check_and_refresh_tokens())
-    background_tasks.add(token_task)
-    token_task.add_done_callback(background_tasks.discard)
-    
-    # 잔고 체크 태스크 시작
-    balance_task = loop.create_task(check_and_save_balances())
-    background_tasks.add(balance_task)
-    balance_task.add_done_callback(background_tasks.discard)
-    
-    # 일별 거래 내역 업데이트 태스크 시작
-    daily_trades_task = loop.create_task(update_daily_trades())
-    background_tasks.add(daily_trades_task)
-    daily_trades_task.add_done_callback(background_tasks.discard)
-    
-    # 분별 데이터 수집 태스크 추가
-    minutely_task = loop.create_task(check_and_save_minutely_data())
-    background_tasks.add(minutely_task)
-    minutely_task.add_done_callback(background_tasks.discard)
+    if shard_membership.enabled:
+        logger.info(f"스케줄러 노드 분산 사용 - 노드: {shard_membership.node_id}")
+        membership_job.start(maintain_shard_membership)
+    scheduler_sync_job.start(sync_scheduler_state)
+    warm_up_job.start(warm_up_accounts)
+    token_job.start(check_and_refresh_tokens)
+    balance_job.start(check_and_save_balances)
+    daily_trades_job.start(update_daily_trades)
+    archive_job.start(archive_old_minutely_balances)
+    quote_job.start(refresh_quote_cache)
+    order_connection_job.start(keep_order_connections_warm)
+    slice_job.start(slice_scheduler.run)
+
+    # 모의 체결 엔진 시세 재생 (PAPER_TRADING_SIMULATOR 사용 시)
+    if settings.PAPER_TRADING_SIMULATOR and settings.PAPER_TRADING_PRICE_FEED:
+        paper_feed_job.start(replay_paper_price_feed)
+
+async def stop_background_tasks(timeout: float = SHUTDOWN_DRAIN_SECONDS):
+    """백그라운드 태스크 중지
 
-def stop_background_tasks():
-    """백그라운드 태스크 중지"""
+    새 순회를 막고 진행 중인 계좌 처리(브로커 호출~commit)가 끝나기를 timeout 초까지 기다린 뒤
+    계좌별 체크 시각을 저장하고 노드에서 이탈한다.
+    """
     logger.info("백그라운드 작업 중지")
-    for task in background_tasks:
-        task.cancel()
+    result = await job_scheduler.shutdown(timeout)
+    logger.info(f"백그라운드 작업 정리 완료 - 정상 종료 {len(result['drained'])}개, 취소 {len(result['cancelled'])}개")
+
+    try:
+        with Session(engine) as session:
+            saved = save_poll_state(session, last_token_check, last_balance_check)
+        logger.info(f"계좌별 체크 시각 저장 - {saved}개 계좌")
+    except Exception as e:
+        logger.error(f"계좌별 체크 시각 저장 실패: {str(e)}")
+
+    try:
+        flush_tracing()
+    except Exception as e:
+        logger.error(f"추적 span 내보내기 실패: {str(e)}")
+
+    try:
+        with Session(engine) as session:
+            job_scheduler.leave(session, shard_membership.node_id)
+    except Exception as e:
+        logger.error(f"작업 상태 보고 삭제 실패: {str(e)}")
+
+    if shard_membership.enabled:
+        try:
+            with Session(engine) as session:
+                shard_membership.leave(session)
+        except Exception as e:
+            logger.error(f"스케줄러 노드 이탈 기록 실패: {str(e)}")
 
 def refresh_token_if_needed(account: Account) -> None:
     """계정의 토큰이 만료되어가는 경우 갱신"""
@@ -425,6 +684,26 @@ async def check_daily_trades(account: Account, session: Session) -> None:
     except Exception as e:
         logger.error(f"거래 내역 체크 실패 - 계정: {account.acnt_name}, 에러: {str(e)}") 
 
+def save_minutely_snapshot(session: Session, balance: Union[Kis_Minutely_Balance, Ls_Minutely_Balance]) -> None:
+    """분별 잔고 저장 (같은 계좌/분 스냅샷이 이미 있으면 이번 조회값으로 덮어씀)"""
+    balance.minute_bucket = minute_bucket(balance.timestamp)
+    upsert_row(session, type(balance), balance.model_dump(), ("account_id", "minute_bucket"))
+
+def build_holdings(output1: list) -> Optional[list]:
+    """잔고 조회 보유종목(output1)을 분별 잔고 holdings 형식으로 변환"""
+    if not output1:
+        return None
+    return [{
+        "stock_code": item.get("pdno"),
+        "stock_name": item.get("prdt_name"),
+        "quantity": int(item.get("hldg_qty", 0)),
+        "purchase_price": float(item.get("pchs_avg_pric", 0)),
+        "current_price": float(item.get("prpr", 0)),
+        "eval_amount": float(item.get("evlu_amt", 0)),
+        "profit_loss": float(item.get("evlu_pfls_amt", 0)),
+        "profit_loss_rate": float(item.get("evlu_pfls_rt", 0))
+    } for item in output1]
+
 async def process_and_save_ls_balance(account: Account, balance_data: dict, session: Session) -> None:
     """LS 증권 잔고 데이터 처리 및 저장"""
     try:
@@ -438,90 +717,33 @@ async def process_and_save_ls_balance(account: Account, balance_data: dict, sess
                 eval_profit_loss = float(output2.get("evlu_pfls_smtl", 0))
                 profit_loss_rate = (eval_profit_loss / purchase_amount * 100) if purchase_amount > 0 else 0
                 
-                # MinutelyBalance 객체 생성 및 저장
-                minutely_balance_ls = Ls_Minutely_Balance(
-                    account_id=account.id,
-                    timestamp=datetime.now().astimezone(timezone('Asia/Seoul')),
-                    total_balance=float(output2.get("dnca_tot_amt", 0)),
-                    available_balance=float(output2.get("prvs_rcdl_excc_amt", 0)),
-                    total_assets=float(output2.get("tot_evlu_amt", 0)),
-                    purchase_amount=purchase_amount,
-                    eval_amount=float(output2.get("evlu_amt_smtl", 0)),
-                    profit_loss=eval_profit_loss,
-                    profit_loss_rate=profit_loss_rate,
-                    asset_change_amount=float(output2.get("asst_icdc_amt", 0)),
-                    asset_change_rate=float(output2.get("asst_icdc_rt", 0)),
-                    holdings=[{
-                        "stock_code": item.get("pdno"),
-                        "stock_name": item.get("prdt_name"),
-                        "quantity": int(item.get("hldg_qty", 0)),
-                        "purchase_price": float(item.get("pchs_avg_pric", 0)),
-                        "current_price": float(item.get("prpr", 0)),
-                        "eval_amount": float(item.get("evlu_amt", 0)),
-                        "profit_loss": float(item.get("evlu_pfls_amt", 0)),
-                        "profit_loss_rate": float(item.get("evlu_pfls_rt", 0))
-                    } for item in output1] if output1 else None
-                )
+                with traced("balance.transform", account, holdings=len(output1)):
+                    # MinutelyBalance 객체 생성 및 저장
+                    minutely_balance_ls = Ls_Minutely_Balance(
+                        account_id=account.id,
+                        timestamp=datetime.now().astimezone(timezone('Asia/Seoul')),
+                        total_balance=float(output2.get("dnca_tot_amt", 0)),
+                        available_balance=float(output2.get("prvs_rcdl_excc_amt", 0)),
+                        total_assets=float(output2.get("tot_evlu_amt", 0)),
+                        purchase_amount=purchase_amount,
+                        eval_amount=float(output2.get("evlu_amt_smtl", 0)),
+                        profit_loss=eval_profit_loss,
+                        profit_loss_rate=profit_loss_rate,
+                        asset_change_amount=float(output2.get("asst_icdc_amt", 0)),
+                        asset_change_rate=float(output2.get("asst_icdc_rt", 0)),
+                        holdings=build_holdings(output1)
+                    )
                 
-                session.add(minutely_balance_ls)
-                session.commit()
+                poll_policy.record_snapshot(account.id, minutely_balance_ls.total_assets, minutely_balance_ls.holdings)
+                with traced("db.commit", account):
+                    save_minutely_snapshot(session, minutely_balance_ls)
+                    apply_balance_snapshot(session, account, minutely_balance_ls)
+                    session.commit()
+                history_cache.invalidate(account.id)
                 
     except Exception as e:
         logger.error(f"LS 잔고 데이터 처리 실패 - 계정: {account.acnt_name}, 에러: {str(e)}")
 
-async def update_account_daily_trades_ls(account_id: str, start_date: str, end_date: str, session: Session) -> tuple[int, list]:
-    """LS 증권 일별 거래내역 업데이트"""
-    try:
-        account = session.get(Account, account_id)
-        if not account:
-            return 0, [(account_id, "계좌를 찾을 수 없습니다.")]
-        
-        # 거래내역 조회
-        trades_data = await inquire_daily_ccld_from_LS(account, start_date, end_date)
-        
-        if not trades_data or not isinstance(trades_data, dict):
-            return 0, [(account.acnt_name, "잘못된 응답 형식")]
-        
-        success_count = 0
-        failed_trades = []
-        
-        # 거래내역 처리
-        for trade in trades_data.get("output1", []):
-            try:
-                # 거래유형 확인
-                trade_type = "매수" if trade.get("sll_buy_dvsn_cd") == "01" else "매도"
-                
-                # 거래내역 저장
-                ls_trade = Ls_Trade(
-                    account_id=account.id,
-                    trade_date=datetime.strptime(trade.get("ord_dt", ""), "%Y%m%d").date(),
-                    trade_time=datetime.strptime(trade.get("ord_tmd", ""), "%H%M%S").time(),
-                    stock_code=trade.get("pdno", ""),
-                    stock_name=trade.get("prdt_name", ""),
-                    trade_type=trade_type,
-                    quantity=int(trade.get("ord_qty", 0)),
-                    price=float(trade.get("ord_unpr", 0)),
-                    amount=float(trade.get("tot_ccld_amt", 0)),
-                    fee=float(trade.get("prsm_tlex_smtl", 0)),
-                    tax=float(trade.get("prsm_tlex_smtl", 0)),
-                    profit_amount=float(trade.get("evlu_pfls_smtl", 0))
-                )
-                
-                session.add(ls_trade)
-                success_count += 1
-                
-            except Exception as e:
-                failed_trades.append((account.acnt_name, f"거래내역 처리 실패: {str(e)}"))
-                continue
-        
-        if success_count > 0:
-            session.commit()
-        
-        return success_count, failed_trades
-        
-    except Exception as e:
-        return 0, [(account_id, f"거래내역 업데이트 실패: {str(e)}")] 
-
 async def process_and_save_kis_balance(account: Account, balance_data: dict, session: Session) -> None:
     """KIS 증권 잔고 데이터 처리 및 저장"""
     try:
@@ -535,33 +757,29 @@ async def process_and_save_kis_balance(account: Account, balance_data: dict, ses
                 eval_profit_loss = float(output2.get("evlu_pfls_smtl_amt", 0))
                 profit_loss_rate = (eval_profit_loss / purchase_amount * 100) if purchase_amount > 0 else 0
                 
-                # MinutelyBalance 객체 생성 및 저장
-                minutely_balance_kis = Kis_Minutely_Balance(
-                    account_id=account.id,
-                    timestamp=datetime.now().astimezone(timezone('Asia/Seoul')),
-                    total_balance=float(output2.get("dnca_tot_amt", 0)),
-                    available_balance=float(output2.get("prvs_rcdl_excc_amt", 0)),
-                    total_assets=float(output2.get("tot_evlu_amt", 0)),
-                    purchase_amount=purchase_amount,
-                    eval_amount=float(output2.get("evlu_amt_smtl_amt", 0)),
-                    profit_loss=eval_profit_loss,
-                    profit_loss_rate=profit_loss_rate,
-                    asset_change_amount=float(output2.get("asst_icdc_amt", 0)),
-                    asset_change_rate=float(output2.get("asst_icdc_rt", 0)),
-                    holdings=[{
-                        "stock_code": item.get("pdno"),
-                        "stock_name": item.get("prdt_name"),
-                        "quantity": int(item.get("hldg_qty", 0)),
-                        "purchase_price": float(item.get("pchs_avg_pric", 0)),
-                        "current_price": float(item.get("prpr", 0)),
-                        "eval_amount": float(item.get("evlu_amt", 0)),
-                        "profit_loss": float(item.get("evlu_pfls_amt", 0)),
-                        "profit_loss_rate": float(item.get("evlu_pfls_rt", 0))
-                    } for item in output1] if output1 else None
-                )
+                with traced("balance.transform", account, holdings=len(output1)):
+                    # MinutelyBalance 객체 생성 및 저장
+                    minutely_balance_kis = Kis_Minutely_Balance(
+                        account_id=account.id,
+                        timestamp=datetime.now().astimezone(timezone('Asia/Seoul')),
+                        total_balance=float(output2.get("dnca_tot_amt", 0)),
+                        available_balance=float(output2.get("prvs_rcdl_excc_amt", 0)),
+                        total_assets=float(output2.get("tot_evlu_amt", 0)),
+                        purchase_amount=purchase_amount,
+                        eval_amount=float(output2.get("evlu_amt_smtl_amt", 0)),
+                        profit_loss=eval_profit_loss,
+                        profit_loss_rate=profit_loss_rate,
+                        asset_change_amount=float(output2.get("asst_icdc_amt", 0)),
+                        asset_change_rate=float(output2.get("asst_icdc_rt", 0)),
+                        holdings=build_holdings(output1)
+                    )
                 
-                session.add(minutely_balance_kis)
-                session.commit()
+                poll_policy.record_snapshot(account.id, minutely_balance_kis.total_assets, minutely_balance_kis.holdings)
+                with traced("db.commit", account):
+                    save_minutely_snapshot(session, minutely_balance_kis)
+                    apply_balance_snapshot(session, account, minutely_balance_kis)
+                    session.commit()
+                history_cache.invalidate(account.id)
                 
     except Exception as e:
         logger.error(f"KIS 잔고 데이터 처리 실패 - 계정: {account.acnt_name}, 에러: {str(e)}") 
\ No newline at end of file
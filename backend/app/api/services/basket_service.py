@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import math
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlmodel import Session, func, select
+
+from app.constants import KST, BASKET_MAX_CONCURRENCY
+from app.core.db import engine
+from app.models.account import Account
+from app.models.order import Basket_Create, Basket_Job, Order, Order_Create
+from app.models.portfolio import Portfolio_Contribution
+from app.api.services.fill_service import BUY, SELL
+from app.api.services.order_service import (
+    MARKET,
+    ORDER_FAILED,
+    ORDER_REJECTED,
+    ORDER_SUBMITTED,
+    ORDER_TYPES,
+    place_order,
+    sell_proceeds,
+    validate_basket
+)
+from app.api.services.quote_service import quote_cache
+
+logger = logging.getLogger(__name__)
+
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_PARTIAL = "partial"
+JOB_FAILED = "failed"
+
+# 실행 중인 바스켓 작업 (가비지 컬렉션 방지)
+_running_jobs: set[asyncio.Task] = set()
+
+
+def compute_basket_orders(
+    holdings: dict[str, int],
+    total_assets: float,
+    prices: dict[str, float],
+    weights: Optional[dict[str, float]] = None,
+    deltas: Optional[dict[str, int]] = None,
+) -> list[tuple[str, str, int]]:
+    """보유수량과 목표 비중/수량 증감으로 (종목코드, 매매구분, 수량) 목록 계산 (매도 먼저)
+
+    목표 비중은 총평가금액 기준 주수로 내림하며, 비중에 없는 보유종목은 전량 매도한다.
+    """
+    if deltas is None:
+        deltas = {}
+        for stock_code in sorted(set(holdings) | set(weights or {})):
+            weight = (weights or {}).get(stock_code, 0.0)
+            price = prices.get(stock_code)
+            if price is None or price <= 0:
+                if weight > 0:
+                    raise ValueError(f"종목 {stock_code} 의 주문단가를 알 수 없습니다.")
+                target = 0
+            else:
+                target = math.floor(total_assets * weight / price)
+            deltas[stock_code] = target - holdings.get(stock_code, 0)
+
+    sells = [(code, SELL, -delta) for code, delta in sorted(deltas.items()) if delta < 0]
+    buys = [(code, BUY, delta) for code, delta in sorted(deltas.items()) if delta > 0]
+    return sells + buys
+
+
+def _resolve_prices(stock_codes: set[str], prices: dict[str, float]) -> dict[str, float]:
+    resolved = dict(prices)
+    for stock_code in stock_codes - set(prices):
+        quote = quote_cache.get(stock_code)
+        if quote:
+            resolved[stock_code] = quote.price
+    return resolved
+
+
+def plan_basket(session: Session, basket_in: Basket_Create, accounts: dict[uuid.UUID, Account]) -> dict[uuid.UUID, list[Order_Create]]:
+    """계좌별 통합 포트폴리오 반영분(최근 잔고)을 기준으로 주문 목록 생성"""
+    contributions = {
+        contribution.account_id: contribution
+        for contribution in session.exec(
+            select(Portfolio_Contribution).where(Portfolio_Contribution.account_id.in_(list(accounts)))
+        ).all()
+    }
+
+    plans: dict[uuid.UUID, list[Order_Create]] = {}
+    for target in basket_in.targets:
+        if (target.weights is None) == (target.deltas is None):
+            raise HTTPException(status_code=400, detail="Each target needs exactly one of weights or deltas")
+        contribution = contributions.get(target.account_id)
+        if target.weights is not None and contribution is None:
+            raise HTTPException(status_code=400, detail=f"No balance snapshot for account {target.account_id}")
+
+        holdings = {
+            stock_code: int(holding["quantity"])
+            for stock_code, holding in ((contribution.holdings if contribution else None) or {}).items()
+        }
+        prices = _resolve_prices(set(holdings) | set(target.weights or target.deltas or {}), basket_in.prices)
+        try:
+            orders = compute_basket_orders(
+                holdings,
+                contribution.total_assets if contribution else 0.0,
+                prices,
+                weights=target.weights,
+                deltas=target.deltas,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        plans[target.account_id] = [
+            Order_Create(
+                stock_code=stock_code,
+                side=side,
+                quantity=quantity,
+                price=0 if basket_in.order_type == MARKET else prices.get(stock_code, 0),
+                order_type=basket_in.order_type,
+            )
+            for stock_code, side, quantity in orders
+        ]
+    return plans
+
+
+def create_basket_job(
+    session: Session, owner_id: uuid.UUID, basket_in: Basket_Create, accounts: dict[uuid.UUID, Account]
+) -> tuple[Basket_Job, dict[uuid.UUID, list[Order_Create]]]:
+    """주문 계획을 세우고 작업 레코드 생성 (주문별 멱등키는 작업 ID 기준으로 고정)"""
+    if basket_in.order_type not in ORDER_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported order type. Expected one of: {', '.join(ORDER_TYPES)}")
+
+    plans = plan_basket(session, basket_in, accounts)
+    for account_id, orders in plans.items():
+        reason = validate_basket(session, accounts[account_id], orders)
+        if reason:
+            raise HTTPException(status_code=400, detail=f"Basket rejected for account {account_id}: {reason}")
+    job = Basket_Job(
+        owner_id=owner_id,
+        account_count=len(plans),
+        order_count=sum(len(orders) for orders in plans.values()),
+    )
+    for account_id, orders in plans.items():
+        for index, order_in in enumerate(orders):
+            order_in.idempotency_key = f"basket-{job.id.hex}-{account_id.hex[:8]}-{index}"
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job, plans
+
+
+def _dispatch_account(account_id: uuid.UUID, orders: list[Order_Create], job_id: uuid.UUID) -> list[Order]:
+    """한 계좌의 주문을 순서대로 전송 (스레드별 DB 세션 사용)
+
+    접수된 매도의 예상 대금은 체결 전이라 잔고에 없으므로 이후 매수 검증에 더해 준다.
+    """
+    placed = []
+    credit = 0.0
+    with Session(engine) as session:
+        account = session.get(Account, account_id)
+        for order_in in orders:
+            order = place_order(session, account, order_in, basket_job_id=job_id, credit=credit)
+            if order.status == ORDER_SUBMITTED:
+                credit += sell_proceeds(order)
+            placed.append(order)
+    return placed
+
+
+async def execute_basket_job(job_id: uuid.UUID, plans: dict[uuid.UUID, list[Order_Create]]) -> None:
+    """계좌별로 동시에 주문을 전송하고 작업 결과 집계 (앱키별 전송 한도는 주문 서비스에서 적용)"""
+    semaphore = asyncio.Semaphore(BASKET_MAX_CONCURRENCY)
+
+    async def dispatch(account_id: uuid.UUID, orders: list[Order_Create]) -> list[Order]:
+        async with semaphore:
+            return await asyncio.to_thread(_dispatch_account, account_id, orders, job_id)
+
+    results = await asyncio.gather(
+        *(dispatch(account_id, orders) for account_id, orders in plans.items() if orders),
+        return_exceptions=True,
+    )
+    errors = [str(result) for result in results if isinstance(result, BaseException)]
+    for error in errors:
+        logger.error(f"바스켓 주문 전송 실패 - 작업: {job_id}, 에러: {error}")
+
+    with Session(engine) as session:
+        finalize_basket_job(session, job_id, errors)
+
+
+def finalize_basket_job(session: Session, job_id: uuid.UUID, errors: Optional[list[str]] = None) -> Basket_Job:
+    """주문별 상태를 집계해 작업 레코드 갱신"""
+    job = session.get(Basket_Job, job_id)
+    counts = dict(session.exec(
+        select(Order.status, func.count()).where(Order.basket_job_id == job_id).group_by(Order.status)
+    ).all())
+    first, last = session.exec(
+        select(func.min(Order.submitted_at), func.max(Order.submitted_at)).where(Order.basket_job_id == job_id)
+    ).one()
+
+    job.submitted_count = counts.get(ORDER_SUBMITTED, 0)
+    job.rejected_count = counts.get(ORDER_REJECTED, 0)
+    job.failed_count = counts.get(ORDER_FAILED, 0) + (job.order_count - sum(counts.values()))
+    job.dispatch_skew_ms = (last - first).total_seconds() * 1000 if first and last else None
+    if job.submitted_count == job.order_count:
+        job.status = JOB_COMPLETED
+    elif job.submitted_count:
+        job.status = JOB_PARTIAL
+    else:
+        job.status = JOB_FAILED if job.order_count else JOB_COMPLETED
+    if errors:
+        job.message = "; ".join(errors)[:1024]
+    job.completed_at = datetime.now(KST)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    logger.info(
+        f"바스켓 주문 완료 - 작업: {job_id}, 접수: {job.submitted_count}/{job.order_count}, "
+        f"편차: {job.dispatch_skew_ms or 0:.0f}ms"
+    )
+    return job
+
+
+def start_basket_job(job_id: uuid.UUID, plans: dict[uuid.UUID, list[Order_Create]]) -> None:
+    task = asyncio.get_running_loop().create_task(execute_basket_job(job_id, plans))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+
+
+def get_basket_job(session: Session, job_id: uuid.UUID) -> dict[str, Any]:
+    job = session.get(Basket_Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Basket job not found")
+    orders = session.exec(
+        select(Order).where(Order.basket_job_id == job_id).order_by(Order.created_at)
+    ).all()
+    return {**job.model_dump(), "orders": orders}
@@ -0,0 +1,198 @@
+"""증권사 응답 필드 매핑
+
+TR별 매핑을 (대상 필드, 원본 키, 변환) 목록으로 선언하고 한 번만 컴파일해
+응답 1건을 튜플(대량 저장용) 또는 dict(응답 형식 유지용)로 바꾸는 함수를 만든다.
+컴파일된 함수는 키 조회와 변환을 한 표현식으로 펼쳐 행마다 중간 객체나 검증을 거치지 않는다.
+
+    TRADE = compile_mapping("TTTC8001R", [
+        ("order_date", "ord_dt"),                 # 그대로
+        ("order_qty", "ord_qty", to_int),         # 변환 함수
+        ("cancel_yn", Const("N")),                # 고정값
+        ("trade_type", lambda row: ...),          # 원본 행 전체를 받는 계산 필드
+    ])
+    TRADE.rows(output1)    # [(...), ...]
+    TRADE.records(output1) # [{...}, ...]
+"""
+import time as clock
+from datetime import date, time
+from decimal import Decimal
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Union
+
+from sqlmodel import Session, SQLModel, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.metrics import record_batch
+from app.core.tracing import traced
+
+
+class Const(NamedTuple):
+    """원본과 무관한 고정값"""
+    value: Any
+
+
+Source = Union[str, Const, Callable[[dict], Any]]
+Field_Spec = Union[tuple[str, Source], tuple[str, Source, Optional[Callable[[Any], Any]]]]
+
+
+def to_int(value: Any) -> int:
+    """빈 값은 0 (증권사 응답의 빈 문자열/누락 대응)"""
+    return int(value) if value not in (None, "") else 0
+
+
+def to_float(value: Any) -> float:
+    return float(value) if value not in (None, "") else 0.0
+
+
+def to_str(value: Any) -> Optional[str]:
+    """빈 값은 None (숫자로 오는 번호 필드 대응)"""
+    return str(value) if value not in (None, "") else None
+
+
+def yyyymmdd(value: str) -> date:
+    return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+
+def hhmmss(value: str) -> time:
+    """HHMMSS 또는 뒤에 밀리초가 붙은 시각"""
+    return time(int(value[:2]), int(value[2:4]), int(value[4:6]))
+
+
+class Field_Mapping:
+    """컴파일된 매핑 (columns 순서대로 값을 담은 튜플 또는 dict 생성)"""
+
+    def __init__(self, name: str, columns: tuple[str, ...], row: Callable[[dict], tuple], record: Callable[[dict], dict]):
+        self.name = name
+        self.columns = columns
+        self.row = row
+        self.record = record
+
+    def rows(self, items: Sequence[dict]) -> list[tuple]:
+        row = self.row
+        return [row(item) for item in items]
+
+    def records(self, items: Sequence[dict]) -> list[dict]:
+        record = self.record
+        return [record(item) for item in items]
+
+    def __repr__(self) -> str:
+        return f"Field_Mapping({self.name!r}, {len(self.columns)} fields)"
+
+
+def compile_mapping(name: str, fields: Sequence[Field_Spec]) -> Field_Mapping:
+    """매핑 선언을 튜플/dict 생성 함수로 컴파일"""
+    namespace: dict[str, Any] = {}
+    expressions = []
+    for index, spec in enumerate(fields):
+        target, source = spec[0], spec[1]
+        convert = spec[2] if len(spec) > 2 else None
+        if isinstance(source, Const):
+            namespace[f"_v{index}"] = source.value
+            expression = f"_v{index}"
+        elif isinstance(source, str):
+            expression = f"get({source!r})"
+        elif callable(source):
+            namespace[f"_f{index}"] = source
+            expression = f"_f{index}(item)"
+        else:
+            raise TypeError(f"{name}.{target}: 지원하지 않는 원본 {source!r}")
+        if convert is not None:
+            namespace[f"_c{index}"] = convert
+            expression = f"_c{index}({expression})"
+        expressions.append((target, expression))
+
+    columns = tuple(target for target, _ in expressions)
+    if len(set(columns)) != len(columns):
+        raise ValueError(f"{name}: 대상 필드 중복")
+
+    tuple_body = ", ".join(expression for _, expression in expressions)
+    dict_body = ", ".join(f"{target!r}: {expression}" for target, expression in expressions)
+    source = (
+        f"def row(item):\n    get = item.get\n    return ({tuple_body},)\n"
+        f"def record(item):\n    get = item.get\n    return {{{dict_body}}}\n"
+    )
+    exec(compile(source, f"<field_mapping {name}>", "exec"), namespace)
+    return Field_Mapping(name, columns, namespace["row"], namespace["record"])
+
+
+def _same_value(stored: Any, value: Any) -> bool:
+    """저장된 값과 새 값 비교 (Numeric 컬럼은 Decimal 로 읽히므로 숫자로 비교)"""
+    if isinstance(stored, Decimal) and isinstance(value, (int, float)):
+        return float(stored) == float(value)
+    return stored == value
+
+
+def bulk_upsert(
+    session: Session,
+    model: type[SQLModel],
+    columns: Sequence[str],
+    rows: Sequence[tuple],
+    key_columns: Sequence[str],
+    *criteria: Any,
+    compare_columns: Optional[Sequence[str]] = None,
+) -> int:
+    """키 컬럼이 같은 기존 행은 PK 기준 일괄 UPDATE, 나머지는 일괄 INSERT (commit 은 호출자)
+
+    criteria 로 좁힌 범위의 기존 행을 한 번에 읽어오므로 행마다 조회하지 않는다.
+    같은 배치 안에서 키가 겹치면 마지막 행을 쓴다.
+    compare_columns(기본: 전체) 값이 그대로인 기존 행은 UPDATE 하지 않으므로
+    같은 내용을 다시 동기화해도 onupdate 컬럼(updated_at)이 바뀌지 않는다.
+    """
+    started = clock.perf_counter()
+    key_index = [columns.index(column) for column in key_columns]
+    compare_index = [columns.index(column) for column in (compare_columns or columns)]
+    with traced("db.bulk_upsert.select", table=model.__tablename__):
+        existing = {
+            tuple(row[index] for index in key_index): (row_id, row)
+            for row_id, *row in session.exec(
+                select(model.id, *(getattr(model, column) for column in columns)).where(*criteria)
+            ).all()
+        }
+
+    latest = {tuple(row[index] for index in key_index): row for row in rows}
+    inserts, updates = [], []
+    for key, row in latest.items():
+        values = dict(zip(columns, row, strict=True))
+        stored = existing.get(key)
+        if stored is None:
+            inserts.append(values)
+        elif not all(_same_value(stored[1][index], row[index]) for index in compare_index):
+            values["id"] = stored[0]
+            updates.append(values)
+
+    with traced("db.bulk_upsert.write", table=model.__tablename__, inserts=len(inserts), updates=len(updates)):
+        if inserts:
+            session.execute(insert(model), inserts)
+        if updates:
+            session.execute(update(model), updates)
+    record_batch("bulk_upsert", started, len(latest))
+    return len(latest)
+
+
+def upsert_row(
+    session: Session,
+    model: type[SQLModel],
+    values: dict[str, Any],
+    key_columns: Sequence[str],
+    update: bool = True,
+) -> None:
+    """유니크 키가 같은 행이 있으면 나머지 컬럼을 덮어쓰는 단건 INSERT ... ON CONFLICT (commit 은 호출자)
+
+    조회 후 쓰기와 달리 여러 워커가 같은 키를 동시에 써도 한 행으로 수렴한다.
+    update=False 면 기존 행을 그대로 둔다 (ON CONFLICT DO NOTHING, 행이 있음을 보장하는 용도).
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(model).values(**values)
+    elif dialect == "sqlite":
+        statement = sqlite.insert(model).values(**values)
+    else:
+        raise ValueError(f"ON CONFLICT 를 지원하지 않는 DB: {dialect}")
+
+    if update:
+        updated = {column: statement.excluded[column] for column in values if column not in ("id", *key_columns)}
+        statement = statement.on_conflict_do_update(index_elements=list(key_columns), set_=updated)
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=list(key_columns))
+    with traced("db.upsert_row", table=model.__tablename__):
+        session.execute(statement)
+
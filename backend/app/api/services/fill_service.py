@@ -0,0 +1,139 @@
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from app.constants import KST
+from app.models.account import Account
+from app.models.kis import Kis_Daily_Trade
+from app.models.ls import Ls_Trade
+
+BUY = "buy"
+SELL = "sell"
+
+# 체결 비용(fee) 출처
+FEE_BASIS_BROKER = "broker"        # 체결별 수수료/세금 (LS)
+FEE_BASIS_ESTIMATED = "estimated"  # 조회 기간 추정제비용합을 체결금액 비중으로 배분 (KIS)
+
+LS_TRADE_NO_WIDTH = 20  # Ls_Trade.trade_no 최대 길이
+
+
+@dataclass(frozen=True, slots=True)
+class Fill:
+    """브로커 공통 체결 내역"""
+    account_id: uuid.UUID
+    stock_code: str
+    stock_name: str
+    side: str                 # buy / sell
+    quantity: int
+    price: float
+    fee: float                # 수수료 + 세금
+    executed_at: datetime     # 체결시각 (KST)
+    ref: str                  # 동일 시각 체결 정렬용 식별자 (주문번호 등)
+    recorded_at: Optional[datetime] = None  # DB 저장/갱신 시각
+
+    @property
+    def key(self) -> tuple[datetime, str]:
+        """체결 처리 순서 키"""
+        return (self.executed_at, self.ref)
+
+
+def _parse_hms(value: Optional[str]) -> time:
+    if value and len(value) >= 6 and value[:6].isdigit():
+        return time(int(value[0:2]), int(value[2:4]), int(value[4:6]))
+    return time(0, 0)
+
+
+def fee_basis(broker: str) -> str:
+    return FEE_BASIS_ESTIMATED if broker.upper() == "KIS" else FEE_BASIS_BROKER
+
+
+def _kis_fee(trade: Kis_Daily_Trade) -> float:
+    """KIS 체결 비용 추정치
+
+    일별 체결 조회는 체결별 수수료/세금을 주지 않고 조회 기간 합계(추정제비용합, 총체결금액)만
+    output2 로 돌려준다. 합계를 체결금액 비중으로 나눠 체결별 비용으로 쓴다 (합계가 없으면 0).
+    """
+    if not trade.estimated_tax_amt or not trade.total_trade_amt_sum:
+        return 0.0
+    amount = trade.trade_amount or (trade.trade_price * trade.trade_qty)
+    return float(trade.estimated_tax_amt) * amount / float(trade.total_trade_amt_sum)
+
+
+def _kis_fill(trade: Kis_Daily_Trade) -> Optional[Fill]:
+    if trade.trade_qty <= 0 or trade.order_type not in ("01", "02"):
+        return None
+    executed_at = KST.localize(
+        datetime.combine(
+            datetime.strptime(trade.order_date, "%Y%m%d").date(),
+            _parse_hms(trade.trade_time or trade.order_time),
+        )
+    )
+    return Fill(
+        account_id=trade.account_id,
+        stock_code=trade.stock_code,
+        stock_name=trade.stock_name,
+        side=SELL if trade.order_type == "01" else BUY,
+        quantity=trade.trade_qty,
+        price=trade.trade_price or (trade.trade_amount / trade.trade_qty),
+        fee=_kis_fee(trade),
+        executed_at=executed_at,
+        ref=trade.order_no,
+        recorded_at=trade.updated_at,
+    )
+
+
+def _ls_fill(trade: Ls_Trade) -> Optional[Fill]:
+    if trade.quantity <= 0 or trade.trade_type not in ("매수", "매도"):
+        return None
+    return Fill(
+        account_id=trade.account_id,
+        stock_code=trade.stock_code,
+        stock_name=trade.stock_name,
+        side=BUY if trade.trade_type == "매수" else SELL,
+        quantity=trade.quantity,
+        price=float(trade.price),
+        fee=float(trade.fee or 0) + float(trade.tax or 0),
+        executed_at=KST.localize(datetime.combine(trade.trade_date, trade.trade_time)),
+        # 거래번호는 거래일자별 순번이므로 자리수를 맞춰 같은 시각 체결의 순서를 유지 (번호 없는 이전 행은 행 ID)
+        ref=trade.trade_no.zfill(LS_TRADE_NO_WIDTH) if trade.trade_no else str(trade.id),
+        recorded_at=trade.updated_at,
+    )
+
+
+def load_fills(
+    session: Session,
+    account: Account,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    recorded_after: Optional[datetime] = None,
+) -> list[Fill]:
+    """계좌의 체결 내역을 브로커 공통 형식으로 체결시각 순 조회 (start_date <= 체결일 < end_date)
+
+    recorded_after 를 지정하면 그 이후 저장/갱신된 체결만 조회한다.
+    """
+    fills: list[Optional[Fill]]
+    if account.broker.upper() == "KIS":
+        statement = select(Kis_Daily_Trade).where(Kis_Daily_Trade.account_id == account.id)
+        if start_date:
+            statement = statement.where(Kis_Daily_Trade.order_date >= start_date.strftime("%Y%m%d"))
+        if end_date:
+            statement = statement.where(Kis_Daily_Trade.order_date < end_date.strftime("%Y%m%d"))
+        if recorded_after:
+            statement = statement.where(Kis_Daily_Trade.updated_at > recorded_after)
+        fills = [_kis_fill(trade) for trade in session.exec(statement).all()]
+    elif account.broker.upper() == "LS":
+        statement = select(Ls_Trade).where(Ls_Trade.account_id == account.id)
+        if start_date:
+            statement = statement.where(Ls_Trade.trade_date >= start_date)
+        if end_date:
+            statement = statement.where(Ls_Trade.trade_date < end_date)
+        if recorded_after:
+            statement = statement.where(Ls_Trade.updated_at > recorded_after)
+        fills = [_ls_fill(trade) for trade in session.exec(statement).all()]
+    else:
+        return []
+
+    return sorted((fill for fill in fills if fill), key=lambda fill: fill.key)
@@ -0,0 +1,53 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from app.constants import HISTORY_CACHE_SIZE, HISTORY_CACHE_TTL_SECONDS
+from app.core.metrics import record_cache
+
+
+class History_Cache:
+    """직렬화된 이력 응답 캐시 (계좌별 무효화, LRU + 유효시간)
+
+    분별 잔고가 새로 저장되면 해당 계좌 항목을 지워 다음 조회에서 다시 직렬화한다.
+    무효화는 잔고를 저장한 프로세스에서만 일어나므로 호출 측은 마지막 잔고 시각을 키에 포함한다.
+    """
+
+    def __init__(self, max_entries: int = HISTORY_CACHE_SIZE, ttl_seconds: float = HISTORY_CACHE_TTL_SECONDS) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[uuid.UUID, Hashable], tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, account_id: uuid.UUID, key: Hashable) -> Optional[bytes]:
+        entry = self._entries.get((account_id, key))
+        if entry is None:
+            record_cache("history", False)
+            return None
+        stored_at, body = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[(account_id, key)]
+            record_cache("history", False)
+            return None
+        self._entries.move_to_end((account_id, key))
+        record_cache("history", True)
+        return body
+
+    def put(self, account_id: uuid.UUID, key: Hashable, body: bytes) -> None:
+        self._entries[(account_id, key)] = (time.monotonic(), body)
+        self._entries.move_to_end((account_id, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, account_id: uuid.UUID) -> None:
+        for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == account_id]:
+            del self._entries[cache_key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+history_cache = History_Cache()
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 import requests
 from fastapi import HTTPException
@@ -6,16 +7,25 @@ from app.constants import (
     KIS_API_BASE_URL,
     KIS_API_ENDPOINTS,
     KIS_API_TR_ID,
-    KIS_API_PARAMS
+    KIS_API_PARAMS,
+    BROKER_REQUEST_TIMEOUT_SECONDS,
+    ORDER_REQUEST_TIMEOUT_SECONDS
 )
 from typing import Any
+from app.api.services import paper_broker
+from app.core.json_codec import decode_response
+from app.core.metrics import observe_broker_call
 
+@observe_broker_call("KIS", "token")
 def get_access_token_KIS(app_key: str, app_secret: str, acnt_type: str) -> tuple[str, datetime]:
     """
     KIS API를 통해 access token을 받아옵니다.
     Returns:
         tuple[str, datetime]: (access_token, expires_at)
     """
+    if paper_broker.is_simulated(acnt_type):
+        return paper_broker.issue_token(app_key)
+
     base_url = KIS_API_BASE_URL[acnt_type]
     try:
         response = requests.post(
@@ -27,7 +37,7 @@ def get_access_token_KIS(app_key: str, app_secret: str, acnt_type: str) -> tuple
             }
         )
         response.raise_for_status()
-        data = response.json()
+        data = decode_response(response)
         
         access_token = data.get("access_token", "")
         expires_at = datetime.strptime(data.get("access_token_token_expired", ""), "%Y-%m-%d %H:%M:%S")
@@ -44,8 +54,34 @@ def get_access_token_KIS(app_key: str, app_secret: str, acnt_type: str) -> tuple
             detail=f"KIS API 토큰 만료 시간 파싱 실패: {str(e)}"
         )
 
+@observe_broker_call("KIS", "approval")
+def get_approval_key_KIS(app_key: str, app_secret: str, acnt_type: str) -> str:
+    """KIS API를 통해 실시간 웹소켓 접속키(approval_key)를 받아옵니다."""
+    base_url = KIS_API_BASE_URL[acnt_type]
+    try:
+        response = requests.post(
+            f"{base_url}{KIS_API_ENDPOINTS['approval']}",
+            json={
+                "grant_type": "client_credentials",
+                "appkey": app_key,
+                "secretkey": app_secret
+            },
+            timeout=BROKER_REQUEST_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        return decode_response(response).get("approval_key", "")
+    except requests.RequestException as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"KIS API 웹소켓 접속키 발급 실패: {str(e)}"
+        )
+
+@observe_broker_call("KIS", "balance")
 async def inquire_balance_from_KIS(account: Account) -> Any:
     """KIS API를 통한 잔고 조회"""
+    if paper_broker.is_simulated(account.acnt_type):
+        return paper_broker.balance_response(str(account.id), "KIS")
+
     base_url = KIS_API_BASE_URL[account.acnt_type]
     
     try:
@@ -65,7 +101,7 @@ async def inquire_balance_from_KIS(account: Account) -> Any:
             }
         )
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
         
     except requests.RequestException as e:
         raise HTTPException(
@@ -73,8 +109,12 @@ async def inquire_balance_from_KIS(account: Account) -> Any:
             detail=f"KIS API 잔고 조회 실패: {str(e)}"
         )
 
+@observe_broker_call("KIS", "daily_trades")
 async def inquire_daily_ccld_from_KIS(account: Account, start_date: str, end_date: str) -> dict:
     """KIS API를 통해 일별 주문체결 내역을 조회"""
+    if paper_broker.is_simulated(account.acnt_type):
+        return paper_broker.daily_ccld_response(str(account.id), "KIS", start_date, end_date)
+
     base_url = KIS_API_BASE_URL[account.acnt_type]
     
     params = {
@@ -100,7 +140,7 @@ async def inquire_daily_ccld_from_KIS(account: Account, start_date: str, end_dat
             headers=headers
         )
         response.raise_for_status()
-        data = response.json()
+        data = decode_response(response)
         
         if data.get("rt_cd") != "0":
             raise HTTPException(
@@ -114,4 +154,100 @@ async def inquire_daily_ccld_from_KIS(account: Account, start_date: str, end_dat
         raise HTTPException(
             status_code=500,
             detail=f"KIS API 호출 실패: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+@observe_broker_call("KIS", "price")
+async def inquire_price_from_KIS(account: Account, stock_code: str) -> dict:
+    """KIS API를 통한 주식 현재가 조회 (계좌와 무관한 시세 조회, 앱키만 사용)"""
+    if paper_broker.is_simulated(account.acnt_type):
+        return paper_broker.price_response(stock_code)
+
+    base_url = KIS_API_BASE_URL[account.acnt_type]
+
+    try:
+        # 시세 갱신 루프가 이벤트 루프를 막지 않도록 스레드에서 요청
+        response = await asyncio.to_thread(
+            requests.get,
+            f"{base_url}{KIS_API_ENDPOINTS['price']}",
+            params={
+                **KIS_API_PARAMS["price"],
+                "FID_INPUT_ISCD": stock_code
+            },
+            headers={
+                "authorization": f"Bearer {account.access_token}",
+                "appkey": account.app_key,
+                "appsecret": account.app_secret,
+                "tr_id": KIS_API_TR_ID["price"][account.acnt_type],
+                "content-type": "application/json"
+            },
+            timeout=BROKER_REQUEST_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        data = decode_response(response)
+
+        if data.get("rt_cd") != "0":
+            raise HTTPException(
+                status_code=400,
+                detail=f"KIS API 오류: {data.get('msg1', '알 수 없는 오류')}"
+            )
+
+        return data.get("output", {})
+
+    except requests.RequestException as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"KIS API 시세 조회 실패: {str(e)}"
+        )
+
+
+@observe_broker_call("KIS", "hashkey")
+def get_hashkey_KIS(account: Account, body: dict, http: Any = requests) -> str:
+    """KIS API 요청 본문 해시키 발급"""
+    if paper_broker.is_simulated(account.acnt_type):
+        return ""
+
+    base_url = KIS_API_BASE_URL[account.acnt_type]
+    try:
+        response = http.post(
+            f"{base_url}{KIS_API_ENDPOINTS['hashkey']}",
+            json=body,
+            headers={
+                "appkey": account.app_key,
+                "appsecret": account.app_secret,
+                "content-type": "application/json"
+            },
+            timeout=ORDER_REQUEST_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        return decode_response(response).get("HASH", "")
+    except requests.RequestException as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"KIS API 해시키 발급 실패: {str(e)}"
+        )
+
+
+@observe_broker_call("KIS", "order")
+def order_cash_KIS(account: Account, side: str, body: dict, hashkey: str, http: Any = requests) -> dict:
+    """KIS API 현금 주문 (side: buy/sell), 응답 본문 그대로 반환"""
+    if paper_broker.is_simulated(account.acnt_type):
+        return paper_broker.order_KIS(str(account.id), side, body)
+
+    base_url = KIS_API_BASE_URL[account.acnt_type]
+    response = http.post(
+        f"{base_url}{KIS_API_ENDPOINTS['order']}",
+        json=body,
+        headers={
+            "authorization": f"Bearer {account.access_token}",
+            "appkey": account.app_key,
+            "appsecret": account.app_secret,
+            "tr_id": KIS_API_TR_ID[f"order_{side}"][account.acnt_type],
+            "custtype": "P",
+            "hashkey": hashkey,
+            "content-type": "application/json"
+        },
+        timeout=ORDER_REQUEST_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+    return decode_response(response)
+
@@ -1,75 +1,78 @@
-from datetime import datetime
-from sqlmodel import select
 from app.models.kis import Kis_Daily_Trade
 from app.models.account import Account
 from uuid import UUID
 from sqlmodel import Session
 from app.api.services.kis_api import inquire_daily_ccld_from_KIS
+from app.api.services.field_mapping import bulk_upsert, compile_mapping, to_float, to_int
 
-def process_trade_data_KIS(response_data: dict, account_id: str) -> list[Kis_Daily_Trade]:
-    """거래 데이터를 처리하여 DailyTrade 객체 리스트로 변환"""
-    trades = []
-    output1 = response_data.get("output1", [])
-    output2 = response_data.get("output2", {})
+# 주식일별주문체결조회 output1 → Kis_Daily_Trade 컬럼
+TTTC8001R_TRADE = compile_mapping("TTTC8001R", [
+    ("order_date", "ord_dt"),
+    ("stock_code", "pdno"),
+    ("stock_name", "prdt_name"),
+    ("order_no", "odno"),
+    ("order_time", "ord_tmd"),
+    ("order_type", "sll_buy_dvsn_cd"),
+    ("order_price", "ord_unpr", to_float),
+    ("order_qty", "ord_qty", to_int),
+    ("trade_price", "avg_prvs", to_float),
+    ("trade_qty", "tot_ccld_qty", to_int),
+    ("trade_amount", "tot_ccld_amt", to_float),
+    ("total_trade_qty", "tot_ccld_qty", to_int),
+    ("remaining_qty", "rmn_qty", to_int),
+    ("cancel_qty", "cncl_cfrm_qty", to_int),
+    ("original_order_no", "orgn_odno"),
+    ("order_type_name", "ord_dvsn_name"),
+    ("order_type_detail_name", "sll_buy_dvsn_cd_name"),
+    ("cancel_yn", "cncl_yn"),
+    ("loan_date", "loan_dt"),
+    ("order_branch_no", "ord_gno_brno"),
+    ("order_media_code", "ord_dvsn_cd"),
+    ("reject_qty", "rjct_qty", to_int),
+    ("trade_condition_name", "ccld_cndt_name"),
+    ("inqr_ip_addr", "inqr_ip_addr"),
+    ("order_method_code", "cpbc_ordp_ord_rcit_dvsn_cd"),
+    ("order_info_code", "cpbc_ordp_infm_mthd_dvsn_cd"),
+    ("info_update_time", "infm_tmd"),
+    ("phone_number", "ctac_tlno"),
+    ("product_type_code", "prdt_type_cd"),
+    ("exchange_code", "excg_dvsn_cd"),
+    ("order_material_code", "cpbc_ordp_mtrl_dvsn_cd"),
+    ("order_org_no", "ord_orgno"),
+    ("reserve_order_end_date", "rsvn_ord_end_dt"),
+    ("exchange_id_code", "excg_id_dvsn_cd"),
+    ("stop_condition_price", "stpm_cndt_pric", to_float),
+    ("stop_effect_time", "stpm_efct_occr_dtmd"),
+])
 
-    # output2의 합산 정보를 저장
-    summary_data = {
-        "total_order_qty_sum": int(output2.get("tot_ord_qty", 0)),
-        "total_trade_qty_sum": int(output2.get("tot_ccld_qty", 0)),
-        "total_trade_amt_sum": float(output2.get("tot_ccld_amt", 0)),
-        "estimated_tax_amt": float(output2.get("prsm_tlex_smtl", 0)),
-        "avg_trade_price": float(output2.get("pchs_avg_pric", 0))
-    }
+# output2 합산 정보 (모든 행에 같은 값)
+TTTC8001R_SUMMARY = compile_mapping("TTTC8001R output2", [
+    ("total_order_qty_sum", "tot_ord_qty", to_int),
+    ("total_trade_qty_sum", "tot_ccld_qty", to_int),
+    ("total_trade_amt_sum", "tot_ccld_amt", to_float),
+    ("estimated_tax_amt", "prsm_tlex_smtl", to_float),
+    ("avg_trade_price", "pchs_avg_pric", to_float),
+])
 
-    # output1의 개별 거래 데이터 처리
-    for trade in output1:
-        daily_trade = Kis_Daily_Trade(
-            account_id=account_id,
-            order_date=trade["ord_dt"],
-            stock_code=trade["pdno"],
-            stock_name=trade["prdt_name"],
-            order_no=trade["odno"],
-            order_time=trade["ord_tmd"],
-            order_type=trade["sll_buy_dvsn_cd"],
-            order_price=float(trade["ord_unpr"]),
-            order_qty=int(trade["ord_qty"]),
-            trade_price=float(trade.get("avg_prvs", 0)),
-            trade_qty=int(trade.get("tot_ccld_qty", 0)),
-            trade_amount=float(trade.get("tot_ccld_amt", 0)),
-            total_trade_qty=int(trade.get("tot_ccld_qty", 0)),
-            remaining_qty=int(trade.get("rmn_qty", 0)),
-            cancel_qty=int(trade.get("cncl_cfrm_qty", 0)),
-            
-            # output1의 추가 필드들
-            original_order_no=trade.get("orgn_odno"),
-            order_type_name=trade.get("ord_dvsn_name"),
-            order_type_detail_name=trade.get("sll_buy_dvsn_cd_name"),
-            cancel_yn=trade.get("cncl_yn"),
-            loan_date=trade.get("loan_dt"),
-            order_branch_no=trade.get("ord_gno_brno"),
-            order_media_code=trade.get("ord_dvsn_cd"),
-            reject_qty=int(trade.get("rjct_qty", 0)),
-            trade_condition_name=trade.get("ccld_cndt_name"),
-            inqr_ip_addr=trade.get("inqr_ip_addr"),
-            order_method_code=trade.get("cpbc_ordp_ord_rcit_dvsn_cd"),
-            order_info_code=trade.get("cpbc_ordp_infm_mthd_dvsn_cd"),
-            info_update_time=trade.get("infm_tmd"),
-            phone_number=trade.get("ctac_tlno"),
-            product_type_code=trade.get("prdt_type_cd"),
-            exchange_code=trade.get("excg_dvsn_cd"),
-            order_material_code=trade.get("cpbc_ordp_mtrl_dvsn_cd"),
-            order_org_no=trade.get("ord_orgno"),
-            reserve_order_end_date=trade.get("rsvn_ord_end_dt"),
-            exchange_id_code=trade.get("excg_id_dvsn_cd"),
-            stop_condition_price=float(trade.get("stpm_cndt_pric", 0)),
-            stop_effect_time=trade.get("stpm_efct_occr_dtmd"),
+TRADE_COLUMNS_KIS = ("account_id", *TTTC8001R_TRADE.columns, *TTTC8001R_SUMMARY.columns)
+# 체결 변경 여부는 체결 컬럼으로만 판단 (output2 합계는 조회 기간마다 달라지므로 비교하지 않음)
+TRADE_COMPARE_COLUMNS_KIS = ("account_id", *TTTC8001R_TRADE.columns)
 
-            # output2의 합산 정보 추가
-            **summary_data
-        )
-        trades.append(daily_trade)
 
-    return trades 
+def extract_trade_rows_KIS(response_data: dict, account_id: UUID) -> list[tuple]:
+    """거래 데이터를 TRADE_COLUMNS_KIS 순서의 튜플 목록으로 변환 (대량 저장용)"""
+    output2 = response_data.get("output2") or {}
+    summary = TTTC8001R_SUMMARY.row(output2 if isinstance(output2, dict) else {})
+    row = TTTC8001R_TRADE.row
+    return [(account_id, *row(trade), *summary) for trade in response_data.get("output1", [])]
+
+
+def process_trade_data_KIS(response_data: dict, account_id: str) -> list[Kis_Daily_Trade]:
+    """거래 데이터를 처리하여 DailyTrade 객체 리스트로 변환"""
+    return [
+        Kis_Daily_Trade(**dict(zip(TRADE_COLUMNS_KIS, row, strict=True)))
+        for row in extract_trade_rows_KIS(response_data, account_id)
+    ]
 
 async def update_account_daily_trades_KIS(
     account_id: UUID,
@@ -92,34 +95,22 @@ async def update_account_daily_trades_KIS(
         if not trade_data.get("output1"):
             return 0, []
             
-        # 거래 내역 처리 및 저장
-        from app.api.routes.accounts import process_trade_data
-        
-        for trade in process_trade_data(trade_data, str(account_id)):
-            try:
-                statement = select(Kis_Daily_Trade).where(
-                    Kis_Daily_Trade.account_id == account_id,
-                    Kis_Daily_Trade.order_date == trade.order_date,
-                    Kis_Daily_Trade.order_no == trade.order_no
-                )
-                existing_trade = session.exec(statement).first()
-
-                if existing_trade:
-                    # 기존 거래 업데이트
-                    for key, value in trade.model_dump().items():
-                        setattr(existing_trade, key, value)
-                else:
-                    # 새 거래 추가
-                    session.add(trade)
-
-                success_count += 1
-
-            except Exception as e:
-                failed_accounts.append((account.acnt_name, f"거래 데이터 처리 실패 (주문번호: {trade.order_no}): {str(e)}"))
-                continue
-
+        # 거래 내역 처리 및 저장 (기존 주문은 갱신, 신규는 추가)
+        rows = extract_trade_rows_KIS(trade_data, account_id)
+        order_date_index = TRADE_COLUMNS_KIS.index("order_date")
+        success_count = bulk_upsert(
+            session,
+            Kis_Daily_Trade,
+            TRADE_COLUMNS_KIS,
+            rows,
+            ("order_date", "order_no"),
+            Kis_Daily_Trade.account_id == account_id,
+            Kis_Daily_Trade.order_date.in_({row[order_date_index] for row in rows}),
+            compare_columns=TRADE_COMPARE_COLUMNS_KIS,
+        )
         session.commit()
         return success_count, failed_accounts
         
     except Exception as e:
+        session.rollback()
         return 0, [(account.acnt_name if account else "Unknown", str(e))] 
\ No newline at end of file
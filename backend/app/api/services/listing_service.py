@@ -0,0 +1,74 @@
+"""목록 API 공통 처리 (keyset 페이지네이션, 전체 건수, 공개 컬럼만 조회)
+
+페이지는 id 순으로 자르고 다음 페이지 시작점을 불투명한 cursor 로 돌려준다.
+OFFSET 없이 `id > cursor` 조건으로 PK 인덱스를 타므로 몇 번째 페이지든 같은 비용이 든다.
+전체 건수는 요청마다 DB 에서 구하고, 조건 없는 큰 테이블만 통계 추정치를 쓴다.
+"""
+import base64
+import binascii
+import uuid
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, func, select
+
+from app.constants import LISTING_COUNT_ESTIMATE_MIN_ROWS
+
+
+def encode_cursor(last_id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(last_id.bytes).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(bytes=base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def count_rows(session: Session, model: type[SQLModel], *criteria: Any) -> int:
+    """목록 전체 건수
+
+    조건이 없고 행이 LISTING_COUNT_ESTIMATE_MIN_ROWS 이상인 Postgres 테이블은 통계 추정치(pg_class.reltuples)를,
+    그 외에는 정확한 COUNT 를 돌려준다. 결과를 프로세스에 캐시하지 않으므로 워커 간에 어긋나지 않는다.
+    """
+    if not criteria and session.get_bind().dialect.name == "postgresql":
+        estimate = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": model.__tablename__},
+        ).scalar()
+        if estimate is not None and estimate >= LISTING_COUNT_ESTIMATE_MIN_ROWS:
+            return int(estimate)
+    return session.exec(select(func.count()).select_from(model).where(*criteria)).one()
+
+
+def fetch_page(
+    session: Session,
+    model: type[SQLModel],
+    columns: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    criteria: Sequence[Any] = (),
+    joins: Sequence[tuple[Any, Any]] = (),
+    skip: int = 0,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """id 순 한 페이지 (columns 만 조회) → (행 dict 목록, 다음 페이지 cursor, 마지막이면 None)
+
+    joins 는 (대상 모델, ON 조건) 목록으로 LEFT OUTER JOIN 한다.
+    skip 은 cursor 가 없을 때만 쓰는 이전 방식 호환용 (깊은 페이지일수록 느림).
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    statement = select(*columns)
+    for target, on_clause in joins:
+        statement = statement.outerjoin(target, on_clause)
+    if cursor:
+        criteria = (*criteria, model.id > decode_cursor(cursor))
+    statement = statement.where(*criteria).order_by(model.id).limit(limit + 1)
+    if skip and not cursor:
+        statement = statement.offset(skip)
+
+    rows = [dict(row._mapping) for row in session.exec(statement).all()]
+    next_cursor = encode_cursor(rows[limit - 1]["id"]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,272 @@
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Session, delete, select
+
+from app.constants import KST
+from app.models.account import Account
+from app.models.ledger import Pnl_Checkpoint, Position_Lot, Realized_Pnl
+from app.api.services.fill_service import BUY, Fill, load_fills
+
+logger = logging.getLogger(__name__)
+
+FIFO = "fifo"
+AVERAGE = "average"
+LOT_METHODS = (FIFO, AVERAGE)
+
+
+@dataclass(slots=True)
+class Lot:
+    """미청산 매수 로트"""
+    quantity: int
+    unit_cost: float
+    opened_at: datetime
+
+
+@dataclass(slots=True)
+class Stock_Book:
+    """종목별 로트/실현손익 상태"""
+    stock_name: Optional[str] = None
+    lots: deque = field(default_factory=deque)
+    realized_pnl: float = 0.0
+    realized_qty: int = 0
+    fees: float = 0.0
+    unmatched_sell_qty: int = 0
+
+    @property
+    def open_qty(self) -> int:
+        return sum(lot.quantity for lot in self.lots)
+
+    @property
+    def open_cost(self) -> float:
+        return sum(lot.quantity * lot.unit_cost for lot in self.lots)
+
+
+class Lot_Book:
+    """체결을 순서대로 반영해 로트와 실현손익을 계산하는 매칭 엔진
+
+    fifo    : 먼저 매수한 로트부터 청산
+    average : 매수 시 기존 로트와 합쳐 이동평균단가로 관리 (국내 증권사 잔고 기준)
+    """
+
+    def __init__(self, method: str = FIFO, books: Optional[dict[str, Stock_Book]] = None) -> None:
+        if method not in LOT_METHODS:
+            raise ValueError(f"지원하지 않는 평가방식: {method}")
+        self.method = method
+        self.books: dict[str, Stock_Book] = books if books is not None else {}
+
+    def apply(self, fill: Fill) -> float:
+        """체결 1건 반영, 이번 체결로 실현된 손익 반환"""
+        book = self.books.setdefault(fill.stock_code, Stock_Book())
+        book.stock_name = fill.stock_name or book.stock_name
+        book.fees += fill.fee
+
+        if fill.side == BUY:
+            unit_cost = fill.price + fill.fee / fill.quantity
+            if self.method == AVERAGE and book.lots:
+                lot = book.lots[0]
+                total_qty = lot.quantity + fill.quantity
+                lot.unit_cost = (lot.quantity * lot.unit_cost + fill.quantity * unit_cost) / total_qty
+                lot.quantity = total_qty
+            else:
+                book.lots.append(Lot(fill.quantity, unit_cost, fill.executed_at))
+            return 0.0
+
+        # 매도: 보유 로트에서 순서대로 차감
+        unit_proceeds = fill.price - fill.fee / fill.quantity
+        remaining = fill.quantity
+        realized = 0.0
+        while remaining and book.lots:
+            lot = book.lots[0]
+            matched = min(remaining, lot.quantity)
+            realized += (unit_proceeds - lot.unit_cost) * matched
+            lot.quantity -= matched
+            remaining -= matched
+            if lot.quantity == 0:
+                book.lots.popleft()
+
+        book.realized_qty += fill.quantity - remaining
+        book.unmatched_sell_qty += remaining
+        book.realized_pnl += realized
+        return realized
+
+    def apply_all(self, fills: list[Fill]) -> float:
+        return sum(self.apply(fill) for fill in fills)
+
+
+def load_lot_book(session: Session, account_id, method: str) -> Lot_Book:
+    """저장된 로트/실현손익으로 매칭 엔진 상태 복원"""
+    books: dict[str, Stock_Book] = {}
+    for pnl in session.exec(
+        select(Realized_Pnl).where(Realized_Pnl.account_id == account_id, Realized_Pnl.method == method)
+    ).all():
+        books[pnl.stock_code] = Stock_Book(
+            stock_name=pnl.stock_name,
+            realized_pnl=pnl.realized_pnl,
+            realized_qty=pnl.realized_qty,
+            fees=pnl.fees,
+            unmatched_sell_qty=pnl.unmatched_sell_qty,
+        )
+    for lot in session.exec(
+        select(Position_Lot)
+        .where(Position_Lot.account_id == account_id, Position_Lot.method == method)
+        .order_by(Position_Lot.stock_code, Position_Lot.sequence)
+    ).all():
+        books.setdefault(lot.stock_code, Stock_Book()).lots.append(
+            Lot(lot.quantity, lot.unit_cost, lot.opened_at)
+        )
+    return Lot_Book(method, books)
+
+
+def save_lot_book(session: Session, account_id, lot_book: Lot_Book, stock_codes: set[str]) -> None:
+    """변경된 종목의 로트/실현손익 저장"""
+    if not stock_codes:
+        return
+
+    session.exec(
+        delete(Position_Lot)
+        .where(
+            Position_Lot.account_id == account_id,
+            Position_Lot.method == lot_book.method,
+            Position_Lot.stock_code.in_(stock_codes),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    existing = {
+        pnl.stock_code: pnl
+        for pnl in session.exec(
+            select(Realized_Pnl).where(
+                Realized_Pnl.account_id == account_id,
+                Realized_Pnl.method == lot_book.method,
+                Realized_Pnl.stock_code.in_(stock_codes),
+            )
+        ).all()
+    }
+
+    for stock_code in stock_codes:
+        book = lot_book.books[stock_code]
+        for sequence, lot in enumerate(book.lots):
+            session.add(Position_Lot(
+                account_id=account_id,
+                method=lot_book.method,
+                stock_code=stock_code,
+                sequence=sequence,
+                quantity=lot.quantity,
+                unit_cost=lot.unit_cost,
+                opened_at=lot.opened_at,
+            ))
+
+        open_qty, open_cost = book.open_qty, book.open_cost
+        pnl = existing.get(stock_code) or Realized_Pnl(
+            account_id=account_id, method=lot_book.method, stock_code=stock_code
+        )
+        pnl.stock_name = book.stock_name
+        pnl.realized_pnl = book.realized_pnl
+        pnl.realized_qty = book.realized_qty
+        pnl.fees = book.fees
+        pnl.open_qty = open_qty
+        pnl.open_cost = open_cost
+        pnl.avg_cost = open_cost / open_qty if open_qty else 0.0
+        pnl.unmatched_sell_qty = book.unmatched_sell_qty
+        session.add(pnl)
+
+
+def reset_lot_book(session: Session, account_id, method: str) -> None:
+    """계좌의 손익 계산 결과 초기화 (전체 재계산용)"""
+    for model in (Position_Lot, Realized_Pnl, Pnl_Checkpoint):
+        session.exec(
+            delete(model)
+            .where(model.account_id == account_id, model.method == method)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def update_realized_pnl(session: Session, account: Account, method: str = FIFO) -> int:
+    """체크포인트 이후 체결만 반영해 로트/실현손익 갱신, 반영한 체결 건수 반환
+
+    당일 체결은 장중 갱신될 수 있으므로 전일까지 확정된 체결만 반영한다.
+    체크포인트 이전 날짜의 체결이 뒤늦게 저장/수정된 경우에는 전체를 재계산한다.
+    """
+    now = datetime.now(KST)
+    checkpoint = session.exec(
+        select(Pnl_Checkpoint).where(Pnl_Checkpoint.account_id == account.id, Pnl_Checkpoint.method == method)
+    ).first()
+
+    start_date = None
+    if checkpoint and checkpoint.last_executed_at:
+        last_executed_at = checkpoint.last_executed_at
+        if last_executed_at.tzinfo is None:
+            last_executed_at = KST.localize(last_executed_at)
+        last_key = (last_executed_at, checkpoint.last_fill_ref or "")
+        # 마지막 처리 이후 저장/수정된 체결 중 이미 반영한 구간에 속하는 것이 있으면 전체 재계산
+        late_fills = [
+            fill for fill in load_fills(
+                session, account, end_date=now.date(), recorded_after=checkpoint.processed_at
+            )
+            if fill.key <= last_key
+        ] if checkpoint.processed_at else []
+        if late_fills:
+            logger.info(f"지연 반영된 체결 발견, 손익 재계산 - 계정: {account.acnt_name}, 방식: {method}")
+            reset_lot_book(session, account.id, method)
+            session.flush()
+            checkpoint = None
+        else:
+            start_date = last_executed_at.astimezone(KST).date()
+
+    fills = load_fills(session, account, start_date=start_date, end_date=now.date())
+    if checkpoint and checkpoint.last_executed_at:
+        fills = [fill for fill in fills if fill.key > last_key]
+
+    if not checkpoint:
+        checkpoint = Pnl_Checkpoint(account_id=account.id, method=method)
+
+    lot_book = load_lot_book(session, account.id, method) if checkpoint.fill_count else Lot_Book(method)
+    lot_book.apply_all(fills)
+    save_lot_book(session, account.id, lot_book, {fill.stock_code for fill in fills})
+
+    if fills:
+        checkpoint.last_executed_at = fills[-1].executed_at
+        checkpoint.last_fill_ref = fills[-1].ref
+        checkpoint.fill_count += len(fills)
+    checkpoint.processed_at = now
+    session.add(checkpoint)
+    session.commit()
+    return len(fills)
+
+
+def update_account_realized_pnl(session: Session, account: Account) -> int:
+    """모든 평가방식으로 계좌의 실현손익 갱신"""
+    return sum(update_realized_pnl(session, account, method) for method in LOT_METHODS)
+
+
+def get_realized_pnl(session: Session, account_id, method: str = FIFO) -> dict:
+    """저장된 종목별 실현손익/미청산 로트 조회 (체결 재생 없이 사전 계산된 결과 사용)"""
+    pnls = session.exec(
+        select(Realized_Pnl)
+        .where(Realized_Pnl.account_id == account_id, Realized_Pnl.method == method)
+        .order_by(Realized_Pnl.stock_code)
+    ).all()
+    lots_by_stock: dict[str, list[Position_Lot]] = {}
+    for lot in session.exec(
+        select(Position_Lot)
+        .where(Position_Lot.account_id == account_id, Position_Lot.method == method)
+        .order_by(Position_Lot.stock_code, Position_Lot.sequence)
+    ).all():
+        lots_by_stock.setdefault(lot.stock_code, []).append(lot)
+    checkpoint = session.exec(
+        select(Pnl_Checkpoint).where(Pnl_Checkpoint.account_id == account_id, Pnl_Checkpoint.method == method)
+    ).first()
+
+    return {
+        "account_id": account_id,
+        "method": method,
+        "total_realized_pnl": sum(pnl.realized_pnl for pnl in pnls),
+        "last_executed_at": checkpoint.last_executed_at if checkpoint else None,
+        "data": [
+            {**pnl.model_dump(), "lots": [lot.model_dump() for lot in lots_by_stock.get(pnl.stock_code, [])]}
+            for pnl in pnls
+        ],
+    }
@@ -6,16 +6,25 @@ from app.constants import (
     LS_API_BASE_URL,
     LS_API_ENDPOINTS,
     LS_API_TR_ID,
-    LS_API_PARAMS
+    LS_API_PARAMS,
+    ORDER_REQUEST_TIMEOUT_SECONDS
 )
 from typing import Any
+from app.api.services import paper_broker
+from app.core.json_codec import decode_response
+from app.core.metrics import observe_broker_call
+from app.api.services.field_mapping import Const, compile_mapping
 
+@observe_broker_call("LS", "token")
 def get_access_token_LS(app_key: str, app_secret: str, acnt_type: str) -> tuple[str, datetime]:
     """
     LS API를 통해 access token을 받아옵니다.
     Returns:
         tuple[str, datetime]: (access_token, expires_at)
     """
+    if paper_broker.is_simulated(acnt_type):
+        return paper_broker.issue_token(app_key)
+
     base_url = LS_API_BASE_URL[acnt_type]
     try:
         headers = {
@@ -35,7 +44,7 @@ def get_access_token_LS(app_key: str, app_secret: str, acnt_type: str) -> tuple[
             data=data
         )
         response.raise_for_status()
-        data = response.json()
+        data = decode_response(response)
 
         # print(data)
         access_token = data.get("access_token", "")
@@ -54,8 +63,117 @@ def get_access_token_LS(app_key: str, app_secret: str, acnt_type: str) -> tuple[
             detail=f"LS API 토큰 만료 시간 파싱 실패: {str(e)}"
         )
 
+# 주식잔고2(t0424) 보유종목 → KIS 잔고 output1 형식
+T0424_HOLDING = compile_mapping("t0424", [
+    ("pdno", "expcode"),            # 종목번호
+    ("prdt_name", "hname"),         # 종목명
+    ("hldg_qty", "janqty"),         # 잔고수량
+    ("pchs_avg_pric", "pamt"),      # 평균단가
+    ("prpr", "price"),              # 현재가
+    ("evlu_pfls_amt", "dtsunik"),   # 평가손익
+    ("evlu_pfls_rt", "sunikrt"),    # 수익률
+    ("market_gb", "marketgb"),      # 시장구분
+    ("jong_gb", "jonggb"),          # 종목구분
+    ("jan_rt", "janrt"),            # 보유비중
+    ("app_amt", "appamt"),          # 평가금액
+    ("fee", "fee"),                 # 수수료
+    ("tax", "tax"),                 # 제세금
+    ("sin_inter", "sininter"),      # 신용이자
+    ("mdpos_qt", "mdposqt"),        # 매도가능수량
+    ("sin_amt", "sinamt"),          # 대출금액
+    ("last_dt", "lastdt"),          # 만기일자
+    ("loan_dt", "loandt"),          # 대출일자
+    ("msat", "msat"),               # 당일매수금액
+    ("mpms", "mpms"),               # 당일매수단가
+    ("mdat", "mdat"),               # 당일매도금액
+    ("mpmd", "mpmd"),               # 당일매도단가
+    ("jsat", "jsat"),               # 전일매수금액
+    ("jpms", "jpms"),               # 전일매수단가
+    ("jdat", "jdat"),               # 전일매도금액
+    ("jpmd", "jpmd"),               # 전일매도단가
+])
+
+def _trade_side(trade: dict) -> str:
+    """거래구분명(TpCodeNm)으로 매수/매도 구분 (변환 형식 기준 01 매수/02 매도, 입출금 등 체결이 아니면 빈 문자열)
+
+    TrdQty 는 매도도 양수이므로 수량 부호로는 구분할 수 없다.
+    """
+    name = trade.get("TpCodeNm") or ""
+    if "매수" in name:
+        return "01"
+    if "매도" in name:
+        return "02"
+    return ""
+
+
+# 거래내역(CDPCQ04700) OutBlock3 → KIS 일별체결 output1 형식
+CDPCQ04700_TRADE = compile_mapping("CDPCQ04700", [
+    ("ord_dt", "OrdDt"),                      # 주문일자 (거래일자 TrdDt 가 아닌 주문일자 기준)
+    ("pdno", "IsuNo"),                        # 종목코드
+    ("prdt_name", "IsuNm"),                   # 종목명
+    ("odno", "TrdNo"),                        # 거래번호
+    ("ord_tmd", "TrxTime"),                   # 거래시간
+    ("sll_buy_dvsn_cd", _trade_side),         # 매수/매도 구분
+    ("ord_unpr", "TrdUprc"),                  # 거래단가
+    ("ord_qty", "TrdQty"),                    # 거래수량
+    ("tot_ccld_qty", "TrdQty"),               # 체결수량
+    ("tot_ccld_amt", "TrdAmt"),               # 체결금액
+    ("rmn_qty", "BalUnit"),                   # 잔고수량
+    ("cncl_cfrm_qty", Const("0")),            # 취소확인수량
+    ("orgn_odno", "OrgTrdNo"),                # 원거래번호
+    ("ord_dvsn_name", "TpCodeNm"),            # 주문구분명
+    ("sll_buy_dvsn_cd_name", "TpCodeNm"),     # 매수/매도 구분명 (거래구분명)
+    ("cncl_yn", Const("N")),                  # 취소여부
+    ("loan_dt", "LoanDt"),                    # 대출일자
+    ("ord_gno_brno", "TrxBrnNo"),             # 주문지점번호
+    ("ord_dvsn_cd", Const("00")),             # 주문구분코드
+    ("rjct_qty", Const("0")),                 # 거절수량
+    ("ccld_cndt_name", "TrdmdaNm"),           # 체결조건명
+    ("inqr_ip_addr", Const("")),              # 조회IP주소
+    ("cpbc_ordp_ord_rcit_dvsn_cd", Const("")),  # 주문접수구분코드
+    ("cpbc_ordp_infm_mthd_dvsn_cd", Const("")),  # 주문정보전달방법구분코드
+    ("infm_tmd", "TrxTime"),                  # 정보전달시간
+    ("ctac_tlno", Const("")),                 # 연락처
+    ("prdt_type_cd", "PdptnCode"),            # 상품유형코드
+    ("excg_dvsn_cd", Const("")),              # 거래소구분코드
+    ("cpbc_ordp_mtrl_dvsn_cd", Const("")),    # 주문매체구분코드
+    ("ord_orgno", Const("")),                 # 주문기관번호
+    ("rsvn_ord_end_dt", Const("")),           # 예약주문종료일자
+    ("excg_id_dvsn_cd", Const("")),           # 거래소ID구분코드
+    ("stpm_cndt_pric", Const("")),            # 정지조건가격
+    ("stpm_efct_occr_dtmd", Const("")),       # 정지효력발생일시
+    ("cmsn_amt", "CmsnAmt"),                  # 수수료
+    ("tax_sum_amt", "TaxSumAmt"),             # 세금합계금액
+    ("evr_tax", "EvrTax"),                    # 제세금
+    ("ictax", "Ictax"),                       # 소득세
+    ("ihtax", "Ihtax"),                       # 주민세
+    ("trtax", "Trtax"),                       # 거래세
+    ("exec_tax", "ExecTax"),                  # 체결세금
+    ("mny_dvd_amt", "MnyDvdAmt"),             # 배당금액
+    ("rcvbl_ocr_amt", "RcvblOcrAmt"),         # 미수발생금액
+    ("trx_brn_nm", "TrxBrnNm"),               # 처리지점명
+    ("base_prc", "BasePrc"),                  # 기준가
+    ("dps_crbal_amt", "DpsCrbalAmt"),         # 예수금금잔금액
+    ("mnyout_able_amt", "MnyoutAbleAmt"),     # 출금가능금액
+    ("bns_base_prc", "BnsBasePrc"),           # 매매기준가
+    ("taxchr_base_prc", "TaxchrBasePrc"),     # 과세기준가
+    ("trd_unit", "TrdUnit"),                  # 거래좌수
+    ("eval_amt", "EvalAmt"),                  # 평가금액
+    ("bnspl_amt", "BnsplAmt"),                # 매매손익금액
+    ("opp_acnt_nm", "OppAcntNm"),             # 상대계좌명
+    ("opp_acnt_no", "OppAcntNo"),             # 상대계좌번호
+    ("loan_rfund_amt", "LoanRfundAmt"),       # 대출상환금액
+    ("loan_intrst_amt", "LoanIntrstAmt"),     # 대출이자금액
+    ("askpsn_nm", "AskpsnNm"),                # 의뢰인명
+    ("rdct_cmsn", "RdctCmsn"),                # 감면수수료
+])
+
+@observe_broker_call("LS", "balance")
 async def inquire_balance_from_LS(account: Account) -> Any:
     """LS API를 통한 잔고 조회"""
+    if paper_broker.is_simulated(account.acnt_type):
+        return paper_broker.balance_response(str(account.id), "LS")
+
     base_url = LS_API_BASE_URL[account.acnt_type]
     
     try:
@@ -86,7 +204,7 @@ async def inquire_balance_from_LS(account: Account) -> Any:
             json=request_body
         )
         response.raise_for_status()
-        data = response.json()
+        data = decode_response(response)
 
         # 응답 코드 확인
         if data.get("rsp_cd") != "00000":
@@ -104,35 +222,7 @@ async def inquire_balance_from_LS(account: Account) -> Any:
         }
 
         # output1 (보유종목 상세) 변환
-        for holding in data.get("t0424OutBlock1", []):
-            balance_response["output1"].append({
-                "pdno": holding.get("expcode"),          # 종목번호
-                "prdt_name": holding.get("hname"),       # 종목명
-                "hldg_qty": holding.get("janqty"),       # 잔고수량
-                "pchs_avg_pric": holding.get("pamt"),    # 평균단가
-                "prpr": holding.get("price"),            # 현재가
-                "evlu_pfls_amt": holding.get("dtsunik"), # 평가손익
-                "evlu_pfls_rt": holding.get("sunikrt"),  # 수익률
-                "market_gb": holding.get("marketgb"),    # 시장구분
-                "jong_gb": holding.get("jonggb"),        # 종목구분
-                "jan_rt": holding.get("janrt"),          # 보유비중
-                "app_amt": holding.get("appamt"),        # 평가금액
-                "fee": holding.get("fee"),               # 수수료
-                "tax": holding.get("tax"),               # 제세금
-                "sin_inter": holding.get("sininter"),    # 신용이자
-                "mdpos_qt": holding.get("mdposqt"),      # 매도가능수량
-                "sin_amt": holding.get("sinamt"),        # 대출금액
-                "last_dt": holding.get("lastdt"),        # 만기일자
-                "loan_dt": holding.get("loandt"),        # 대출일자
-                "msat": holding.get("msat"),             # 당일매수금액
-                "mpms": holding.get("mpms"),             # 당일매수단가
-                "mdat": holding.get("mdat"),             # 당일매도금액
-                "mpmd": holding.get("mpmd"),             # 당일매도단가
-                "jsat": holding.get("jsat"),             # 전일매수금액
-                "jpms": holding.get("jpms"),             # 전일매수단가
-                "jdat": holding.get("jdat"),             # 전일매도금액
-                "jpmd": holding.get("jpmd")              # 전일매도단가
-            })
+        balance_response["output1"] = T0424_HOLDING.records(data.get("t0424OutBlock1", []))
 
         # output2 (계좌잔고 종합) 변환
         out_block = data.get("t0424OutBlock", {})
@@ -157,8 +247,62 @@ async def inquire_balance_from_LS(account: Account) -> Any:
             detail=f"LS API 잔고 조회 실패: {str(e)}"
         )
 
+def convert_daily_ccld_LS(data: dict) -> dict:
+    """LS 거래내역(CDPCQ04700) 응답을 KIS 일별체결 형식으로 변환"""
+    trade_response = {
+        "rt_cd": data.get("rsp_cd"),
+        "msg1": data.get("rsp_msg"),
+        "output1": [],  # 거래내역
+        "output2": []   # 계좌정보
+    }
+
+    # output1 (거래내역) 변환
+    trade_response["output1"] = CDPCQ04700_TRADE.records(data.get("CDPCQ04700OutBlock3", []))
+
+    # output2 (계좌정보) 변환
+    out_block = data.get("CDPCQ04700OutBlock2", {})
+    trade_response["output2"].append({
+        "acnt_nm": out_block.get("AcntNm", ""),    # 계좌명
+        "rec_cnt": out_block.get("RecCnt", 0)      # 레코드갯수
+    })
+
+    # output4 (손익합계) 변환
+    out_block4 = data.get("CDPCQ04700OutBlock4", {})
+    trade_response["output4"] = [{
+        "pnl_sum_amt": out_block4.get("PnlSumAmt", 0),  # 손익합계금액
+        "ctrct_asm": out_block4.get("CtrctAsm", 0),    # 약정누계
+        "cmsn_amt_sum_amt": out_block4.get("CmsnAmtSumAmt", 0)  # 수수료합계금액
+    }]
+
+    # output5 (매매합계) 변환
+    out_block5 = data.get("CDPCQ04700OutBlock5", {})
+    trade_response["output5"] = [{
+        "mnyin_amt": out_block5.get("MnyinAmt", 0),    # 입금금액
+        "secin_amt": out_block5.get("SecinAmt", 0),    # 입고금액
+        "mnyout_amt": out_block5.get("MnyoutAmt", 0),  # 출금금액
+        "secout_amt": out_block5.get("SecoutAmt", 0),  # 출고금액
+        "diff_amt": out_block5.get("DiffAmt", 0),      # 차이금액
+        "diff_amt0": out_block5.get("DiffAmt0", 0),    # 차이금액0
+        "sell_qty": out_block5.get("SellQty", 0),      # 매도수량
+        "sell_amt": out_block5.get("SellAmt", 0),      # 매도금액
+        "sell_cmsn": out_block5.get("SellCmsn", 0),    # 매도수수료
+        "evr_tax": out_block5.get("EvrTax", 0),        # 제세금
+        "fcurr_sell_adjst_amt": out_block5.get("FcurrSellAdjstAmt", 0),  # 외화매도정산금액
+        "buy_qty": out_block5.get("BuyQty", 0),        # 매수수량
+        "buy_amt": out_block5.get("BuyAmt", 0),        # 매수금액
+        "buy_cmsn": out_block5.get("BuyCmsn", 0),      # 매수수수료
+        "exec_tax": out_block5.get("ExecTax", 0),      # 체결세금
+        "fcurr_buy_adjst_amt": out_block5.get("FcurrBuyAdjstAmt", 0)     # 외화매수정산금액
+    }]
+
+    return trade_response
+
+@observe_broker_call("LS", "daily_trades")
 async def inquire_daily_ccld_from_LS(account: Account, start_date: str, end_date: str) -> dict:
     """LS API를 통해 일별 주문체결 내역을 조회"""
+    if paper_broker.is_simulated(account.acnt_type):
+        return paper_broker.daily_ccld_response(str(account.id), "LS", start_date, end_date)
+
     base_url = LS_API_BASE_URL[account.acnt_type]
     
     try:
@@ -191,7 +335,7 @@ async def inquire_daily_ccld_from_LS(account: Account, start_date: str, end_date
             json=request_body
         )
         response.raise_for_status()
-        data = response.json()
+        data = decode_response(response)
 
         # 응답 코드 확인
         if data.get("rsp_cd") != "00000":
@@ -200,115 +344,7 @@ async def inquire_daily_ccld_from_LS(account: Account, start_date: str, end_date
                 detail=f"LS API 오류: {data.get('rsp_msg', '알 수 없는 오류')}"
             )
 
-        # 응답 데이터 변환
-        trade_response = {
-            "rt_cd": data.get("rsp_cd"),
-            "msg1": data.get("rsp_msg"),
-            "output1": [],  # 거래내역
-            "output2": []   # 계좌정보
-        }
-
-        # output1 (거래내역) 변환
-        for trade in data.get("CDPCQ04700OutBlock3", []):
-            trade_response["output1"].append({
-                "ord_dt": trade.get("TrdDt"),           # 거래일자
-                "pdno": trade.get("IsuNo"),             # 종목코드
-                "prdt_name": trade.get("IsuNm"),        # 종목명
-                "odno": trade.get("TrdNo"),             # 거래번호
-                "ord_tmd": trade.get("TrxTime"),        # 거래시간
-                "sll_buy_dvsn_cd": "01" if trade.get("TrdQty", 0) > 0 else "02",  # 매수/매도 구분
-                "ord_unpr": trade.get("TrdUprc"),       # 거래단가
-                "ord_qty": trade.get("TrdQty"),         # 거래수량
-                "tot_ccld_qty": trade.get("TrdQty"),    # 체결수량
-                "tot_ccld_amt": trade.get("TrdAmt"),    # 체결금액
-                "rmn_qty": trade.get("BalUnit"),        # 잔고수량
-                "cncl_cfrm_qty": "0",                   # 취소확인수량
-                "orgn_odno": trade.get("OrgTrdNo"),     # 원거래번호
-                "ord_dvsn_name": trade.get("TpCodeNm"), # 주문구분명
-                "sll_buy_dvsn_cd_name": "매수" if trade.get("TrdQty", 0) > 0 else "매도",  # 매수/매도 구분명
-                "cncl_yn": "N",                         # 취소여부
-                "loan_dt": trade.get("LoanDt"),         # 대출일자
-                "ord_gno_brno": trade.get("TrxBrnNo"),  # 주문지점번호
-                "ord_dvsn_cd": "00",                    # 주문구분코드
-                "rjct_qty": "0",                        # 거절수량
-                "ccld_cndt_name": trade.get("TrdmdaNm"), # 체결조건명
-                "inqr_ip_addr": "",                     # 조회IP주소
-                "cpbc_ordp_ord_rcit_dvsn_cd": "",      # 주문접수구분코드
-                "cpbc_ordp_infm_mthd_dvsn_cd": "",     # 주문정보전달방법구분코드
-                "infm_tmd": trade.get("TrxTime"),       # 정보전달시간
-                "ctac_tlno": "",                        # 연락처
-                "prdt_type_cd": trade.get("PdptnCode"), # 상품유형코드
-                "excg_dvsn_cd": "",                     # 거래소구분코드
-                "cpbc_ordp_mtrl_dvsn_cd": "",          # 주문매체구분코드
-                "ord_orgno": "",                        # 주문기관번호
-                "rsvn_ord_end_dt": "",                  # 예약주문종료일자
-                "excg_id_dvsn_cd": "",                  # 거래소ID구분코드
-                "stpm_cndt_pric": "",                   # 정지조건가격
-                "stpm_efct_occr_dtmd": "",             # 정지효력발생일시
-                "cmsn_amt": trade.get("CmsnAmt"),      # 수수료
-                "tax_sum_amt": trade.get("TaxSumAmt"),  # 세금합계금액
-                "evr_tax": trade.get("EvrTax"),        # 제세금
-                "ictax": trade.get("Ictax"),           # 소득세
-                "ihtax": trade.get("Ihtax"),           # 주민세
-                "trtax": trade.get("Trtax"),           # 거래세
-                "exec_tax": trade.get("ExecTax"),      # 체결세금
-                "mny_dvd_amt": trade.get("MnyDvdAmt"), # 배당금액
-                "rcvbl_ocr_amt": trade.get("RcvblOcrAmt"), # 미수발생금액
-                "trx_brn_nm": trade.get("TrxBrnNm"),   # 처리지점명
-                "base_prc": trade.get("BasePrc"),      # 기준가
-                "dps_crbal_amt": trade.get("DpsCrbalAmt"), # 예수금금잔금액
-                "mnyout_able_amt": trade.get("MnyoutAbleAmt"), # 출금가능금액
-                "bns_base_prc": trade.get("BnsBasePrc"), # 매매기준가
-                "taxchr_base_prc": trade.get("TaxchrBasePrc"), # 과세기준가
-                "trd_unit": trade.get("TrdUnit"),      # 거래좌수
-                "eval_amt": trade.get("EvalAmt"),      # 평가금액
-                "bnspl_amt": trade.get("BnsplAmt"),    # 매매손익금액
-                "opp_acnt_nm": trade.get("OppAcntNm"), # 상대계좌명
-                "opp_acnt_no": trade.get("OppAcntNo"), # 상대계좌번호
-                "loan_rfund_amt": trade.get("LoanRfundAmt"), # 대출상환금액
-                "loan_intrst_amt": trade.get("LoanIntrstAmt"), # 대출이자금액
-                "askpsn_nm": trade.get("AskpsnNm"),    # 의뢰인명
-                "ord_dt": trade.get("OrdDt"),          # 주문일자
-                "rdct_cmsn": trade.get("RdctCmsn")     # 감면수수료
-            })
-
-        # output2 (계좌정보) 변환
-        out_block = data.get("CDPCQ04700OutBlock2", {})
-        trade_response["output2"].append({
-            "acnt_nm": out_block.get("AcntNm", ""),    # 계좌명
-            "rec_cnt": out_block.get("RecCnt", 0)      # 레코드갯수
-        })
-
-        # output4 (손익합계) 변환
-        out_block4 = data.get("CDPCQ04700OutBlock4", {})
-        trade_response["output4"] = [{
-            "pnl_sum_amt": out_block4.get("PnlSumAmt", 0),  # 손익합계금액
-            "ctrct_asm": out_block4.get("CtrctAsm", 0),    # 약정누계
-            "cmsn_amt_sum_amt": out_block4.get("CmsnAmtSumAmt", 0)  # 수수료합계금액
-        }]
-
-        # output5 (매매합계) 변환
-        out_block5 = data.get("CDPCQ04700OutBlock5", {})
-        trade_response["output5"] = [{
-            "mnyin_amt": out_block5.get("MnyinAmt", 0),    # 입금금액
-            "secin_amt": out_block5.get("SecinAmt", 0),    # 입고금액
-            "mnyout_amt": out_block5.get("MnyoutAmt", 0),  # 출금금액
-            "secout_amt": out_block5.get("SecoutAmt", 0),  # 출고금액
-            "diff_amt": out_block5.get("DiffAmt", 0),      # 차이금액
-            "diff_amt0": out_block5.get("DiffAmt0", 0),    # 차이금액0
-            "sell_qty": out_block5.get("SellQty", 0),      # 매도수량
-            "sell_amt": out_block5.get("SellAmt", 0),      # 매도금액
-            "sell_cmsn": out_block5.get("SellCmsn", 0),    # 매도수수료
-            "evr_tax": out_block5.get("EvrTax", 0),        # 제세금
-            "fcurr_sell_adjst_amt": out_block5.get("FcurrSellAdjstAmt", 0),  # 외화매도정산금액
-            "buy_qty": out_block5.get("BuyQty", 0),        # 매수수량
-            "buy_amt": out_block5.get("BuyAmt", 0),        # 매수금액
-            "buy_cmsn": out_block5.get("BuyCmsn", 0),      # 매수수수료
-            "exec_tax": out_block5.get("ExecTax", 0),      # 체결세금
-            "fcurr_buy_adjst_amt": out_block5.get("FcurrBuyAdjstAmt", 0)     # 외화매수정산금액
-        }]
-
-        return trade_response
+        return convert_daily_ccld_LS(data)
 
     except requests.RequestException as e:
         raise HTTPException(
@@ -316,6 +352,7 @@ async def inquire_daily_ccld_from_LS(account: Account, start_date: str, end_date
             detail=f"LS API 거래내역 조회 실패: {str(e)}"
         )
 
+@observe_broker_call("LS", "account_info")
 async def inquire_account_info_from_LS(account: Account) -> dict:
     """LS API를 통해 계좌 정보를 조회"""
     base_url = LS_API_BASE_URL[account.acnt_type]
@@ -350,7 +387,7 @@ async def inquire_account_info_from_LS(account: Account) -> dict:
             json=request_body
         )
         response.raise_for_status()
-        data = response.json()
+        data = decode_response(response)
 
         # 응답 코드 확인
         if data.get("rsp_cd") != "00000":
@@ -372,4 +409,29 @@ async def inquire_account_info_from_LS(account: Account) -> dict:
         raise HTTPException(
             status_code=500,
             detail=f"LS API 계좌정보 조회 실패: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+
+@observe_broker_call("LS", "order")
+def order_stock_LS(account: Account, body: dict, http: Any = requests) -> dict:
+    """LS API 현물주문 (CSPAT00601), 응답 본문 그대로 반환"""
+    if paper_broker.is_simulated(account.acnt_type):
+        return paper_broker.order_LS(str(account.id), body)
+
+    base_url = LS_API_BASE_URL[account.acnt_type]
+    response = http.post(
+        f"{base_url}{LS_API_ENDPOINTS['order']}",
+        json=body,
+        headers={
+            "content-type": "application/json; charset=utf-8",
+            "authorization": f"Bearer {account.access_token}",
+            "tr_cd": LS_API_TR_ID["order"],
+            "tr_cont": "N",
+            "tr_cont_key": "",
+            "mac_address": account.mac_address or ""
+        },
+        timeout=ORDER_REQUEST_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+    return decode_response(response)
+
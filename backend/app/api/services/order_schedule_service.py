@@ -0,0 +1,419 @@
+import asyncio
+import heapq
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select, update
+
+from app.constants import (
+    KST,
+    MARKET_START_TIME,
+    SCHEDULE_CLAIM_TIMEOUT_SECONDS,
+    SCHEDULE_MAX_CONCURRENCY,
+    SCHEDULE_MAX_SLICES,
+    SCHEDULE_PROFILE_BUCKET_MINUTES,
+    SCHEDULE_VOLUME_PROFILE
+)
+from app.core.db import engine
+from app.models.account import Account
+from app.models.order import Order_Create, Order_Slice, Parent_Order, Parent_Order_Create
+from app.api.services.fill_service import BUY, SELL
+from app.api.services.order_service import (
+    LIMIT,
+    MARKET,
+    ORDER_FAILED,
+    ORDER_PENDING,
+    ORDER_SUBMITTED,
+    ORDER_TYPES,
+    get_order_by_key,
+    place_order
+)
+from app.api.services.quote_service import quote_cache
+
+logger = logging.getLogger(__name__)
+
+TWAP = "twap"
+VWAP = "vwap"
+SCHEDULE_STRATEGIES = (TWAP, VWAP)
+
+PARENT_SCHEDULED = "scheduled"
+PARENT_RUNNING = "running"
+PARENT_COMPLETED = "completed"
+PARENT_CANCELLED = "cancelled"
+
+SLICE_PENDING = "pending"
+SLICE_SENDING = "sending"
+SLICE_CANCELLED = "cancelled"
+
+
+def _slice_times(start: datetime, end: datetime, slice_count: int) -> list[datetime]:
+    """구간을 slice_count 등분한 각 구간의 시작 시각"""
+    step = (end - start) / slice_count
+    return [start + step * index for index in range(slice_count)]
+
+
+def _allocate(quantity: int, weights: Sequence[float]) -> list[int]:
+    """비중대로 정수 수량 배분 (최대 잔여법, 합계 보존)"""
+    total = sum(weights)
+    if total <= 0:
+        weights, total = [1.0] * len(weights), float(len(weights))
+    raw = [quantity * weight / total for weight in weights]
+    allocated = [int(value) for value in raw]
+    remainders = sorted(range(len(raw)), key=lambda index: (allocated[index] - raw[index], index))
+    for index in remainders[:quantity - sum(allocated)]:
+        allocated[index] += 1
+    return allocated
+
+
+def _profile_weight(start: datetime, end: datetime, profile: Sequence[float]) -> float:
+    """[start, end) 구간에 해당하는 장중 거래량 비중 (구간 내에서는 균등 분포로 가정)"""
+    session_start = start.astimezone(KST).replace(
+        hour=MARKET_START_TIME.hour, minute=MARKET_START_TIME.minute, second=0, microsecond=0
+    )
+    bucket = timedelta(minutes=SCHEDULE_PROFILE_BUCKET_MINUTES)
+    weight = 0.0
+    for index, bucket_weight in enumerate(profile):
+        bucket_start = session_start + bucket * index
+        overlap = (min(end, bucket_start + bucket) - max(start, bucket_start)).total_seconds()
+        if overlap > 0:
+            weight += bucket_weight * overlap / bucket.total_seconds()
+    return weight
+
+
+def build_schedule(
+    strategy: str,
+    quantity: int,
+    start: datetime,
+    end: datetime,
+    slice_count: int,
+    profile: Sequence[float] = SCHEDULE_VOLUME_PROFILE,
+) -> list[tuple[datetime, int]]:
+    """(전송 시각, 수량) 목록 계산
+
+    twap: 구간을 균등 분할해 같은 수량씩
+    vwap: 같은 시각에 나누되 각 구간의 장중 거래량 비중만큼 수량 배분
+    """
+    slice_count = max(1, min(slice_count, quantity))
+    times = _slice_times(start, end, slice_count)
+    if strategy == VWAP:
+        step = (end - start) / slice_count
+        weights = [_profile_weight(time, time + step, profile) for time in times]
+    else:
+        weights = [1.0] * slice_count
+    return [(time, qty) for time, qty in zip(times, _allocate(quantity, weights), strict=True) if qty > 0]
+
+
+def compute_slippage_bps(side: str, arrival_price: Optional[float], avg_price: Optional[float]) -> Optional[float]:
+    """기준가 대비 불리한 방향을 양수로 한 슬리피지(bp)"""
+    if not arrival_price or not avg_price:
+        return None
+    sign = 1 if side == BUY else -1
+    return sign * (avg_price - arrival_price) / arrival_price * 10_000
+
+
+def create_parent_order(session: Session, account: Account, parent_in: Parent_Order_Create) -> Parent_Order:
+    """모주문과 자식주문 일정 저장"""
+    if account.broker.upper() not in ("KIS", "LS"):
+        raise HTTPException(status_code=400, detail="Unsupported broker")
+    if parent_in.side not in (BUY, SELL):
+        raise HTTPException(status_code=400, detail=f"Unsupported side. Expected one of: {BUY}, {SELL}")
+    if parent_in.strategy not in SCHEDULE_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported strategy. Expected one of: {', '.join(SCHEDULE_STRATEGIES)}")
+    if parent_in.order_type not in ORDER_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported order type. Expected one of: {', '.join(ORDER_TYPES)}")
+    if parent_in.slice_count > SCHEDULE_MAX_SLICES:
+        raise HTTPException(status_code=400, detail=f"slice_count must be at most {SCHEDULE_MAX_SLICES}")
+
+    now = datetime.now(KST)
+    start = parent_in.start_time or now
+    end = parent_in.end_time
+    if start.tzinfo is None:
+        start = KST.localize(start)
+    if end.tzinfo is None:
+        end = KST.localize(end)
+    if end <= start or end <= now:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time and in the future")
+
+    arrival_price = parent_in.arrival_price
+    if arrival_price is None:
+        quote = quote_cache.get(parent_in.stock_code)
+        arrival_price = quote.price if quote else None
+
+    parent = Parent_Order(
+        **parent_in.model_dump(exclude={"start_time", "end_time", "arrival_price"}),
+        start_time=start,
+        end_time=end,
+        arrival_price=arrival_price,
+    )
+    session.add(parent)
+    for sequence, (scheduled_at, quantity) in enumerate(
+        build_schedule(parent.strategy, parent.quantity, start, end, parent.slice_count)
+    ):
+        session.add(Order_Slice(parent_id=parent.id, sequence=sequence, scheduled_at=scheduled_at, quantity=quantity))
+    session.commit()
+    session.refresh(parent)
+    return parent
+
+
+def cancel_parent_order(session: Session, parent: Parent_Order) -> Parent_Order:
+    """미전송 자식주문 취소 (이미 전송된 주문은 유지)"""
+    for order_slice in session.exec(
+        select(Order_Slice).where(Order_Slice.parent_id == parent.id, Order_Slice.status == SLICE_PENDING)
+    ).all():
+        order_slice.status = SLICE_CANCELLED
+        session.add(order_slice)
+    parent.status = PARENT_CANCELLED
+    parent.completed_at = datetime.now(KST)
+    session.add(parent)
+    session.commit()
+    session.refresh(parent)
+    return parent
+
+
+def _update_parent_progress(session: Session, parent: Parent_Order) -> None:
+    slices = session.exec(select(Order_Slice).where(Order_Slice.parent_id == parent.id)).all()
+    submitted = [item for item in slices if item.status == ORDER_SUBMITTED]
+    parent.submitted_qty = sum(item.quantity for item in submitted)
+    priced = [item for item in submitted if item.reference_price]
+    priced_qty = sum(item.quantity for item in priced)
+    parent.avg_price = (
+        sum(item.quantity * item.reference_price for item in priced) / priced_qty if priced_qty else None
+    )
+    parent.slippage_bps = compute_slippage_bps(parent.side, parent.arrival_price, parent.avg_price)
+    if all(item.status not in (SLICE_PENDING, SLICE_SENDING) for item in slices) and parent.status != PARENT_CANCELLED:
+        parent.status = PARENT_COMPLETED
+        parent.completed_at = datetime.now(KST)
+    elif parent.status == PARENT_SCHEDULED:
+        parent.status = PARENT_RUNNING
+    session.add(parent)
+
+
+def slice_idempotency_key(slice_id: uuid.UUID) -> str:
+    return f"slice-{slice_id.hex}"
+
+
+def claim_slice(session: Session, slice_id: uuid.UUID) -> bool:
+    """pending → sending 으로 바꿔 전송을 맡음 (여러 워커가 같은 자식주문을 들고 있어도 하나만 성공)"""
+    result = session.execute(
+        update(Order_Slice)
+        .where(Order_Slice.id == slice_id, Order_Slice.status == SLICE_PENDING)
+        .values(status=SLICE_SENDING, claimed_at=datetime.now(KST))
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def recover_stuck_slices(session: Session, timeout_seconds: float = SCHEDULE_CLAIM_TIMEOUT_SECONDS) -> int:
+    """전송 도중 프로세스가 죽어 sending 으로 남은 자식주문 정리 → 정리한 건수
+
+    - 멱등키 주문 기록이 없으면 전송 전에 멈춘 것이므로 pending 으로 되돌려 다시 전송
+    - 주문이 결과를 남겼으면 그 결과를 반영
+    - 주문이 pending 이면 증권사 접수 여부를 알 수 없으므로 재전송하지 않고 failed 로 기록
+    """
+    cutoff = datetime.now(KST) - timedelta(seconds=timeout_seconds)
+    stuck = session.exec(
+        select(Order_Slice).where(Order_Slice.status == SLICE_SENDING, Order_Slice.claimed_at < cutoff)
+    ).all()
+    for order_slice in stuck:
+        parent = session.get(Parent_Order, order_slice.parent_id)
+        order = get_order_by_key(session, parent.account_id, slice_idempotency_key(order_slice.id))
+        if order is None:
+            order_slice.status = SLICE_PENDING
+            order_slice.claimed_at = None
+        else:
+            if order.status == ORDER_PENDING:
+                order.status = ORDER_FAILED
+                order.message = "전송 결과 확인 불가 (전송 중 중단)"
+                session.add(order)
+            order_slice.status = order.status
+            order_slice.order_id = order.id
+            order_slice.executed_at = order.submitted_at or datetime.now(KST)
+        session.add(order_slice)
+        _update_parent_progress(session, parent)
+        logger.warning(f"중단된 분할 주문 복구 - 자식주문: {order_slice.id}, 상태: {order_slice.status}")
+    session.commit()
+    return len(stuck)
+
+
+def execute_slice(slice_id: uuid.UUID) -> Optional[str]:
+    """자식주문 1건 전송, 결과 상태 반환 (다른 워커가 이미 맡았으면 None)
+
+    멱등키를 자식주문 ID로 고정해 전송 직후 재시작되어도 같은 주문이 두 번 나가지 않는다.
+    """
+    with Session(engine) as session:
+        if not claim_slice(session, slice_id):
+            return None
+        order_slice = session.get(Order_Slice, slice_id)
+        parent = session.get(Parent_Order, order_slice.parent_id)
+        if parent.status == PARENT_CANCELLED:
+            order_slice.status = SLICE_CANCELLED
+            session.add(order_slice)
+            session.commit()
+            return order_slice.status
+
+        account = session.get(Account, parent.account_id)
+        quote = quote_cache.get(parent.stock_code)
+        order_type = parent.order_type
+        price = parent.limit_price or (quote.price if quote else None)
+        if order_type == LIMIT and price is None:
+            order_type = MARKET
+
+        try:
+            order = place_order(session, account, Order_Create(
+                stock_code=parent.stock_code,
+                side=parent.side,
+                quantity=order_slice.quantity,
+                price=price if order_type == LIMIT else 0,
+                order_type=order_type,
+                idempotency_key=slice_idempotency_key(order_slice.id),
+            ))
+        except HTTPException:
+            # 검증 오류는 다시 보내도 같으므로 실패로 닫음 (sending 으로 남겨 반복 복구되지 않게)
+            session.rollback()
+            order_slice.status = ORDER_FAILED
+            session.add(order_slice)
+            _update_parent_progress(session, parent)
+            session.commit()
+            raise
+
+        order_slice.status = order.status
+        order_slice.order_id = order.id
+        order_slice.reference_price = price
+        order_slice.executed_at = order.submitted_at or datetime.now(KST)
+        session.add(order_slice)
+        _update_parent_progress(session, parent)
+        session.commit()
+
+        lag = (order_slice.executed_at - order_slice.scheduled_at).total_seconds()
+        logger.info(
+            f"분할 주문 전송 - 종목: {parent.stock_code}, {order_slice.sequence + 1}회차 "
+            f"{order_slice.quantity}주 {order.status}, 지연: {lag:.3f}초"
+        )
+        return order_slice.status
+
+
+class Slice_Scheduler:
+    """자식주문 전송 시각을 힙으로 관리하며 예정 시각에 맞춰 전송하는 스케줄러
+
+    예정 시각이 된 자식주문은 max_concurrency 개까지 동시에 전송하고(한 건이 느려도 다음 건이 밀리지 않게),
+    sending 으로 남은 중단된 전송은 시작 시와 claim_timeout_seconds 마다 복구한다.
+    """
+
+    def __init__(
+        self,
+        bind: Engine = engine,
+        execute: Callable[[uuid.UUID], Optional[str]] = execute_slice,
+        max_concurrency: int = SCHEDULE_MAX_CONCURRENCY,
+        claim_timeout_seconds: float = SCHEDULE_CLAIM_TIMEOUT_SECONDS,
+    ) -> None:
+        self._bind = bind
+        self._execute = execute
+        self.max_concurrency = max_concurrency
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self._heap: list[tuple[datetime, int, uuid.UUID]] = []
+        self._queued: set[uuid.UUID] = set()
+        self._counter = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._in_flight: set[asyncio.Task] = set()
+        self._recovered_at = float("-inf")
+
+    def _push(self, scheduled_at: datetime, slice_id: uuid.UUID) -> None:
+        if slice_id in self._queued:
+            return
+        self._queued.add(slice_id)
+        self._counter += 1
+        heapq.heappush(self._heap, (scheduled_at, self._counter, slice_id))
+
+    def load_pending(self, session: Session, parent_id: Optional[uuid.UUID] = None) -> int:
+        """DB의 미전송 자식주문을 일정에 등록 (재시작 시 전체, 신규 모주문 시 해당 건만)"""
+        statement = select(Order_Slice).where(Order_Slice.status == SLICE_PENDING)
+        if parent_id:
+            statement = statement.where(Order_Slice.parent_id == parent_id)
+        slices = session.exec(statement).all()
+        for order_slice in slices:
+            self._push(order_slice.scheduled_at, order_slice.id)
+        if self._wake:
+            self._wake.set()
+        return len(slices)
+
+    def _recover_stuck(self) -> tuple[int, list[tuple[datetime, uuid.UUID]]]:
+        """중단된 전송을 되돌리고 미전송 자식주문의 (전송 시각, ID) 목록 반환"""
+        with Session(self._bind) as session:
+            recovered = recover_stuck_slices(session, self.claim_timeout_seconds)
+            pending = session.exec(
+                select(Order_Slice.scheduled_at, Order_Slice.id).where(Order_Slice.status == SLICE_PENDING)
+            ).all()
+        return recovered, [(scheduled_at, slice_id) for scheduled_at, slice_id in pending]
+
+    async def _recover(self) -> None:
+        """중단된 전송 복구 후 되돌린 자식주문을 다시 일정에 등록 (DB 작업은 작업 스레드에서 실행)"""
+        self._recovered_at = asyncio.get_running_loop().time()
+        try:
+            recovered, pending = await asyncio.to_thread(self._recover_stuck)
+        except Exception as e:
+            logger.error(f"분할 주문 복구 실패: {str(e)}")
+            return
+        for scheduled_at, slice_id in pending:
+            self._push(scheduled_at, slice_id)
+        if recovered:
+            logger.info(f"분할 주문 복구 - 중단된 전송 {recovered}건, 미전송 {len(pending)}건")
+
+    async def _dispatch(self, slice_id: uuid.UUID, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            try:
+                await asyncio.to_thread(self._execute, slice_id)
+            except Exception as e:
+                logger.error(f"분할 주문 전송 실패 - 자식주문: {slice_id}, 에러: {str(e)}")
+
+    async def run(self) -> None:
+        self._wake = asyncio.Event()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        with Session(self._bind) as session:
+            resumed = self.load_pending(session)
+        if resumed:
+            logger.info(f"분할 주문 재개 - 미전송 {resumed}건")
+
+        try:
+            while True:
+                if loop.time() - self._recovered_at >= self.claim_timeout_seconds:
+                    await self._recover()
+                self._wake.clear()
+                until_recovery = self._recovered_at + self.claim_timeout_seconds - loop.time()
+
+                delay = (self._heap[0][0] - datetime.now(KST)).total_seconds() if self._heap else until_recovery
+                if delay > 0:
+                    # 더 이른 일정이 추가되거나 복구 시각이 되면 깨어나 다시 계산
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=min(delay, until_recovery))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                now = datetime.now(KST)
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, slice_id = heapq.heappop(self._heap)
+                    self._queued.discard(slice_id)
+                    task = asyncio.create_task(self._dispatch(slice_id, semaphore))
+                    self._in_flight.add(task)
+                    task.add_done_callback(self._in_flight.discard)
+        finally:
+            for task in self._in_flight:
+                task.cancel()
+
+
+slice_scheduler = Slice_Scheduler()
+
+
+def get_parent_order(session: Session, parent_id: uuid.UUID) -> dict[str, Any]:
+    parent = session.get(Parent_Order, parent_id)
+    if not parent:
+        raise HTTPException(status_code=404, detail="Parent order not found")
+    slices = session.exec(
+        select(Order_Slice).where(Order_Slice.parent_id == parent_id).order_by(Order_Slice.sequence)
+    ).all()
+    return {**parent.model_dump(), "slices": slices}
@@ -0,0 +1,393 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+import requests
+from fastapi import HTTPException
+from requests.adapters import HTTPAdapter
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.constants import (
+    KST,
+    KIS_API_BASE_URL,
+    LS_API_BASE_URL,
+    ORDER_HTTP_POOL_SIZE,
+    ORDER_REQUEST_TIMEOUT_SECONDS,
+    ORDER_HASHKEY_CACHE_SIZE,
+    ORDER_LATENCY_SAMPLE_SIZE,
+    ORDER_RATE_LIMIT_PER_SECOND,
+    TOKEN_REFRESH_THRESHOLD_MINUTES
+)
+from app.core.metrics import record_cache
+from app.models.account import Account
+from app.models.order import Order, Order_Create
+from app.api.services.archive_service import MINUTELY_BALANCE_MODELS
+from app.api.services.fill_service import BUY, SELL
+from app.api.services.kis_api import get_access_token_KIS, get_hashkey_KIS, order_cash_KIS
+from app.api.services.paper_broker import is_simulated
+from app.api.services.ls_api import get_access_token_LS, order_stock_LS
+from app.api.services.quote_service import quote_cache
+
+logger = logging.getLogger(__name__)
+
+LIMIT = "limit"
+MARKET = "market"
+ORDER_TYPES = (LIMIT, MARKET)
+
+ORDER_PENDING = "pending"
+ORDER_SUBMITTED = "submitted"
+ORDER_REJECTED = "rejected"
+ORDER_FAILED = "failed"
+
+# 브로커 URL별 keep-alive 세션 (TLS 연결 재사용)
+_http_sessions: dict[str, requests.Session] = {}
+# (app_key, 요청 본문) -> 해시키
+_hashkey_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+_hashkey_cache_lock = threading.Lock()
+# 최근 주문 지연시간(ms)
+_latencies: deque = deque(maxlen=ORDER_LATENCY_SAMPLE_SIZE)
+
+
+class Rate_Limiter:
+    """초당 요청 수 제한 (토큰 버킷, 여러 스레드에서 공유)"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = burst if burst is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """요청 1건을 예약하고 전송까지 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+# 앱키별 주문 전송 한도
+_rate_limiters: dict[str, Rate_Limiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(account: Account) -> Rate_Limiter:
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(account.app_key)
+        if limiter is None:
+            limiter = Rate_Limiter(ORDER_RATE_LIMIT_PER_SECOND[account.acnt_type])
+            _rate_limiters[account.app_key] = limiter
+        return limiter
+
+
+def get_base_url(account: Account) -> str:
+    if account.broker.upper() == "KIS":
+        return KIS_API_BASE_URL[account.acnt_type]
+    return LS_API_BASE_URL[account.acnt_type]
+
+
+def get_http_session(base_url: str) -> requests.Session:
+    """브로커 URL별 주문용 keep-alive 세션"""
+    http = _http_sessions.get(base_url)
+    if http is None:
+        http = requests.Session()
+        http.mount(base_url, HTTPAdapter(pool_connections=1, pool_maxsize=ORDER_HTTP_POOL_SIZE, max_retries=0))
+        _http_sessions[base_url] = http
+    return http
+
+
+def warm_up_order_sessions(session: Session) -> int:
+    """활성 계좌가 사용하는 브로커 URL에 미리 연결해 주문 시 TLS 핸드셰이크를 생략, 연결한 URL 수 반환"""
+    accounts = session.exec(select(Account).where(Account.is_active.is_(True))).all()
+    warmed = 0
+    for base_url in sorted({get_base_url(account) for account in accounts if not is_simulated(account.acnt_type)}):
+        try:
+            get_http_session(base_url).head(base_url, timeout=ORDER_REQUEST_TIMEOUT_SECONDS)
+            warmed += 1
+        except requests.RequestException as e:
+            logger.warning(f"주문 연결 준비 실패 - {base_url}, 에러: {str(e)}")
+    return warmed
+
+
+def _get_hashkey(account: Account, body: dict, http: requests.Session) -> str:
+    """동일 본문 재전송 시 해시키 발급 요청 생략"""
+    cache_key = (account.app_key, json.dumps(body, sort_keys=True))
+    # 주문은 여러 작업 스레드에서 동시에 전송되므로 캐시 조회/갱신은 잠금 안에서 (발급 요청은 잠금 밖에서)
+    with _hashkey_cache_lock:
+        hashkey = _hashkey_cache.get(cache_key)
+        if hashkey is not None:
+            _hashkey_cache.move_to_end(cache_key)
+    record_cache("hashkey", hashkey is not None)
+    if hashkey is not None:
+        return hashkey
+
+    hashkey = get_hashkey_KIS(account, body, http)
+    with _hashkey_cache_lock:
+        _hashkey_cache[cache_key] = hashkey
+        _hashkey_cache.move_to_end(cache_key)
+        while len(_hashkey_cache) > ORDER_HASHKEY_CACHE_SIZE:
+            _hashkey_cache.popitem(last=False)
+    return hashkey
+
+
+def build_kis_order_body(account: Account, order: Order) -> dict:
+    return {
+        "CANO": account.cano,
+        "ACNT_PRDT_CD": account.acnt_prdt_cd,
+        "PDNO": order.stock_code,
+        "ORD_DVSN": "01" if order.order_type == MARKET else "00",
+        "ORD_QTY": str(order.quantity),
+        "ORD_UNPR": "0" if order.order_type == MARKET else str(int(order.price))
+    }
+
+
+def build_ls_order_body(order: Order) -> dict:
+    return {
+        "CSPAT00601InBlock1": {
+            "IsuNo": order.stock_code,
+            "OrdQty": order.quantity,
+            "OrdPrc": 0 if order.order_type == MARKET else order.price,
+            "BnsTpCode": "2" if order.side == BUY else "1",
+            "OrdprcPtnCode": "03" if order.order_type == MARKET else "00",
+            "MgntrnCode": "000",
+            "LoanDt": "",
+            "OrdCndiTpCode": "0"
+        }
+    }
+
+
+def _order_price(order: Order) -> Optional[float]:
+    """지정가는 주문단가, 시장가는 시세 캐시의 현재가"""
+    if order.order_type == LIMIT and order.price:
+        return order.price
+    quote = quote_cache.get(order.stock_code)
+    return quote.price if quote else None
+
+
+def validate_order(session: Session, account: Account, order: Order, credit: float = 0.0) -> Optional[str]:
+    """마지막 잔고 스냅샷과 이후 접수 주문 기준으로 주문가능금액/보유수량 검증, 거부 사유 반환
+
+    잔고 스냅샷이 없거나 시장가 주문의 현재가를 모르면 증권사 검증에 맡긴다.
+    credit 은 매수 주문가능금액에 더할 금액 (같은 바스켓에서 먼저 낸 매도 대금, 아직 잔고에 없음).
+    """
+    model = MINUTELY_BALANCE_MODELS[account.broker.upper()]
+    balance = session.exec(
+        select(model).where(model.account_id == account.id).order_by(model.timestamp.desc())
+    ).first()
+    if not balance:
+        return None
+
+    pending = session.exec(
+        select(Order).where(
+            Order.account_id == account.id,
+            Order.status == ORDER_SUBMITTED,
+            Order.submitted_at > balance.timestamp,
+        )
+    ).all()
+
+    if order.side == BUY:
+        price = _order_price(order)
+        if price is None:
+            return None
+        reserved = sum(
+            item.quantity * (_order_price(item) or 0)
+            for item in pending if item.side == BUY
+        )
+        available = balance.available_balance + credit - reserved
+        required = order.quantity * price
+        if required > available:
+            return f"주문가능금액 부족 (필요: {required:,.0f}, 가능: {available:,.0f})"
+        return None
+
+    held = sum(
+        int(item.get("quantity") or 0)
+        for item in (balance.holdings or [])
+        if item.get("stock_code") == order.stock_code
+    )
+    held -= sum(item.quantity for item in pending if item.side == SELL and item.stock_code == order.stock_code)
+    if order.quantity > held:
+        return f"매도가능수량 부족 (주문: {order.quantity}, 가능: {held})"
+    return None
+
+
+def sell_proceeds(order: Order) -> float:
+    """매도 예상 대금 (시장가인데 현재가를 모르면 0)"""
+    return order.quantity * (_order_price(order) or 0) if order.side == SELL else 0.0
+
+
+def validate_basket(session: Session, account: Account, orders: list[Order_Create]) -> Optional[str]:
+    """한 계좌의 바스켓 주문을 하나로 검증, 첫 거부 사유 반환
+
+    매도를 먼저 검증해 예상 대금을 모은 뒤, 매수는 그 대금을 더한 주문가능금액에서
+    앞선 매수 금액을 차감해 가며 검증한다 (전송도 매도 → 매수 순서).
+    """
+    basket = [Order(**order_in.model_dump(exclude={"idempotency_key"}), account_id=account.id) for order_in in orders]
+    credit = 0.0
+    for order in sorted(basket, key=lambda order: order.side != SELL):
+        reason = validate_order(session, account, order, credit)
+        if reason:
+            return f"{order.stock_code} {order.side}: {reason}"
+        if order.side == SELL:
+            credit += sell_proceeds(order)
+        else:
+            credit -= order.quantity * (_order_price(order) or 0)
+    return None
+
+
+def refresh_order_token(session: Session, account: Account) -> bool:
+    """토큰이 없거나 만료가 임박하면 주문 전송 전에 재발급해 저장 → 갱신 여부
+
+    백그라운드 토큰 갱신 주기 사이에 만료된 토큰으로 주문이 거부되지 않도록 한다. 발급 실패 시 HTTPException.
+    """
+    expires_at = account.access_token_expired
+    if account.access_token and expires_at is not None:
+        if expires_at.tzinfo is None:
+            expires_at = KST.localize(expires_at)
+        if datetime.now(KST) + timedelta(minutes=TOKEN_REFRESH_THRESHOLD_MINUTES) < expires_at:
+            return False
+
+    issue_token = get_access_token_KIS if account.broker.upper() == "KIS" else get_access_token_LS
+    account.access_token, account.access_token_expired = issue_token(
+        app_key=account.app_key,
+        app_secret=account.app_secret,
+        acnt_type=account.acnt_type
+    )
+    session.add(account)
+    session.commit()
+    return True
+
+
+def _submit(account: Account, order: Order) -> tuple[str, Optional[str], Optional[str]]:
+    """증권사에 주문 전송 → (상태, 주문번호, 메시지)"""
+    http = get_http_session(get_base_url(account))
+    if account.broker.upper() == "KIS":
+        body = build_kis_order_body(account, order)
+        data = order_cash_KIS(account, order.side, body, _get_hashkey(account, body, http), http)
+        if data.get("rt_cd") == "0":
+            return ORDER_SUBMITTED, data.get("output", {}).get("ODNO"), data.get("msg1")
+        return ORDER_REJECTED, None, data.get("msg1")
+
+    data = order_stock_LS(account, build_ls_order_body(order), http)
+    order_no = data.get("CSPAT00601OutBlock2", {}).get("OrdNo")
+    if order_no:
+        return ORDER_SUBMITTED, str(order_no), data.get("rsp_msg")
+    return ORDER_REJECTED, None, data.get("rsp_msg")
+
+
+def place_order(
+    session: Session,
+    account: Account,
+    order_in: Order_Create,
+    basket_job_id: Optional[uuid.UUID] = None,
+    credit: float = 0.0,
+) -> Order:
+    """주문 검증 후 전송 (같은 멱등키로 재요청하면 기존 주문을 그대로 반환)
+
+    credit 은 매수 검증 시 주문가능금액에 더할 금액 (validate_order 참고).
+    """
+    if order_in.side not in (BUY, SELL):
+        raise HTTPException(status_code=400, detail=f"Unsupported side. Expected one of: {BUY}, {SELL}")
+    if order_in.order_type not in ORDER_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported order type. Expected one of: {', '.join(ORDER_TYPES)}")
+    if order_in.order_type == LIMIT and order_in.price <= 0:
+        raise HTTPException(status_code=400, detail="Limit order requires a positive price")
+    if account.broker.upper() not in ("KIS", "LS"):
+        raise HTTPException(status_code=400, detail="Unsupported broker")
+
+    idempotency_key = order_in.idempotency_key or uuid.uuid4().hex
+    existing = get_order_by_key(session, account.id, idempotency_key)
+    if existing:
+        return existing
+
+    order = Order(
+        **order_in.model_dump(exclude={"idempotency_key"}),
+        account_id=account.id,
+        broker=account.broker.upper(),
+        idempotency_key=idempotency_key,
+        basket_job_id=basket_job_id,
+    )
+    reason = validate_order(session, account, order, credit)
+    if reason:
+        order.status = ORDER_REJECTED
+        order.message = reason
+
+    # 전송 전에 멱등키를 먼저 기록해 동시 재시도가 중복 전송되지 않도록 함
+    session.add(order)
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return get_order_by_key(session, account.id, idempotency_key)
+    if reason:
+        session.refresh(order)
+        return order
+
+    try:
+        refresh_order_token(session, account)
+    except HTTPException as e:
+        # 전송하지 않았으므로 실패로 기록 (같은 멱등키로 재요청해도 재전송하지 않음)
+        order.status = ORDER_FAILED
+        order.message = f"토큰 갱신 실패: {e.detail}"[:255]
+        session.add(order)
+        session.commit()
+        session.refresh(order)
+        return order
+
+    get_rate_limiter(account).acquire()
+    started = time.perf_counter()
+    try:
+        order.status, order.broker_order_no, order.message = _submit(account, order)
+    except (requests.RequestException, HTTPException) as e:
+        # 전송 결과를 알 수 없으므로 재전송하지 않고 실패로 기록
+        order.status = ORDER_FAILED
+        order.message = str(getattr(e, "detail", e))[:255]
+    order.latency_ms = (time.perf_counter() - started) * 1000
+    _latencies.append(order.latency_ms)
+    if order.status == ORDER_SUBMITTED:
+        order.submitted_at = datetime.now(KST)
+    if order.message:
+        order.message = order.message[:255]
+
+    session.add(order)
+    session.commit()
+    session.refresh(order)
+    logger.info(
+        f"주문 {order.status} - 계정: {account.acnt_name}, 종목: {order.stock_code}, "
+        f"{order.side} {order.quantity}주, 지연: {order.latency_ms:.1f}ms"
+    )
+    return order
+
+
+def get_order_by_key(session: Session, account_id: uuid.UUID, idempotency_key: str) -> Optional[Order]:
+    return session.exec(
+        select(Order).where(Order.account_id == account_id, Order.idempotency_key == idempotency_key)
+    ).first()
+
+
+def get_order_latency_stats() -> dict[str, Any]:
+    """최근 주문 전송 지연시간 분위수"""
+    if not _latencies:
+        return {"count": 0}
+    samples = np.fromiter(_latencies, dtype=np.float64)
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99]).tolist()
+    return {
+        "count": int(samples.size),
+        "p50_ms": p50,
+        "p90_ms": p90,
+        "p99_ms": p99,
+        "max_ms": float(samples.max()),
+    }
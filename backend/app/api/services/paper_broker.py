@@ -0,0 +1,465 @@
+import asyncio
+import csv
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from app.constants import KST, PAPER_INITIAL_CASH, PAPER_TOKEN_TTL_SECONDS, PAPER_FEED_REPLAY_SPEED
+from app.core.config import settings
+from app.api.services.fill_service import BUY, SELL
+
+logger = logging.getLogger(__name__)
+
+
+class Paper_Reject(ValueError):
+    """모의 체결 엔진 주문 거부 (메시지는 증권사 응답 메시지로 사용)"""
+
+
+@dataclass(frozen=True, slots=True)
+class Price_Tick:
+    """재생용 시세 1건"""
+    timestamp: datetime
+    stock_code: str
+    price: float
+    volume: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class Paper_Fill:
+    """모의 체결 1건"""
+    order_no: str
+    account_key: str
+    stock_code: str
+    side: str
+    quantity: int
+    price: float
+    filled_at: datetime
+
+
+@dataclass(slots=True)
+class Paper_Order:
+    """모의 주문 (price 가 None 이면 시장가)"""
+    order_no: str
+    account_key: str
+    stock_code: str
+    side: str
+    quantity: int
+    price: Optional[float]
+    sequence: int
+    ordered_at: datetime
+    filled: int = 0
+    filled_amount: float = 0.0
+    realized_pnl: float = 0.0
+    last_filled_at: Optional[datetime] = None
+
+    @property
+    def remaining(self) -> int:
+        return self.quantity - self.filled
+
+
+@dataclass(slots=True)
+class Paper_Position:
+    quantity: int = 0
+    avg_price: float = 0.0
+
+
+@dataclass(slots=True)
+class Paper_Account:
+    """모의 계좌 (예수금, 보유종목, 주문)"""
+    cash: float
+    positions: dict[str, Paper_Position] = field(default_factory=dict)
+    orders: dict[str, Paper_Order] = field(default_factory=dict)
+
+    def open_orders(self, side: str, stock_code: Optional[str] = None) -> list[Paper_Order]:
+        return [
+            order for order in self.orders.values()
+            if order.side == side and order.remaining > 0 and order.price is not None
+            and (stock_code is None or order.stock_code == stock_code)
+        ]
+
+    def available_cash(self) -> float:
+        return self.cash - sum(order.remaining * order.price for order in self.open_orders(BUY))
+
+    def available_quantity(self, stock_code: str) -> int:
+        position = self.positions.get(stock_code)
+        held = position.quantity if position else 0
+        return held - sum(order.remaining for order in self.open_orders(SELL, stock_code))
+
+
+class Order_Book:
+    """종목별 호가창 (가격-시간 우선, 체결/소진된 주문은 꺼낼 때 정리)"""
+
+    def __init__(self) -> None:
+        self._bids: list[tuple[float, int, Paper_Order]] = []
+        self._asks: list[tuple[float, int, Paper_Order]] = []
+
+    def add(self, order: Paper_Order) -> None:
+        if order.side == BUY:
+            heapq.heappush(self._bids, (-order.price, order.sequence, order))
+        else:
+            heapq.heappush(self._asks, (order.price, order.sequence, order))
+
+    def best(self, side: str) -> Optional[Paper_Order]:
+        heap = self._bids if side == BUY else self._asks
+        while heap and heap[0][2].remaining <= 0:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def depth(self, side: str) -> int:
+        heap = self._bids if side == BUY else self._asks
+        return sum(1 for _, _, order in heap if order.remaining > 0)
+
+
+def _crosses(order: Paper_Order, price: float) -> bool:
+    """주문이 해당 가격에 체결 가능한지 (시장가는 항상 가능)"""
+    if order.price is None:
+        return True
+    return order.price >= price if order.side == BUY else order.price <= price
+
+
+class Matching_Engine:
+    """모의투자 체결 엔진
+
+    주문은 먼저 호가창의 반대편 대기 주문과 가격-시간 우선으로 체결하고, 남은 수량은
+    재생 중인 시세(최근 체결가)로 체결 가능하면 그 가격에 체결한다. 지정가 잔량은 호가창에
+    남아 이후 시세가 지정가에 닿으면 체결된다.
+    """
+
+    def __init__(self, initial_cash: float = PAPER_INITIAL_CASH) -> None:
+        self.initial_cash = initial_cash
+        self.accounts: dict[str, Paper_Account] = {}
+        self.books: dict[str, Order_Book] = {}
+        self.last_prices: dict[str, float] = {}
+        self.volumes: dict[str, int] = {}
+        self._sequence = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def account(self, account_key: str) -> Paper_Account:
+        with self._lock:
+            account = self.accounts.get(account_key)
+            if account is None:
+                account = Paper_Account(cash=self.initial_cash)
+                self.accounts[account_key] = account
+            return account
+
+    def _book(self, stock_code: str) -> Order_Book:
+        book = self.books.get(stock_code)
+        if book is None:
+            book = Order_Book()
+            self.books[stock_code] = book
+        return book
+
+    def _fill(self, order: Paper_Order, quantity: int, price: float, at: datetime) -> Paper_Fill:
+        account = self.accounts[order.account_key]
+        position = account.positions.setdefault(order.stock_code, Paper_Position())
+        if order.side == BUY:
+            total = position.quantity + quantity
+            position.avg_price = (position.avg_price * position.quantity + price * quantity) / total
+            position.quantity = total
+            account.cash -= price * quantity
+        else:
+            order.realized_pnl += (price - position.avg_price) * quantity
+            position.quantity -= quantity
+            account.cash += price * quantity
+            if position.quantity == 0:
+                del account.positions[order.stock_code]
+
+        order.filled += quantity
+        order.filled_amount += price * quantity
+        order.last_filled_at = at
+        self.volumes[order.stock_code] = self.volumes.get(order.stock_code, 0) + quantity
+        return Paper_Fill(order.order_no, order.account_key, order.stock_code, order.side, quantity, price, at)
+
+    def submit(
+        self,
+        account_key: str,
+        stock_code: str,
+        side: str,
+        quantity: int,
+        price: Optional[float] = None,
+        at: Optional[datetime] = None,
+    ) -> tuple[Paper_Order, list[Paper_Fill]]:
+        """주문 접수 및 즉시 체결분 처리 (증거금/보유수량 부족 시 Paper_Reject)"""
+        at = at or datetime.now(KST)
+        with self._lock:
+            account = self.account(account_key)
+            last = self.last_prices.get(stock_code)
+            if side not in (BUY, SELL):
+                raise Paper_Reject(f"매매구분 오류 ({side})")
+            if quantity <= 0:
+                raise Paper_Reject("주문수량 오류")
+            if price is None and last is None:
+                raise Paper_Reject(f"시장가 주문 불가 - 종목 {stock_code} 시세 없음")
+            if side == BUY:
+                required = quantity * (price if price is not None else last)
+                available = account.available_cash()
+                if required > available:
+                    raise Paper_Reject(f"주문가능금액 부족 (필요: {required:,.0f}, 가능: {available:,.0f})")
+            elif quantity > account.available_quantity(stock_code):
+                raise Paper_Reject(f"매도가능수량 부족 (주문: {quantity}, 가능: {account.available_quantity(stock_code)})")
+
+            sequence = next(self._sequence)
+            order = Paper_Order(f"{sequence:010d}", account_key, stock_code, side, quantity, price, sequence, at)
+            account.orders[order.order_no] = order
+
+            book = self._book(stock_code)
+            opposite = SELL if side == BUY else BUY
+            fills = []
+            while order.remaining:
+                resting = book.best(opposite)
+                if resting is None or not _crosses(order, resting.price):
+                    break
+                matched = min(order.remaining, resting.remaining)
+                fills.append(self._fill(resting, matched, resting.price, at))
+                fills.append(self._fill(order, matched, resting.price, at))
+
+            if order.remaining and last is not None and _crosses(order, last):
+                fills.append(self._fill(order, order.remaining, last, at))
+            if order.remaining:
+                book.add(order)
+            return order, fills
+
+    def on_price(self, stock_code: str, price: float, at: Optional[datetime] = None, volume: int = 0) -> list[Paper_Fill]:
+        """시세 반영, 해당 가격에 닿은 대기 주문을 우선순위대로 체결"""
+        at = at or datetime.now(KST)
+        with self._lock:
+            self.last_prices[stock_code] = price
+            self.volumes[stock_code] = self.volumes.get(stock_code, 0) + volume
+            book = self.books.get(stock_code)
+            if book is None:
+                return []
+            fills = []
+            for side in (BUY, SELL):
+                while (resting := book.best(side)) is not None and _crosses(resting, price):
+                    fills.append(self._fill(resting, resting.remaining, price, at))
+            return fills
+
+    def replay(self, ticks: Iterable[Price_Tick]) -> int:
+        """시세를 대기 없이 순서대로 반영, 체결 건수 반환"""
+        return sum(len(self.on_price(tick.stock_code, tick.price, tick.timestamp, tick.volume)) for tick in ticks)
+
+    async def run_replay(self, ticks: Iterable[Price_Tick], speed: float = PAPER_FEED_REPLAY_SPEED) -> int:
+        """시세 간격을 배속에 맞춰 재현하며 반영"""
+        filled = 0
+        previous: Optional[datetime] = None
+        for tick in ticks:
+            if speed > 0 and previous is not None:
+                await asyncio.sleep(max(0.0, (tick.timestamp - previous).total_seconds() / speed))
+            previous = tick.timestamp
+            filled += len(self.on_price(tick.stock_code, tick.price, tick.timestamp, tick.volume))
+        return filled
+
+    def reset(self) -> None:
+        with self._lock:
+            self.accounts.clear()
+            self.books.clear()
+            self.last_prices.clear()
+            self.volumes.clear()
+
+
+paper_engine = Matching_Engine()
+
+
+def load_price_feed(path: str) -> list[Price_Tick]:
+    """시세 CSV 로드 (timestamp,stock_code,price[,volume], 시각 순 정렬)"""
+    ticks = []
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            timestamp = datetime.fromisoformat(row["timestamp"])
+            if timestamp.tzinfo is None:
+                timestamp = KST.localize(timestamp)
+            ticks.append(Price_Tick(
+                timestamp=timestamp,
+                stock_code=row["stock_code"].strip(),
+                price=float(row["price"]),
+                volume=int(row.get("volume") or 0),
+            ))
+    ticks.sort(key=lambda tick: tick.timestamp)
+    return ticks
+
+
+def is_simulated(acnt_type: str) -> bool:
+    """모의투자 계좌를 내장 체결 엔진으로 처리하는지 여부 (실전계좌는 항상 증권사로 전송)"""
+    return settings.PAPER_TRADING_SIMULATOR and acnt_type == "paper"
+
+
+# ---------------------------------------------------------------------------
+# 증권사 응답 형식 변환 (inquire_*_from_KIS / inquire_*_from_LS 반환 형식과 동일)
+# ---------------------------------------------------------------------------
+
+def _amount(value: float) -> str:
+    return str(int(round(value)))
+
+
+def _rate(value: float) -> str:
+    return f"{value:.2f}"
+
+
+def issue_token(app_key: str) -> tuple[str, datetime]:
+    return f"paper-{app_key}", datetime.now() + timedelta(seconds=PAPER_TOKEN_TTL_SECONDS)
+
+
+def balance_response(account_key: str, broker: str, engine: Matching_Engine = paper_engine) -> dict[str, Any]:
+    """잔고 조회 응답 (KIS 원본 / LS 변환 형식)"""
+    with engine._lock:
+        account = engine.account(account_key)
+        output1 = []
+        purchase_total = eval_total = 0.0
+        for stock_code, position in sorted(account.positions.items()):
+            price = engine.last_prices.get(stock_code, position.avg_price)
+            purchase = position.avg_price * position.quantity
+            evaluation = price * position.quantity
+            purchase_total += purchase
+            eval_total += evaluation
+            output1.append({
+                "pdno": stock_code,
+                "prdt_name": stock_code,
+                "hldg_qty": str(position.quantity),
+                "ord_psbl_qty": str(account.available_quantity(stock_code)),
+                "pchs_avg_pric": f"{position.avg_price:.4f}",
+                "pchs_amt": _amount(purchase),
+                "prpr": _amount(price),
+                "evlu_amt": _amount(evaluation),
+                "evlu_pfls_amt": _amount(evaluation - purchase),
+                "evlu_pfls_rt": _rate((evaluation - purchase) / purchase * 100 if purchase else 0),
+            })
+        cash, available = account.cash, account.available_cash()
+
+    suffix = "_amt" if broker == "KIS" else ""
+    summary = {
+        "dnca_tot_amt": _amount(cash),
+        "prvs_rcdl_excc_amt": _amount(available),
+        "tot_evlu_amt": _amount(cash + eval_total),
+        "nass_amt": _amount(cash + eval_total),
+        f"pchs_amt_smtl{suffix}": _amount(purchase_total),
+        f"evlu_amt_smtl{suffix}": _amount(eval_total),
+        f"evlu_pfls_smtl{suffix}": _amount(eval_total - purchase_total),
+        "asst_icdc_amt": "0",
+        "asst_icdc_rt": "0.00",
+    }
+    return {"rt_cd": "0" if broker == "KIS" else "00000", "msg1": "조회가 완료되었습니다.", "output1": output1, "output2": [summary]}
+
+
+def _orders_between(account: Paper_Account, start_date: str, end_date: str) -> list[Paper_Order]:
+    start, end = start_date.replace("-", ""), end_date.replace("-", "")
+    return [
+        order for order in account.orders.values()
+        if start <= order.ordered_at.astimezone(KST).strftime("%Y%m%d") <= end
+    ]
+
+
+def daily_ccld_response(
+    account_key: str, broker: str, start_date: str, end_date: str, engine: Matching_Engine = paper_engine
+) -> dict[str, Any]:
+    """일별 주문체결 조회 응답
+
+    KIS 는 주문 단위(미체결 포함, 01 매도/02 매수), LS 는 체결된 주문만(변환 형식 기준 01 매수/02 매도)
+    """
+    with engine._lock:
+        orders = _orders_between(engine.account(account_key), start_date, end_date)
+        rows = []
+        for order in orders:
+            if broker != "KIS" and not order.filled:
+                continue
+            ordered_at = order.ordered_at.astimezone(KST)
+            avg_price = order.filled_amount / order.filled if order.filled else 0.0
+            row = {
+                "ord_dt": ordered_at.strftime("%Y%m%d"),
+                "ord_tmd": ordered_at.strftime("%H%M%S"),
+                "pdno": order.stock_code,
+                "prdt_name": order.stock_code,
+                "odno": order.order_no,
+                "sll_buy_dvsn_cd_name": "매수" if order.side == BUY else "매도",
+                "ord_dvsn_cd": "01" if order.price is None else "00",
+                "ord_dvsn_name": "시장가" if order.price is None else "지정가",
+                "tot_ccld_qty": str(order.filled),
+                "tot_ccld_amt": _amount(order.filled_amount),
+                "cncl_yn": "N",
+                "cncl_cfrm_qty": "0",
+                "rjct_qty": "0",
+                "infm_tmd": (order.last_filled_at or order.ordered_at).astimezone(KST).strftime("%H%M%S"),
+            }
+            if broker == "KIS":
+                row.update({
+                    "sll_buy_dvsn_cd": "02" if order.side == BUY else "01",
+                    "ord_unpr": _amount(order.price or 0),
+                    "ord_qty": str(order.quantity),
+                    "avg_prvs": _amount(avg_price),
+                    "rmn_qty": str(order.remaining),
+                })
+            else:
+                row.update({
+                    "sll_buy_dvsn_cd": "01" if order.side == BUY else "02",
+                    "ord_unpr": _amount(avg_price),
+                    "ord_qty": str(order.filled),
+                    "cmsn_amt": "0",
+                    "tax_sum_amt": "0",
+                    "bnspl_amt": _amount(order.realized_pnl),
+                })
+            rows.append(row)
+
+    if broker != "KIS":
+        return {"rt_cd": "00000", "msg1": "조회가 완료되었습니다.", "output1": rows, "output2": [{"acnt_nm": "", "rec_cnt": len(rows)}]}
+
+    filled_qty = sum(order.filled for order in orders)
+    filled_amount = sum(order.filled_amount for order in orders)
+    return {
+        "rt_cd": "0",
+        "msg1": "조회가 완료되었습니다.",
+        "output1": rows,
+        "output2": {
+            "tot_ord_qty": str(sum(order.quantity for order in orders)),
+            "tot_ccld_qty": str(filled_qty),
+            "tot_ccld_amt": _amount(filled_amount),
+            "prsm_tlex_smtl": "0",
+            "pchs_avg_pric": _amount(filled_amount / filled_qty if filled_qty else 0),
+        },
+    }
+
+
+def price_response(stock_code: str, engine: Matching_Engine = paper_engine) -> dict[str, Any]:
+    """현재가 조회 응답 output (시세가 없으면 0)"""
+    return {
+        "stck_prpr": _amount(engine.last_prices.get(stock_code, 0)),
+        "prdy_ctrt": "0.00",
+        "acml_vol": str(engine.volumes.get(stock_code, 0)),
+    }
+
+
+def order_KIS(account_key: str, side: str, body: dict, engine: Matching_Engine = paper_engine) -> dict[str, Any]:
+    """KIS 현금주문 본문으로 주문 접수 후 KIS 응답 형식 반환"""
+    market = body.get("ORD_DVSN") == "01"
+    try:
+        order, _ = engine.submit(
+            account_key, body["PDNO"], side, int(body["ORD_QTY"]), None if market else float(body["ORD_UNPR"])
+        )
+    except Paper_Reject as e:
+        return {"rt_cd": "1", "msg_cd": "PAPER001", "msg1": str(e)}
+    return {
+        "rt_cd": "0",
+        "msg_cd": "APBK0013",
+        "msg1": "주문 전송 완료 되었습니다.",
+        "output": {"KRX_FWDG_ORD_ORGNO": "", "ODNO": order.order_no, "ORD_TMD": order.ordered_at.strftime("%H%M%S")},
+    }
+
+
+def order_LS(account_key: str, body: dict, engine: Matching_Engine = paper_engine) -> dict[str, Any]:
+    """LS 현물주문(CSPAT00601) 본문으로 주문 접수 후 LS 응답 형식 반환"""
+    block = body["CSPAT00601InBlock1"]
+    side = BUY if block.get("BnsTpCode") == "2" else SELL
+    market = block.get("OrdprcPtnCode") == "03"
+    try:
+        order, _ = engine.submit(
+            account_key, block["IsuNo"], side, int(block["OrdQty"]), None if market else float(block["OrdPrc"])
+        )
+    except Paper_Reject as e:
+        return {"rsp_cd": "02714", "rsp_msg": str(e)}
+    return {
+        "rsp_cd": "00040" if side == BUY else "00039",
+        "rsp_msg": f"{'매수' if side == BUY else '매도'}주문이 완료되었습니다.",
+        "CSPAT00601OutBlock2": {"OrdNo": order.sequence, "OrdTime": order.ordered_at.strftime("%H%M%S%f")[:9]},
+    }
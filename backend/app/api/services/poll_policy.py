@@ -0,0 +1,177 @@
+"""계좌별 적응형 잔고 조회 주기
+
+최근 활동으로 계좌마다 0~1 활동 점수를 매기고 최소/최대 주기 사이에서 조회 주기를 정한다.
+    - 오늘 주문/체결 (이 서버로 접수한 주문 + 스냅샷 간 보유종목 수량 변화)
+    - 보유종목 수
+    - 총평가금액 변동성 (최근 스냅샷 간 변화율의 표준편차)
+    - 대시보드 조회 중 여부 (최근 조회 API 호출)
+보유종목 없이 변화도 없는 계좌는 최대 주기로, 활동이 많거나 누군가 보고 있는 계좌는 최소 주기로 조회한다.
+조회 API 는 아무 워커로나 가므로 조회 시각은 account_view 테이블에 남기고(계좌별 POLL_VIEW_WRITE_SECONDS 마다 1회)
+잔고를 조회하는 워커가 순회마다 update_views 로 읽어 온다.
+"""
+import hashlib
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+from sqlmodel import Session, func, select
+
+from app.constants import (
+    KST,
+    POLL_ACTIVE_FILLS,
+    POLL_ASSET_SAMPLES,
+    POLL_HOLDINGS_REFERENCE,
+    POLL_HOLDINGS_WEIGHT,
+    POLL_VIEW_WINDOW_SECONDS,
+    POLL_VIEW_WRITE_SECONDS,
+    POLL_VOLATILITY_REFERENCE,
+)
+from app.core.config import settings
+from app.models.order import Order
+from app.models.scheduler import Account_View
+from app.api.services.field_mapping import upsert_row
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Account_Activity:
+    """계좌별 최근 활동"""
+    total_assets: deque = field(default_factory=lambda: deque(maxlen=POLL_ASSET_SAMPLES))
+    holdings: Optional[dict[str, int]] = None
+    holdings_changes: int = 0
+    activity_date: Optional[date] = None
+    orders_today: int = 0
+    last_viewed: float = float("-inf")  # unix 시각 (워커 간 공유 값과 비교)
+
+
+def phase_offset(account_id: uuid.UUID, period: float) -> float:
+    """계좌별 고정 위상 (0 이상 period 미만, 재시작해도 같은 값)
+
+    처음 보는 계좌의 첫 조회를 주기 안에 고르게 흩어 시작 직후 요청이 한꺼번에 몰리지 않게 한다.
+    """
+    digest = hashlib.blake2b(f"phase:{account_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64 * period
+
+
+def _holding_quantities(holdings: Optional[list]) -> dict[str, int]:
+    return {item["stock_code"]: item["quantity"] for item in holdings or []}
+
+
+class Poll_Policy:
+    def __init__(
+        self,
+        min_seconds: float = settings.POLL_INTERVAL_MIN_SECONDS,
+        max_seconds: float = settings.POLL_INTERVAL_MAX_SECONDS,
+        view_window_seconds: float = POLL_VIEW_WINDOW_SECONDS,
+    ) -> None:
+        self.min_seconds = min_seconds
+        self.max_seconds = max(max_seconds, min_seconds)
+        self.view_window_seconds = view_window_seconds
+        self._activity: dict[uuid.UUID, Account_Activity] = {}
+        self._view_written: dict[uuid.UUID, float] = {}
+
+    def _get(self, account_id: uuid.UUID, today: Optional[date] = None) -> Account_Activity:
+        activity = self._activity.get(account_id)
+        if activity is None:
+            activity = self._activity[account_id] = Account_Activity()
+        today = today or datetime.now(KST).date()
+        if activity.activity_date != today:
+            activity.activity_date = today
+            activity.holdings_changes = 0
+            activity.orders_today = 0
+        return activity
+
+    def record_snapshot(self, account_id: uuid.UUID, total_assets: float, holdings: Optional[list]) -> None:
+        """잔고 저장 시 호출 (holdings 는 build_holdings 결과)"""
+        activity = self._get(account_id)
+        activity.total_assets.append(total_assets)
+        quantities = _holding_quantities(holdings)
+        if activity.holdings is not None and quantities != activity.holdings:
+            activity.holdings_changes += 1
+        activity.holdings = quantities
+
+    def record_view(self, account_id: uuid.UUID, session: Optional[Session] = None) -> None:
+        """대시보드 조회 API 호출 시 호출 (session 이 있으면 다른 워커도 보도록 DB 에 기록)"""
+        now = time.time()
+        self._get(account_id).last_viewed = now
+        if session is None or now - self._view_written.get(account_id, float("-inf")) < POLL_VIEW_WRITE_SECONDS:
+            return
+        try:
+            upsert_row(session, Account_View, {
+                "account_id": account_id,
+                "last_viewed": datetime.fromtimestamp(now, KST),
+            }, ["account_id"])
+            session.commit()
+            self._view_written[account_id] = now
+        except Exception as e:
+            # 조회 응답은 막지 않음 (이 워커 안에서는 여전히 조회 중으로 봄)
+            session.rollback()
+            logger.warning(f"계좌 조회 시각 기록 실패 - 계좌: {account_id}, 에러: {str(e)}")
+
+    def update_views(self, session: Session) -> None:
+        """다른 워커가 기록한 최근 조회 시각 반영 (조회 중으로 볼 수 있는 것만)"""
+        since = datetime.now(KST) - timedelta(seconds=self.view_window_seconds)
+        statement = select(Account_View.account_id, Account_View.last_viewed).where(Account_View.last_viewed >= since)
+        for account_id, last_viewed in session.exec(statement).all():
+            if last_viewed.tzinfo is None:  # SQLite 는 시간대 없이 돌려줌
+                last_viewed = KST.localize(last_viewed)
+            activity = self._get(account_id)
+            activity.last_viewed = max(activity.last_viewed, last_viewed.timestamp())
+
+    def update_order_counts(self, session: Session) -> None:
+        """오늘 증권사에 접수된 주문 수 (계좌별 1회 집계 쿼리)"""
+        today = datetime.now(KST).date()
+        start = KST.localize(datetime.combine(today, datetime.min.time()))
+        statement = (
+            select(Order.account_id, func.count())
+            .where(Order.submitted_at >= start)
+            .group_by(Order.account_id)
+        )
+        for account_id, count in session.exec(statement).all():
+            self._get(account_id, today).orders_today = count
+
+    def activity_score(self, account_id: uuid.UUID) -> float:
+        activity = self._activity.get(account_id)
+        if activity is None or activity.holdings is None:
+            return 1.0  # 아직 스냅샷이 없으면 최소 주기로 조회해 상태 파악
+        if time.time() - activity.last_viewed <= self.view_window_seconds:
+            return 1.0
+
+        fills_score = min((activity.orders_today + activity.holdings_changes) / POLL_ACTIVE_FILLS, 1.0)
+        holdings_score = min(len(activity.holdings) / POLL_HOLDINGS_REFERENCE, 1.0) * POLL_HOLDINGS_WEIGHT
+        volatility_score = 0.0
+        if len(activity.total_assets) >= 3:
+            assets = np.fromiter(activity.total_assets, dtype=np.float64)
+            previous = assets[:-1]
+            returns = np.diff(assets)[previous > 0] / previous[previous > 0]
+            if returns.size >= 2:
+                volatility_score = min(float(returns.std()) / POLL_VOLATILITY_REFERENCE, 1.0)
+        return max(fills_score, holdings_score, volatility_score)
+
+    def interval(self, account_id: uuid.UUID) -> float:
+        """활동 점수 0 → 최대 주기, 1 → 최소 주기"""
+        score = self.activity_score(account_id)
+        return self.max_seconds - (self.max_seconds - self.min_seconds) * score
+
+    def status(self) -> list[dict[str, Any]]:
+        now = time.time()
+        return [
+            {
+                "account_id": account_id,
+                "interval_seconds": self.interval(account_id),
+                "activity_score": self.activity_score(account_id),
+                "holdings_count": len(activity.holdings) if activity.holdings is not None else None,
+                "fills_today": activity.orders_today + activity.holdings_changes,
+                "viewing": now - activity.last_viewed <= self.view_window_seconds,
+            }
+            for account_id, activity in self._activity.items()
+        ]
+
+
+poll_policy = Poll_Policy()
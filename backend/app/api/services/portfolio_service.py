@@ -0,0 +1,176 @@
+import uuid
+from typing import Any, Optional, Union
+
+from sqlmodel import Session, select
+
+from app.models.account import Account
+from app.models.kis import Kis_Minutely_Balance
+from app.models.ls import Ls_Minutely_Balance
+from app.models.portfolio import Portfolio_Contribution, User_Portfolio
+from app.api.services.field_mapping import upsert_row
+from app.api.services.quote_service import quote_cache, remark_exposures
+
+SUMMARY_FIELDS = ("total_assets", "purchase_amount", "eval_amount", "profit_loss")
+HOLDING_FIELDS = ("quantity", "purchase_amount", "eval_amount", "profit_loss")
+
+
+def _holdings_from_balance(balance: Union[Kis_Minutely_Balance, Ls_Minutely_Balance]) -> dict[str, dict[str, Any]]:
+    """잔고 스냅샷의 보유종목을 종목코드별 반영분으로 변환"""
+    holdings: dict[str, dict[str, Any]] = {}
+    for item in balance.holdings or []:
+        stock_code = item.get("stock_code")
+        quantity = int(item.get("quantity") or 0)
+        if not stock_code or quantity <= 0:
+            continue
+        holding = holdings.setdefault(stock_code, {
+            "stock_name": item.get("stock_name"),
+            "quantity": 0,
+            "purchase_amount": 0.0,
+            "eval_amount": 0.0,
+            "profit_loss": 0.0,
+        })
+        holding["quantity"] += quantity
+        holding["purchase_amount"] += quantity * float(item.get("purchase_price") or 0)
+        holding["eval_amount"] += float(item.get("eval_amount") or 0)
+        holding["profit_loss"] += float(item.get("profit_loss") or 0)
+    return holdings
+
+
+def apply_contribution_delta(
+    portfolio: User_Portfolio,
+    old: Optional[Portfolio_Contribution],
+    new: Optional[Portfolio_Contribution],
+) -> None:
+    """계좌 반영분의 이전 값을 빼고 새 값을 더해 통합 포트폴리오를 갱신 (다른 계좌는 조회하지 않음)"""
+    for field in SUMMARY_FIELDS:
+        value = getattr(portfolio, field)
+        if old:
+            value -= getattr(old, field)
+        if new:
+            value += getattr(new, field)
+        setattr(portfolio, field, round(value, 2))
+    portfolio.account_count += (1 if new else 0) - (1 if old else 0)
+
+    exposures = {stock_code: dict(exposure) for stock_code, exposure in (portfolio.exposures or {}).items()}
+    for contribution, sign in ((old, -1), (new, 1)):
+        if not contribution:
+            continue
+        for stock_code, holding in (contribution.holdings or {}).items():
+            exposure = exposures.setdefault(stock_code, {
+                "stock_name": holding.get("stock_name"),
+                **dict.fromkeys(HOLDING_FIELDS, 0),
+                "account_count": 0,
+            })
+            for field in HOLDING_FIELDS:
+                exposure[field] = round(exposure[field] + sign * holding[field], 2)
+            exposure["account_count"] += sign
+            if sign > 0 and holding.get("stock_name"):
+                exposure["stock_name"] = holding["stock_name"]
+
+    # JSON 컬럼은 변경 감지를 위해 새 객체로 교체
+    portfolio.exposures = {
+        stock_code: exposure
+        for stock_code, exposure in exposures.items()
+        if exposure["account_count"] > 0
+    }
+
+
+def _get_or_create_portfolio(session: Session, owner_id: uuid.UUID) -> User_Portfolio:
+    """사용자 통합 포트폴리오 행을 (없으면 만들어) 잠근 채 반환
+
+    처음 반영하는 워커가 동시에 들어와도 INSERT ... ON CONFLICT DO NOTHING 으로 한 행만 생기고,
+    이후 행 잠금 순서대로 증분이 더해진다.
+    """
+    upsert_row(
+        session,
+        User_Portfolio,
+        User_Portfolio(owner_id=owner_id, exposures={}).model_dump(),
+        ("owner_id",),
+        update=False,
+    )
+    return session.exec(
+        select(User_Portfolio).where(User_Portfolio.owner_id == owner_id).with_for_update()
+    ).one()
+
+
+def apply_balance_snapshot(
+    session: Session,
+    account: Account,
+    balance: Union[Kis_Minutely_Balance, Ls_Minutely_Balance],
+) -> None:
+    """새 잔고 스냅샷을 사용자 통합 포트폴리오에 증분 반영 (커밋은 호출자가 스냅샷과 함께 수행)"""
+    old = session.get(Portfolio_Contribution, account.id)
+    if old and old.snapshot_timestamp and balance.timestamp and balance.timestamp < old.snapshot_timestamp:
+        return
+
+    new = Portfolio_Contribution(
+        account_id=account.id,
+        owner_id=account.owner_id,
+        broker=account.broker.upper(),
+        snapshot_timestamp=balance.timestamp,
+        holdings=_holdings_from_balance(balance),
+        **{field: float(getattr(balance, field) or 0) for field in SUMMARY_FIELDS},
+    )
+
+    portfolio = _get_or_create_portfolio(session, account.owner_id)
+    apply_contribution_delta(portfolio, old, new)
+    session.add(portfolio)
+
+    if old:
+        for field in ("snapshot_timestamp", "holdings", *SUMMARY_FIELDS):
+            setattr(old, field, getattr(new, field))
+        session.add(old)
+    else:
+        session.add(new)
+
+
+def remove_account_contribution(session: Session, account: Account) -> None:
+    """삭제/비활성화된 계좌의 반영분을 통합 포트폴리오에서 제외"""
+    old = session.get(Portfolio_Contribution, account.id)
+    if not old:
+        return
+    portfolio = _get_or_create_portfolio(session, old.owner_id)
+    apply_contribution_delta(portfolio, old, None)
+    session.add(portfolio)
+    session.delete(old)
+
+
+def rebuild_user_portfolio(session: Session, owner_id: uuid.UUID) -> User_Portfolio:
+    """계좌 반영분으로 통합 포트폴리오를 다시 합산 (누적 오차 복구용)"""
+    portfolio = _get_or_create_portfolio(session, owner_id)
+    portfolio.account_count = 0
+    portfolio.exposures = {}
+    for field in SUMMARY_FIELDS:
+        setattr(portfolio, field, 0.0)
+    for contribution in session.exec(
+        select(Portfolio_Contribution).where(Portfolio_Contribution.owner_id == owner_id)
+    ).all():
+        apply_contribution_delta(portfolio, None, contribution)
+    session.add(portfolio)
+    session.commit()
+    session.refresh(portfolio)
+    return portfolio
+
+
+def get_user_portfolio(session: Session, owner_id: uuid.UUID, remark: bool = True) -> dict[str, Any]:
+    """사전 계산된 사용자 통합 포트폴리오 조회 (remark 시 이후 시세 캐시로 재평가)"""
+    portfolio = session.get(User_Portfolio, owner_id) or User_Portfolio(owner_id=owner_id, exposures={})
+    result = {
+        **portfolio.model_dump(exclude={"exposures"}),
+        "profit_loss_rate": (
+            portfolio.profit_loss / portfolio.purchase_amount * 100 if portfolio.purchase_amount > 0 else 0
+        ),
+        "data": [
+            {"stock_code": stock_code, **exposure}
+            for stock_code, exposure in (portfolio.exposures or {}).items()
+        ],
+    }
+    if remark:
+        quotes = quote_cache.get_many(exposure["stock_code"] for exposure in result["data"])
+        result = remark_exposures(result, quotes, marked_after=portfolio.updated_at)
+
+    total_assets = result["total_assets"]
+    for exposure in result["data"]:
+        exposure["weight"] = exposure["eval_amount"] / total_assets if total_assets > 0 else 0
+    result["data"].sort(key=lambda exposure: exposure["eval_amount"], reverse=True)
+    return result
@@ -0,0 +1,270 @@
+import logging
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlmodel import Session, delete, select
+
+from app.constants import KST, POSITION_SNAPSHOT_INTERVAL_FILLS
+from app.models.account import Account
+from app.models.ledger import Position_Snapshot
+from app.api.services.archive_service import MINUTELY_BALANCE_MODELS
+from app.api.services.fill_service import Fill, load_fills
+from app.api.services.lot_matching_service import AVERAGE, Lot, Lot_Book, Stock_Book
+
+logger = logging.getLogger(__name__)
+
+# 개시 스냅샷의 체결 식별자 (같은 시각 체결보다 앞에 정렬)
+OPENING_FILL_REF = ""
+
+
+def _lot_book_from_snapshot(snapshot: Optional[Position_Snapshot]) -> Lot_Book:
+    """스냅샷 포지션으로 이동평균 매칭 엔진 상태 복원"""
+    books: dict[str, Stock_Book] = {}
+    if snapshot:
+        for stock_code, position in (snapshot.positions or {}).items():
+            books[stock_code] = Stock_Book(
+                stock_name=position.get("stock_name"),
+                lots=deque([Lot(int(position["quantity"]), float(position["avg_cost"]), snapshot.as_of)]),
+            )
+    return Lot_Book(AVERAGE, books)
+
+
+def _positions(lot_book: Lot_Book) -> dict[str, dict[str, Any]]:
+    """매칭 엔진 상태에서 보유수량이 있는 종목만 포지션으로 추출"""
+    positions = {}
+    for stock_code, book in sorted(lot_book.books.items()):
+        open_qty = book.open_qty
+        if open_qty > 0:
+            positions[stock_code] = {
+                "stock_name": book.stock_name,
+                "quantity": open_qty,
+                "avg_cost": book.open_cost / open_qty,
+            }
+    return positions
+
+
+def get_latest_snapshot(
+    session: Session, account_id: uuid.UUID, at: Optional[datetime] = None
+) -> Optional[Position_Snapshot]:
+    """at 시점 이전의 가장 최근 포지션 스냅샷"""
+    statement = select(Position_Snapshot).where(Position_Snapshot.account_id == account_id)
+    if at is not None:
+        statement = statement.where(Position_Snapshot.as_of <= at)
+    return session.exec(
+        statement.order_by(Position_Snapshot.as_of.desc(), Position_Snapshot.fill_count.desc())
+    ).first()
+
+
+def _opening_snapshot(session: Session, account: Account) -> Optional[Position_Snapshot]:
+    """가장 오래된 분별 잔고로 개시 포지션 스냅샷 생성 (저장하지 않음, 잔고가 없으면 None)
+
+    체결은 일별 조회 기간만큼만 저장되므로 그 이전에 산 종목은 체결 재생만으로 복원되지 않는다.
+    잔고의 보유수량/매입평균가를 시작점으로 삼고 그 이후 체결만 재생한다.
+    """
+    model = MINUTELY_BALANCE_MODELS[account.broker.upper()]
+    balance = session.exec(
+        select(model).where(model.account_id == account.id).order_by(model.timestamp)
+    ).first()
+    if not balance:
+        return None
+
+    positions = {}
+    for item in balance.holdings or []:
+        quantity = int(item.get("quantity") or 0)
+        if item.get("stock_code") and quantity > 0:
+            positions[item["stock_code"]] = {
+                "stock_name": item.get("stock_name"),
+                "quantity": quantity,
+                "avg_cost": float(item.get("purchase_price") or 0),
+            }
+    as_of = balance.timestamp if balance.timestamp.tzinfo else KST.localize(balance.timestamp)
+    return Position_Snapshot(
+        account_id=account.id, as_of=as_of, last_fill_ref=OPENING_FILL_REF, fill_count=0, positions=positions
+    )
+
+
+def _seed_opening_snapshot(session: Session, account: Account) -> None:
+    """개시 스냅샷이 없으면 체결만 재생한 기존 스냅샷을 지우고 가장 오래된 잔고로 다시 시작"""
+    has_opening = session.exec(
+        select(Position_Snapshot.id).where(
+            Position_Snapshot.account_id == account.id,
+            Position_Snapshot.last_fill_ref == OPENING_FILL_REF,
+        )
+    ).first()
+    if has_opening:
+        return
+    opening = _opening_snapshot(session, account)
+    if opening is None:
+        return
+    session.exec(
+        delete(Position_Snapshot)
+        .where(Position_Snapshot.account_id == account.id)
+        .execution_options(synchronize_session=False)
+    )
+    session.add(opening)
+    session.flush()
+
+
+def _snapshot_key(snapshot: Position_Snapshot) -> tuple[datetime, str]:
+    as_of = snapshot.as_of if snapshot.as_of.tzinfo else KST.localize(snapshot.as_of)
+    return (as_of, snapshot.last_fill_ref)
+
+
+def _load_tail(
+    session: Session,
+    account: Account,
+    snapshot: Optional[Position_Snapshot],
+    end_date,
+    at: Optional[datetime] = None,
+) -> list[Fill]:
+    """스냅샷 이후 체결만 조회 (at 지정 시 그 시각까지)"""
+    start_date = _snapshot_key(snapshot)[0].astimezone(KST).date() if snapshot else None
+    fills = load_fills(session, account, start_date=start_date, end_date=end_date)
+    if snapshot:
+        last_key = _snapshot_key(snapshot)
+        fills = [fill for fill in fills if fill.key > last_key]
+    if at is not None:
+        fills = [fill for fill in fills if fill.executed_at <= at]
+    return fills
+
+
+def _discard_stale_snapshots(session: Session, account: Account, snapshot: Position_Snapshot) -> None:
+    """마지막 스냅샷 이후 과거 구간에 뒤늦게 저장/수정된 체결이 있으면 그 시점 이후 스냅샷 삭제
+
+    내용이 같은 재동기화는 bulk_upsert 가 행을 갱신하지 않으므로 지연 체결로 보지 않는다.
+    """
+    last_key = _snapshot_key(snapshot)
+    late_fills = [
+        fill for fill in load_fills(
+            session, account, end_date=datetime.now(KST).date(), recorded_after=snapshot.created_at
+        )
+        if fill.key <= last_key
+    ]
+    if not late_fills:
+        return
+
+    earliest = min(fill.executed_at for fill in late_fills)
+    logger.info(f"지연 반영된 체결 발견, {earliest} 이후 포지션 스냅샷 재생성 - 계정: {account.acnt_name}")
+    session.exec(
+        delete(Position_Snapshot)
+        .where(
+            Position_Snapshot.account_id == account.id,
+            Position_Snapshot.as_of >= earliest,
+            Position_Snapshot.last_fill_ref != OPENING_FILL_REF,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    session.flush()
+
+
+def update_position_snapshots(
+    session: Session, account: Account, interval: int = POSITION_SNAPSHOT_INTERVAL_FILLS
+) -> int:
+    """마지막 스냅샷 이후 확정 체결을 재생해 interval 건마다(및 마지막 체결에서) 스냅샷 저장
+
+    당일 체결은 장중 갱신될 수 있으므로 전일까지의 체결만 스냅샷에 반영하며,
+    생성한 스냅샷 수를 반환한다. 재생은 가장 오래된 잔고로 만든 개시 스냅샷에서 시작한다.
+    """
+    _seed_opening_snapshot(session, account)
+    snapshot = get_latest_snapshot(session, account.id)
+    if snapshot:
+        _discard_stale_snapshots(session, account, snapshot)
+        snapshot = get_latest_snapshot(session, account.id)
+
+    fills = _load_tail(session, account, snapshot, end_date=datetime.now(KST).date())
+    if not fills:
+        session.commit()
+        return 0
+
+    lot_book = _lot_book_from_snapshot(snapshot)
+    fill_count = snapshot.fill_count if snapshot else 0
+    created = 0
+    for index, fill in enumerate(fills, start=1):
+        lot_book.apply(fill)
+        if index % interval and index != len(fills):
+            continue
+        session.add(Position_Snapshot(
+            account_id=account.id,
+            as_of=fill.executed_at,
+            last_fill_ref=fill.ref,
+            fill_count=fill_count + index,
+            positions=_positions(lot_book),
+        ))
+        created += 1
+
+    session.commit()
+    return created
+
+
+def reconstruct_positions(session: Session, account: Account, at: Optional[datetime] = None) -> dict[str, Any]:
+    """at 시점의 종목별 포지션 재구성 (가장 가까운 스냅샷 + 이후 체결만 재생)"""
+    if at is None:
+        at = datetime.now(KST)
+    elif at.tzinfo is None:
+        at = KST.localize(at)
+
+    snapshot = get_latest_snapshot(session, account.id, at)
+    if snapshot is None:
+        # 스냅샷 작업 전이면 개시 잔고에서 바로 재생
+        opening = _opening_snapshot(session, account)
+        if opening is not None and opening.as_of <= at:
+            snapshot = opening
+    fills = _load_tail(
+        session, account, snapshot, end_date=at.astimezone(KST).date() + timedelta(days=1), at=at
+    )
+    lot_book = _lot_book_from_snapshot(snapshot)
+    lot_book.apply_all(fills)
+
+    return {
+        "account_id": account.id,
+        "at": at,
+        "snapshot_as_of": snapshot.as_of if snapshot else None,
+        "replayed_fills": len(fills),
+        "data": [
+            {"stock_code": stock_code, **position}
+            for stock_code, position in _positions(lot_book).items()
+        ],
+    }
+
+
+def check_position_drift(session: Session, account: Account) -> dict[str, Any]:
+    """마지막 분별 잔고의 보유수량과 같은 시점의 원장 포지션(개시 잔고 + 이후 체결)을 비교"""
+    model = MINUTELY_BALANCE_MODELS[account.broker.upper()]
+    balance = session.exec(
+        select(model).where(model.account_id == account.id).order_by(model.timestamp.desc())
+    ).first()
+    if not balance:
+        return {"account_id": account.id, "balance_timestamp": None, "in_sync": True, "data": []}
+
+    broker_positions = {
+        item["stock_code"]: item for item in (balance.holdings or []) if item.get("stock_code")
+    }
+    ledger_positions = {
+        item["stock_code"]: item
+        for item in reconstruct_positions(session, account, balance.timestamp)["data"]
+    }
+
+    drifts = []
+    for stock_code in sorted(broker_positions.keys() | ledger_positions.keys()):
+        broker_qty = int(broker_positions.get(stock_code, {}).get("quantity", 0))
+        ledger_qty = int(ledger_positions.get(stock_code, {}).get("quantity", 0))
+        if broker_qty != ledger_qty:
+            drifts.append({
+                "stock_code": stock_code,
+                "stock_name": (
+                    broker_positions.get(stock_code, {}).get("stock_name")
+                    or ledger_positions.get(stock_code, {}).get("stock_name")
+                ),
+                "ledger_quantity": ledger_qty,
+                "broker_quantity": broker_qty,
+                "difference": broker_qty - ledger_qty,
+            })
+
+    return {
+        "account_id": account.id,
+        "balance_timestamp": balance.timestamp,
+        "in_sync": not drifts,
+        "data": drifts,
+    }
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from sqlmodel import Session, select
+
+from app.constants import KST, QUOTE_REQUEST_INTERVAL_SECONDS, QUOTE_STALE_SECONDS
+from app.core.metrics import record_cache
+from app.models.account import Account
+from app.models.portfolio import Portfolio_Contribution
+from app.api.services.kis_api import inquire_price_from_KIS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Quote:
+    """종목 현재가"""
+    stock_code: str
+    price: float
+    change_rate: float
+    volume: int
+    updated_at: datetime
+
+
+class Quote_Cache:
+    """전체 계좌가 공유하는 종목별 현재가 캐시"""
+
+    def __init__(self, stale_seconds: float = QUOTE_STALE_SECONDS) -> None:
+        self.stale_seconds = stale_seconds
+        self._quotes: dict[str, Quote] = {}
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def update(self, quote: Quote) -> None:
+        current = self._quotes.get(quote.stock_code)
+        if current is None or quote.updated_at >= current.updated_at:
+            self._quotes[quote.stock_code] = quote
+
+    def get(self, stock_code: str, now: Optional[datetime] = None) -> Optional[Quote]:
+        """유효시간 내 시세만 반환"""
+        quote = self._quotes.get(stock_code)
+        if quote is not None and ((now or datetime.now(KST)) - quote.updated_at).total_seconds() > self.stale_seconds:
+            quote = None
+        record_cache("quote", quote is not None)
+        return quote
+
+    def get_many(self, stock_codes: Iterable[str], now: Optional[datetime] = None) -> dict[str, Quote]:
+        now = now or datetime.now(KST)
+        quotes = {}
+        for stock_code in stock_codes:
+            quote = self.get(stock_code, now)
+            if quote:
+                quotes[stock_code] = quote
+        return quotes
+
+    def clear(self) -> None:
+        self._quotes.clear()
+
+
+quote_cache = Quote_Cache()
+
+
+def get_held_stock_codes(session: Session) -> set[str]:
+    """통합 포트폴리오 반영분 기준 전체 계좌의 보유 종목코드 (종목당 1회만 조회하기 위함)"""
+    stock_codes: set[str] = set()
+    for holdings in session.exec(select(Portfolio_Contribution.holdings)).all():
+        stock_codes.update((holdings or {}).keys())
+    return stock_codes
+
+
+def get_quote_accounts(session: Session) -> list[Account]:
+    """시세 조회에 사용할 유효 토큰 보유 KIS 계좌 (앱키당 1개, 실전계좌 우선)"""
+    now = datetime.now(KST)
+    accounts = session.exec(
+        select(Account).where(
+            Account.is_active == True,
+            Account.broker == "KIS",
+            Account.access_token.is_not(None),
+        )
+    ).all()
+    accounts = [
+        account for account in accounts
+        if account.access_token_expired is None
+        or (account.access_token_expired if account.access_token_expired.tzinfo
+            else KST.localize(account.access_token_expired)) > now
+    ]
+    # 요청 제한은 앱키 단위이므로 같은 앱키를 쓰는 계좌는 하나만 사용
+    by_app_key: dict[str, Account] = {}
+    for account in sorted(accounts, key=lambda account: account.acnt_type != "live"):
+        by_app_key.setdefault(account.app_key, account)
+    return list(by_app_key.values())
+
+
+def _parse_quote(stock_code: str, output: dict[str, Any], updated_at: datetime) -> Optional[Quote]:
+    price = float(output.get("stck_prpr") or 0)
+    if price <= 0:
+        return None
+    return Quote(
+        stock_code=stock_code,
+        price=price,
+        change_rate=float(output.get("prdy_ctrt") or 0),
+        volume=int(output.get("acml_vol") or 0),
+        updated_at=updated_at,
+    )
+
+
+async def _refresh_with_app_key(account: Account, stock_codes: list[str], cache: Quote_Cache) -> int:
+    """한 앱키에 배정된 종목을 요청 간격을 지키며 차례로 조회"""
+    updated = 0
+    for index, stock_code in enumerate(stock_codes):
+        if index:
+            await asyncio.sleep(QUOTE_REQUEST_INTERVAL_SECONDS)
+        try:
+            output = await inquire_price_from_KIS(account, stock_code)
+            quote = _parse_quote(stock_code, output, datetime.now(KST))
+            if quote:
+                cache.update(quote)
+                updated += 1
+        except Exception as e:
+            logger.error(f"시세 조회 실패 - 종목: {stock_code}, 에러: {str(e)}")
+    return updated
+
+
+async def refresh_quotes(session: Session, cache: Quote_Cache = quote_cache) -> int:
+    """보유 종목별 현재가를 1건씩만 조회해 캐시 갱신, 갱신한 종목 수 반환
+
+    종목을 시세 조회 가능한 앱키들에 나눠 앱키별로 동시에 조회하고, 앱키마다 요청 간격을 지킨다.
+    """
+    stock_codes = sorted(get_held_stock_codes(session))
+    accounts = get_quote_accounts(session)
+    if not stock_codes or not accounts:
+        return 0
+
+    results = await asyncio.gather(*(
+        _refresh_with_app_key(account, stock_codes[index::len(accounts)], cache)
+        for index, account in enumerate(accounts[:len(stock_codes)])
+    ))
+    return sum(results)
+
+
+def remark_exposures(
+    portfolio: dict[str, Any],
+    quotes: dict[str, Quote],
+    marked_after: Optional[datetime] = None,
+) -> dict[str, Any]:
+    """잔고 스냅샷 이후 시세로 종목별 평가금액/손익과 합계를 재평가
+
+    marked_after 이전 시세는 이미 잔고 스냅샷에 반영된 것으로 보고 건너뛴다.
+    """
+    delta = 0.0
+    marked_at = None
+    data = []
+    for exposure in portfolio.get("data", []):
+        quote = quotes.get(exposure["stock_code"])
+        if quote is None or (marked_after and quote.updated_at <= marked_after):
+            data.append(exposure)
+            continue
+        eval_amount = exposure["quantity"] * quote.price
+        delta += eval_amount - exposure["eval_amount"]
+        marked_at = max(marked_at, quote.updated_at) if marked_at else quote.updated_at
+        data.append({
+            **exposure,
+            "current_price": quote.price,
+            "eval_amount": eval_amount,
+            "profit_loss": eval_amount - exposure["purchase_amount"],
+        })
+
+    remarked = {**portfolio, "data": data, "marked_at": marked_at}
+    if delta:
+        remarked["total_assets"] = portfolio["total_assets"] + delta
+        remarked["eval_amount"] = portfolio["eval_amount"] + delta
+        remarked["profit_loss"] = portfolio["profit_loss"] + delta
+        purchase_amount = portfolio["purchase_amount"]
+        remarked["profit_loss_rate"] = (
+            remarked["profit_loss"] / purchase_amount * 100 if purchase_amount > 0 else 0
+        )
+    return remarked
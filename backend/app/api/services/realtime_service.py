@@ -0,0 +1,446 @@
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, Iterable, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlmodel import Session, select
+from websockets.asyncio.client import connect
+
+from app.constants import (
+    KST,
+    KIS_WS_URL,
+    KIS_WS_TR_ID,
+    REALTIME_APPROVAL_KEY_TTL_SECONDS,
+    REALTIME_MAX_SYMBOLS_PER_SESSION,
+    REALTIME_QUEUE_SIZE,
+    REALTIME_RECONNECT_SECONDS
+)
+from app.core.config import settings
+from app.core.db import engine
+from app.models.account import Account
+from app.api.services.kis_api import get_approval_key_KIS
+from app.api.services.quote_service import Quote, quote_cache
+
+logger = logging.getLogger(__name__)
+
+# H0STCNT0 체결 레코드 필드 위치
+TICK_FIELD_STOCK_CODE = 0
+TICK_FIELD_TIME = 1
+TICK_FIELD_PRICE = 2
+TICK_FIELD_CHANGE_RATE = 5
+TICK_FIELD_VOLUME = 12
+TICK_FIELD_ACCUMULATED_VOLUME = 13
+TICK_FIELD_COUNT = 46
+
+
+@dataclass(frozen=True, slots=True)
+class Session_Credential:
+    """브로커 실시간 세션 접속 정보 (접속키당 1세션, account_id 는 접속키를 재발급할 계좌)"""
+    url: str
+    approval_key: str
+    account_id: Optional[uuid.UUID] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Tick:
+    """실시간 체결가"""
+    stock_code: str
+    price: float
+    change_rate: float
+    volume: int
+    accumulated_volume: int
+    traded_at: datetime
+
+
+def build_subscribe_message(approval_key: str, stock_code: str, register: bool = True) -> str:
+    """KIS 실시간 체결가 등록/해제 요청 메시지"""
+    return json.dumps({
+        "header": {
+            "approval_key": approval_key,
+            "custtype": "P",
+            "tr_type": "1" if register else "2",
+            "content-type": "utf-8"
+        },
+        "body": {
+            "input": {
+                "tr_id": KIS_WS_TR_ID["price"],
+                "tr_key": stock_code
+            }
+        }
+    })
+
+
+def parse_kis_message(raw: str, today: Optional[datetime] = None) -> tuple[list[Tick], Optional[dict]]:
+    """KIS 웹소켓 메시지 파싱 → (체결 목록, 제어 메시지)
+
+    체결 데이터는 '0|TR_ID|건수|필드^필드^...' 형식이며 한 메시지에 여러 건이 이어 붙어 온다.
+    """
+    if raw[:1] not in ("0", "1"):
+        return [], json.loads(raw)
+
+    parts = raw.split("|", 3)
+    if len(parts) < 4 or parts[0] != "0" or parts[1] != KIS_WS_TR_ID["price"]:
+        return [], None
+
+    count = int(parts[2])
+    fields = parts[3].split("^")
+    size = len(fields) // count if count else TICK_FIELD_COUNT
+    today = today or datetime.now(KST)
+    ticks = []
+    for index in range(count):
+        record = fields[index * size:(index + 1) * size]
+        hms = record[TICK_FIELD_TIME]
+        ticks.append(Tick(
+            stock_code=record[TICK_FIELD_STOCK_CODE],
+            price=float(record[TICK_FIELD_PRICE]),
+            change_rate=float(record[TICK_FIELD_CHANGE_RATE]),
+            volume=int(record[TICK_FIELD_VOLUME]),
+            accumulated_volume=int(record[TICK_FIELD_ACCUMULATED_VOLUME]),
+            traded_at=today.replace(hour=int(hms[0:2]), minute=int(hms[2:4]), second=int(hms[4:6]), microsecond=0),
+        ))
+    return ticks, None
+
+
+class Broker_Session:
+    """브로커 실시간 웹소켓 세션 1개 (끊기면 접속키를 갱신하고 등록 종목을 다시 등록하며 재연결)"""
+
+    def __init__(
+        self,
+        credential: Session_Credential,
+        on_tick: Callable[[Tick], None],
+        reload: Optional[Callable[[Session_Credential], Session_Credential]] = None,
+    ) -> None:
+        self.credential = credential
+        self.symbols: set[str] = set()
+        self._on_tick = on_tick
+        self._reload = reload
+        self._websocket = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _send(self, stock_code: str, register: bool) -> None:
+        if self._websocket is not None:
+            try:
+                await self._websocket.send(build_subscribe_message(self.credential.approval_key, stock_code, register))
+            except Exception as e:
+                # 연결이 끊긴 경우 재연결 시 전체 재등록
+                logger.warning(f"실시간 등록 요청 실패 - 종목: {stock_code}, 에러: {str(e)}")
+
+    async def subscribe(self, stock_code: str) -> None:
+        self.symbols.add(stock_code)
+        await self._send(stock_code, register=True)
+
+    async def unsubscribe(self, stock_code: str) -> None:
+        self.symbols.discard(stock_code)
+        await self._send(stock_code, register=False)
+
+    async def _refresh_credential(self) -> None:
+        """재연결 전 접속키 갱신 (만료 시 재발급, DB/HTTP 호출이라 스레드에서 실행)"""
+        if self._reload is None:
+            return
+        try:
+            self.credential = await asyncio.to_thread(self._reload, self.credential)
+        except Exception as e:
+            logger.error(f"웹소켓 접속키 갱신 실패 - {self.credential.url}, 에러: {str(e)}")
+
+    async def _run(self) -> None:
+        reconnect = False
+        while True:
+            try:
+                if reconnect:
+                    await self._refresh_credential()
+                reconnect = True
+                async with connect(self.credential.url) as websocket:
+                    self._websocket = websocket
+                    for stock_code in list(self.symbols):
+                        await self._send(stock_code, register=True)
+
+                    async for raw in websocket:
+                        ticks, control = parse_kis_message(raw)
+                        if control and control.get("header", {}).get("tr_id") == "PINGPONG":
+                            await websocket.send(raw)
+                        for tick in ticks:
+                            self._on_tick(tick)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"실시간 세션 오류 - {self.credential.url}, 에러: {str(e)}")
+            finally:
+                self._websocket = None
+            await asyncio.sleep(REALTIME_RECONNECT_SECONDS)
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._websocket is not None:
+            await self._websocket.close()
+            self._websocket = None
+
+
+class Subscription:
+    """사용자 1명의 실시간 체결 구독 (느린 소비자는 오래된 체결부터 버림)"""
+
+    def __init__(self, manager: "Subscription_Manager", symbols: set[str], queue_size: int) -> None:
+        self.manager = manager
+        self.symbols = symbols
+        self.queue: asyncio.Queue[Tick] = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def put(self, tick: Tick) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(tick)
+
+    async def get(self) -> Tick:
+        return await self.queue.get()
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Tick:
+        return await self.get()
+
+    async def close(self) -> None:
+        await self.manager.unsubscribe(self)
+
+
+class Subscription_Manager:
+    """종목별 구독 수를 세어 브로커 세션에 최소 개수로 등록하고 체결을 구독자에게 분배"""
+
+    def __init__(
+        self,
+        credentials: Callable[[], list[Session_Credential]],
+        max_symbols_per_session: int = REALTIME_MAX_SYMBOLS_PER_SESSION,
+        queue_size: int = REALTIME_QUEUE_SIZE,
+        reload: Optional[Callable[[Session_Credential], Session_Credential]] = None,
+    ) -> None:
+        """credentials 는 DB 조회/접속키 발급을 하는 동기 함수 (이벤트 루프 밖 스레드에서 호출)"""
+        self._credentials = credentials
+        self._reload = reload
+        self.max_symbols_per_session = max_symbols_per_session
+        self.queue_size = queue_size
+        self.sessions: list[Broker_Session] = []
+        self.refcounts: dict[str, int] = {}
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._symbol_sessions: dict[str, Broker_Session] = {}
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, symbols: Iterable[str]) -> Subscription:
+        subscription = Subscription(self, set(symbols), self.queue_size)
+        # 새 세션이 필요할 때 쓸 접속 정보는 잠금 밖에서 미리 읽어 둠 (다른 구독/해제를 막지 않도록)
+        credentials = await asyncio.to_thread(self._credentials)
+        async with self._lock:
+            try:
+                for stock_code in subscription.symbols:
+                    if not self.refcounts.get(stock_code):
+                        await self._register(stock_code, credentials)
+                    self.refcounts[stock_code] = self.refcounts.get(stock_code, 0) + 1
+                    self._subscribers.setdefault(stock_code, set()).add(subscription)
+            except Exception:
+                await self._release(subscription)
+                raise
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        async with self._lock:
+            await self._release(subscription)
+
+    async def _release(self, subscription: Subscription) -> None:
+        released = self._remove(subscription)
+        for stock_code in released:
+            session = self._symbol_sessions.pop(stock_code)
+            await session.unsubscribe(stock_code)
+        if released:
+            await self._rebalance()
+
+    def _remove(self, subscription: Subscription) -> list[str]:
+        """구독 해제, 더 이상 구독자가 없는 종목 목록 반환"""
+        released = []
+        for stock_code in subscription.symbols:
+            subscribers = self._subscribers.get(stock_code)
+            if not subscribers or subscription not in subscribers:
+                continue
+            subscribers.discard(subscription)
+            self.refcounts[stock_code] -= 1
+            if self.refcounts[stock_code] == 0:
+                del self.refcounts[stock_code]
+                del self._subscribers[stock_code]
+                if stock_code in self._symbol_sessions:
+                    released.append(stock_code)
+        subscription.symbols = set()
+        return released
+
+    async def _register(self, stock_code: str, credentials: Sequence[Session_Credential] = ()) -> None:
+        """여유가 있는 세션 중 가장 많이 찬 세션에 등록, 없으면 credentials 중 미사용 접속키로 새 세션 생성"""
+        candidates = [s for s in self.sessions if len(s.symbols) < self.max_symbols_per_session]
+        if candidates:
+            session = max(candidates, key=lambda s: len(s.symbols))
+        else:
+            session = self._open_session(credentials)
+        await session.subscribe(stock_code)
+        self._symbol_sessions[stock_code] = session
+
+    def _open_session(self, credentials: Sequence[Session_Credential]) -> Broker_Session:
+        used_keys = {session.credential.approval_key for session in self.sessions}
+        used_accounts = {session.credential.account_id for session in self.sessions} - {None}
+        for credential in credentials:
+            if credential.approval_key not in used_keys and credential.account_id not in used_accounts:
+                session = Broker_Session(credential, self._dispatch, self._reload)
+                session.start()
+                self.sessions.append(session)
+                logger.info(f"실시간 세션 추가 - 총 {len(self.sessions)}개")
+                return session
+        raise HTTPException(status_code=503, detail="실시간 등록 가능한 세션이 없습니다.")
+
+    async def _rebalance(self) -> None:
+        """등록 종목이 더 적은 세션에 들어갈 수 있으면 가장 한가한 세션을 비우고 종료 (구독이 없으면 전부 종료)"""
+        if not self.refcounts:
+            for session in self.sessions:
+                await session.close()
+            self.sessions.clear()
+            return
+        while len(self.sessions) > 1:
+            total = sum(len(session.symbols) for session in self.sessions)
+            if total > (len(self.sessions) - 1) * self.max_symbols_per_session:
+                return
+            victim = min(self.sessions, key=lambda session: len(session.symbols))
+            self.sessions.remove(victim)
+            for stock_code in list(victim.symbols):
+                await victim.unsubscribe(stock_code)
+                await self._register(stock_code)
+            await victim.close()
+            logger.info(f"실시간 세션 정리 - 총 {len(self.sessions)}개")
+
+    def _dispatch(self, tick: Tick) -> None:
+        quote_cache.update(Quote(
+            stock_code=tick.stock_code,
+            price=tick.price,
+            change_rate=tick.change_rate,
+            volume=tick.accumulated_volume,
+            updated_at=tick.traded_at,
+        ))
+        for subscription in self._subscribers.get(tick.stock_code, ()):
+            subscription.put(tick)
+
+    def stats(self) -> dict:
+        return {
+            "sessions": [sorted(session.symbols) for session in self.sessions],
+            "refcounts": dict(self.refcounts),
+        }
+
+    async def close(self) -> None:
+        async with self._lock:
+            for session in self.sessions:
+                await session.close()
+            self.sessions.clear()
+            self.refcounts.clear()
+            self._subscribers.clear()
+            self._symbol_sessions.clear()
+
+
+def _ensure_approval_key(session: Session, account: Account) -> bool:
+    """접속키가 없거나 재발급 시각이 지났으면 발급 후 저장 → 사용 가능한 접속키가 있는지"""
+    now = datetime.now(KST)
+    if account.approval_key and account.approval_key_expired and account.approval_key_expired > now:
+        return True
+    try:
+        account.approval_key = get_approval_key_KIS(
+            app_key=account.app_key,
+            app_secret=account.app_secret,
+            acnt_type=account.acnt_type
+        )
+        account.approval_key_expired = now + timedelta(seconds=REALTIME_APPROVAL_KEY_TTL_SECONDS)
+        session.add(account)
+        session.commit()
+        return True
+    except HTTPException as e:
+        logger.error(f"웹소켓 접속키 발급 실패 - 계정: {account.acnt_name}, 에러: {e.detail}")
+        return False
+
+
+def load_kis_credentials(owner_id: Optional[uuid.UUID] = None) -> list[Session_Credential]:
+    """웹소켓 접속 정보 (실전계좌 우선)
+
+    owner_id 가 없으면 REALTIME_SERVICE_ACCOUNT_IDS 에 지정한 공용 계좌, 있으면 해당 사용자의 활성 KIS 계좌만 쓴다.
+    DB 조회와 접속키 발급(HTTP)을 하므로 이벤트 루프에서는 asyncio.to_thread 로 호출한다.
+    """
+    criteria = [Account.is_active == True, Account.broker == "KIS"]
+    if owner_id is None:
+        if not settings.REALTIME_SERVICE_ACCOUNT_IDS:
+            return []
+        criteria.append(Account.id.in_(settings.REALTIME_SERVICE_ACCOUNT_IDS))
+    else:
+        criteria.append(Account.owner_id == owner_id)
+
+    credentials = []
+    with Session(engine) as session:
+        accounts = session.exec(select(Account).where(*criteria)).all()
+        for account in sorted(accounts, key=lambda account: account.acnt_type != "live"):
+            if not _ensure_approval_key(session, account):
+                continue
+            # 같은 앱키를 쓰는 계좌는 접속키도 같으므로 세션 1개만
+            if any(credential.approval_key == account.approval_key for credential in credentials):
+                continue
+            credentials.append(Session_Credential(KIS_WS_URL[account.acnt_type], account.approval_key, account.id))
+    return credentials
+
+
+def reload_kis_credential(credential: Session_Credential) -> Session_Credential:
+    """재연결 전 접속키 갱신 (재발급 시각이 지났으면 재발급)"""
+    if credential.account_id is None:
+        return credential
+    with Session(engine) as session:
+        account = session.get(Account, credential.account_id)
+        if account is None or not _ensure_approval_key(session, account):
+            return credential
+        return Session_Credential(credential.url, account.approval_key, account.id)
+
+
+class Realtime_Hub:
+    """접속키 묶음(pool)별 Subscription_Manager
+
+    공용 계좌(REALTIME_SERVICE_ACCOUNT_IDS)가 지정되면 모든 사용자가 공용 pool 을 함께 쓰고,
+    없으면 사용자마다 본인 KIS 계좌의 접속키로만 세션을 연다 (다른 사용자의 앱키를 쓰지 않음).
+    """
+
+    def __init__(
+        self,
+        credentials: Callable[[Optional[uuid.UUID]], list[Session_Credential]] = load_kis_credentials,
+        reload: Optional[Callable[[Session_Credential], Session_Credential]] = reload_kis_credential,
+        shared: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self._credentials = credentials
+        self._reload = reload
+        self._shared = shared or (lambda: bool(settings.REALTIME_SERVICE_ACCOUNT_IDS))
+        self.managers: dict[Optional[uuid.UUID], Subscription_Manager] = {}
+
+    def manager_for(self, user_id: uuid.UUID) -> Subscription_Manager:
+        pool = None if self._shared() else user_id
+        manager = self.managers.get(pool)
+        if manager is None:
+            manager = self.managers[pool] = Subscription_Manager(partial(self._credentials, pool), reload=self._reload)
+        return manager
+
+    async def subscribe(self, user_id: uuid.UUID, symbols: Iterable[str]) -> Subscription:
+        return await self.manager_for(user_id).subscribe(symbols)
+
+    async def close(self) -> None:
+        for manager in self.managers.values():
+            await manager.close()
+        self.managers.clear()
+
+
+realtime_manager = Realtime_Hub()
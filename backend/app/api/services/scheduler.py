@@ -0,0 +1,441 @@
+"""백그라운드 작업 스케줄러
+
+루프마다 Scheduled_Job 을 하나씩 두고 다음 실행 예정 시각, 마지막 순회 시간/오류, 계좌별 상태를 기록한다.
+루프는 asyncio.sleep 대신 job.sleep 으로 대기해 일시정지를 따른다 (다음 대기 시점부터 적용).
+계좌 단위 즉시 실행은 루프와 별개의 태스크로 돌리며 대기 중인 실행 수를 queue_depth 로 보여준다.
+워커(프로세스)가 여러 개이면 관리 API 요청은 그중 하나에만 닿으므로 일시정지 상태, 즉시 실행 요청,
+노드별 상태는 DB 에 두고 각 워커가 sync 로 주기적으로 반영/보고한다.
+종료 시에는 취소 대신 정지 신호를 보내 루프가 다음 job.sleep 에서 스스로 빠져나오게 하고
+(계좌 순회는 job.stopping 으로 다음 계좌부터 건너뜀), 기한 안에 끝나지 않은 태스크만 취소한다.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import Session, delete, select
+
+from app.constants import KST, SCHEDULER_NODE_TIMEOUT_SECONDS, SCHEDULER_RUN_CLAIM_LIMIT
+from app.core.db import engine
+from app.models.account import Account
+from app.models.scheduler import Account_Poll_State, Scheduler_Job_Control, Scheduler_Job_Report, Scheduler_Run_Request
+
+logger = logging.getLogger(__name__)
+
+Account_Runner = Callable[[Session, Account], Awaitable[Any]]
+
+
+class Job_Stopped(BaseException):
+    """정지 신호 후 job.sleep 에서 발생 (루프를 빠져나오는 용도, start 가 처리)
+
+    루프의 `except Exception` 오류 기록에 걸리지 않도록 CancelledError 처럼 BaseException 을 상속한다.
+    """
+
+
+@dataclass
+class Account_Run:
+    """계좌별 마지막 처리 결과"""
+    last_run: Optional[datetime] = None
+    last_success: Optional[datetime] = None
+    last_error: Optional[str] = None
+    consecutive_failures: int = 0
+
+
+class Scheduled_Job:
+    """백그라운드 루프 1개의 실행 상태"""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        run_account: Optional[Account_Runner] = None,
+        pausable: bool = True,
+        cooperative: bool = True,
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.run_account = run_account
+        self.pausable = pausable
+        self.cooperative = cooperative
+        self.task: Optional[asyncio.Task] = None
+        self.next_run: Optional[datetime] = None
+        self.last_started: Optional[datetime] = None
+        self.last_duration_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[datetime] = None
+        self.run_count = 0
+        self.error_count = 0
+        self.running = False
+        self.accounts: dict[uuid.UUID, Account_Run] = {}
+        self.pending: set[asyncio.Task] = set()
+        self._started_at = 0.0
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        self._stop = stop_event or asyncio.Event()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def start(self, loop_func: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        self.task = asyncio.get_event_loop().create_task(self._run(loop_func), name=f"job:{self.name}")
+        return self.task
+
+    async def _run(self, loop_func: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await loop_func()
+        except Job_Stopped:
+            logger.info(f"백그라운드 작업 종료 - {self.name}")
+
+    async def _wait_unless_stopped(self, waiter: Awaitable[Any], timeout: Optional[float] = None) -> None:
+        """waiter 완료(또는 timeout)까지 대기, 그 사이 정지 신호가 오면 Job_Stopped"""
+        stop = asyncio.ensure_future(self._stop.wait())
+        wait = asyncio.ensure_future(waiter)
+        try:
+            await asyncio.wait({stop, wait}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            wait.cancel()
+        if self.stopping:
+            raise Job_Stopped(self.name)
+
+    async def sleep(self, seconds: float) -> None:
+        """다음 순회까지 대기 (일시정지 중이면 재개될 때까지 추가 대기, 정지 신호 시 Job_Stopped)"""
+        seconds = max(seconds, 0)
+        self.next_run = datetime.now(KST) + timedelta(seconds=seconds)
+        await self._wait_unless_stopped(asyncio.sleep(seconds), timeout=seconds)
+        if self.paused:
+            await self._wait_unless_stopped(self._resumed.wait())
+
+    async def wait_for(self, event: asyncio.Event) -> None:
+        """선행 조건(event) 대기 (정지 신호 시 Job_Stopped)"""
+        if not event.is_set():
+            await self._wait_unless_stopped(event.wait())
+
+    def pause(self) -> None:
+        if not self.pausable:
+            raise HTTPException(status_code=409, detail=f"일시정지할 수 없는 작업입니다: {self.name}")
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        self._resumed.set()
+
+    def sweep_started(self) -> None:
+        self.running = True
+        self.last_started = datetime.now(KST)
+        self._started_at = time.perf_counter()
+
+    def sweep_finished(self, error: Optional[BaseException] = None) -> None:
+        """순회 종료 기록 (error 는 순회 전체를 중단시킨 예외)"""
+        if not self.running:
+            return
+        self.running = False
+        self.run_count += 1
+        self.last_duration_seconds = time.perf_counter() - self._started_at
+        if error is not None:
+            self.error_count += 1
+            self.last_error = str(error)
+            self.last_error_at = datetime.now(KST)
+
+    def record_account(self, account_id: uuid.UUID, error: Optional[str] = None) -> None:
+        run = self.accounts.get(account_id)
+        if run is None:
+            run = self.accounts[account_id] = Account_Run()
+        run.last_run = datetime.now(KST)
+        if error is None:
+            run.last_success = run.last_run
+            run.last_error = None
+            run.consecutive_failures = 0
+        else:
+            run.last_error = error
+            run.consecutive_failures += 1
+
+    def trigger(self, account_ids: list[uuid.UUID]) -> int:
+        """계좌별 즉시 실행 태스크 생성 → 생성한 실행 수"""
+        if self.run_account is None:
+            raise HTTPException(status_code=400, detail=f"계좌 단위 즉시 실행을 지원하지 않는 작업입니다: {self.name}")
+        if self.stopping:
+            raise HTTPException(status_code=503, detail="서버가 종료 중입니다")
+        loop = asyncio.get_event_loop()
+        for account_id in account_ids:
+            task = loop.create_task(self._run_account(account_id))
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+        return len(account_ids)
+
+    async def _run_account(self, account_id: uuid.UUID) -> None:
+        with Session(engine) as session:
+            account = session.get(Account, account_id)
+            if account is None:
+                return
+            try:
+                await self.run_account(session, account)
+                session.commit()
+                self.record_account(account_id)
+                logger.info(f"즉시 실행 완료 - 작업: {self.name}, 계정: {account.acnt_name}")
+            except Exception as e:
+                session.rollback()
+                self.record_account(account_id, str(e))
+                logger.error(f"즉시 실행 실패 - 작업: {self.name}, 계정: {account.acnt_name}, 에러: {str(e)}")
+
+    def status(self, include_accounts: bool = False) -> dict[str, Any]:
+        now = datetime.now(KST)
+        if self.task is None:
+            state = "stopped"
+        elif self.task.done():
+            state = "finished"
+        elif self.stopping:
+            state = "stopping"
+        elif self.paused:
+            state = "paused"
+        else:
+            state = "running" if self.running else "idle"
+        status = {
+            "name": self.name,
+            "description": self.description,
+            "state": state,
+            "pausable": self.pausable,
+            "supports_account_run": self.run_account is not None,
+            "next_run": self.next_run,
+            "overdue": state == "idle" and self.next_run is not None and self.next_run < now - timedelta(seconds=5),
+            "last_started": self.last_started,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+            "run_count": self.run_count,
+            "error_count": self.error_count,
+            "queue_depth": len(self.pending),
+            "accounts": None,
+        }
+        if include_accounts:
+            status["accounts"] = [
+                {"account_id": account_id, **vars(run)} for account_id, run in self.accounts.items()
+            ]
+        return status
+
+
+class Job_Scheduler:
+    """이름으로 작업을 찾아 조회/일시정지/즉시 실행"""
+
+    def __init__(self) -> None:
+        self.jobs: dict[str, Scheduled_Job] = {}
+        self._stop = asyncio.Event()
+
+    def register(
+        self,
+        name: str,
+        description: str,
+        run_account: Optional[Account_Runner] = None,
+        pausable: bool = True,
+        cooperative: bool = True,
+    ) -> Scheduled_Job:
+        """cooperative=False 는 job.sleep 으로 대기하지 않는 루프 (종료 시 바로 취소)"""
+        if name in self.jobs:
+            raise ValueError(f"이미 등록된 작업: {name}")
+        job = self.jobs[name] = Scheduled_Job(name, description, run_account, pausable, cooperative, self._stop)
+        return job
+
+    def get(self, name: str) -> Scheduled_Job:
+        job = self.jobs.get(name)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {name}")
+        return job
+
+    def running_tasks(self) -> list[asyncio.Task]:
+        return [job.task for job in self.jobs.values() if job.task is not None and not job.task.done()]
+
+    async def shutdown(self, timeout: float) -> dict[str, list[str]]:
+        """새 순회/즉시 실행을 막고 진행 중인 작업이 끝나기를 timeout 초까지 기다린 뒤 남은 태스크 취소
+
+        → {"drained": 스스로 끝난 작업, "cancelled": 취소한 작업}
+        """
+        self._stop.set()
+        names: dict[asyncio.Task, str] = {}
+        draining: list[asyncio.Task] = []
+        for job in self.jobs.values():
+            if job.task is not None and not job.task.done():
+                names[job.task] = job.name
+                if job.cooperative:
+                    draining.append(job.task)
+            for task in job.pending:
+                names[task] = f"{job.name}:account_run"
+                draining.append(task)
+
+        if draining:
+            await asyncio.wait(draining, timeout=timeout)
+        leftover = [task for task in names if not task.done()]
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            await asyncio.gather(*leftover, return_exceptions=True)
+
+        cancelled = [names[task] for task in names if task.cancelled()]
+        drained = [names[task] for task in names if not task.cancelled()]
+        if cancelled:
+            logger.warning(f"종료 기한 초과로 취소한 작업: {', '.join(cancelled)}")
+        return {"drained": drained, "cancelled": cancelled}
+
+    def _account_ids(self, session: Session, account_id: Optional[uuid.UUID]) -> list[uuid.UUID]:
+        if account_id is not None:
+            account = session.get(Account, account_id)
+            if account is None:
+                raise HTTPException(status_code=404, detail="계좌를 찾을 수 없습니다")
+            return [account.id]
+        return list(session.exec(select(Account.id).where(Account.is_active == True)).all())
+
+    def request_run(self, session: Session, name: str, account_id: Optional[uuid.UUID] = None) -> int:
+        """즉시 실행 요청 저장 (다음 sync 에서 워커 하나가 가져가 실행) → 요청한 계좌 수"""
+        job = self.get(name)
+        if job.run_account is None:
+            raise HTTPException(status_code=400, detail=f"계좌 단위 즉시 실행을 지원하지 않는 작업입니다: {name}")
+        if job.stopping:
+            raise HTTPException(status_code=503, detail="서버가 종료 중입니다")
+        now = datetime.now(KST)
+        account_ids = self._account_ids(session, account_id)
+        for requested in account_ids:
+            session.add(Scheduler_Run_Request(job_name=name, account_id=requested, requested_at=now))
+        session.commit()
+        return len(account_ids)
+
+    def set_paused(self, session: Session, name: str, paused: bool) -> Scheduled_Job:
+        """일시정지/재개를 현재 워커에 바로 적용하고 DB 에 저장 (다른 워커는 다음 sync 에서 반영)"""
+        job = self.get(name)
+        if paused:
+            job.pause()
+        else:
+            job.resume()
+        control = session.get(Scheduler_Job_Control, name)
+        if control is None:
+            control = Scheduler_Job_Control(name=name, updated_at=datetime.now(KST))
+        control.paused = paused
+        control.updated_at = datetime.now(KST)
+        session.add(control)
+        session.commit()
+        return job
+
+    def sync(self, session: Session, node_id: str, timeout_seconds: float = SCHEDULER_NODE_TIMEOUT_SECONDS) -> int:
+        """DB 공유 상태와 동기화 → 가져가 실행한 즉시 실행 요청 수
+
+        1. 저장된 일시정지 상태를 로컬 작업에 반영
+        2. 로컬 작업 상태를 node_id 로 보고 (timeout_seconds 동안 보고가 없는 노드는 정리)
+        3. 대기 중인 즉시 실행 요청을 가져와(다른 워커와 겹치지 않게 잠금 후 삭제) 로컬에서 실행
+        """
+        for control in session.exec(select(Scheduler_Job_Control)).all():
+            job = self.jobs.get(control.name)
+            if job is None or not job.pausable or job.paused == control.paused:
+                continue
+            if control.paused:
+                job.pause()
+            else:
+                job.resume()
+            logger.info(f"작업 {'일시정지' if control.paused else '재개'} 반영 - {job.name}")
+
+        now = datetime.now(KST)
+        for job in self.jobs.values():
+            report = session.get(Scheduler_Job_Report, (node_id, job.name))
+            if report is None:
+                report = Scheduler_Job_Report(node_id=node_id, name=job.name, status={}, reported_at=now)
+            report.status = jsonable_encoder(job.status(include_accounts=True))
+            report.reported_at = now
+            session.add(report)
+        session.exec(delete(Scheduler_Job_Report).where(
+            Scheduler_Job_Report.reported_at < now - timedelta(seconds=timeout_seconds)
+        ))
+        session.commit()
+
+        if self._stop.is_set():
+            return 0
+        requests = session.exec(
+            select(Scheduler_Run_Request)
+            .order_by(Scheduler_Run_Request.requested_at)
+            .limit(SCHEDULER_RUN_CLAIM_LIMIT)
+            .with_for_update(skip_locked=True)
+        ).all()
+        claimed: dict[str, list[uuid.UUID]] = {}
+        for request in requests:
+            claimed.setdefault(request.job_name, []).append(request.account_id)
+            session.delete(request)
+        session.commit()
+
+        triggered = 0
+        for name, account_ids in claimed.items():
+            job = self.jobs.get(name)
+            if job is None or job.run_account is None:
+                logger.warning(f"실행할 수 없는 즉시 실행 요청 무시 - 작업: {name}, {len(account_ids)}건")
+                continue
+            triggered += job.trigger(account_ids)
+        return triggered
+
+    def reports(
+        self,
+        session: Session,
+        node_id: str,
+        name: Optional[str] = None,
+        include_accounts: bool = False,
+        timeout_seconds: float = SCHEDULER_NODE_TIMEOUT_SECONDS,
+    ) -> list[dict[str, Any]]:
+        """모든 노드의 작업 상태 (현재 노드는 보고 대신 지금 상태)"""
+        jobs = [self.get(name)] if name is not None else list(self.jobs.values())
+        statement = select(Scheduler_Job_Report).where(
+            Scheduler_Job_Report.node_id != node_id,
+            Scheduler_Job_Report.reported_at >= datetime.now(KST) - timedelta(seconds=timeout_seconds),
+        )
+        if name is not None:
+            statement = statement.where(Scheduler_Job_Report.name == name)
+        statuses = [{**job.status(include_accounts), "node_id": node_id} for job in jobs]
+        for report in session.exec(statement).all():
+            status = {**report.status, "node_id": report.node_id}
+            if not include_accounts:
+                status["accounts"] = None
+            statuses.append(status)
+        return sorted(statuses, key=lambda status: (status["name"], status["node_id"]))
+
+    def leave(self, session: Session, node_id: str) -> None:
+        """종료 시 현재 노드의 상태 보고 삭제"""
+        session.exec(delete(Scheduler_Job_Report).where(Scheduler_Job_Report.node_id == node_id))
+        session.commit()
+
+
+def save_poll_state(
+    session: Session,
+    token_checks: dict[uuid.UUID, datetime],
+    balance_checks: dict[uuid.UUID, datetime],
+) -> int:
+    """계좌별 마지막 토큰/잔고 체크 시각 저장 → 저장한 계좌 수"""
+    now = datetime.now(KST)
+    account_ids = set(token_checks) | set(balance_checks)
+    existing = {
+        state.account_id: state
+        for state in session.exec(
+            select(Account_Poll_State).where(Account_Poll_State.account_id.in_(account_ids))
+        ).all()
+    } if account_ids else {}
+    for account_id in account_ids:
+        state = existing.get(account_id) or Account_Poll_State(account_id=account_id, updated_at=now)
+        state.last_token_check = token_checks.get(account_id, state.last_token_check)
+        state.last_balance_check = balance_checks.get(account_id, state.last_balance_check)
+        state.updated_at = now
+        session.add(state)
+    session.commit()
+    return len(account_ids)
+
+
+def load_poll_state(session: Session, account_ids: list[uuid.UUID]) -> list[Account_Poll_State]:
+    if not account_ids:
+        return []
+    return list(session.exec(
+        select(Account_Poll_State).where(Account_Poll_State.account_id.in_(account_ids))
+    ).all())
+
+
+job_scheduler = Job_Scheduler()
@@ -0,0 +1,119 @@
+"""스케줄러 노드 간 계좌 폴링 분산
+
+노드마다 scheduler_node 테이블에 heartbeat 를 남기고, 살아 있는 노드 목록으로
+계좌 ID 를 rendezvous(최고 점수) 해시로 배정한다. 노드가 추가/이탈하면 다음 heartbeat 에서
+해당 노드 몫의 계좌만 다른 노드로 옮겨 간다 (전체 재배정 없음).
+배정은 DB 락 없이 각 노드가 같은 규칙으로 계산하므로, 노드 변경 직후 heartbeat 1주기 동안은
+같은 계좌를 두 노드가 조회하거나 잠시 아무도 조회하지 않을 수 있다.
+"""
+import hashlib
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Sequence, TypeVar
+
+from sqlmodel import Session, delete, select
+
+from app.constants import KST, SCHEDULER_NODE_TIMEOUT_SECONDS
+from app.core.config import settings
+from app.models.scheduler import Scheduler_Node
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def shard_score(node_id: str, account_id: uuid.UUID) -> int:
+    """노드-계좌 쌍의 배정 점수 (프로세스/실행과 무관하게 같은 값)"""
+    digest = hashlib.blake2b(f"{node_id}:{account_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def assign_owner(account_id: uuid.UUID, nodes: Sequence[str]) -> str:
+    return max(nodes, key=lambda node_id: shard_score(node_id, account_id))
+
+
+class Shard_Membership:
+    """현재 노드의 멤버십과 계좌 배정"""
+
+    def __init__(
+        self,
+        node_id: str,
+        enabled: bool = False,
+        timeout_seconds: float = SCHEDULER_NODE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.node_id = node_id
+        self.enabled = enabled
+        self.timeout_seconds = timeout_seconds
+        self.nodes: list[str] = [node_id]
+        self.ready = False
+        self.started_at = datetime.now(KST)
+        self.last_heartbeat: Optional[datetime] = None
+
+    def heartbeat(self, session: Session) -> list[str]:
+        """heartbeat 기록, 끊긴 노드 정리 후 살아 있는 노드 목록 갱신"""
+        now = datetime.now(KST)
+        node = session.get(Scheduler_Node, self.node_id)
+        if node is None:
+            node = Scheduler_Node(
+                node_id=self.node_id,
+                hostname=socket.gethostname(),
+                started_at=self.started_at,
+                heartbeat_at=now,
+            )
+        node.heartbeat_at = now
+        session.add(node)
+        session.exec(delete(Scheduler_Node).where(
+            Scheduler_Node.heartbeat_at < now - timedelta(seconds=self.timeout_seconds)
+        ))
+        session.commit()
+
+        nodes = list(session.exec(select(Scheduler_Node.node_id).order_by(Scheduler_Node.node_id)).all())
+        if nodes != self.nodes:
+            logger.info(f"스케줄러 노드 변경 - {len(self.nodes)}개 → {len(nodes)}개: {', '.join(nodes)}")
+        self.nodes = nodes
+        self.ready = True
+        self.last_heartbeat = now
+        return nodes
+
+    def leave(self, session: Session) -> None:
+        """종료 시 즉시 이탈 (다른 노드가 다음 heartbeat 에서 계좌를 이어받음)"""
+        session.exec(delete(Scheduler_Node).where(Scheduler_Node.node_id == self.node_id))
+        session.commit()
+        self.ready = False
+
+    def owns(self, account_id: uuid.UUID) -> bool:
+        if not self.enabled:
+            return True
+        if not self.ready:
+            return False
+        return assign_owner(account_id, self.nodes) == self.node_id
+
+    def assigned(self, accounts: Iterable[T]) -> list[T]:
+        """현재 노드가 맡은 계좌만"""
+        return [account for account in accounts if self.owns(account.id)]
+
+    @property
+    def is_leader(self) -> bool:
+        """노드 하나만 실행해야 하는 작업 담당 (노드 ID 가 가장 작은 노드)"""
+        if not self.enabled:
+            return True
+        return self.ready and bool(self.nodes) and self.nodes[0] == self.node_id
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "node_id": self.node_id,
+            "ready": self.ready,
+            "is_leader": self.is_leader,
+            "nodes": self.nodes,
+            "last_heartbeat": self.last_heartbeat,
+        }
+
+
+shard_membership = Shard_Membership(
+    node_id=settings.SCHEDULER_NODE_ID or f"{socket.gethostname()}-{os.getpid()}",
+    enabled=settings.SCHEDULER_SHARDING_ENABLED,
+)
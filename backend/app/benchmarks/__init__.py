@@ -0,0 +1 @@
+"""증권사 응답 변환 마이크로벤치마크 (python -m app.benchmarks)"""
@@ -0,0 +1,131 @@
+"""증권사 응답 변환 마이크로벤치마크
+
+    python -m app.benchmarks                    # 측정 결과 출력
+    python -m app.benchmarks --check            # baseline.json 대비 회귀 시 종료 코드 1
+    python -m app.benchmarks --update-baseline  # 기준값 갱신
+
+실행 환경마다 CPU 속도가 달라 절대 시간 대신 같은 프로세스에서 잰 기준 작업(순수 파이썬 dict/float 변환)
+대비 배수로 비교한다. 메모리는 tracemalloc 최대 할당량으로 비교한다.
+"""
+import argparse
+import json
+import statistics
+import sys
+import timeit
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+from app.api.services.background_tasks import build_holdings
+from app.api.services.kis_trade_service import extract_trade_rows_KIS, process_trade_data_KIS
+from app.api.services.ls_api import convert_daily_ccld_LS
+from app.api.services.ls_trade_service import extract_trade_rows_LS, process_trade_data_LS
+from app.benchmarks.payloads import kis_balance_payload, kis_daily_ccld_payload, ls_daily_ccld_raw_payload
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.3
+REPEAT = 7
+
+
+def _reference_workload() -> None:
+    rows = [{"qty": str(index), "price": f"{index}.5"} for index in range(2000)]
+    [{"quantity": int(row["qty"]), "amount": float(row["price"]) * 2} for row in rows]
+
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    account_id = str(uuid.uuid4())
+    balance = kis_balance_payload()
+    daily = kis_daily_ccld_payload()
+    ls_raw = ls_daily_ccld_raw_payload()
+    return {
+        "build_holdings": lambda: build_holdings(balance["output1"]),
+        "process_trade_data_KIS": lambda: process_trade_data_KIS(daily, account_id),
+        "process_trade_data_LS": lambda: process_trade_data_LS(daily, account_id),
+        "extract_trade_rows_KIS": lambda: extract_trade_rows_KIS(daily, account_id),
+        "extract_trade_rows_LS": lambda: extract_trade_rows_LS(daily, account_id),
+        "convert_daily_ccld_LS": lambda: convert_daily_ccld_LS(ls_raw),
+    }
+
+
+def _time_per_call(timer: timeit.Timer, number: int) -> float:
+    return timer.timeit(number) / number
+
+
+def measure(func: Callable[[], Any], repeat: int = REPEAT) -> dict[str, float]:
+    """기준 작업 대비 실행 시간 배수와 최대 할당량(KiB)
+
+    기준 작업과 대상 함수를 라운드마다 번갈아 재서 라운드별 배수의 중앙값을 쓴다.
+    측정 중 CPU 클럭이나 다른 프로세스 부하가 바뀌어도 양쪽에 같이 반영된다.
+    """
+    reference, target = timeit.Timer(_reference_workload), timeit.Timer(func)
+    reference_number, _ = reference.autorange()
+    target_number, _ = target.autorange()
+    ratios, seconds = [], []
+    for _ in range(repeat):
+        reference_seconds = _time_per_call(reference, reference_number)
+        seconds.append(_time_per_call(target, target_number))
+        ratios.append(seconds[-1] / reference_seconds)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"relative": statistics.median(ratios), "seconds": min(seconds), "peak_kib": peak / 1024}
+
+
+def run(repeat: int = REPEAT) -> dict[str, Any]:
+    results = {}
+    for name, func in build_cases().items():
+        result = measure(func, repeat)
+        results[name] = {
+            "relative": round(result["relative"], 3),
+            "peak_kib": round(result["peak_kib"], 1),
+            "ms": round(result["seconds"] * 1000, 3),
+        }
+    return {"cases": results}
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """기준 대비 시간 배수 또는 최대 할당량이 허용치를 넘은 항목"""
+    regressions = []
+    for name, expected in baseline["cases"].items():
+        actual = current["cases"].get(name)
+        if actual is None:
+            regressions.append(f"{name}: 측정 항목 없음")
+            continue
+        for metric in ("relative", "peak_kib"):
+            limit = expected[metric] * (1 + tolerance)
+            if actual[metric] > limit:
+                regressions.append(f"{name}.{metric}: {actual[metric]} > {limit:.3f} (기준 {expected[metric]})")
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks", description="증권사 응답 변환 마이크로벤치마크")
+    parser.add_argument("--check", action="store_true", help="기준값 대비 회귀 시 실패")
+    parser.add_argument("--update-baseline", action="store_true", help="측정 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 증가율 (기본 0.3 = 30%%)")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--output", type=Path, default=None, help="측정 결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    current = run(args.repeat)
+    for name, result in current["cases"].items():
+        print(f"{name:<26} {result['ms']:>9.3f} ms  x{result['relative']:<8} {result['peak_kib']:>10.1f} KiB")
+
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"기준값 갱신: {BASELINE_PATH}")
+    if args.check:
+        regressions = compare(current, json.loads(BASELINE_PATH.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"회귀: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,235 @@
+"""벤치마크용 증권사 응답 (실제 응답의 필드 구성/값 형식을 따라 고정 시드로 생성)"""
+import random
+from datetime import date, timedelta
+from typing import Any
+
+HOLDINGS = 100
+FILLS = 1000
+SEED = 20240304
+
+
+def _stock_codes(rng: random.Random, count: int) -> list[str]:
+    return [f"{rng.randrange(1, 400_000):06d}" for _ in range(count)]
+
+
+def kis_balance_payload(holdings: int = HOLDINGS) -> dict[str, Any]:
+    """KIS 주식잔고조회(TTTC8434R) 응답"""
+    rng = random.Random(SEED)
+    output1 = []
+    for index, stock_code in enumerate(_stock_codes(rng, holdings)):
+        quantity = rng.randrange(1, 1_000)
+        avg_price = rng.randrange(1_000, 500_000, 50)
+        price = int(avg_price * rng.uniform(0.7, 1.3)) // 10 * 10
+        purchase, evaluation = avg_price * quantity, price * quantity
+        output1.append({
+            "pdno": stock_code,
+            "prdt_name": f"종목{index:03d}",
+            "trad_dvsn_name": "현금",
+            "bfdy_buy_qty": "0",
+            "bfdy_sll_qty": "0",
+            "thdt_buyqty": str(rng.randrange(0, 10)),
+            "thdt_sll_qty": "0",
+            "hldg_qty": str(quantity),
+            "ord_psbl_qty": str(quantity),
+            "pchs_avg_pric": f"{avg_price:.4f}",
+            "pchs_amt": str(purchase),
+            "prpr": str(price),
+            "evlu_amt": str(evaluation),
+            "evlu_pfls_amt": str(evaluation - purchase),
+            "evlu_pfls_rt": f"{(evaluation - purchase) / purchase * 100:.2f}",
+            "evlu_erng_rt": "0.00000000",
+            "loan_dt": "",
+            "loan_amt": "0",
+            "stln_slng_chgs": "0",
+            "expd_dt": "",
+            "fltt_rt": f"{rng.uniform(-5, 5):.2f}",
+            "bfdy_cprs_icdc": str(rng.randrange(-5_000, 5_000, 10)),
+            "item_mgna_rt_name": "20%",
+            "grta_rt_name": "",
+            "sbst_pric": str(int(price * 0.7)),
+            "stck_loan_unpr": "0.0000",
+        })
+    purchase_total = sum(int(item["pchs_amt"]) for item in output1)
+    eval_total = sum(int(item["evlu_amt"]) for item in output1)
+    return {
+        "ctx_area_fk100": "",
+        "ctx_area_nk100": "",
+        "output1": output1,
+        "output2": [{
+            "dnca_tot_amt": "12345678",
+            "nxdy_excc_amt": "12345678",
+            "prvs_rcdl_excc_amt": "12345678",
+            "cma_evlu_amt": "0",
+            "bfdy_buy_amt": "0",
+            "thdt_buy_amt": "0",
+            "tot_evlu_amt": str(12_345_678 + eval_total),
+            "nass_amt": str(12_345_678 + eval_total),
+            "pchs_amt_smtl_amt": str(purchase_total),
+            "evlu_amt_smtl_amt": str(eval_total),
+            "evlu_pfls_smtl_amt": str(eval_total - purchase_total),
+            "bfdy_tot_asst_evlu_amt": str(12_345_678 + purchase_total),
+            "asst_icdc_amt": "0",
+            "asst_icdc_erng_rt": "0.00000000",
+        }],
+        "rt_cd": "0",
+        "msg_cd": "KIOK0510",
+        "msg1": "조회가 완료되었습니다",
+    }
+
+
+def kis_daily_ccld_payload(fills: int = FILLS) -> dict[str, Any]:
+    """KIS 주식일별주문체결조회(TTTC8001R) 응답 (LS 변환 결과와 같은 필드 구성)"""
+    rng = random.Random(SEED + 1)
+    codes = _stock_codes(rng, 50)
+    start = date(2024, 3, 4)
+    output1 = []
+    for index in range(fills):
+        quantity = rng.randrange(1, 200)
+        price = rng.randrange(1_000, 500_000, 50)
+        buy = rng.random() < 0.5
+        output1.append({
+            "ord_dt": (start + timedelta(days=index % 5)).strftime("%Y%m%d"),
+            "ord_gno_brno": "06010",
+            "odno": f"{index:010d}",
+            "orgn_odno": "",
+            "ord_dvsn_name": "지정가",
+            "sll_buy_dvsn_cd": "02" if buy else "01",
+            "sll_buy_dvsn_cd_name": "현금매수" if buy else "현금매도",
+            "pdno": rng.choice(codes),
+            "prdt_name": "종목",
+            "ord_qty": str(quantity),
+            "ord_unpr": str(price),
+            "ord_tmd": f"{9 + index % 6:02d}{rng.randrange(60):02d}{rng.randrange(60):02d}",
+            "tot_ccld_qty": str(quantity),
+            "avg_prvs": str(price),
+            "cncl_yn": "",
+            "tot_ccld_amt": str(quantity * price),
+            "loan_dt": "",
+            "ord_dvsn_cd": "00",
+            "cncl_cfrm_qty": "0",
+            "rmn_qty": "0",
+            "rjct_qty": "0",
+            "ccld_cndt_name": "없음",
+            "infm_tmd": "",
+            "ctac_tlno": "",
+            "prdt_type_cd": "300",
+            "excg_dvsn_cd": "02",
+            "inqr_ip_addr": "",
+            "cpbc_ordp_ord_rcit_dvsn_cd": "",
+            "cpbc_ordp_infm_mthd_dvsn_cd": "",
+            "cpbc_ordp_mtrl_dvsn_cd": "",
+            "ord_orgno": "",
+            "rsvn_ord_end_dt": "",
+            "excg_id_dvsn_cd": "KRX",
+            "stpm_cndt_pric": "0",
+            "stpm_efct_occr_dtmd": "",
+            "cmsn_amt": str(int(quantity * price * 0.00015)),
+            "tax_sum_amt": "0" if buy else str(int(quantity * price * 0.0018)),
+            "bnspl_amt": "0" if buy else str(rng.randrange(-100_000, 100_000)),
+        })
+    total_qty = sum(int(row["tot_ccld_qty"]) for row in output1)
+    total_amount = sum(int(row["tot_ccld_amt"]) for row in output1)
+    return {
+        "ctx_area_fk100": "",
+        "ctx_area_nk100": "",
+        "output1": output1,
+        "output2": {
+            "tot_ord_qty": str(total_qty),
+            "tot_ccld_qty": str(total_qty),
+            "tot_ccld_amt": str(total_amount),
+            "prsm_tlex_smtl": "0",
+            "pchs_avg_pric": f"{total_amount / total_qty:.4f}",
+        },
+        "rt_cd": "0",
+        "msg_cd": "KIOK0460",
+        "msg1": "조회가 완료되었습니다.",
+    }
+
+
+def ls_daily_ccld_raw_payload(fills: int = FILLS) -> dict[str, Any]:
+    """LS 계좌 거래내역(CDPCQ04700) 원본 응답"""
+    rng = random.Random(SEED + 2)
+    codes = _stock_codes(rng, 50)
+    start = date(2024, 3, 4)
+    rows = []
+    for index in range(fills):
+        quantity = rng.randrange(1, 200)
+        price = float(rng.randrange(1_000, 500_000, 50))
+        trade_date = (start + timedelta(days=index % 5)).strftime("%Y%m%d")
+        rows.append({
+            "AcntNo": "20012345601",
+            "TrdDt": trade_date,
+            "TrdNo": index + 1,
+            "TpCodeNm": "매수" if index % 2 else "매도",
+            "SmryNo": "",
+            "SmryNm": "",
+            "CancTpNm": "",
+            "TrdQty": quantity,
+            "Trtax": 0,
+            "FcurrAdjstAmt": 0,
+            "AdjstAmt": quantity * price,
+            "OvdSum": 0,
+            "DpsBfbalAmt": 0,
+            "SellPldgRfundAmt": 0,
+            "DpspdgLoanBfbalAmt": 0,
+            "TrdmdaNm": "HTS",
+            "OrgTrdNo": 0,
+            "IsuNm": "종목",
+            "IsuNo": rng.choice(codes),
+            "TrdUprc": price,
+            "CmsnAmt": round(quantity * price * 0.00015),
+            "FcurrCmsnAmt": 0,
+            "RfundDiffAmt": 0,
+            "RepayAmtSum": 0,
+            "SecCrbalQty": quantity,
+            "CslLoanRfundIntrstAmt": 0,
+            "DpspdgLoanCrbalAmt": 0,
+            "TrxTime": f"{9 + index % 6:02d}{rng.randrange(60):02d}{rng.randrange(60):02d}00",
+            "Inouno": 0,
+            "IsuNo2": "",
+            "TrdAmt": quantity * price,
+            "ChckAmt": 0,
+            "TaxSumAmt": 0,
+            "FcurrTaxSumAmt": 0,
+            "IntrstUtlfee": 0,
+            "MnyDvdAmt": 0,
+            "RcvblOcrAmt": 0,
+            "TrxBrnNo": "001",
+            "TrxBrnNm": "본점",
+            "DpspdgLoanAmt": 0,
+            "DpspdgLoanRfundAmt": 0,
+            "BasePrc": price,
+            "DpsCrbalAmt": 12_345_678,
+            "BoaAmt": 0,
+            "MnyoutAbleAmt": 12_345_678,
+            "BcrLoanOcrAmt": 0,
+            "BcrLoanBfbalAmt": 0,
+            "BnsBasePrc": price,
+            "TaxchrBasePrc": price,
+            "TrdUnit": 0,
+            "BalUnit": quantity,
+            "EvrTax": 0,
+            "EvalAmt": quantity * price,
+            "BnsplAmt": 0,
+            "OppAcntNm": "",
+            "OppAcntNo": "",
+            "LoanRfundAmt": 0,
+            "LoanIntrstAmt": 0,
+            "AskpsnNm": "",
+            "OrdDt": trade_date,
+            "TrdIntrstRate": 0,
+            "RdctCmsn": 0,
+            "Ictax": 0,
+            "Ihtax": 0,
+            "ExecTax": 0,
+            "PdptnCode": "01",
+        })
+    return {
+        "rsp_cd": "00000",
+        "rsp_msg": "조회가 완료되었습니다.",
+        "CDPCQ04700OutBlock1": {"RecCnt": 1, "QryTp": "0", "AcntNo": "20012345601"},
+        "CDPCQ04700OutBlock2": {"RecCnt": 1, "AcntNm": "홍길동"},
+        "CDPCQ04700OutBlock3": rows,
+        "CDPCQ04700OutBlock4": {"RecCnt": 1, "PnlSumAmt": 0, "CtrctAsm": 0, "CmsnAmtSumAmt": 0},
+        "CDPCQ04700OutBlock5": {"RecCnt": 1, "SellQty": 0, "BuyQty": 0, "SellAmt": 0, "BuyAmt": 0},
+    }
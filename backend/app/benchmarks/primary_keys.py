@@ -0,0 +1,126 @@
+"""PK 방식별 INSERT 처리량/인덱스 크기 비교 (추가 위주 테이블용)
+
+    python -m app.benchmarks.primary_keys                  # 설정된 DB(Postgres)에서 측정
+    python -m app.benchmarks.primary_keys --rows 1000000   # 행 수 지정
+
+분별 잔고와 같은 모양의 임시 테이블을 PK 방식(uuid4 / uuid7 / bigint identity)별로 만들어
+같은 행을 배치 INSERT 한 뒤 초당 행 수와 PK 인덱스/테이블 크기를 비교하고 테이블을 지운다.
+인덱스 크기는 Postgres 에서만 잰다 (다른 DB 는 처리량만 출력).
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from sqlalchemy import JSON, TIMESTAMP, BigInteger, Column, Float, Identity, Integer, MetaData, Table, Uuid, text
+from sqlalchemy.engine import Engine
+
+from app.constants import KST
+from app.models.common import uuid7
+
+ID_SCHEMES: dict[str, tuple[Callable[[], Column], Optional[Callable[[], uuid.UUID]]]] = {
+    "uuid4": (lambda: Column("id", Uuid, primary_key=True), uuid.uuid4),
+    "uuid7": (lambda: Column("id", Uuid, primary_key=True), uuid7),
+    # SQLite 는 INTEGER PK 만 자동 증가
+    "bigint": (lambda: Column("id", BigInteger().with_variant(Integer, "sqlite"), Identity(), primary_key=True), None),
+}
+
+
+def build_table(metadata: MetaData, scheme: str) -> Table:
+    id_column, _ = ID_SCHEMES[scheme]
+    return Table(
+        f"pk_benchmark_{scheme}",
+        metadata,
+        id_column(),
+        Column("account_id", Uuid, nullable=False),
+        Column("timestamp", TIMESTAMP(timezone=True), nullable=False),
+        Column("total_assets", Float, nullable=False),
+        Column("holdings", JSON),
+    )
+
+
+def build_rows(rows: int, accounts: int) -> list[dict[str, Any]]:
+    """계좌 accounts 개가 1분마다 스냅샷을 남기는 순서의 행"""
+    account_ids = [uuid.uuid4() for _ in range(accounts)]
+    started = datetime.now(KST) - timedelta(minutes=rows // accounts + 1)
+    return [
+        {
+            "account_id": account_ids[index % accounts],
+            "timestamp": started + timedelta(minutes=index // accounts),
+            "total_assets": 10_000_000 + index,
+            "holdings": [{"stock_code": "005930", "quantity": index % 100}],
+        }
+        for index in range(rows)
+    ]
+
+
+def _relation_sizes(engine: Engine, table: Table) -> dict[str, Optional[float]]:
+    if engine.dialect.name != "postgresql":
+        return {"index_mib": None, "table_mib": None}
+    with engine.connect() as connection:
+        index_bytes, table_bytes = connection.execute(text(
+            "SELECT pg_relation_size(indexrelid), pg_relation_size(indrelid) "
+            "FROM pg_index WHERE indrelid = CAST(:table AS regclass) AND indisprimary"
+        ), {"table": table.name}).one()
+    return {"index_mib": round(index_bytes / 2**20, 2), "table_mib": round(table_bytes / 2**20, 2)}
+
+
+def measure(engine: Engine, scheme: str, rows: list[dict[str, Any]], batch_size: int) -> dict[str, Any]:
+    """scheme PK 테이블에 rows 를 batch_size 씩 INSERT (행마다 id 생성 포함)"""
+    metadata = MetaData()
+    table = build_table(metadata, scheme)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    _, new_id = ID_SCHEMES[scheme]
+    try:
+        started = time.perf_counter()
+        for offset in range(0, len(rows), batch_size):
+            batch = rows[offset:offset + batch_size]
+            if new_id is not None:
+                batch = [{"id": new_id(), **row} for row in batch]
+            with engine.begin() as connection:
+                connection.execute(table.insert(), batch)
+        seconds = time.perf_counter() - started
+        if engine.dialect.name == "postgresql":
+            with engine.connect() as connection:
+                connection.execute(text(f"VACUUM ANALYZE {table.name}").execution_options(isolation_level="AUTOCOMMIT"))
+        return {"rows_per_second": round(len(rows) / seconds), "seconds": round(seconds, 3), **_relation_sizes(engine, table)}
+    finally:
+        metadata.drop_all(engine)
+
+
+def run(engine: Engine, rows: int, accounts: int, batch_size: int) -> dict[str, Any]:
+    data = build_rows(rows, accounts)
+    return {
+        "rows": rows,
+        "batch_size": batch_size,
+        "schemes": {scheme: measure(engine, scheme, data, batch_size) for scheme in ID_SCHEMES},
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.primary_keys", description="PK 방식별 INSERT/인덱스 크기 비교")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--accounts", type=int, default=500, help="행을 나눠 가질 계좌 수")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", type=Path, default=None, help="측정 결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    from app.core.db import engine
+
+    result = run(engine, args.rows, args.accounts, args.batch_size)
+    for scheme, measured in result["schemes"].items():
+        sizes = "" if measured["index_mib"] is None else f"  PK 인덱스 {measured['index_mib']:>8.2f} MiB  테이블 {measured['table_mib']:>8.2f} MiB"
+        print(f"{scheme:<7} {measured['rows_per_second']:>10} rows/s{sizes}")
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2, default=str) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
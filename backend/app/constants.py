@@ -8,17 +8,62 @@ UTC = timezone('UTC')        # UTC 시간대
 # 토큰 관련 설정
 TOKEN_REFRESH_THRESHOLD_MINUTES = 30  # 토큰 만료 전 갱신 시작 시간(분)
 TOKEN_CHECK_INTERVAL_SECONDS = 60     # 토큰 체크 주기(초)
+TOKEN_ISSUE_RATE_PER_SECOND = 1       # 토큰 발급 요청 속도 (전체 계좌 합산, KIS 발급 제한 대응)
 
 # 거래 시간 설정
 MARKET_START_TIME = time(9, 0)        # 장 시작 시간 (09:00)
 MARKET_END_TIME = time(15, 30)        # 장 종료 시간 (15:30)
 
-# 잔고 체크 설정
-BALANCE_CHECK_INTERVAL_SECONDS = 60   # 잔고 체크 주기(초)
+# 잔고 체크 설정 (잔고 사이 평가금액은 시세 캐시로 재평가)
+BALANCE_CHECK_INTERVAL_SECONDS = 300  # 장중 분별 잔고 최대 수집 주기(초, 적응형 주기가 더 길어도 이 주기로 조회)
+
+# 적응형 잔고 조회 주기 설정 (최소/최대 주기는 settings.POLL_INTERVAL_MIN/MAX_SECONDS)
+POLL_ACTIVE_FILLS = 5                 # 하루 체결/주문이 이 수 이상이면 최소 주기
+POLL_HOLDINGS_REFERENCE = 20          # 보유종목이 이 수 이상이면 보유종목 점수 최대
+POLL_HOLDINGS_WEIGHT = 0.5            # 보유종목 점수 최대치 (보유만으로는 최소 주기까지 줄이지 않음)
+POLL_VOLATILITY_REFERENCE = 0.002     # 스냅샷 간 총평가금액 변화율 표준편차가 이 값 이상이면 최소 주기
+POLL_ASSET_SAMPLES = 30               # 변동성 계산에 쓰는 최근 스냅샷 수
+POLL_VIEW_WINDOW_SECONDS = 120        # 마지막 조회 API 호출 후 조회 중으로 보는 시간(초)
+POLL_VIEW_WRITE_SECONDS = 30          # 같은 계좌 조회 시각을 DB 에 다시 기록하기까지의 최소 간격(초)
+
+# 시세 캐시 설정
+QUOTE_REFRESH_INTERVAL_SECONDS = 5    # 보유종목 시세 갱신 주기(초)
+QUOTE_REQUEST_INTERVAL_SECONDS = 0.06 # 앱키당 시세 요청 간격(초, 초당 20건 제한)
+QUOTE_STALE_SECONDS = 60              # 시세 유효시간(초)
 
 # 백그라운드 작업 설정
 TOKEN_CHECK_INTERVAL = 60  # 토큰 체크 간격(초)
-BALANCE_CHECK_INTERVAL = 60  # 잔고 체크 간격(초)
+BALANCE_CHECK_INTERVAL = 5  # 잔고 순회 간격(초, 계좌별 조회 시점은 적응형 주기와 계좌별 위상으로 결정)
+
+# 스케줄러 노드 분산 설정 (SCHEDULER_SHARDING_ENABLED 사용 시)
+SCHEDULER_HEARTBEAT_SECONDS = 10       # 노드 heartbeat 주기(초)
+SCHEDULER_NODE_TIMEOUT_SECONDS = 30    # heartbeat 가 끊긴 노드를 제외하기까지의 시간(초)
+
+# 스케줄러 관리 API 설정 (모든 워커가 DB 를 통해 같은 상태를 봄)
+SCHEDULER_SYNC_SECONDS = 5             # 일시정지/상태/즉시 실행 요청 DB 동기화 주기(초, 워커 간 공유)
+SCHEDULER_RUN_CLAIM_LIMIT = 100        # 동기화 1회에 가져갈 즉시 실행 요청 수
+SHUTDOWN_DRAIN_SECONDS = 20            # 종료 시 진행 중인 순회/즉시 실행을 기다리는 최대 시간(초)
+
+# 분별 잔고 보존/아카이브 설정
+MINUTELY_RETENTION_DAYS = 30          # DB에 원본 분별 데이터를 보관하는 기간(일)
+MINUTELY_ARCHIVE_HOUR = 4             # 아카이브 작업 실행 시각 (KST, 시)
+MINUTELY_ARCHIVE_COMPRESSION = "zstd" # Parquet 컬럼 압축 방식
+
+# 포트폴리오 분석 설정
+ANALYTICS_DEFAULT_LOOKBACK_DAYS = 30     # 기본 분석 기간(일)
+ANALYTICS_ROLLING_WINDOW = 60            # 롤링 변동성 윈도우(스냅샷 개수)
+ANALYTICS_CASH_FLOW_THRESHOLD = 0.01     # 입출금으로 간주할 원금 변동 비율 (직전 총평가금액 대비)
+ANALYTICS_TRADING_SECONDS_PER_YEAR = 252 * 6.5 * 3600  # 연환산용 연간 거래시간(초)
+ANALYTICS_CACHE_SIZE = 256               # 분석 결과 캐시 최대 개수
+
+# API 응답 직렬화 설정
+HISTORY_CACHE_SIZE = 256                 # 직렬화된 분별 이력 응답 캐시 최대 개수
+HISTORY_CACHE_TTL_SECONDS = 300          # 이력 응답 캐시 유효시간(초, 신규 분별 잔고 저장 시 즉시 무효화)
+SERIALIZATION_SAMPLE_SIZE = 1000         # 라우트별 직렬화 시간 통계에 사용할 최근 응답 수
+LISTING_COUNT_ESTIMATE_MIN_ROWS = 100_000  # 조건 없는 목록 건수를 통계 추정치로 대신할 최소 행 수
+
+# 포지션 원장 설정
+POSITION_SNAPSHOT_INTERVAL_FILLS = 200   # 포지션 스냅샷 간격(체결 건수)
 
 # API 관련 설정
 KIS_API_BASE_URL = {
@@ -29,8 +74,12 @@ KIS_API_BASE_URL = {
 # KIS API 엔드포인트
 KIS_API_ENDPOINTS = {
     "token": "/oauth2/tokenP",                    # 토큰 발급
+    "approval": "/oauth2/Approval",               # 웹소켓 접속키 발급
     "balance": "/uapi/domestic-stock/v1/trading/inquire-balance",  # 잔고조회
-    "daily_trades": "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"  # 일별거래내역
+    "daily_trades": "/uapi/domestic-stock/v1/trading/inquire-daily-ccld",  # 일별거래내역
+    "price": "/uapi/domestic-stock/v1/quotations/inquire-price",  # 주식현재가 시세
+    "order": "/uapi/domestic-stock/v1/trading/order-cash",  # 현금 주문
+    "hashkey": "/uapi/hashkey"                    # 요청 본문 해시키 발급
 }
 
 # KIS API 트랜잭션 ID
@@ -42,6 +91,18 @@ KIS_API_TR_ID = {
     "daily_trades": {
         "paper": "VTTC8001R",  # 모의투자 일별거래내역
         "live": "TTTC8001R"    # 실전투자 일별거래내역
+    },
+    "price": {
+        "paper": "FHKST01010100",  # 모의투자 주식현재가 시세
+        "live": "FHKST01010100"    # 실전투자 주식현재가 시세
+    },
+    "order_buy": {
+        "paper": "VTTC0802U",  # 모의투자 현금 매수주문
+        "live": "TTTC0802U"    # 실전투자 현금 매수주문
+    },
+    "order_sell": {
+        "paper": "VTTC0801U",  # 모의투자 현금 매도주문
+        "live": "TTTC0801U"    # 실전투자 현금 매도주문
     }
 }
 
@@ -70,9 +131,62 @@ KIS_API_PARAMS = {
         "INQR_DVSN_2": "",             # 조회구분2
         "CTX_AREA_FK100": "",          # 연속조회검색조건
         "CTX_AREA_NK100": ""           # 연속조회키
+    },
+    "price": {
+        "FID_COND_MRKT_DIV_CODE": "J"  # 시장분류코드 (주식)
     }
 }
 
+# 주문 설정
+ORDER_HTTP_POOL_SIZE = 10             # 브로커별 주문용 keep-alive 연결 수
+ORDER_KEEPALIVE_SECONDS = 30          # 주문용 연결 유지 요청 주기(초)
+ORDER_REQUEST_TIMEOUT_SECONDS = 5     # 주문 요청 타임아웃(초)
+ORDER_HASHKEY_CACHE_SIZE = 1024       # 해시키 캐시 최대 개수
+ORDER_LATENCY_SAMPLE_SIZE = 1000      # 지연시간 통계에 사용할 최근 주문 수
+ORDER_RATE_LIMIT_PER_SECOND = {       # 앱키당 초당 주문 전송 한도
+    "paper": 2,
+    "live": 15
+}
+BASKET_MAX_CONCURRENCY = 32           # 바스켓 주문 동시 전송 계좌 수
+
+# 분할 주문(TWAP/VWAP) 설정
+SCHEDULE_MAX_SLICES = 390             # 모주문당 최대 분할 수
+SCHEDULE_PROFILE_BUCKET_MINUTES = 30  # 거래량 프로파일 구간 길이(분)
+SCHEDULE_MAX_CONCURRENCY = 8          # 예정 시각이 된 자식주문 동시 전송 수
+SCHEDULE_CLAIM_TIMEOUT_SECONDS = 60   # 전송 중(sending) 상태가 이보다 오래되면 중단된 전송으로 보고 복구
+SCHEDULE_VOLUME_PROFILE = (           # 장중 30분 구간별 거래량 비중 (09:00~15:30, 장 초반/마감 집중)
+    0.14, 0.09, 0.07, 0.06, 0.055, 0.05, 0.05,
+    0.05, 0.055, 0.06, 0.07, 0.09, 0.16
+)
+
+# 모의 체결 엔진 설정 (PAPER_TRADING_SIMULATOR 사용 시 모의투자 계좌에 적용)
+PAPER_INITIAL_CASH = 100_000_000      # 계좌별 초기 예수금
+PAPER_TOKEN_TTL_SECONDS = 86400       # 모의 접근토큰 유효기간(초)
+PAPER_FEED_REPLAY_SPEED = 1.0         # 시세 재생 배속 (0 이하면 대기 없이 재생)
+
+# 스텁 게이트웨이 기본값 (부하 테스트용, 런타임에 /stub/config 로 변경 가능)
+STUB_LATENCY_MS = 50                  # 응답 지연 중앙값(ms)
+STUB_LATENCY_P99_MS = 300             # 응답 지연 p99(ms, 로그정규분포)
+STUB_ERROR_RATE = 0.0                 # 5xx 오류 비율
+STUB_RATE_LIMIT_PER_SECOND = 20       # 앱키당 초당 허용 요청 수 (0 이면 무제한)
+STUB_HOLDINGS_PER_ACCOUNT = 20        # 계좌별 보유종목 수
+STUB_FILLS_PER_DAY = 10               # 계좌별 일 체결 건수
+
+# KIS 실시간 웹소켓 설정
+KIS_WS_URL = {
+    "paper": "ws://ops.koreainvestment.com:31000",  # 모의투자 웹소켓 URL
+    "live": "ws://ops.koreainvestment.com:21000"    # 실전투자 웹소켓 URL
+}
+KIS_WS_TR_ID = {
+    "price": "H0STCNT0"  # 국내주식 실시간체결가
+}
+REALTIME_MAX_SYMBOLS_PER_SESSION = 41  # 세션당 실시간 등록 가능 종목 수
+REALTIME_QUEUE_SIZE = 1000             # 구독자별 체결 큐 크기 (초과 시 오래된 체결부터 버림)
+REALTIME_RECONNECT_SECONDS = 5         # 세션 끊김 시 재연결 대기(초)
+REALTIME_AUTH_TIMEOUT_SECONDS = 5      # 연결 후 첫 메시지로 토큰을 받을 때까지 대기(초)
+REALTIME_APPROVAL_KEY_TTL_SECONDS = 82800  # 웹소켓 접속키 재발급 주기(초, 유효기간 24시간보다 1시간 일찍)
+BROKER_REQUEST_TIMEOUT_SECONDS = 10    # 주문 외 브로커 요청(접속키/시세 등) 타임아웃(초)
+
 # LS API 관련 설정
 LS_API_BASE_URL = {
     "paper": "https://openapi.ls-sec.co.kr:8080",  # 모의투자 API URL
@@ -83,13 +197,15 @@ LS_API_BASE_URL = {
 LS_API_ENDPOINTS = {
     "token": "/oauth2/token",           # 토큰 발급
     "balance": "/stock/accno",  # 잔고조회
-    "daily_trades": "/stock/accno/trades"  # 거래내역조회
+    "daily_trades": "/stock/accno/trades",  # 거래내역조회
+    "order": "/stock/order"     # 현물주문
 }
 
 # LS API 트랜잭션 코드
 LS_API_TR_ID = {
     "balance": "t0424",        # 잔고조회 TR 코드
-    "daily_trades": "CDPCQ04700"  # 거래내역조회 TR 코드
+    "daily_trades": "CDPCQ04700",  # 거래내역조회 TR 코드
+    "order": "CSPAT00601"      # 현물주문 TR 코드
 }
 
 # LS API 파라미터
@@ -1,4 +1,6 @@
+import os
 import secrets
+import uuid
 import warnings
 from typing import Annotated, Any, Literal
 
@@ -92,6 +94,60 @@ class Settings(BaseSettings):
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
 
+    # 보존기간이 지난 분별 잔고를 저장할 로컬 아카이브 경로
+    MINUTELY_ARCHIVE_DIR: str = "archive"
+
+    # 서버 워커 프로세스 수 (uvicorn 과 같은 환경변수, Dockerfile 기본 4)
+    WEB_CONCURRENCY: int = 1
+    # 모의투자 계좌를 증권사 모의서버 대신 내장 체결 엔진으로 처리 (오프라인/CI/부하 테스트용)
+    # 엔진 상태(예수금/잔고/미체결)가 프로세스 메모리에 있으므로 워커 1개에서만 허용
+    PAPER_TRADING_SIMULATOR: bool = False
+    # 체결 엔진에 재생할 시세 CSV (timestamp,stock_code,price)
+    PAPER_TRADING_PRICE_FEED: str | None = None
+    # 모든 KIS/LS 요청을 로컬 스텁 게이트웨이로 보냄 (부하 테스트 전용, 예: http://localhost:8100)
+    BROKER_STUB_URL: str | None = None
+    # 계좌별 잔고 조회 주기 범위 (활동이 많을수록 최소 주기에 가까워짐)
+    POLL_INTERVAL_MIN_SECONDS: int = 60
+    POLL_INTERVAL_MAX_SECONDS: int = 900
+    # 여러 스케줄러 노드가 계좌 폴링을 나눠 맡음 (heartbeat 테이블 + 계좌 ID 해시 배정)
+    SCHEDULER_SHARDING_ENABLED: bool = False
+    # 노드 식별자 (미지정 시 호스트명-프로세스ID)
+    SCHEDULER_NODE_ID: str | None = None
+    # 실시간 체결가 세션에 쓸 공용(서비스) KIS 계좌 ID (쉼표 구분, 비우면 구독자 본인 계좌의 접속키만 사용)
+    REALTIME_SERVICE_ACCOUNT_IDS: Annotated[
+        list[uuid.UUID] | str, BeforeValidator(parse_cors)
+    ] = []
+    # Prometheus 지표 노출 (/metrics, 기본 꺼짐). METRICS_TOKEN 을 지정하면 Bearer 토큰으로 요구
+    # 여러 워커로 실행할 때는 PROMETHEUS_MULTIPROC_DIR 이 있어야 워커 지표가 합쳐짐 (scripts/start.sh)
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str | None = None
+    # OpenTelemetry 추적 내보내기 (none/console/file/otlp)
+    OTEL_TRACES_EXPORTER: Literal["none", "console", "file", "otlp"] = "none"
+    OTEL_TRACES_FILE: str = "traces.jsonl"
+    OTEL_EXPORTER_OTLP_ENDPOINT: str | None = None
+
+    @model_validator(mode="after")
+    def _check_paper_trading_workers(self) -> Self:
+        if self.PAPER_TRADING_SIMULATOR and self.WEB_CONCURRENCY > 1:
+            raise ValueError(
+                "PAPER_TRADING_SIMULATOR keeps engine state in process memory and "
+                f"requires a single worker (WEB_CONCURRENCY=1, got {self.WEB_CONCURRENCY})"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def _check_metrics_exposure(self) -> Self:
+        if not self.METRICS_ENABLED:
+            return self
+        if not self.METRICS_TOKEN and self.ENVIRONMENT != "local":
+            raise ValueError("METRICS_ENABLED requires METRICS_TOKEN outside the local environment")
+        if self.WEB_CONCURRENCY > 1 and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            raise ValueError(
+                "METRICS_ENABLED with multiple workers requires PROMETHEUS_MULTIPROC_DIR, "
+                "otherwise /metrics returns a single worker's counters"
+            )
+        return self
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
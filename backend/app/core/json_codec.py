@@ -0,0 +1,161 @@
+"""orjson 기반 JSON 인코딩/디코딩과 직렬화 시간 측정
+
+증권사 응답 디코딩(decode_response)과 API 응답 직렬화(Timed_JSON_Response)에 쓴다.
+직렬화 시간은 응답의 Server-Timing 헤더와 라우트별 통계(get_serialization_stats)로 확인한다.
+"""
+import time
+from collections import deque
+from decimal import Decimal
+from typing import Any, Callable, Coroutine, Optional
+
+import numpy as np
+import orjson
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from opentelemetry.trace import SpanKind
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.constants import SERIALIZATION_SAMPLE_SIZE
+from app.core.tracing import set_span_attributes, traced
+
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        # FastAPI jsonable_encoder 와 같은 규칙 (소수부가 없으면 정수)
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"JSON 직렬화 불가 타입: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=JSON_OPTIONS)
+
+
+loads = orjson.loads
+
+
+def decode_response(response: Any) -> Any:
+    """requests/httpx 응답 본문 디코딩 (response.json() 대체)
+
+    현재 span(증권사 호출)에 상태 코드, 응답 헤더 수신까지 걸린 시간(연결/TLS 포함), 본문 크기를 남긴다.
+    """
+    content = response.content
+    elapsed = getattr(response, "elapsed", None)
+    set_span_attributes(**{
+        "http.status_code": response.status_code,
+        "http.response_size": len(content),
+        **({"http.elapsed_ms": elapsed.total_seconds() * 1000} if elapsed is not None else {}),
+    })
+    with traced("json.decode"):
+        return orjson.loads(content)
+
+
+class Serialization_Stats:
+    """라우트별 최근 직렬화 시간과 캐시 적중 수"""
+
+    def __init__(self, sample_size: int = SERIALIZATION_SAMPLE_SIZE) -> None:
+        self.sample_size = sample_size
+        self._samples: dict[str, deque[float]] = {}
+        self._cache_hits: dict[str, int] = {}
+
+    def record(self, route: str, duration_ms: float, cache_hit: bool = False) -> None:
+        samples = self._samples.get(route)
+        if samples is None:
+            samples = self._samples[route] = deque(maxlen=self.sample_size)
+        samples.append(duration_ms)
+        if cache_hit:
+            self._cache_hits[route] = self._cache_hits.get(route, 0) + 1
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        result = {}
+        for route, samples in self._samples.items():
+            values = np.fromiter(samples, dtype=np.float64)
+            p50, p99 = np.percentile(values, [50, 99]).tolist()
+            result[route] = {
+                "count": int(values.size),
+                "cache_hits": self._cache_hits.get(route, 0),
+                "p50_ms": p50,
+                "p99_ms": p99,
+                "max_ms": float(values.max()),
+            }
+        return result
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._cache_hits.clear()
+
+
+serialization_stats = Serialization_Stats()
+
+
+def get_serialization_stats() -> dict[str, dict[str, Any]]:
+    return serialization_stats.summary()
+
+
+def _add_server_timing(response: Response, duration_ms: float, cache_hit: bool) -> None:
+    response.headers.append("server-timing", f"serialize;dur={duration_ms:.3f}")
+    if cache_hit:
+        response.headers.append("server-timing", 'cache;desc="hit"')
+
+
+class Timed_JSON_Response(JSONResponse):
+    """orjson 으로 렌더링하고 렌더링 시간을 기록하는 기본 응답 클래스"""
+
+    serialization_ms: float = 0.0
+    cache_hit: bool = False
+
+    def __init__(self, content: Any, status_code: int = 200, **kwargs: Any) -> None:
+        super().__init__(content, status_code=status_code, **kwargs)
+        _add_server_timing(self, self.serialization_ms, self.cache_hit)
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        self.serialization_ms = (time.perf_counter() - started) * 1000
+        return body
+
+
+class Serialized_JSON_Response(Response):
+    """이미 직렬화된 JSON 바이트 응답 (캐시 적중 시 직렬화 생략)"""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        body: bytes,
+        serialization_ms: float = 0.0,
+        cache_hit: bool = False,
+        status_code: int = 200,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(content=body, status_code=status_code, **kwargs)
+        self.serialization_ms = serialization_ms
+        self.cache_hit = cache_hit
+        _add_server_timing(self, serialization_ms, cache_hit)
+
+
+class Timed_Route(APIRoute):
+    """응답의 직렬화 시간을 라우트 경로별로 집계하고 요청마다 추적 span 을 남기는 라우트 클래스"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        route = f"{','.join(sorted(self.methods))} {self.path_format}"
+
+        async def timed_handler(request: Request) -> Response:
+            with traced(route, kind=SpanKind.SERVER, **{"http.route": self.path_format}) as span:
+                response = await handler(request)
+                duration: Optional[float] = getattr(response, "serialization_ms", None)
+                if duration is not None:
+                    cache_hit = getattr(response, "cache_hit", False)
+                    serialization_stats.record(route, duration, cache_hit)
+                    span.set_attributes({"serialization_ms": duration, "cache_hit": cache_hit})
+            return response
+
+        return timed_handler
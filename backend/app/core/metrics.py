@@ -0,0 +1,194 @@
+"""Prometheus 지표 (/metrics)
+
+증권사 호출 지연, 토큰 갱신, 백그라운드 순회 시간/지연, DB flush, 캐시 적중을 수집한다.
+여러 워커로 실행할 때는 PROMETHEUS_MULTIPROC_DIR 을 지정하면 워커 지표를 합쳐 노출한다.
+"""
+import functools
+import inspect
+import os
+import secrets
+import time
+from typing import Any, Callable, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from opentelemetry.trace import SpanKind
+from starlette.responses import Response
+
+from app.core.tracing import traced
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+BROKER_REQUEST_SECONDS = Histogram(
+    "broker_request_seconds",
+    "증권사 API 호출 지연(초)",
+    ["broker", "endpoint", "acnt_type", "status"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+TOKEN_REFRESHES = Counter(
+    "broker_token_refreshes_total",
+    "접근토큰 발급 요청 수",
+    ["broker", "acnt_type", "status"],
+)
+SWEEP_SECONDS = Histogram(
+    "background_sweep_seconds",
+    "백그라운드 루프 1회 순회 시간(초)",
+    ["loop"],
+    buckets=(0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+SWEEP_LAG_SECONDS = Gauge(
+    "background_sweep_lag_seconds",
+    "예정 시각 대비 마지막 순회 시작 지연(초)",
+    ["loop"],
+    multiprocess_mode="max",
+)
+SWEEP_ACCOUNTS = Counter(
+    "background_sweep_accounts_total",
+    "순회에서 처리한 계좌 수",
+    ["loop", "status"],
+)
+DB_FLUSH_SECONDS = Histogram(
+    "db_flush_seconds",
+    "DB flush/대량 저장 시간(초)",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_BATCH_ROWS = Histogram(
+    "db_batch_rows",
+    "flush/대량 저장 1회당 행 수",
+    ["operation"],
+    buckets=(1, 5, 10, 50, 100, 500, 1000, 5000),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "캐시 조회 수 (적중률 = hit / (hit + miss))",
+    ["cache", "result"],
+)
+
+
+def _argument_getter(func: Callable[..., Any], name: str) -> Callable[[tuple, dict], Any]:
+    """함수 인자 중 name 의 값을 꺼내는 함수 (없으면 None)"""
+    parameters = list(inspect.signature(func).parameters)
+    if name not in parameters:
+        return lambda args, kwargs: None
+    index = parameters.index(name)
+    return lambda args, kwargs: kwargs[name] if name in kwargs else (args[index] if index < len(args) else None)
+
+
+def observe_broker_call(broker: str, endpoint: str) -> Callable[[F], F]:
+    """증권사 API 함수의 호출 지연/성공 여부 기록과 추적 span 생성 (동기/비동기 함수 모두 지원)"""
+
+    def decorator(func: F) -> F:
+        account_of = _argument_getter(func, "account")
+        acnt_type_arg = _argument_getter(func, "acnt_type")
+        span_name = f"broker.{broker}.{endpoint}"
+
+        def acnt_type_of(args: tuple, kwargs: dict) -> str:
+            account = account_of(args, kwargs)
+            acnt_type = getattr(account, "acnt_type", None) if account is not None else acnt_type_arg(args, kwargs)
+            return acnt_type or "unknown"
+
+        def span(args: tuple, kwargs: dict) -> Any:
+            return traced(
+                span_name, account_of(args, kwargs), kind=SpanKind.CLIENT,
+                **{"broker": broker, "broker.endpoint": endpoint, "account.acnt_type": acnt_type_of(args, kwargs)},
+            )
+
+        def record(args: tuple, kwargs: dict, started: float, status: str) -> None:
+            acnt_type = acnt_type_of(args, kwargs)
+            BROKER_REQUEST_SECONDS.labels(broker, endpoint, acnt_type, status).observe(time.perf_counter() - started)
+            if endpoint == "token":
+                TOKEN_REFRESHES.labels(broker, acnt_type, status).inc()
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                started, status = time.perf_counter(), "error"
+                try:
+                    with span(args, kwargs):
+                        result = await func(*args, **kwargs)
+                    status = "ok"
+                    return result
+                finally:
+                    record(args, kwargs, started, status)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started, status = time.perf_counter(), "error"
+            try:
+                with span(args, kwargs):
+                    result = func(*args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                record(args, kwargs, started, status)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def record_sweep(loop: str, started: float, lag_seconds: float, success: int = 0, failed: int = 0) -> None:
+    """백그라운드 순회 1회 결과 기록 (started 는 time.perf_counter 기준)"""
+    SWEEP_SECONDS.labels(loop).observe(time.perf_counter() - started)
+    SWEEP_LAG_SECONDS.labels(loop).set(max(lag_seconds, 0.0))
+    if success:
+        SWEEP_ACCOUNTS.labels(loop, "ok").inc(success)
+    if failed:
+        SWEEP_ACCOUNTS.labels(loop, "error").inc(failed)
+
+
+def record_batch(operation: str, started: float, rows: int) -> None:
+    DB_FLUSH_SECONDS.labels(operation).observe(time.perf_counter() - started)
+    DB_BATCH_ROWS.labels(operation).observe(rows)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    session.info["flush_started"] = time.perf_counter()
+    session.info["flush_rows"] = len(session.new) + len(session.dirty) + len(session.deleted)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    started = session.info.pop("flush_started", None)
+    if started is not None:
+        record_batch("flush", started, session.info.pop("flush_rows", 0))
+
+
+def check_metrics_token(authorization: str | None, token: str | None) -> None:
+    """METRICS_TOKEN 이 지정되어 있으면 Authorization: Bearer <token> 요구"""
+    if token and not secrets.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+def mark_worker_dead() -> None:
+    """멀티 워커 모드에서 종료하는 워커의 gauge 파일 정리"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def metrics_response() -> Response:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,86 @@
+"""OpenTelemetry 분산 추적
+
+백그라운드 순회 → 계좌 → 증권사 호출 → 응답 디코딩 → 변환 → DB 저장 단계를 span 으로 남긴다.
+OTEL_TRACES_EXPORTER 로 내보낼 곳을 고른다.
+    none    추적 안 함 (기본, no-op tracer)
+    console 표준 출력
+    file    OTEL_TRACES_FILE 에 span 1개당 JSON 1줄
+    otlp    OTLP/HTTP 수집기 (OTEL_EXPORTER_OTLP_ENDPOINT)
+"""
+import os
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from opentelemetry import trace
+from opentelemetry.trace import Span, SpanKind
+
+from app.core.config import settings
+
+tracer = trace.get_tracer("app")
+
+
+def account_attributes(account: Any) -> dict[str, str]:
+    """span 에 붙일 계좌 속성 (계좌명/키 등 민감 정보는 제외)"""
+    return {
+        "account.id": str(account.id),
+        "account.broker": str(account.broker),
+        "account.acnt_type": str(account.acnt_type),
+    }
+
+
+@contextmanager
+def traced(name: str, account: Any = None, kind: SpanKind = SpanKind.INTERNAL, **attributes: Any) -> Iterator[Span]:
+    """현재 span 의 하위 span 생성 (예외는 span 에 기록 후 그대로 전파)"""
+    with tracer.start_as_current_span(name, kind=kind) as span:
+        if span.is_recording():
+            if account is not None:
+                span.set_attributes(account_attributes(account))
+            if attributes:
+                span.set_attributes(attributes)
+        yield span
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attributes(attributes)
+
+
+def _build_exporter(exporter: str, file_path: str, endpoint: Optional[str]) -> Any:
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if exporter == "console":
+        return ConsoleSpanExporter()
+    if exporter == "file":
+        out = open(file_path, "a", encoding="utf-8", buffering=1)
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + os.linesep)
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+    raise ValueError(f"지원하지 않는 추적 exporter: {exporter}")
+
+
+def configure_tracing(
+    exporter: str = settings.OTEL_TRACES_EXPORTER,
+    file_path: str = settings.OTEL_TRACES_FILE,
+    endpoint: Optional[str] = settings.OTEL_EXPORTER_OTLP_ENDPOINT,
+) -> None:
+    """TracerProvider 등록 (프로세스 시작 시 1회, exporter 가 none 이면 아무것도 하지 않음)"""
+    if exporter == "none":
+        return
+
+    from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({SERVICE_NAME: settings.PROJECT_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(_build_exporter(exporter, file_path, endpoint)))
+    trace.set_tracer_provider(provider)
+
+
+def flush_tracing(timeout_millis: int = 5000) -> None:
+    """종료 전 배치에 남은 span 내보내기 (SDK provider 가 없으면 아무것도 하지 않음)"""
+    force_flush = getattr(trace.get_tracer_provider(), "force_flush", None)
+    if force_flush is not None:
+        force_flush(timeout_millis)
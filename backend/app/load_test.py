@@ -0,0 +1,236 @@
+"""스텁 게이트웨이 대상 종단 부하 테스트
+
+가상 계좌 N개를 만들어 잔고/거래내역 순회와 API 조회를 실행하고
+순회 시간, API 지연 p50/p99, DB 기록 속도, 계좌당 증권사 호출 수를 보고한다.
+
+    python -m app.load_test --accounts 1000 --sweeps 3
+    python -m app.load_test --stub-url http://localhost:8100   # 이미 실행 중인 스텁 사용
+"""
+import argparse
+import asyncio
+import logging
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import httpx
+import numpy as np
+import uvicorn
+from sqlmodel import Session, delete, func, select
+
+from app import crud
+from app.constants import KST
+from app.core.config import settings
+from app.core.db import engine
+from app.core.security import create_access_token
+from app.models.account import Account
+from app.models.kis import Kis_Daily_Trade, Kis_Minutely_Balance
+from app.models.ls import Ls_Daily_Trade, Ls_Minutely_Balance, Ls_Trade
+from app.models.user import User, User_Create
+from app.stub_gateway import stub_app, use_broker_stub
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LOAD_TEST_EMAIL = "loadtest@example.com"
+LOAD_TEST_PREFIX = "loadtest-"
+WRITE_MODELS = (Kis_Minutely_Balance, Ls_Minutely_Balance, Kis_Daily_Trade, Ls_Daily_Trade, Ls_Trade)
+
+
+def start_stub(port: int = 0) -> str:
+    """스텁 게이트웨이를 별도 스레드에서 실행하고 URL 반환"""
+    if not port:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def seed_accounts(session: Session, count: int) -> User:
+    """부하 테스트 사용자와 KIS/LS 반반 모의 계좌 생성 (이미 있으면 재사용)"""
+    user = crud.get_user_by_email(session=session, email=LOAD_TEST_EMAIL)
+    if not user:
+        user = crud.create_user(session=session, user_create=User_Create(
+            email=LOAD_TEST_EMAIL, password=uuid.uuid4().hex, full_name="load test"
+        ))
+
+    existing = session.exec(
+        select(func.count()).select_from(Account).where(Account.owner_id == user.id)
+    ).one()
+    for index in range(existing, count):
+        broker = "KIS" if index % 2 == 0 else "LS"
+        session.add(Account(
+            owner_id=user.id,
+            broker=broker,
+            acnt_name=f"{LOAD_TEST_PREFIX}{index:05d}",
+            cano=f"9{index:07d}",
+            acnt_prdt_cd="01",
+            acnt_type="paper",
+            app_key=f"{LOAD_TEST_PREFIX}key-{index:05d}",
+            app_secret=f"{LOAD_TEST_PREFIX}secret-{index:05d}",
+        ))
+    session.commit()
+    return user
+
+
+def count_writes(session: Session, account_ids: list[uuid.UUID]) -> int:
+    return sum(
+        session.exec(select(func.count()).select_from(model).where(model.account_id.in_(account_ids))).one()
+        for model in WRITE_MODELS
+    )
+
+
+def percentiles(samples: list[float]) -> dict[str, Optional[float]]:
+    if not samples:
+        return {"p50": None, "p99": None}
+    p50, p99 = np.percentile(np.asarray(samples), [50, 99]).tolist()
+    return {"p50": p50, "p99": p99}
+
+
+async def run_sweeps(account_ids: list[uuid.UUID], sweeps: int) -> dict[str, Any]:
+    """백그라운드 루프와 같은 함수로 잔고/거래내역 순회"""
+    from app.api.services.background_tasks import last_balance_check, sweep_balances, sync_account_trades
+
+    balance_durations, trade_durations, failures = [], [], 0
+    end_date = datetime.now(KST).strftime("%Y-%m-%d")
+    start_date = (datetime.now(KST) - timedelta(days=7)).strftime("%Y-%m-%d")
+    with Session(engine) as session:
+        accounts = session.exec(select(Account).where(Account.id.in_(account_ids))).all()
+        writes_before = count_writes(session, account_ids)
+        started = time.perf_counter()
+
+        for sweep in range(sweeps):
+            # 매 순회 모든 계좌를 조회하도록 마지막 체크 시각을 과거로 설정 (시작 위상 분산 무시)
+            last_balance_check.update(dict.fromkeys(account_ids, datetime.fromtimestamp(0, KST)))
+            sweep_started = time.perf_counter()
+            success, failed = await sweep_balances(session, accounts, datetime.now(KST))
+            balance_durations.append(time.perf_counter() - sweep_started)
+            failures += len(failed)
+            logger.info(f"잔고 순회 {sweep + 1}/{sweeps} - 성공 {success}, 실패 {len(failed)}, {balance_durations[-1]:.2f}초")
+
+        sweep_started = time.perf_counter()
+        for account in accounts:
+            try:
+                _, failed = await sync_account_trades(session, account, start_date, end_date)
+                failures += len(failed)
+            except Exception as e:
+                failures += 1
+                logger.error(f"거래내역 순회 실패 - {account.acnt_name}: {str(e)}")
+        trade_durations.append(time.perf_counter() - sweep_started)
+
+        elapsed = time.perf_counter() - started
+        writes = count_writes(session, account_ids) - writes_before
+
+    return {
+        "balance_sweep_seconds": balance_durations,
+        "trade_sweep_seconds": trade_durations,
+        "failures": failures,
+        "db_rows_written": writes,
+        "db_rows_per_second": writes / elapsed if elapsed else 0.0,
+    }
+
+
+async def run_api_load(user_id: uuid.UUID, requests: int, concurrency: int) -> dict[str, Any]:
+    """API 라우트 동시 호출 지연 측정 (앱 프로세스 내 ASGI 호출, 백그라운드 작업은 시작하지 않음)"""
+    from app.main import app
+
+    token = create_access_token(user_id, timedelta(hours=1))
+    paths = [f"{settings.API_V1_STR}/accounts/", f"{settings.API_V1_STR}/portfolio/"]
+    latencies: dict[str, list[float]] = {path: [] for path in paths}
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://loadtest",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        async def call(path: str) -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                elapsed = (time.perf_counter() - started) * 1000
+                if response.status_code >= 400:
+                    errors += 1
+                latencies[path].append(elapsed)
+
+        await asyncio.gather(*(call(paths[index % len(paths)]) for index in range(requests)))
+
+    return {
+        "api_errors": errors,
+        "api_latency_ms": {path: percentiles(samples) for path, samples in latencies.items()},
+        "api_latency_all_ms": percentiles([value for samples in latencies.values() for value in samples]),
+    }
+
+
+def cleanup(session: Session, owner_id: uuid.UUID) -> None:
+    session.exec(delete(Account).where(Account.owner_id == owner_id))
+    session.commit()
+
+
+async def main(args: argparse.Namespace) -> None:
+    if settings.PAPER_TRADING_SIMULATOR:
+        raise SystemExit("PAPER_TRADING_SIMULATOR 가 켜져 있으면 모의 계좌 요청이 스텁으로 가지 않습니다.")
+
+    stub_url = args.stub_url or start_stub()
+    use_broker_stub(stub_url)
+    async with httpx.AsyncClient(base_url=stub_url) as stub:
+        if args.latency_ms is not None or args.error_rate is not None or args.rate_limit is not None:
+            config = (await stub.get("/stub/config")).json()
+            for key, value in (
+                ("latency_ms", args.latency_ms),
+                ("error_rate", args.error_rate),
+                ("rate_limit_per_second", args.rate_limit),
+            ):
+                if value is not None:
+                    config[key] = value
+            await stub.put("/stub/config", json=config)
+        await stub.post("/stub/reset")
+
+        with Session(engine) as session:
+            user_id = seed_accounts(session, args.accounts).id
+            account_ids = list(session.exec(
+                select(Account.id).where(Account.owner_id == user_id).limit(args.accounts)
+            ).all())
+
+        try:
+            report = await run_sweeps(account_ids, args.sweeps)
+            report.update(await run_api_load(user_id, args.api_requests, args.concurrency))
+            stats = (await stub.get("/stub/stats")).json()
+        finally:
+            if not args.keep:
+                with Session(engine) as session:
+                    cleanup(session, user_id)
+
+    logger.info(f"계좌 수: {len(account_ids)}")
+    logger.info(f"잔고 순회 시간(초): {', '.join(f'{value:.2f}' for value in report['balance_sweep_seconds'])}")
+    logger.info(f"거래내역 순회 시간(초): {report['trade_sweep_seconds'][0]:.2f}")
+    logger.info(f"DB 기록: {report['db_rows_written']}건 ({report['db_rows_per_second']:.1f}건/초)")
+    logger.info(f"API 지연(ms): {report['api_latency_all_ms']} / 경로별 {report['api_latency_ms']}")
+    logger.info(f"API 오류: {report['api_errors']}, 순회 실패: {report['failures']}")
+    logger.info(
+        f"증권사 호출: 총 {stats['total_calls']}건, 계좌당 {stats['calls_per_account']:.1f}건, "
+        f"한도 초과 {stats['rate_limited']}건, 오류 {stats['errors']}건"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스텁 게이트웨이 대상 부하 테스트")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--sweeps", type=int, default=3)
+    parser.add_argument("--api-requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--stub-url", default=None, help="실행 중인 스텁 URL (미지정 시 내장 실행)")
+    parser.add_argument("--latency-ms", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=None)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--keep", action="store_true", help="생성한 계좌를 삭제하지 않음")
+    asyncio.run(main(parser.parse_args()))
@@ -1,10 +1,13 @@
+from typing import Annotated
+
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Header
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.tracing import configure_tracing
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,6 +17,13 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+configure_tracing()
+
+if settings.BROKER_STUB_URL:
+    from app.stub_gateway import use_broker_stub
+
+    use_broker_stub(settings.BROKER_STUB_URL)
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
@@ -31,3 +41,13 @@ if settings.all_cors_origins:
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+
+if settings.METRICS_ENABLED:
+    from app.core.metrics import check_metrics_token, mark_worker_dead, metrics_response
+
+    @app.get("/metrics", tags=["metrics"], include_in_schema=False)
+    def metrics(authorization: Annotated[str | None, Header()] = None):
+        check_metrics_token(authorization, settings.METRICS_TOKEN)
+        return metrics_response()
+
+    app.on_event("shutdown")(mark_worker_dead)
@@ -3,6 +3,10 @@ from .item import *
 from .account import *
 from .kis import *
 from .common import *
+from .ledger import *
+from .portfolio import *
+from .order import *
+from .scheduler import *
 
 __all__ = [
     # User models
@@ -110,6 +110,11 @@ class Account(Account_Base, table=True):
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE", description="소유자 ID")
     owner: Optional["User"] = Relationship(back_populates="accounts")
     owner_name: Optional[str] = None
+    approval_key_expired: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="승인키 재발급 예정일시"
+    )
     
     # 일별 데이터 관계
     kis_daily_trades: List["Kis_Daily_Trade"] = Relationship(back_populates="account", cascade_delete=True)
@@ -191,7 +196,8 @@ class Account_Public(Account_Base):
 class Accounts_Public(SQLModel):
     """계좌 목록 공개 모델"""
     data: list[Account_Public]
-    count: int
+    count: int = Field(description="전체 건수 (조건 없는 큰 목록은 통계 추정치)")
+    next_cursor: Optional[str] = Field(default=None, description="다음 페이지 cursor (마지막 페이지면 없음)")
 
     class Config:
         json_schema_extra = {
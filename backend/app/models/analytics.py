@@ -0,0 +1,47 @@
+import uuid
+from datetime import datetime
+from typing import Optional, List
+from sqlmodel import Field, SQLModel
+
+class Portfolio_Analytics_Response(SQLModel):
+    """계좌 성과 분석 응답 모델"""
+    account_id: uuid.UUID = Field(description="계좌 ID")
+    start_time: Optional[datetime] = Field(default=None, description="분석 시작 시각 (첫 스냅샷)")
+    end_time: Optional[datetime] = Field(default=None, description="분석 종료 시각 (마지막 스냅샷)")
+    sample_count: int = Field(default=0, description="분석에 사용된 스냅샷 수")
+
+    # 수익률 지표
+    time_weighted_return: float = Field(default=0, description="시간가중수익률 (입출금 보정)")
+    total_profit_loss_change: float = Field(default=0, description="기간 중 평가손익 변동액")
+    net_cash_flow: float = Field(default=0, description="추정 순입출금액")
+
+    # 위험 지표
+    max_drawdown: float = Field(default=0, description="최대낙폭 (MDD)")
+    volatility: float = Field(default=0, description="연환산 변동성")
+    sharpe_ratio: Optional[float] = Field(default=None, description="연환산 샤프지수")
+
+    # 시계열 (차트용)
+    timestamps: List[datetime] = Field(default_factory=list, description="스냅샷 시각")
+    equity_index: List[float] = Field(default_factory=list, description="누적 수익 지수 (시작=1)")
+    drawdown: List[float] = Field(default_factory=list, description="고점 대비 낙폭")
+    rolling_volatility: List[Optional[float]] = Field(default_factory=list, description="롤링 연환산 변동성")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "account_id": "123e4567-e89b-12d3-a456-426614174000",
+                "start_time": "2024-03-01T09:00:00+09:00",
+                "end_time": "2024-03-19T15:30:00+09:00",
+                "sample_count": 4500,
+                "time_weighted_return": 0.0417,
+                "total_profit_loss_change": 200000,
+                "net_cash_flow": 1000000,
+                "max_drawdown": -0.031,
+                "volatility": 0.18,
+                "sharpe_ratio": 1.2,
+                "timestamps": [],
+                "equity_index": [],
+                "drawdown": [],
+                "rolling_volatility": []
+            }
+        }
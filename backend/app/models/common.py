@@ -1,3 +1,7 @@
+import os
+import time as clock
+import uuid
+from datetime import datetime
 from sqlmodel import SQLModel
 from typing import Optional
 from pydantic import Field
@@ -17,4 +21,25 @@ class Token_Payload(SQLModel):
 
 class New_Password(SQLModel):
     token: str
-    new_password: str = Field(min_length=8, max_length=40) 
\ No newline at end of file
+    new_password: str = Field(min_length=8, max_length=40) 
+
+def minute_bucket(timestamp: datetime) -> datetime:
+    """스냅샷이 속한 분 (초 이하 버림, 계좌별 분당 1건 키)"""
+    return timestamp.replace(second=0, microsecond=0)
+
+def minute_bucket_default(context) -> Optional[datetime]:
+    """minute_bucket 컬럼 INSERT 기본값 (같은 행의 timestamp 에서 계산)"""
+    timestamp = context.get_current_parameters().get("timestamp")
+    return minute_bucket(timestamp) if timestamp is not None else None
+
+def uuid7() -> uuid.UUID:
+    """시간순 UUID (RFC 9562 v7: 앞 48비트 unix ms + 난수 74비트)
+
+    uuid4 와 같은 UUID 컬럼에 그대로 저장되고, 새 행의 PK 가 B-tree 오른쪽 끝에 붙어
+    추가 위주 테이블에서 인덱스 페이지 분할과 캐시 교체가 줄어든다.
+    """
+    value = (clock.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76      # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62      # variant 10
+    return uuid.UUID(int=value)
+
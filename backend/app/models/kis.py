@@ -6,6 +6,8 @@ from sqlmodel import Field, Relationship, SQLModel
 from sqlalchemy import TIMESTAMP, Column, Index, UniqueConstraint, text, JSON
 from decimal import Decimal
 
+from app.models.common import minute_bucket_default, uuid7
+
 class Kis_Balance_Base(SQLModel):
     """KIS 증권 계좌 잔고 정보 기본 모델"""
     account_id: uuid.UUID = Field(foreign_key="account.id", description="계좌 ID")
@@ -121,7 +123,7 @@ class Kis_Daily_Trade_Base(SQLModel):
 
 class Kis_Daily_Trade(Kis_Daily_Trade_Base, table=True):
     """KIS 증권 일별 거래내역 테이블"""
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False)
     account: Optional["Account"] = Relationship(back_populates="kis_daily_trades")
     
@@ -150,7 +152,7 @@ class Kis_Daily_Trade(Kis_Daily_Trade_Base, table=True):
 
 class Kis_Minutely_Balance(SQLModel, table=True):
     """KIS 증권 분별 잔고 정보 테이블"""
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False)
     account: Optional["Account"] = Relationship(back_populates="kis_minutely_balances")
     timestamp: datetime = Field(
@@ -179,12 +181,20 @@ class Kis_Minutely_Balance(SQLModel, table=True):
         sa_column=Column(JSON)
     )
 
+    # 계좌별 분당 1건 (비우면 INSERT 시 timestamp 에서 계산)
+    minute_bucket: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, default=minute_bucket_default),
+        description="스냅샷 분 (timestamp 의 초 이하 버림)"
+    )
+
     class Config:
         table_name = "kis_minutely_balances"
         description = "KIS 증권 분별 잔고 정보 테이블"
 
     __table_args__ = (
         Index('ix_kis_minutely_balances_account_timestamp', 'account_id', 'timestamp'),
+        UniqueConstraint('account_id', 'minute_bucket', name='uq_kis_minutely_balances_account_minute'),
     )
 
 class Kis_Daily_Trade_Response(SQLModel):
@@ -0,0 +1,168 @@
+import uuid
+from datetime import datetime
+from typing import Optional, List
+from pytz import timezone
+from sqlmodel import Field, SQLModel
+from sqlalchemy import TIMESTAMP, Column, Index, UniqueConstraint, text, JSON
+
+class Position_Lot(SQLModel, table=True):
+    """종목별 미청산 매수 로트 테이블"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False, ondelete="CASCADE")
+    method: str = Field(max_length=10, description="평가방식 (fifo/average)")
+    stock_code: str = Field(max_length=12, description="종목코드")
+    sequence: int = Field(default=0, description="로트 순번 (선입선출 순서)")
+    quantity: int = Field(description="잔여수량")
+    unit_cost: float = Field(description="주당 취득원가 (매수 수수료 포함)")
+    opened_at: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+        description="최초 매수 체결시각"
+    )
+
+    class Config:
+        table_name = "position_lots"
+        description = "종목별 미청산 매수 로트 테이블"
+
+    __table_args__ = (
+        Index('ix_position_lots_account_method_stock', 'account_id', 'method', 'stock_code'),
+    )
+
+class Realized_Pnl_Base(SQLModel):
+    """종목별 실현손익 기본 모델"""
+    account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False, ondelete="CASCADE")
+    method: str = Field(max_length=10, description="평가방식 (fifo/average)")
+    stock_code: str = Field(max_length=12, description="종목코드")
+    stock_name: Optional[str] = Field(default=None, max_length=100, description="종목명")
+    realized_pnl: float = Field(default=0, description="누적 실현손익 (수수료/세금 차감)")
+    realized_qty: int = Field(default=0, description="누적 청산수량")
+    fees: float = Field(default=0, description="누적 수수료/세금")
+    open_qty: int = Field(default=0, description="미청산 보유수량")
+    open_cost: float = Field(default=0, description="미청산 취득원가 합계")
+    avg_cost: float = Field(default=0, description="미청산 평균단가")
+    unmatched_sell_qty: int = Field(default=0, description="매수 이력 없이 매도된 수량")
+
+class Realized_Pnl(Realized_Pnl_Base, table=True):
+    """종목별 실현손익 테이블"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone('Asia/Seoul')),
+        sa_column=Column(
+            TIMESTAMP(timezone=True),
+            server_default=text("CURRENT_TIMESTAMP"),
+            onupdate=lambda: datetime.now(timezone('Asia/Seoul'))
+        )
+    )
+
+    class Config:
+        table_name = "realized_pnls"
+        description = "종목별 실현손익 테이블"
+
+    __table_args__ = (
+        UniqueConstraint('account_id', 'method', 'stock_code', name='uix_realized_pnl_account_method_stock'),
+    )
+
+class Pnl_Checkpoint(SQLModel, table=True):
+    """계좌별 손익 계산 체크포인트 테이블"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False, ondelete="CASCADE")
+    method: str = Field(max_length=10, description="평가방식 (fifo/average)")
+    last_executed_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="마지막으로 반영한 체결시각"
+    )
+    last_fill_ref: Optional[str] = Field(default=None, max_length=64, description="마지막으로 반영한 체결 식별자")
+    fill_count: int = Field(default=0, description="누적 반영 체결 건수")
+    processed_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="마지막 처리시각"
+    )
+
+    class Config:
+        table_name = "pnl_checkpoints"
+        description = "계좌별 손익 계산 체크포인트 테이블"
+
+    __table_args__ = (
+        UniqueConstraint('account_id', 'method', name='uix_pnl_checkpoint_account_method'),
+    )
+
+class Position_Snapshot(SQLModel, table=True):
+    """체결 재생 결과 포지션 스냅샷 테이블"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False, ondelete="CASCADE")
+    as_of: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+        description="마지막으로 반영한 체결시각"
+    )
+    last_fill_ref: str = Field(max_length=64, description="마지막으로 반영한 체결 식별자")
+    fill_count: int = Field(default=0, description="누적 반영 체결 건수")
+    positions: dict = Field(
+        default_factory=dict,
+        sa_column=Column(JSON),
+        description="종목별 포지션 {stock_code: {stock_name, quantity, avg_cost}}"
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone('Asia/Seoul')),
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    )
+
+    class Config:
+        table_name = "position_snapshots"
+        description = "체결 재생 결과 포지션 스냅샷 테이블"
+
+    __table_args__ = (
+        Index('ix_position_snapshots_account_as_of', 'account_id', 'as_of'),
+    )
+
+class Position_Lot_Public(SQLModel):
+    """미청산 로트 공개 모델"""
+    stock_code: str
+    sequence: int
+    quantity: int
+    unit_cost: float
+    opened_at: datetime
+
+class Realized_Pnl_Public(Realized_Pnl_Base):
+    """종목별 실현손익 공개 모델"""
+    updated_at: Optional[datetime] = None
+    lots: List[Position_Lot_Public] = Field(default_factory=list)
+
+class Realized_Pnl_Response(SQLModel):
+    """계좌 실현손익 응답 모델"""
+    account_id: uuid.UUID
+    method: str
+    total_realized_pnl: float
+    fee_basis: str = Field(description="fees 출처: broker(체결별 수수료/세금), estimated(조회 기간 추정제비용합 배분)")
+    last_executed_at: Optional[datetime] = None
+    data: List[Realized_Pnl_Public]
+
+class Position_Public(SQLModel):
+    """종목별 포지션 공개 모델"""
+    stock_code: str
+    stock_name: Optional[str] = None
+    quantity: int
+    avg_cost: float
+
+class Positions_Response(SQLModel):
+    """시점별 포지션 재구성 응답 모델"""
+    account_id: uuid.UUID
+    at: datetime
+    snapshot_as_of: Optional[datetime] = Field(default=None, description="재생 시작점 스냅샷 시각")
+    replayed_fills: int = Field(default=0, description="스냅샷 이후 재생한 체결 건수")
+    data: List[Position_Public]
+
+class Position_Drift(SQLModel):
+    """원장과 브로커 잔고의 수량 차이"""
+    stock_code: str
+    stock_name: Optional[str] = None
+    ledger_quantity: int
+    broker_quantity: int
+    difference: int
+
+class Position_Drift_Response(SQLModel):
+    """원장-잔고 대사 응답 모델"""
+    account_id: uuid.UUID
+    balance_timestamp: Optional[datetime] = Field(default=None, description="비교한 잔고 스냅샷 시각")
+    in_sync: bool
+    data: List[Position_Drift]
@@ -6,6 +6,8 @@ from sqlmodel import Field, Relationship, SQLModel
 from sqlalchemy import TIMESTAMP, Column, Index, UniqueConstraint, text, JSON
 from decimal import Decimal
 
+from app.models.common import minute_bucket_default, uuid7
+
 class Ls_Balance_Base(SQLModel):
     """LS 증권 계좌 잔고 정보 기본 모델"""
     account_id: uuid.UUID = Field(foreign_key="account.id", description="계좌 ID")
@@ -45,6 +47,7 @@ class Ls_Trade_Base(SQLModel):
     stock_code: str = Field(max_length=12, description="종목코드")
     stock_name: str = Field(max_length=100, description="종목명")
     trade_type: str = Field(max_length=20, description="거래유형 (매수/매도)")
+    trade_no: Optional[str] = Field(default=None, max_length=20, description="거래번호 (CDPCQ04700 TrdNo)")
     quantity: int = Field(description="거래수량")
     price: Decimal = Field(max_digits=13, decimal_places=2, description="거래단가")
     amount: Decimal = Field(max_digits=20, decimal_places=2, description="거래금액")
@@ -55,10 +58,15 @@ class Ls_Trade_Base(SQLModel):
                                  sa_column=Column(TIMESTAMP(timezone=True), 
                                                   server_default=text("CURRENT_TIMESTAMP")), 
                                                   description="생성일시")
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone('Asia/Seoul')),
+                                 sa_column=Column(TIMESTAMP(timezone=True),
+                                                  server_default=text("CURRENT_TIMESTAMP"),
+                                                  onupdate=lambda: datetime.now(timezone('Asia/Seoul'))),
+                                                  description="수정일시 (내용이 바뀐 재동기화에서만 갱신)")
 
 class Ls_Trade(Ls_Trade_Base, table=True):
     """LS 증권 거래내역 테이블"""
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, description="거래내역 ID")
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True, description="거래내역 ID")
     account: "Account" = Relationship(back_populates="ls_trades")
 
     class Config:
@@ -122,7 +130,7 @@ class Ls_Daily_Trade_Base(SQLModel):
 
 class Ls_Daily_Trade(Ls_Daily_Trade_Base, table=True):
     """LS 증권 일별 거래내역 테이블"""
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False)
     account: Optional["Account"] = Relationship(back_populates="ls_daily_trades")
     
@@ -151,7 +159,7 @@ class Ls_Daily_Trade(Ls_Daily_Trade_Base, table=True):
 
 class Ls_Minutely_Balance(SQLModel, table=True):
     """LS 증권 분별 잔고 정보 테이블"""
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False)
     account: Optional["Account"] = Relationship(back_populates="ls_minutely_balances")
     timestamp: datetime = Field(
@@ -180,12 +188,20 @@ class Ls_Minutely_Balance(SQLModel, table=True):
         sa_column=Column(JSON)
     )
 
+    # 계좌별 분당 1건 (비우면 INSERT 시 timestamp 에서 계산)
+    minute_bucket: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, default=minute_bucket_default),
+        description="스냅샷 분 (timestamp 의 초 이하 버림)"
+    )
+
     class Config:
         table_name = "ls_minutely_balances"
         description = "LS 증권 분별 잔고 정보 테이블"
 
     __table_args__ = (
         Index('ix_ls_minutely_balances_account_timestamp', 'account_id', 'timestamp'),
+        UniqueConstraint('account_id', 'minute_bucket', name='uq_ls_minutely_balances_account_minute'),
     )
 
 class Ls_Daily_Trade_Response(SQLModel):
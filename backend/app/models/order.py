@@ -0,0 +1,262 @@
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict
+from pytz import timezone
+from sqlmodel import Field, SQLModel
+from sqlalchemy import TIMESTAMP, Column, Index, UniqueConstraint, text
+
+class Order_Base(SQLModel):
+    """주문 기본 모델"""
+    stock_code: str = Field(max_length=12, description="종목코드")
+    side: str = Field(max_length=4, description="매매구분 (buy/sell)")
+    quantity: int = Field(gt=0, description="주문수량")
+    price: float = Field(default=0, ge=0, description="주문단가 (시장가는 0)")
+    order_type: str = Field(default="limit", max_length=10, description="주문유형 (limit/market)")
+
+class Order_Create(Order_Base):
+    """주문 요청 모델"""
+    idempotency_key: Optional[str] = Field(
+        default=None, max_length=64, description="재시도 시 중복 주문 방지 키 (미지정 시 자동 생성)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "stock_code": "005930",
+                "side": "buy",
+                "quantity": 10,
+                "price": 71000,
+                "order_type": "limit",
+                "idempotency_key": "rebalance-20240304-005930"
+            }
+        }
+
+class Order(Order_Base, table=True):
+    """주문 테이블"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False, ondelete="CASCADE")
+    broker: str = Field(max_length=10, description="증권사 구분 (KIS/LS)")
+    idempotency_key: str = Field(max_length=64, description="중복 주문 방지 키")
+    basket_job_id: Optional[uuid.UUID] = Field(
+        default=None, foreign_key="basket_job.id", index=True, ondelete="SET NULL", description="바스켓 주문 작업 ID"
+    )
+    status: str = Field(default="pending", max_length=10, description="주문상태 (pending/submitted/rejected/failed)")
+    broker_order_no: Optional[str] = Field(default=None, max_length=20, description="증권사 주문번호")
+    message: Optional[str] = Field(default=None, max_length=255, description="증권사/검증 응답 메시지")
+    latency_ms: Optional[float] = Field(default=None, description="주문 전송~응답 지연시간(ms)")
+    submitted_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="주문 접수 시각"
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone('Asia/Seoul')),
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    )
+
+    class Config:
+        table_name = "orders"
+        description = "주문 테이블"
+
+    __table_args__ = (
+        UniqueConstraint('account_id', 'idempotency_key', name='uix_order_account_idempotency_key'),
+        Index('ix_orders_account_status_submitted', 'account_id', 'status', 'submitted_at'),
+    )
+
+class Basket_Job(SQLModel, table=True):
+    """바스켓 주문 작업 테이블 (주문별 상태는 orders.basket_job_id 로 연결)"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    status: str = Field(default="running", max_length=10, description="작업상태 (running/completed/partial/failed)")
+    account_count: int = Field(default=0, description="대상 계좌 수")
+    order_count: int = Field(default=0, description="생성된 주문 수")
+    submitted_count: int = Field(default=0, description="접수된 주문 수")
+    rejected_count: int = Field(default=0, description="거부된 주문 수")
+    failed_count: int = Field(default=0, description="전송 실패 주문 수")
+    dispatch_skew_ms: Optional[float] = Field(default=None, description="첫 주문~마지막 주문 접수 시각 차이(ms)")
+    message: Optional[str] = Field(default=None, max_length=1024, description="주문 생성 실패 사유")
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone('Asia/Seoul')),
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    )
+    completed_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="작업 완료 시각"
+    )
+
+    class Config:
+        table_name = "basket_jobs"
+        description = "바스켓 주문 작업 테이블"
+
+class Basket_Account_Target(SQLModel):
+    """계좌별 바스켓 목표 (목표 비중 또는 수량 증감 중 하나)"""
+    account_id: uuid.UUID
+    weights: Optional[Dict[str, float]] = Field(
+        default=None, description="종목별 목표 비중 (총평가금액 대비, 미포함 보유종목은 전량 매도)"
+    )
+    deltas: Optional[Dict[str, int]] = Field(default=None, description="종목별 수량 증감 (음수는 매도)")
+
+class Basket_Create(SQLModel):
+    """바스켓 주문 요청 모델"""
+    targets: List[Basket_Account_Target]
+    order_type: str = Field(default="limit", max_length=10, description="주문유형 (limit/market)")
+    prices: Dict[str, float] = Field(
+        default_factory=dict, description="종목별 주문단가 (미지정 시 시세 캐시 현재가)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "targets": [
+                    {"account_id": "123e4567-e89b-12d3-a456-426614174000", "weights": {"005930": 0.5, "000660": 0.3}},
+                    {"account_id": "123e4567-e89b-12d3-a456-426614174001", "deltas": {"005930": 10}}
+                ],
+                "order_type": "limit",
+                "prices": {"005930": 71000, "000660": 150000}
+            }
+        }
+
+class Order_Public(Order_Base):
+    """주문 공개 모델"""
+    id: uuid.UUID
+    account_id: uuid.UUID
+    broker: str
+    idempotency_key: str
+    status: str
+    basket_job_id: Optional[uuid.UUID] = None
+    broker_order_no: Optional[str] = None
+    message: Optional[str] = None
+    latency_ms: Optional[float] = None
+    submitted_at: Optional[datetime] = None
+    created_at: datetime
+
+class Orders_Public(SQLModel):
+    """주문 목록 응답 모델"""
+    data: List[Order_Public]
+    count: int
+
+class Order_Latency_Stats(SQLModel):
+    """최근 주문 지연시간 통계"""
+    count: int = 0
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+
+class Basket_Job_Public(SQLModel):
+    """바스켓 주문 작업 응답 모델"""
+    id: uuid.UUID
+    status: str
+    account_count: int
+    order_count: int
+    submitted_count: int
+    rejected_count: int
+    failed_count: int
+    dispatch_skew_ms: Optional[float] = None
+    message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    orders: List[Order_Public] = Field(default_factory=list)
+
+class Parent_Order_Base(SQLModel):
+    """분할 주문(모주문) 기본 모델"""
+    account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False, ondelete="CASCADE")
+    stock_code: str = Field(max_length=12, description="종목코드")
+    side: str = Field(max_length=4, description="매매구분 (buy/sell)")
+    quantity: int = Field(gt=0, description="총 주문수량")
+    strategy: str = Field(default="twap", max_length=10, description="분할방식 (twap/vwap)")
+    start_time: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), nullable=False), description="분할 시작 시각")
+    end_time: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), nullable=False), description="분할 종료 시각")
+    slice_count: int = Field(default=10, gt=0, description="분할 횟수")
+    order_type: str = Field(default="limit", max_length=10, description="자식주문 유형 (limit/market)")
+    limit_price: Optional[float] = Field(default=None, description="지정가 (미지정 시 전송 시점 현재가)")
+
+class Parent_Order_Create(SQLModel):
+    """분할 주문 요청 모델"""
+    account_id: uuid.UUID
+    stock_code: str = Field(max_length=12)
+    side: str = Field(max_length=4)
+    quantity: int = Field(gt=0)
+    strategy: str = Field(default="twap", max_length=10)
+    start_time: Optional[datetime] = Field(default=None, description="미지정 시 즉시 시작")
+    end_time: datetime
+    slice_count: int = Field(default=10, gt=0)
+    order_type: str = Field(default="limit", max_length=10)
+    limit_price: Optional[float] = Field(default=None, gt=0)
+    arrival_price: Optional[float] = Field(default=None, gt=0, description="기준가 (미지정 시 현재가)")
+
+class Parent_Order(Parent_Order_Base, table=True):
+    """분할 주문(모주문) 테이블"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    status: str = Field(default="scheduled", max_length=10, description="상태 (scheduled/running/completed/cancelled)")
+    arrival_price: Optional[float] = Field(default=None, description="주문 시점 기준가")
+    submitted_qty: int = Field(default=0, description="접수된 수량")
+    avg_price: Optional[float] = Field(default=None, description="접수 자식주문 기준 평균단가")
+    slippage_bps: Optional[float] = Field(default=None, description="기준가 대비 불리한 방향 슬리피지(bp)")
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone('Asia/Seoul')),
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    )
+    completed_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="완료 시각"
+    )
+
+    class Config:
+        table_name = "parent_orders"
+        description = "분할 주문(모주문) 테이블"
+
+class Order_Slice(SQLModel, table=True):
+    """분할 주문 자식주문 일정 테이블 (재시작 시 미전송 분부터 재개)"""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    parent_id: uuid.UUID = Field(foreign_key="parent_order.id", nullable=False, ondelete="CASCADE")
+    sequence: int = Field(description="분할 순번")
+    scheduled_at: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), nullable=False), description="전송 예정 시각")
+    quantity: int = Field(description="분할 수량")
+    status: str = Field(default="pending", max_length=10, description="상태 (pending/sending/submitted/rejected/failed/cancelled)")
+    order_id: Optional[uuid.UUID] = Field(default=None, foreign_key="order.id", ondelete="SET NULL", description="전송된 주문 ID")
+    reference_price: Optional[float] = Field(default=None, description="전송 시점 기준 단가")
+    executed_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="실제 전송 시각"
+    )
+    claimed_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="전송을 맡은 시각 (sending 상태로 오래 남으면 복구 대상)"
+    )
+
+    class Config:
+        table_name = "order_slices"
+        description = "분할 주문 자식주문 일정 테이블"
+
+    __table_args__ = (
+        Index('ix_order_slices_status_scheduled', 'status', 'scheduled_at'),
+        UniqueConstraint('parent_id', 'sequence', name='uix_order_slice_parent_sequence'),
+    )
+
+class Order_Slice_Public(SQLModel):
+    """자식주문 일정 공개 모델"""
+    id: uuid.UUID
+    sequence: int
+    scheduled_at: datetime
+    quantity: int
+    status: str
+    order_id: Optional[uuid.UUID] = None
+    reference_price: Optional[float] = None
+    executed_at: Optional[datetime] = None
+
+class Parent_Order_Public(Parent_Order_Base):
+    """분할 주문 응답 모델"""
+    id: uuid.UUID
+    status: str
+    arrival_price: Optional[float] = None
+    submitted_qty: int
+    avg_price: Optional[float] = None
+    slippage_bps: Optional[float] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    slices: List[Order_Slice_Public] = Field(default_factory=list)
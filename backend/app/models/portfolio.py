@@ -0,0 +1,81 @@
+import uuid
+from datetime import datetime
+from typing import Optional, List
+from pytz import timezone
+from sqlmodel import Field, SQLModel
+from sqlalchemy import TIMESTAMP, Column, JSON, text
+
+class Portfolio_Contribution(SQLModel, table=True):
+    """계좌별 통합 포트폴리오 반영분 테이블 (마지막으로 합산된 잔고 스냅샷)"""
+    account_id: uuid.UUID = Field(foreign_key="account.id", primary_key=True, ondelete="CASCADE")
+    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, index=True, ondelete="CASCADE")
+    broker: str = Field(max_length=10, description="증권사 구분 (KIS/LS)")
+    snapshot_timestamp: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=True),
+        description="반영된 잔고 스냅샷 시각"
+    )
+    total_assets: float = Field(default=0, description="총평가금액")
+    purchase_amount: float = Field(default=0, description="매입금액합계금액")
+    eval_amount: float = Field(default=0, description="평가금액합계금액")
+    profit_loss: float = Field(default=0, description="평가손익합계금액")
+    holdings: dict = Field(
+        default_factory=dict,
+        sa_column=Column(JSON),
+        description="종목별 반영분 {stock_code: {stock_name, quantity, purchase_amount, eval_amount, profit_loss}}"
+    )
+
+    class Config:
+        table_name = "portfolio_contributions"
+        description = "계좌별 통합 포트폴리오 반영분 테이블"
+
+class User_Portfolio(SQLModel, table=True):
+    """사용자별 통합 포트폴리오 테이블 (계좌 반영분의 합계)"""
+    owner_id: uuid.UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    account_count: int = Field(default=0, description="합산된 계좌 수")
+    total_assets: float = Field(default=0, description="총평가금액")
+    purchase_amount: float = Field(default=0, description="매입금액합계금액")
+    eval_amount: float = Field(default=0, description="평가금액합계금액")
+    profit_loss: float = Field(default=0, description="평가손익합계금액")
+    exposures: dict = Field(
+        default_factory=dict,
+        sa_column=Column(JSON),
+        description="종목별 합산 노출 {stock_code: {stock_name, quantity, purchase_amount, eval_amount, profit_loss, account_count}}"
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone('Asia/Seoul')),
+        sa_column=Column(
+            TIMESTAMP(timezone=True),
+            server_default=text("CURRENT_TIMESTAMP"),
+            onupdate=lambda: datetime.now(timezone('Asia/Seoul'))
+        )
+    )
+
+    class Config:
+        table_name = "user_portfolios"
+        description = "사용자별 통합 포트폴리오 테이블"
+
+class Portfolio_Exposure(SQLModel):
+    """종목별 합산 노출 공개 모델"""
+    stock_code: str
+    stock_name: Optional[str] = None
+    quantity: int = 0
+    purchase_amount: float = 0
+    eval_amount: float = 0
+    profit_loss: float = 0
+    current_price: Optional[float] = Field(default=None, description="시세 캐시 재평가 시 현재가")
+    weight: float = Field(default=0, description="총평가금액 대비 비중")
+    account_count: int = Field(default=0, description="보유 계좌 수")
+
+class User_Portfolio_Public(SQLModel):
+    """통합 포트폴리오 응답 모델"""
+    owner_id: uuid.UUID
+    account_count: int = 0
+    total_assets: float = 0
+    purchase_amount: float = 0
+    eval_amount: float = 0
+    profit_loss: float = 0
+    profit_loss_rate: float = Field(default=0, description="수익률 (%)")
+    updated_at: Optional[datetime] = Field(default=None, description="마지막 잔고 반영 시각")
+    marked_at: Optional[datetime] = Field(default=None, description="시세 캐시 재평가 시각")
+    data: List[Portfolio_Exposure] = Field(default_factory=list)
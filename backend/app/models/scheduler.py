@@ -0,0 +1,158 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional, List
+from sqlmodel import Field, SQLModel
+from sqlalchemy import JSON, TIMESTAMP, Column
+from app.models.common import uuid7
+
+class Account_Job_Status(SQLModel):
+    """작업별 계좌 처리 상태"""
+    account_id: uuid.UUID = Field(description="계좌 ID")
+    last_run: Optional[datetime] = Field(default=None, description="마지막 처리 시각")
+    last_success: Optional[datetime] = Field(default=None, description="마지막 성공 시각")
+    last_error: Optional[str] = Field(default=None, description="마지막 실패 사유 (성공 시 비움)")
+    consecutive_failures: int = Field(default=0, description="연속 실패 횟수")
+
+class Scheduled_Job_Status(SQLModel):
+    """백그라운드 작업 상태 (워커/노드별)"""
+    node_id: Optional[str] = Field(default=None, description="상태를 보고한 노드 (워커 프로세스)")
+    name: str = Field(description="작업 이름")
+    description: str = Field(description="작업 설명")
+    state: str = Field(description="상태 (stopped/idle/running/paused/stopping/finished)")
+    pausable: bool = Field(description="일시정지 가능 여부")
+    supports_account_run: bool = Field(description="계좌 단위 즉시 실행 지원 여부")
+    next_run: Optional[datetime] = Field(default=None, description="다음 실행 예정 시각")
+    overdue: bool = Field(default=False, description="예정 시각이 지났는데 실행되지 않음")
+    last_started: Optional[datetime] = Field(default=None, description="마지막 순회 시작 시각")
+    last_duration_seconds: Optional[float] = Field(default=None, description="마지막 순회 소요 시간(초)")
+    last_error: Optional[str] = Field(default=None, description="순회를 중단시킨 마지막 오류")
+    last_error_at: Optional[datetime] = Field(default=None, description="마지막 오류 시각")
+    run_count: int = Field(default=0, description="순회 횟수")
+    error_count: int = Field(default=0, description="오류로 중단된 순회 횟수")
+    queue_depth: int = Field(default=0, description="대기/진행 중인 즉시 실행 수")
+    accounts: Optional[List[Account_Job_Status]] = Field(default=None, description="계좌별 상태 (단건 조회 시)")
+
+class Scheduled_Jobs_Public(SQLModel):
+    """백그라운드 작업 목록"""
+    data: List[Scheduled_Job_Status]
+    count: int
+
+class Job_Trigger_Response(SQLModel):
+    """즉시 실행 요청 결과"""
+    job: str = Field(description="작업 이름")
+    triggered: int = Field(description="실행을 요청한 계좌 수 (워커 중 하나가 가져가 실행)")
+
+class Scheduler_Node(SQLModel, table=True):
+    """스케줄러 노드 heartbeat 테이블 (살아 있는 노드끼리 계좌를 나눠 폴링)"""
+    node_id: str = Field(primary_key=True, max_length=100, description="노드 식별자")
+    hostname: str = Field(max_length=255, description="호스트명")
+    started_at: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+        description="노드 시작 시각"
+    )
+    heartbeat_at: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, index=True),
+        description="마지막 heartbeat 시각"
+    )
+
+    class Config:
+        table_name = "scheduler_nodes"
+        description = "스케줄러 노드 heartbeat 테이블"
+
+class Scheduler_Job_Control(SQLModel, table=True):
+    """작업별 일시정지 상태 (모든 워커가 주기적으로 읽어 반영)"""
+    name: str = Field(primary_key=True, max_length=100, description="작업 이름")
+    paused: bool = Field(default=False, description="일시정지 여부")
+    updated_at: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+        description="변경 시각"
+    )
+
+    class Config:
+        table_name = "scheduler_job_controls"
+        description = "작업별 일시정지 상태 테이블"
+
+class Scheduler_Job_Report(SQLModel, table=True):
+    """노드(워커)별 작업 상태 보고 (관리 API 가 어느 워커로 가든 전체 상태를 보여 줌)"""
+    node_id: str = Field(primary_key=True, max_length=100, description="노드 식별자")
+    name: str = Field(primary_key=True, max_length=100, description="작업 이름")
+    status: dict[str, Any] = Field(sa_column=Column(JSON, nullable=False), description="Scheduled_Job_Status 값")
+    reported_at: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, index=True),
+        description="보고 시각"
+    )
+
+    class Config:
+        table_name = "scheduler_job_reports"
+        description = "노드별 작업 상태 테이블"
+
+class Scheduler_Run_Request(SQLModel, table=True):
+    """계좌 단위 즉시 실행 요청 (먼저 가져간 워커 하나가 실행)"""
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+    job_name: str = Field(max_length=100, description="작업 이름")
+    account_id: uuid.UUID = Field(foreign_key="account.id", ondelete="CASCADE", description="계좌 ID")
+    requested_at: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, index=True),
+        description="요청 시각"
+    )
+
+    class Config:
+        table_name = "scheduler_run_requests"
+        description = "즉시 실행 요청 테이블"
+
+class Shard_Status(SQLModel):
+    """스케줄러 노드 분산 상태"""
+    enabled: bool = Field(description="노드 분산 사용 여부")
+    node_id: str = Field(description="현재 노드 식별자")
+    ready: bool = Field(description="첫 heartbeat 완료 여부 (완료 전에는 계좌를 맡지 않음)")
+    is_leader: bool = Field(description="단일 노드 작업(아카이브) 담당 여부")
+    nodes: List[str] = Field(default_factory=list, description="살아 있는 노드 목록")
+    last_heartbeat: Optional[datetime] = Field(default=None, description="마지막 heartbeat 성공 시각")
+
+class Poll_Interval_Status(SQLModel):
+    """계좌별 적응형 잔고 조회 주기"""
+    account_id: uuid.UUID = Field(description="계좌 ID")
+    interval_seconds: float = Field(description="현재 조회 주기(초)")
+    activity_score: float = Field(description="활동 점수 (0=휴면, 1=최소 주기)")
+    holdings_count: Optional[int] = Field(default=None, description="보유종목 수 (스냅샷 전이면 없음)")
+    fills_today: int = Field(default=0, description="오늘 주문/보유수량 변화 횟수")
+    viewing: bool = Field(default=False, description="대시보드 조회 중 여부")
+
+class Poll_Intervals_Public(SQLModel):
+    """계좌별 적응형 잔고 조회 주기 목록"""
+    data: List[Poll_Interval_Status]
+    count: int
+
+class Account_Poll_State(SQLModel, table=True):
+    """계좌별 마지막 토큰/잔고 체크 시각 (종료 시 저장, 시작 시 복원해 재시작 직후 몰아서 조회하지 않음)"""
+    account_id: uuid.UUID = Field(foreign_key="account.id", primary_key=True, ondelete="CASCADE", description="계좌 ID")
+    last_token_check: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True)),
+        description="마지막 토큰 체크 시각"
+    )
+    last_balance_check: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True)),
+        description="마지막 잔고 조회 시각"
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+        description="저장 시각"
+    )
+
+    class Config:
+        table_name = "account_poll_states"
+        description = "계좌별 폴링 체크포인트 테이블"
+
+class Account_View(SQLModel, table=True):
+    """계좌별 마지막 대시보드 조회 시각 (조회 API 를 받은 워커와 잔고를 조회하는 워커가 달라 DB 로 공유)"""
+    account_id: uuid.UUID = Field(foreign_key="account.id", primary_key=True, ondelete="CASCADE", description="계좌 ID")
+    last_viewed: datetime = Field(
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False, index=True),
+        description="마지막 조회 시각"
+    )
+
+    class Config:
+        table_name = "account_views"
+        description = "계좌별 마지막 조회 시각 테이블"
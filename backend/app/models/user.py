@@ -44,4 +44,5 @@ class User_Public(User_Base):
 
 class Users_Public(SQLModel):
     data: list[User_Public]
-    count: int 
\ No newline at end of file
+    count: int = Field(description="전체 건수 (조건 없는 큰 목록은 통계 추정치)")
+    next_cursor: str | None = Field(default=None, description="다음 페이지 cursor (마지막 페이지면 없음)") 
\ No newline at end of file
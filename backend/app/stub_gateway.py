@@ -0,0 +1,404 @@
+"""KIS/LS 스텁 게이트웨이 (부하 테스트용)
+
+토큰/잔고/일별 체결 엔드포인트를 실제 증권사와 같은 경로와 응답 형식으로 흉내 내고,
+응답 지연 분포, 오류 비율, 앱키별 초당 요청 한도를 설정할 수 있다.
+
+    fastapi run app/stub_gateway.py --port 8100
+
+백엔드는 BROKER_STUB_URL=http://localhost:8100 으로 실행하면 모든 증권사 요청을 이 서버로 보낸다.
+"""
+import asyncio
+import logging
+import math
+import random
+import time
+import zlib
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlmodel import SQLModel
+
+from app.constants import (
+    KST,
+    KIS_API_BASE_URL,
+    KIS_API_ENDPOINTS,
+    LS_API_BASE_URL,
+    LS_API_ENDPOINTS,
+    STUB_LATENCY_MS,
+    STUB_LATENCY_P99_MS,
+    STUB_ERROR_RATE,
+    STUB_RATE_LIMIT_PER_SECOND,
+    STUB_HOLDINGS_PER_ACCOUNT,
+    STUB_FILLS_PER_DAY
+)
+
+logger = logging.getLogger(__name__)
+
+# 표준정규분포 99% 분위수
+Z_99 = 2.326
+
+
+class Stub_Config(SQLModel):
+    """스텁 동작 설정"""
+    latency_ms: float = STUB_LATENCY_MS
+    latency_p99_ms: float = STUB_LATENCY_P99_MS
+    error_rate: float = STUB_ERROR_RATE
+    rate_limit_per_second: int = STUB_RATE_LIMIT_PER_SECOND
+    holdings_per_account: int = STUB_HOLDINGS_PER_ACCOUNT
+    fills_per_day: int = STUB_FILLS_PER_DAY
+
+
+class Stub_State:
+    """설정, 호출 통계, 앱키별 최근 요청 시각"""
+
+    def __init__(self) -> None:
+        self.config = Stub_Config()
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.account_calls: Counter[str] = Counter()
+        self.errors = 0
+        self.rate_limited = 0
+        self._recent: dict[str, deque] = defaultdict(deque)
+
+    def sample_latency(self) -> float:
+        """중앙값과 p99 로 정한 로그정규분포에서 지연(초) 추출"""
+        median = max(self.config.latency_ms, 0.0)
+        if median == 0:
+            return 0.0
+        sigma = math.log(max(self.config.latency_p99_ms, median) / median) / Z_99
+        return median * math.exp(random.gauss(0.0, sigma)) / 1000
+
+    def allow(self, client_key: str) -> bool:
+        """앱키별 1초 구간 요청 수 제한"""
+        limit = self.config.rate_limit_per_second
+        if limit <= 0:
+            return True
+        now = time.monotonic()
+        recent = self._recent[client_key]
+        while recent and now - recent[0] >= 1.0:
+            recent.popleft()
+        if len(recent) >= limit:
+            return False
+        recent.append(now)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        accounts = len(self.account_calls)
+        return {
+            "calls": dict(self.calls),
+            "total_calls": sum(self.calls.values()),
+            "accounts": accounts,
+            "calls_per_account": sum(self.account_calls.values()) / accounts if accounts else 0.0,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+        }
+
+
+state = Stub_State()
+stub_app = FastAPI(title="Broker Stub Gateway")
+
+
+def use_broker_stub(url: str) -> None:
+    """KIS/LS 기본 URL을 스텁 게이트웨이로 교체 (실전/모의 모두)"""
+    for base_urls in (KIS_API_BASE_URL, LS_API_BASE_URL):
+        for acnt_type in base_urls:
+            base_urls[acnt_type] = url.rstrip("/")
+    logger.warning(f"증권사 요청을 스텁 게이트웨이로 전송 - {url}")
+
+
+def _rng(*parts: str) -> random.Random:
+    """계좌/날짜별로 항상 같은 데이터를 만드는 난수 생성기"""
+    return random.Random(zlib.crc32("|".join(parts).encode()))
+
+
+def _holdings(account_key: str) -> list[dict[str, Any]]:
+    """계좌별 보유종목 (수량/평균단가는 고정, 현재가는 분 단위로 변동)"""
+    rng = _rng(account_key)
+    minute = datetime.now(KST).strftime("%Y%m%d%H%M")
+    holdings = []
+    for index in range(state.config.holdings_per_account):
+        stock_code = f"{rng.randrange(1, 400_000):06d}"
+        avg_price = rng.randrange(1_000, 500_000, 100)
+        price = avg_price * (1 + _rng(stock_code, minute).uniform(-0.1, 0.1))
+        holdings.append({
+            "stock_code": stock_code,
+            "stock_name": f"종목{index + 1:03d}",
+            "quantity": rng.randrange(1, 500),
+            "avg_price": float(avg_price),
+            "price": float(round(price, -1)),
+        })
+    return holdings
+
+
+def _fills(account_key: str, start_date: str, end_date: str) -> list[dict[str, Any]]:
+    """조회 기간의 평일별 체결 내역"""
+    day = datetime.strptime(start_date.replace("-", ""), "%Y%m%d")
+    end = datetime.strptime(end_date.replace("-", ""), "%Y%m%d")
+    fills = []
+    while day <= end:
+        if day.weekday() < 5:
+            rng = _rng(account_key, day.strftime("%Y%m%d"))
+            for index in range(state.config.fills_per_day):
+                quantity = rng.randrange(1, 100)
+                price = float(rng.randrange(1_000, 500_000, 100))
+                fills.append({
+                    "date": day.strftime("%Y%m%d"),
+                    "time": f"{9 + index * 6 // max(state.config.fills_per_day, 1):02d}{rng.randrange(60):02d}{rng.randrange(60):02d}",
+                    "order_no": f"{zlib.crc32(account_key.encode()) % 10_000:04d}{day.strftime('%m%d')}{index:04d}",
+                    "stock_code": f"{rng.randrange(1, 400_000):06d}",
+                    "side": "02" if rng.random() < 0.5 else "01",
+                    "quantity": quantity,
+                    "price": price,
+                    "amount": quantity * price,
+                })
+        day += timedelta(days=1)
+    return fills
+
+
+async def _gate(broker: str, endpoint: str, client_key: str, account_key: Optional[str]) -> Optional[JSONResponse]:
+    """지연/한도/오류 주입, 정상 처리 시 None"""
+    state.calls[f"{broker}:{endpoint}"] += 1
+    if account_key:
+        state.account_calls[account_key] += 1
+    await asyncio.sleep(state.sample_latency())
+
+    if not state.allow(client_key):
+        state.rate_limited += 1
+        if broker == "KIS":
+            return JSONResponse(status_code=500, content={
+                "rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."
+            })
+        return JSONResponse(status_code=429, content={"rsp_cd": "IGW00201", "rsp_msg": "초당 전송건수를 초과하였습니다."})
+
+    if random.random() < state.config.error_rate:
+        state.errors += 1
+        if broker == "KIS":
+            return JSONResponse(status_code=500, content={"rt_cd": "1", "msg_cd": "EGW00500", "msg1": "시스템 오류"})
+        return JSONResponse(status_code=500, content={"rsp_cd": "99999", "rsp_msg": "시스템 오류"})
+    return None
+
+
+# ---------------------------------------------------------------------------
+# KIS
+# ---------------------------------------------------------------------------
+
+@stub_app.post(KIS_API_ENDPOINTS["token"])
+async def kis_token(request: Request) -> Any:
+    body = await request.json()
+    app_key = body.get("appkey", "")
+    if error := await _gate("KIS", "token", app_key, None):
+        return error
+    expires_at = datetime.now() + timedelta(days=1)
+    return {
+        "access_token": f"stub-{app_key}",
+        "token_type": "Bearer",
+        "expires_in": 86400,
+        "access_token_token_expired": expires_at.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+@stub_app.get(KIS_API_ENDPOINTS["balance"])
+async def kis_balance(request: Request) -> Any:
+    account_key = request.query_params.get("CANO", "")
+    if error := await _gate("KIS", "balance", request.headers.get("appkey", ""), account_key):
+        return error
+
+    output1 = []
+    purchase_total = eval_total = 0.0
+    for holding in _holdings(account_key):
+        purchase = holding["avg_price"] * holding["quantity"]
+        evaluation = holding["price"] * holding["quantity"]
+        purchase_total += purchase
+        eval_total += evaluation
+        output1.append({
+            "pdno": holding["stock_code"],
+            "prdt_name": holding["stock_name"],
+            "hldg_qty": str(holding["quantity"]),
+            "ord_psbl_qty": str(holding["quantity"]),
+            "pchs_avg_pric": f"{holding['avg_price']:.4f}",
+            "pchs_amt": str(int(purchase)),
+            "prpr": str(int(holding["price"])),
+            "evlu_amt": str(int(evaluation)),
+            "evlu_pfls_amt": str(int(evaluation - purchase)),
+            "evlu_pfls_rt": f"{(evaluation - purchase) / purchase * 100:.2f}",
+        })
+    cash = 10_000_000.0
+    return {
+        "rt_cd": "0",
+        "msg_cd": "20310000",
+        "msg1": "모의투자 조회가 완료되었습니다.",
+        "output1": output1,
+        "output2": [{
+            "dnca_tot_amt": str(int(cash)),
+            "prvs_rcdl_excc_amt": str(int(cash)),
+            "tot_evlu_amt": str(int(cash + eval_total)),
+            "nass_amt": str(int(cash + eval_total)),
+            "pchs_amt_smtl_amt": str(int(purchase_total)),
+            "evlu_amt_smtl_amt": str(int(eval_total)),
+            "evlu_pfls_smtl_amt": str(int(eval_total - purchase_total)),
+            "asst_icdc_amt": "0",
+            "asst_icdc_rt": "0.00",
+        }],
+    }
+
+
+@stub_app.get(KIS_API_ENDPOINTS["daily_trades"])
+async def kis_daily_trades(request: Request) -> Any:
+    params = request.query_params
+    account_key = params.get("CANO", "")
+    if error := await _gate("KIS", "daily_trades", request.headers.get("appkey", ""), account_key):
+        return error
+
+    fills = _fills(account_key, params.get("INQR_STRT_DT", ""), params.get("INQR_END_DT", ""))
+    output1 = [{
+        "ord_dt": fill["date"],
+        "ord_tmd": fill["time"],
+        "pdno": fill["stock_code"],
+        "prdt_name": fill["stock_code"],
+        "odno": fill["order_no"],
+        "sll_buy_dvsn_cd": fill["side"],
+        "sll_buy_dvsn_cd_name": "매수" if fill["side"] == "02" else "매도",
+        "ord_dvsn_cd": "00",
+        "ord_dvsn_name": "지정가",
+        "ord_unpr": str(int(fill["price"])),
+        "ord_qty": str(fill["quantity"]),
+        "avg_prvs": str(int(fill["price"])),
+        "tot_ccld_qty": str(fill["quantity"]),
+        "tot_ccld_amt": str(int(fill["amount"])),
+        "rmn_qty": "0",
+        "cncl_cfrm_qty": "0",
+        "rjct_qty": "0",
+        "cncl_yn": "N",
+        "infm_tmd": fill["time"],
+    } for fill in fills]
+    total_qty = sum(fill["quantity"] for fill in fills)
+    total_amount = sum(fill["amount"] for fill in fills)
+    return {
+        "rt_cd": "0",
+        "msg1": "조회가 완료되었습니다.",
+        "output1": output1,
+        "output2": {
+            "tot_ord_qty": str(total_qty),
+            "tot_ccld_qty": str(total_qty),
+            "tot_ccld_amt": str(int(total_amount)),
+            "prsm_tlex_smtl": "0",
+            "pchs_avg_pric": str(int(total_amount / total_qty)) if total_qty else "0",
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# LS
+# ---------------------------------------------------------------------------
+
+@stub_app.post(LS_API_ENDPOINTS["token"])
+async def ls_token(request: Request) -> Any:
+    form = await request.form()
+    app_key = str(form.get("appkey", ""))
+    if error := await _gate("LS", "token", app_key, None):
+        return error
+    return {"access_token": f"stub-{app_key}", "token_type": "Bearer", "expires_in": 86400}
+
+
+@stub_app.post(LS_API_ENDPOINTS["balance"])
+async def ls_balance(request: Request) -> Any:
+    token = request.headers.get("authorization", "")
+    if error := await _gate("LS", "balance", token, token):
+        return error
+
+    rows = []
+    purchase_total = eval_total = 0.0
+    for holding in _holdings(token):
+        purchase = holding["avg_price"] * holding["quantity"]
+        evaluation = holding["price"] * holding["quantity"]
+        purchase_total += purchase
+        eval_total += evaluation
+        rows.append({
+            "expcode": holding["stock_code"],
+            "hname": holding["stock_name"],
+            "janqty": holding["quantity"],
+            "mdposqt": holding["quantity"],
+            "pamt": holding["avg_price"],
+            "price": holding["price"],
+            "appamt": evaluation,
+            "dtsunik": evaluation - purchase,
+            "sunikrt": round((evaluation - purchase) / purchase * 100, 2),
+        })
+    cash = 10_000_000.0
+    return {
+        "rsp_cd": "00000",
+        "rsp_msg": "조회가 완료되었습니다.",
+        "t0424OutBlock": {
+            "sunamt": cash + eval_total,
+            "sunamt1": cash,
+            "tappamt": eval_total,
+            "mamt": purchase_total,
+            "tdtsunik": eval_total - purchase_total,
+            "dtsunik": 0,
+        },
+        "t0424OutBlock1": rows,
+    }
+
+
+@stub_app.post(LS_API_ENDPOINTS["daily_trades"])
+async def ls_daily_trades(request: Request) -> Any:
+    token = request.headers.get("authorization", "")
+    if error := await _gate("LS", "daily_trades", token, token):
+        return error
+
+    block = (await request.json()).get("CDPCQ04700InBlock1", {})
+    fills = _fills(token, block.get("QrySrtDt", ""), block.get("QryEndDt", ""))
+    return {
+        "rsp_cd": "00000",
+        "rsp_msg": "조회가 완료되었습니다.",
+        "CDPCQ04700OutBlock2": {"AcntNm": "stub", "RecCnt": len(fills)},
+        "CDPCQ04700OutBlock3": [{
+            "TrdDt": fill["date"],
+            "OrdDt": fill["date"],
+            "TrxTime": fill["time"],
+            "IsuNo": fill["stock_code"],
+            "IsuNm": fill["stock_code"],
+            "TrdNo": fill["order_no"],
+            "TpCodeNm": "장내매수" if fill["side"] == "02" else "장내매도",
+            "TrdQty": fill["quantity"],
+            "TrdUprc": fill["price"],
+            "TrdAmt": fill["amount"],
+            "CmsnAmt": 0,
+            "TaxSumAmt": 0,
+            "BnsplAmt": 0,
+        } for fill in fills],
+    }
+
+
+# ---------------------------------------------------------------------------
+# 스텁 제어
+# ---------------------------------------------------------------------------
+
+@stub_app.get("/stub/config", response_model=Stub_Config)
+def read_config() -> Any:
+    return state.config
+
+
+@stub_app.put("/stub/config", response_model=Stub_Config)
+def update_config(config: Stub_Config) -> Any:
+    state.config = config
+    return state.config
+
+
+@stub_app.get("/stub/stats")
+def read_stats() -> Any:
+    return state.stats()
+
+
+@stub_app.post("/stub/reset")
+def reset_stats() -> Any:
+    state.reset()
+    return state.stats()
+
+
+app = stub_app
@@ -98,6 +98,46 @@ def test_read_accounts(
     assert content["count"] >= 2
 
 
+def test_read_accounts_pages_by_cursor_with_owner_name(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        create_random_account(db)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get(
+            f"{settings.API_V1_STR}/accounts/", headers=superuser_token_headers, params=params
+        )
+        assert response.status_code == 200
+        content = response.json()
+        assert len(content["data"]) <= 2
+        seen.extend(content["data"])
+        cursor = content["next_cursor"]
+        if cursor is None:
+            break
+
+    ids = [account["id"] for account in seen]
+    assert len(set(ids)) == len(ids) == content["count"]
+    assert ids == sorted(ids)
+    # 공개 컬럼 + 소유자 이름(이름이 없으면 이메일)만 내려줌
+    assert all(account["owner_name"] for account in seen)
+    assert all("app_secret" not in account for account in seen)
+
+
+def test_read_accounts_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/accounts/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor!"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
 def test_update_account(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
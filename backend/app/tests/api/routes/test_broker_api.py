@@ -0,0 +1,197 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.constants import KST
+from app.core.config import settings
+from app.models import Account
+from app.models.kis import Kis_Minutely_Balance
+from app.tests.utils.account import create_random_account
+
+
+def create_own_account(db: Session) -> Account:
+    """테스트 일반 사용자(EMAIL_TEST_USER) 소유 KIS 계좌"""
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    return create_random_account(db, owner_id=user.id)
+
+
+def add_balance(db: Session, account: Account, timestamp: datetime, holdings: list[dict]) -> None:
+    db.add(Kis_Minutely_Balance(
+        account_id=account.id, timestamp=timestamp,
+        total_balance=0, available_balance=0, total_assets=0,
+        purchase_amount=0, eval_amount=0, profit_loss=0, profit_loss_rate=0,
+        asset_change_amount=0, asset_change_rate=0, holdings=holdings,
+    ))
+    db.commit()
+
+
+def test_read_realized_pnl_without_fills(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    response = client.get(f"{settings.API_V1_STR}/broker/kis/{account.id}/pnl", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["account_id"] == str(account.id)
+    assert content["method"] == "fifo"
+    assert content["total_realized_pnl"] == 0
+    assert content["data"] == []
+    # KIS 체결 내역의 비용은 추정치
+    assert content["fee_basis"] == "estimated"
+
+
+def test_read_realized_pnl_unsupported_method(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/broker/kis/{account.id}/pnl",
+        headers=normal_user_token_headers,
+        params={"method": "lifo"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Unsupported method")
+
+
+def test_read_realized_pnl_broker_mismatch(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    response = client.get(f"{settings.API_V1_STR}/broker/ls/{account.id}/pnl", headers=normal_user_token_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Account broker mismatch")
+
+
+def test_read_realized_pnl_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_random_account(db)
+    response = client.get(f"{settings.API_V1_STR}/broker/kis/{account.id}/pnl", headers=normal_user_token_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_read_realized_pnl_account_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/broker/kis/{uuid.uuid4()}/pnl", headers=normal_user_token_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Account not found"
+
+
+def test_read_positions_without_balance_or_fills(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    response = client.get(f"{settings.API_V1_STR}/broker/kis/{account.id}/positions", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["account_id"] == str(account.id)
+    assert content["snapshot_as_of"] is None
+    assert content["replayed_fills"] == 0
+    assert content["data"] == []
+
+    response = client.get(
+        f"{settings.API_V1_STR}/broker/kis/{account.id}/positions/drift", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["balance_timestamp"] is None
+    assert content["in_sync"] is True
+    assert content["data"] == []
+
+
+def test_read_positions_starts_from_opening_balance(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    opened_at = datetime.now(KST) - timedelta(hours=1)
+    add_balance(db, account, opened_at, [
+        {"stock_code": "005930", "stock_name": "삼성전자", "quantity": 10, "purchase_price": 70000},
+    ])
+
+    response = client.get(f"{settings.API_V1_STR}/broker/kis/{account.id}/positions", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["snapshot_as_of"] is not None
+    assert content["data"] == [
+        {"stock_code": "005930", "stock_name": "삼성전자", "quantity": 10, "avg_cost": 70000.0},
+    ]
+
+    # 개시 잔고 이전 시점은 재구성할 포지션이 없음
+    response = client.get(
+        f"{settings.API_V1_STR}/broker/kis/{account.id}/positions",
+        headers=normal_user_token_headers,
+        params={"at": (opened_at - timedelta(hours=1)).isoformat()},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+    response = client.get(
+        f"{settings.API_V1_STR}/broker/kis/{account.id}/positions/drift", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["in_sync"] is True
+
+
+def test_read_position_drift_against_latest_balance(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    now = datetime.now(KST)
+    add_balance(db, account, now - timedelta(hours=1), [{"stock_code": "005930", "quantity": 10}])
+    # 체결 내역 없이 보유수량만 바뀐 잔고 → 원장과 어긋남
+    add_balance(db, account, now - timedelta(minutes=1), [{"stock_code": "005930", "quantity": 12}])
+
+    response = client.get(
+        f"{settings.API_V1_STR}/broker/kis/{account.id}/positions/drift", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["in_sync"] is False
+    assert [(item["stock_code"], item["ledger_quantity"], item["broker_quantity"]) for item in content["data"]] == [
+        ("005930", 10, 12),
+    ]
+
+
+def test_read_positions_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_random_account(db)
+    response = client.get(f"{settings.API_V1_STR}/broker/kis/{account.id}/positions", headers=normal_user_token_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_read_positions_account_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/broker/kis/{uuid.uuid4()}/positions", headers=normal_user_token_headers
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Account not found"
+
+
+def test_read_minutely_history_sees_balances_saved_elsewhere(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    now = datetime.now(KST).replace(second=0, microsecond=0)
+    params = {"start_time": (now - timedelta(hours=2)).isoformat(), "end_time": (now + timedelta(minutes=1)).isoformat()}
+    add_balance(db, account, now - timedelta(hours=1), [])
+    url = f"{settings.API_V1_STR}/broker/kis/{account.id}/trades/minutely"
+
+    response = client.get(url, headers=normal_user_token_headers, params=params)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    response = client.get(url, headers=normal_user_token_headers, params=params)
+    assert 'cache;desc="hit"' in response.headers["server-timing"]
+
+    # 다른 프로세스가 저장한 잔고(이 프로세스의 캐시 무효화 없음)도 다음 조회에 반영
+    add_balance(db, account, now - timedelta(minutes=1), [])
+    response = client.get(url, headers=normal_user_token_headers, params=params)
+    assert len(response.json()) == 2
@@ -0,0 +1,259 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.constants import KST
+from app.core.config import settings
+from app.models import Account
+from app.models.kis import Kis_Minutely_Balance
+from app.tests.utils.account import create_random_account
+
+
+def create_own_account(db: Session) -> Account:
+    """테스트 일반 사용자(EMAIL_TEST_USER) 소유 KIS 계좌"""
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    return create_random_account(db, owner_id=user.id)
+
+
+def add_empty_balance(db: Session, account: Account) -> None:
+    """주문가능금액 0, 보유종목 없는 잔고 스냅샷 (사전 검증에서 주문이 거부되어 증권사로 전송하지 않음)"""
+    db.add(Kis_Minutely_Balance(
+        account_id=account.id, timestamp=datetime.now(KST) - timedelta(minutes=1),
+        total_balance=0, available_balance=0, total_assets=0,
+        purchase_amount=0, eval_amount=0, profit_loss=0, profit_loss_rate=0,
+        asset_change_amount=0, asset_change_rate=0, holdings=[],
+    ))
+    db.commit()
+
+
+def test_read_order_latency_requires_superuser(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/orders/latency", headers=normal_user_token_headers)
+    assert response.status_code == 403
+
+    response = client.get(f"{settings.API_V1_STR}/orders/latency", headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert "count" in response.json()
+
+
+def test_create_order_account_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/{uuid.uuid4()}",
+        headers=normal_user_token_headers,
+        json={"stock_code": "005930", "side": "buy", "quantity": 1, "price": 70000},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Account not found"
+
+
+def test_create_order_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_random_account(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/{account.id}",
+        headers=normal_user_token_headers,
+        json={"stock_code": "005930", "side": "buy", "quantity": 1, "price": 70000},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_create_order_unsupported_side(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/{account.id}",
+        headers=normal_user_token_headers,
+        json={"stock_code": "005930", "side": "hold", "quantity": 1, "price": 70000},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Unsupported side")
+
+
+def test_create_order_is_idempotent_by_header(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    add_empty_balance(db, account)
+    headers = {**normal_user_token_headers, "Idempotency-Key": "route-test-1"}
+    data = {"stock_code": "005930", "side": "buy", "quantity": 1, "price": 70000}
+
+    first = client.post(f"{settings.API_V1_STR}/orders/{account.id}", headers=headers, json=data)
+    second = client.post(f"{settings.API_V1_STR}/orders/{account.id}", headers=headers, json=data)
+    assert first.status_code == second.status_code == 200
+    assert first.json()["id"] == second.json()["id"]
+    assert first.json()["idempotency_key"] == "route-test-1"
+    assert first.json()["status"] == "rejected"
+    assert "주문가능금액" in first.json()["message"]
+
+    response = client.get(f"{settings.API_V1_STR}/orders/{account.id}", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 1
+    assert [order["id"] for order in content["data"]] == [first.json()["id"]]
+
+
+def test_read_orders_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_random_account(db)
+    response = client.get(f"{settings.API_V1_STR}/orders/{account.id}", headers=normal_user_token_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_create_basket_without_targets(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/baskets", headers=normal_user_token_headers, json={"targets": []}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Basket has no targets"
+
+
+def test_create_basket_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_random_account(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/baskets",
+        headers=normal_user_token_headers,
+        json={"targets": [{"account_id": str(account.id), "deltas": {"005930": 1}}], "prices": {"005930": 70000}},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_create_basket_target_needs_weights_or_deltas(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/baskets",
+        headers=normal_user_token_headers,
+        json={
+            "targets": [{"account_id": str(account.id), "weights": {"005930": 1.0}, "deltas": {"005930": 1}}],
+            "prices": {"005930": 70000},
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Each target needs exactly one of weights or deltas"
+
+
+def test_create_basket_weights_need_balance_snapshot(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/baskets",
+        headers=normal_user_token_headers,
+        json={"targets": [{"account_id": str(account.id), "weights": {"005930": 1.0}}], "prices": {"005930": 70000}},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"No balance snapshot for account {account.id}"
+
+
+def test_create_basket_rejected_by_prevalidation(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    add_empty_balance(db, account)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/baskets",
+        headers=normal_user_token_headers,
+        json={"targets": [{"account_id": str(account.id), "deltas": {"005930": 1}}], "prices": {"005930": 70000}},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith(f"Basket rejected for account {account.id}")
+
+
+def test_read_basket_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/orders/baskets/{uuid.uuid4()}", headers=normal_user_token_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Basket job not found"
+
+
+def schedule_data(account: Account, **overrides) -> dict:
+    """내일 시작하는 TWAP 분할 주문 (테스트 중에는 자식주문 전송 시각이 오지 않음)"""
+    start = datetime.now(KST) + timedelta(days=1)
+    return {
+        "account_id": str(account.id), "stock_code": "005930", "side": "buy", "quantity": 10,
+        "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat(),
+        "slice_count": 5, "limit_price": 70000, "arrival_price": 70000, **overrides,
+    }
+
+
+def test_create_read_and_cancel_schedule(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/schedules", headers=normal_user_token_headers, json=schedule_data(account)
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["status"] == "scheduled"
+    assert len(content["slices"]) == 5
+    assert sum(item["quantity"] for item in content["slices"]) == 10
+
+    response = client.get(
+        f"{settings.API_V1_STR}/orders/schedules/{content['id']}", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == content["id"]
+
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/schedules/{content['id']}/cancel", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["status"] == "cancelled"
+    assert all(item["status"] == "cancelled" for item in content["slices"])
+
+
+def test_create_schedule_rejects_past_end_time(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_own_account(db)
+    now = datetime.now(KST)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/schedules",
+        headers=normal_user_token_headers,
+        json=schedule_data(
+            account, start_time=(now - timedelta(hours=2)).isoformat(), end_time=(now - timedelta(hours=1)).isoformat()
+        ),
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "end_time must be after start_time and in the future"
+
+
+def test_create_schedule_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    account = create_random_account(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/orders/schedules", headers=normal_user_token_headers, json=schedule_data(account)
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_read_schedule_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/orders/schedules/{uuid.uuid4()}", headers=normal_user_token_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Parent order not found"
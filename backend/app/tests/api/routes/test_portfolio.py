@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.tests.utils.user import create_random_user
+
+
+def test_read_my_portfolio(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    response = client.get(f"{settings.API_V1_STR}/portfolio/", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["owner_id"] == str(user.id)
+    assert isinstance(content["data"], list)
+
+
+def test_read_user_portfolio_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    other = create_random_user(db)
+    response = client.get(f"{settings.API_V1_STR}/portfolio/{other.id}", headers=normal_user_token_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+
+
+def test_read_user_portfolio_as_superuser(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    other = create_random_user(db)
+    response = client.get(f"{settings.API_V1_STR}/portfolio/{other.id}", headers=superuser_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    # 잔고가 반영된 적 없는 사용자는 빈 포트폴리오
+    assert content["owner_id"] == str(other.id)
+    assert content["account_count"] == 0
+    assert content["total_assets"] == 0
+    assert content["data"] == []
+
+
+def test_rebuild_my_portfolio(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    before = client.get(f"{settings.API_V1_STR}/portfolio/", headers=normal_user_token_headers).json()
+    response = client.post(f"{settings.API_V1_STR}/portfolio/rebuild", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["owner_id"] == str(user.id)
+    # 증분 갱신 결과와 계좌별 반영분 재합산 결과가 같아야 함
+    assert content["account_count"] == before["account_count"]
+    assert content["total_assets"] == pytest.approx(before["total_assets"])
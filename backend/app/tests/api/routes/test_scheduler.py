@@ -0,0 +1,88 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models.scheduler import Scheduler_Job_Control
+
+
+def test_scheduler_requires_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/scheduler/jobs", headers=normal_user_token_headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_read_jobs(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/scheduler/jobs", headers=superuser_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == len(content["data"])
+    assert {"token", "balance", "archive"} <= {job["name"] for job in content["data"]}
+
+    response = client.get(f"{settings.API_V1_STR}/scheduler/jobs/balance", headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert all(job["name"] == "balance" for job in response.json()["data"])
+
+
+def test_read_job_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/scheduler/jobs/unknown", headers=superuser_token_headers)
+    assert response.status_code == 404
+
+
+def test_pause_and_resume_job_is_stored(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    response = client.post(f"{settings.API_V1_STR}/scheduler/jobs/archive/pause", headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert response.json()["name"] == "archive"
+    # 다른 워커가 다음 동기화에서 읽도록 DB 에 저장
+    assert db.get(Scheduler_Job_Control, "archive", populate_existing=True).paused
+
+    response = client.post(f"{settings.API_V1_STR}/scheduler/jobs/archive/resume", headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert not db.get(Scheduler_Job_Control, "archive", populate_existing=True).paused
+
+
+def test_pause_unpausable_job(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(f"{settings.API_V1_STR}/scheduler/jobs/order_slices/pause", headers=superuser_token_headers)
+    assert response.status_code == 409
+
+
+def test_run_job_for_unknown_account(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/scheduler/jobs/token/run",
+        headers=superuser_token_headers,
+        params={"account_id": str(uuid.uuid4())},
+    )
+    assert response.status_code == 404
+
+
+def test_run_job_without_account_runner(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(f"{settings.API_V1_STR}/scheduler/jobs/archive/run", headers=superuser_token_headers)
+    assert response.status_code == 400
+
+
+def test_read_nodes_and_poll_intervals(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/scheduler/nodes", headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert response.json()["node_id"]
+
+    response = client.get(f"{settings.API_V1_STR}/scheduler/poll-intervals", headers=superuser_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == len(content["data"])
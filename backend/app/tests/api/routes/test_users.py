@@ -7,7 +7,7 @@ from sqlmodel import Session, select
 from app import crud
 from app.core.config import settings
 from app.core.security import verify_password
-from app.models import User, UserCreate
+from app.models import User, UserCreate, UserPublic
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -168,6 +168,33 @@ def test_retrieve_users(
         assert "email" in item
 
 
+def test_retrieve_users_by_cursor_with_public_columns(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(2):
+        crud.create_user(
+            session=db,
+            user_create=UserCreate(email=random_email(), password=random_lower_string()),
+        )
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/", headers=superuser_token_headers, params={"limit": 1}
+    )
+    first = r.json()
+    assert len(first["data"]) == 1
+    assert first["next_cursor"]
+    assert set(first["data"][0]) == set(UserPublic.model_fields)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 1, "cursor": first["next_cursor"]},
+    )
+    second = r.json()
+    assert second["count"] == first["count"]
+    assert second["data"][0]["id"] > first["data"][0]["id"]
+
+
 def test_update_user_me(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -0,0 +1,19 @@
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine
+
+
+@pytest.fixture()
+def engine() -> Engine:
+    """테스트마다 새로 만드는 메모리 SQLite (모든 모델 테이블 생성)"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture()
+def session(engine: Engine) -> Generator[Session, None, None]:
+    with Session(engine) as session:
+        yield session
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from app.api.services.analytics_service import compute_portfolio_metrics
+
+
+def _minutes(count: int) -> np.ndarray:
+    return np.arange(count, dtype=np.int64) * 60 * 1_000_000
+
+
+def test_compute_portfolio_metrics_returns_and_drawdown() -> None:
+    total_assets = np.array([100.0, 110.0, 99.0, 121.0])
+    profit_loss = total_assets - 100.0
+    metrics = compute_portfolio_metrics(_minutes(4), total_assets, profit_loss, window=2)
+
+    assert metrics["sample_count"] == 4
+    assert metrics["time_weighted_return"] == pytest.approx(0.21)
+    assert metrics["max_drawdown"] == pytest.approx(-0.1)
+    assert metrics["net_cash_flow"] == 0
+    assert metrics["equity_index"][0] == 1.0
+    assert metrics["rolling_volatility"][:2] == [None, None]
+    assert metrics["rolling_volatility"][2] is not None
+    assert metrics["volatility"] > 0
+
+
+def test_compute_portfolio_metrics_excludes_cash_flows() -> None:
+    # 두 번째 스냅샷에서 100 입금, 평가손익은 그대로
+    total_assets = np.array([100.0, 200.0, 220.0])
+    profit_loss = np.array([0.0, 0.0, 20.0])
+    metrics = compute_portfolio_metrics(_minutes(3), total_assets, profit_loss)
+
+    assert metrics["net_cash_flow"] == pytest.approx(100.0)
+    assert metrics["time_weighted_return"] == pytest.approx(0.1)
+
+
+def test_compute_portfolio_metrics_single_sample() -> None:
+    metrics = compute_portfolio_metrics(_minutes(1), np.array([100.0]), np.array([0.0]))
+
+    assert metrics["sample_count"] == 1
+    assert metrics["time_weighted_return"] == 0.0
+    assert metrics["sharpe_ratio"] is None
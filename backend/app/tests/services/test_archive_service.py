@@ -0,0 +1,88 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from app.api.services.archive_service import (
+    archive_minutely_balances,
+    get_archive_path,
+    get_retention_cutoff,
+    load_minutely_history,
+    read_archived_balances,
+)
+from app.constants import MINUTELY_RETENTION_DAYS
+from app.core.config import settings
+from app.models.account import Account
+from app.models.kis import Kis_Minutely_Balance
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MINUTELY_ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture()
+def account(session: Session) -> Account:
+    account = Account(
+        owner_id=uuid.uuid4(), broker="KIS", acnt_name="주식계좌1", cano="50123456",
+        acnt_prdt_cd="01", acnt_type="paper", app_key="key", app_secret="secret",
+    )
+    session.add(account)
+    session.commit()
+    return account
+
+
+def add_balance(session: Session, account: Account, timestamp, total_assets: float) -> None:
+    session.add(Kis_Minutely_Balance(
+        account_id=account.id, timestamp=timestamp,
+        total_balance=total_assets, available_balance=total_assets, total_assets=total_assets,
+        purchase_amount=0, eval_amount=0, profit_loss=0, profit_loss_rate=0,
+        asset_change_amount=0, asset_change_rate=0,
+        holdings=[{"stock_code": "005930", "quantity": 1}],
+    ))
+    session.commit()
+
+
+def db_timestamps(session: Session) -> list:
+    return session.exec(select(Kis_Minutely_Balance.timestamp).order_by(Kis_Minutely_Balance.timestamp)).all()
+
+
+def test_archive_moves_rows_before_cutoff_and_is_idempotent(session: Session, account: Account) -> None:
+    cutoff = get_retention_cutoff(MINUTELY_RETENTION_DAYS)
+    old = [cutoff - timedelta(days=1, minutes=minute) for minute in (2, 1)]
+    recent = cutoff + timedelta(minutes=1)
+    for index, timestamp in enumerate([*old, recent]):
+        add_balance(session, account, timestamp, 1_000_000 + index)
+
+    assert archive_minutely_balances(session, MINUTELY_RETENTION_DAYS) == 2
+    assert len(db_timestamps(session)) == 1  # 보존기간 안쪽 행만 DB 에 남음
+    path = get_archive_path("KIS", account.id, old[0].year, old[0].month)
+    assert path.exists()
+
+    archived = read_archived_balances("KIS", account.id, old[0] - timedelta(hours=1), cutoff)
+    assert [balance.total_assets for balance in archived] == [1_000_000, 1_000_001]
+    assert archived[0].holdings == [{"stock_code": "005930", "quantity": 1}]
+
+    # 같은 시각을 다시 아카이브해도 파일에 중복 저장하지 않음
+    add_balance(session, account, old[0], 9_999_999)
+    assert archive_minutely_balances(session, MINUTELY_RETENTION_DAYS) == 1
+    archived = read_archived_balances("KIS", account.id, old[0] - timedelta(hours=1), cutoff)
+    assert [balance.total_assets for balance in archived] == [1_000_000, 1_000_001]
+    assert archive_minutely_balances(session, MINUTELY_RETENTION_DAYS) == 0
+
+
+def test_load_minutely_history_merges_db_and_archive(session: Session, account: Account) -> None:
+    cutoff = get_retention_cutoff(MINUTELY_RETENTION_DAYS)
+    old = cutoff - timedelta(hours=1)
+    add_balance(session, account, old, 1.0)
+    archive_minutely_balances(session, MINUTELY_RETENTION_DAYS)
+    add_balance(session, account, cutoff + timedelta(hours=1), 2.0)
+    add_balance(session, account, cutoff - timedelta(minutes=30), 3.0)  # 아카이브 전 DB 에 남은 이전 구간
+
+    history = load_minutely_history(session, "KIS", account.id, old - timedelta(minutes=1), cutoff + timedelta(days=1))
+    assert [balance.total_assets for balance in history] == [1.0, 3.0, 2.0]
+
+    # 보존기간 안쪽 구간은 DB 만 조회
+    recent = load_minutely_history(session, "KIS", account.id, cutoff, cutoff + timedelta(days=1))
+    assert [balance.total_assets for balance in recent] == [2.0]
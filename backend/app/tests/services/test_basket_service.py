@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from app.api.services.basket_service import compute_basket_orders
+from app.api.services.fill_service import BUY, SELL
+from app.api.services.order_service import Rate_Limiter
+
+
+def test_weights_rebalance_sells_first_and_liquidates_unlisted() -> None:
+    holdings = {"005930": 10, "000660": 5, "035720": 3}
+    prices = {"005930": 70_000, "000660": 150_000, "035720": 50_000}
+
+    orders = compute_basket_orders(
+        holdings, 2_000_000, prices, weights={"005930": 0.7, "000660": 0.3}
+    )
+
+    # 005930: 1,400,000 / 70,000 = 20주 → +10, 000660: 600,000 / 150,000 = 4주 → -1, 035720: 전량 매도
+    assert orders == [("000660", SELL, 1), ("035720", SELL, 3), ("005930", BUY, 10)]
+
+
+def test_deltas_pass_through_and_missing_price_rejected() -> None:
+    assert compute_basket_orders({}, 0, {}, deltas={"005930": 5, "000660": -2, "035720": 0}) == [
+        ("000660", SELL, 2), ("005930", BUY, 5)
+    ]
+    with pytest.raises(ValueError):
+        compute_basket_orders({}, 1_000_000, {}, weights={"005930": 1.0})
+
+
+def test_rate_limiter_spaces_requests_after_burst() -> None:
+    limiter = Rate_Limiter(rate=100, burst=2)
+    waits = [limiter.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.01, abs=0.005)
+    assert waits[3] == pytest.approx(0.02, abs=0.005)
+
+    started = time.monotonic()
+    Rate_Limiter(rate=50, burst=1).acquire()
+    assert time.monotonic() - started < 0.05
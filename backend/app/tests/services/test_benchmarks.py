@@ -0,0 +1,52 @@
+import time
+import uuid
+
+from sqlalchemy import create_engine
+
+from app.api.services.background_tasks import build_holdings
+from app.api.services.kis_trade_service import process_trade_data_KIS
+from app.api.services.ls_api import convert_daily_ccld_LS
+from app.benchmarks.__main__ import compare
+from app.benchmarks.payloads import kis_balance_payload, kis_daily_ccld_payload, ls_daily_ccld_raw_payload
+from app.benchmarks.primary_keys import run as run_primary_keys
+from app.models.common import uuid7
+
+
+def test_payloads_parse_with_transforms() -> None:
+    holdings = build_holdings(kis_balance_payload(holdings=3)["output1"])
+    assert len(holdings) == 3
+    assert holdings[0]["eval_amount"] == holdings[0]["current_price"] * holdings[0]["quantity"]
+
+    assert len(process_trade_data_KIS(kis_daily_ccld_payload(fills=10), uuid.uuid4())) == 10
+
+    converted = convert_daily_ccld_LS(ls_daily_ccld_raw_payload(fills=4))
+    assert len(converted["output1"]) == 4
+    assert converted["output1"][0]["pdno"]
+    # 같은 시드는 같은 응답
+    assert kis_daily_ccld_payload(fills=5) == kis_daily_ccld_payload(fills=5)
+
+
+def test_compare_flags_time_and_memory_regressions() -> None:
+    baseline = {"cases": {"a": {"relative": 10.0, "peak_kib": 100.0}, "b": {"relative": 1.0, "peak_kib": 1.0}}}
+    current = {"cases": {"a": {"relative": 12.9, "peak_kib": 131.0}}}
+    regressions = compare(current, baseline, tolerance=0.3)
+    assert regressions[0].startswith("a.peak_kib")
+    assert regressions[1].startswith("b:")
+    assert len(regressions) == 2
+
+
+def test_uuid7_is_time_ordered() -> None:
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+    assert first.version == second.version == 7
+    assert first.variant == uuid.RFC_4122
+    assert first < second
+    assert abs((first.int >> 80) - time.time_ns() // 1_000_000) < 1000
+
+
+def test_primary_key_benchmark_runs_each_scheme() -> None:
+    result = run_primary_keys(create_engine("sqlite://"), rows=200, accounts=5, batch_size=50)
+    assert set(result["schemes"]) == {"uuid4", "uuid7", "bigint"}
+    assert all(measured["rows_per_second"] > 0 for measured in result["schemes"].values())
+
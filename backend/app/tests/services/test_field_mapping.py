@@ -0,0 +1,201 @@
+import asyncio
+import uuid
+from datetime import date, datetime, time
+
+import pytest
+from sqlmodel import Session, select
+
+from app.api.services import kis_trade_service, ls_trade_service
+from app.api.services.field_mapping import Const, compile_mapping, hhmmss, to_float, upsert_row
+from app.api.services.fill_service import BUY, SELL, _ls_fill, load_fills
+from app.api.services.kis_trade_service import update_account_daily_trades_KIS
+from app.api.services.ls_api import convert_daily_ccld_LS
+from app.api.services.ls_trade_service import process_trade_data_LS, update_account_daily_trades_LS
+from app.benchmarks.payloads import kis_daily_ccld_payload, ls_daily_ccld_raw_payload
+from app.models.account import Account
+from app.constants import KST
+from app.models.common import minute_bucket
+from app.models.kis import Kis_Daily_Trade, Kis_Minutely_Balance
+from app.models.ls import Ls_Trade
+
+
+def add_account(session: Session, broker: str) -> Account:
+    account = Account(
+        owner_id=uuid.uuid4(), broker=broker, acnt_name=f"{broker}계좌", cano="50123456",
+        acnt_prdt_cd="01", acnt_type="paper", app_key="key", app_secret="secret",
+    )
+    session.add(account)
+    session.commit()
+    return account
+
+
+def test_compiled_mapping_builds_tuples_and_dicts() -> None:
+    mapping = compile_mapping("sample", [
+        ("code", "pdno"),
+        ("price", "prpr", to_float),
+        ("side", lambda item: "buy" if item.get("qty", 0) > 0 else "sell"),
+        ("flag", Const("N")),
+    ])
+    item = {"pdno": "005930", "prpr": "", "qty": 3}
+    assert mapping.columns == ("code", "price", "side", "flag")
+    assert mapping.row(item) == ("005930", 0.0, "buy", "N")
+    assert mapping.records([item]) == [{"code": "005930", "price": 0.0, "side": "buy", "flag": "N"}]
+    assert hhmmss("093015123") == time(9, 30, 15)
+
+    with pytest.raises(ValueError):
+        compile_mapping("duplicate", [("code", "pdno"), ("code", "isu_no")])
+
+
+def test_ls_conversion_feeds_ls_trades() -> None:
+    converted = convert_daily_ccld_LS(ls_daily_ccld_raw_payload(fills=3))
+    first = converted["output1"][0]
+    assert first["ord_dt"] == "20240304"
+    assert first["cncl_yn"] == "N"
+
+    # 변환 결과의 output2 는 목록이고 정지조건가격은 빈 문자열이다
+    trades = process_trade_data_LS(converted, uuid.uuid4())
+    assert len(trades) == 3
+    assert trades[0].trade_date == date(2024, 3, 4)
+
+
+def test_ls_trade_side_comes_from_type_name() -> None:
+    raw = ls_daily_ccld_raw_payload(fills=3)
+    # 매도도 거래수량은 양수
+    for row, name in zip(raw["CDPCQ04700OutBlock3"], ("장내매수", "장내매도", "이체입금"), strict=True):
+        row["TpCodeNm"] = name
+    trades = process_trade_data_LS(convert_daily_ccld_LS(raw), uuid.uuid4())
+    assert [trade.trade_type for trade in trades] == ["매수", "매도", "이체입금"]
+    assert all(trade.quantity > 0 for trade in trades)
+    # 체결이 아닌 거래는 체결 재생에서 제외
+    assert [_ls_fill(trade).side if _ls_fill(trade) else None for trade in trades] == [BUY, SELL, None]
+
+
+def test_bulk_upsert_inserts_then_updates(session: Session, monkeypatch) -> None:
+    account = add_account(session, "KIS")
+    payload = kis_daily_ccld_payload(fills=20)
+
+    async def fake_inquire(*args, **kwargs):
+        return payload
+
+    monkeypatch.setattr(kis_trade_service, "inquire_daily_ccld_from_KIS", fake_inquire)
+    assert asyncio.run(update_account_daily_trades_KIS(account.id, "20240304", "20240308", session)) == (20, [])
+
+    payload["output1"][0]["tot_ccld_qty"] = "999"
+    assert asyncio.run(update_account_daily_trades_KIS(account.id, "20240304", "20240308", session)) == (20, [])
+    trades = session.exec(select(Kis_Daily_Trade).where(Kis_Daily_Trade.account_id == account.id)).all()
+    assert len(trades) == 20
+    updated = next(trade for trade in trades if trade.order_no == payload["output1"][0]["odno"])
+    assert updated.trade_qty == 999
+
+
+def test_bulk_upsert_skips_unchanged_rows(session: Session, monkeypatch) -> None:
+    account = add_account(session, "KIS")
+    payload = kis_daily_ccld_payload(fills=5)
+
+    async def fake_inquire(*args, **kwargs):
+        return payload
+
+    monkeypatch.setattr(kis_trade_service, "inquire_daily_ccld_from_KIS", fake_inquire)
+    asyncio.run(update_account_daily_trades_KIS(account.id, "20240304", "20240308", session))
+    stamps = {trade.order_no: trade.updated_at for trade in session.exec(select(Kis_Daily_Trade)).all()}
+
+    # 같은 내용 재동기화, 조회 기간 합계(output2)만 다른 재동기화는 행을 건드리지 않음
+    asyncio.run(update_account_daily_trades_KIS(account.id, "20240304", "20240308", session))
+    payload["output2"]["prsm_tlex_smtl"] = "12345"
+    asyncio.run(update_account_daily_trades_KIS(account.id, "20240301", "20240308", session))
+    session.expire_all()
+    assert {trade.order_no: trade.updated_at for trade in session.exec(select(Kis_Daily_Trade)).all()} == stamps
+
+    payload["output1"][0]["tot_ccld_qty"] = "999"
+    asyncio.run(update_account_daily_trades_KIS(account.id, "20240304", "20240308", session))
+    session.expire_all()
+    changed = [
+        trade.order_no for trade in session.exec(select(Kis_Daily_Trade)).all()
+        if trade.updated_at != stamps[trade.order_no]
+    ]
+    assert changed == [payload["output1"][0]["odno"]]
+
+
+def test_ls_trade_sync_is_idempotent(session: Session, monkeypatch) -> None:
+    account = add_account(session, "LS")
+    converted = convert_daily_ccld_LS(ls_daily_ccld_raw_payload(fills=10))
+
+    async def fake_inquire(*args, **kwargs):
+        return converted
+
+    monkeypatch.setattr(ls_trade_service, "inquire_daily_ccld_from_LS", fake_inquire)
+    for _ in range(2):
+        count, failed = asyncio.run(update_account_daily_trades_LS(account.id, "20240304", "20240308", session))
+        assert failed == []
+    assert count == len(session.exec(select(Ls_Trade).where(Ls_Trade.account_id == account.id)).all())
+
+
+def test_ls_identical_fills_are_kept_by_trade_no(session: Session, monkeypatch) -> None:
+    account = add_account(session, "LS")
+    raw = ls_daily_ccld_raw_payload(fills=2)
+    second = raw["CDPCQ04700OutBlock3"][1]
+    second.update({key: value for key, value in raw["CDPCQ04700OutBlock3"][0].items() if key != "TrdNo"})
+    converted = convert_daily_ccld_LS(raw)
+    # 거래번호 없이 저장된 이전 행은 다시 동기화하면 번호가 있는 행으로 바뀜
+    legacy = process_trade_data_LS(converted, account.id)[0]
+    legacy.trade_no = None
+    session.add(legacy)
+    session.commit()
+
+    async def fake_inquire(*args, **kwargs):
+        return converted
+
+    monkeypatch.setattr(ls_trade_service, "inquire_daily_ccld_from_LS", fake_inquire)
+    assert asyncio.run(update_account_daily_trades_LS(account.id, "20240304", "20240308", session)) == (2, [])
+    trades = session.exec(select(Ls_Trade).where(Ls_Trade.account_id == account.id)).all()
+    assert sorted(trade.trade_no for trade in trades) == ["1", "2"]
+
+
+def test_ls_corrected_resync_updates_rows_in_place(session: Session, monkeypatch) -> None:
+    account = add_account(session, "LS")
+    raw = ls_daily_ccld_raw_payload(fills=5)
+
+    async def fake_inquire(*args, **kwargs):
+        return convert_daily_ccld_LS(raw)
+
+    monkeypatch.setattr(ls_trade_service, "inquire_daily_ccld_from_LS", fake_inquire)
+    asyncio.run(update_account_daily_trades_LS(account.id, "20240304", "20240308", session))
+    before = {trade.trade_no: (trade.id, trade.updated_at) for trade in session.exec(select(Ls_Trade)).all()}
+    refs = [fill.ref for fill in load_fills(session, account)]
+
+    # 체결 내용이 정정된 거래만 같은 행에서 갱신되고 체결 식별자는 그대로 유지
+    raw["CDPCQ04700OutBlock3"][0]["TrdUprc"] += 50
+    asyncio.run(update_account_daily_trades_LS(account.id, "20240304", "20240308", session))
+    session.expire_all()
+    after = {trade.trade_no: (trade.id, trade.updated_at) for trade in session.exec(select(Ls_Trade)).all()}
+    assert {no: row_id for no, (row_id, _) in after.items()} == {no: row_id for no, (row_id, _) in before.items()}
+    assert [no for no in after if after[no][1] != before[no][1]] == ["1"]
+    assert [fill.ref for fill in load_fills(session, account)] == refs
+
+
+def test_minutely_snapshot_upsert_keeps_one_row_per_minute(session: Session) -> None:
+    account = add_account(session, "KIS")
+
+    def snapshot(second: int, minute: int = 1, total_assets: float = 1000.0) -> Kis_Minutely_Balance:
+        return Kis_Minutely_Balance(
+            account_id=account.id, timestamp=KST.localize(datetime(2026, 10, 19, 9, minute, second)),
+            total_balance=0, available_balance=0, total_assets=total_assets, purchase_amount=0,
+            eval_amount=0, profit_loss=0, profit_loss_rate=0, asset_change_amount=0, asset_change_rate=0,
+        )
+
+    # 같은 분에 두 루프/재시도가 저장해도 한 행, 나중 조회값으로 덮어씀
+    for balance in (snapshot(5), snapshot(40, total_assets=1200.0), snapshot(3, minute=2)):
+        balance.minute_bucket = minute_bucket(balance.timestamp)
+        upsert_row(session, Kis_Minutely_Balance, balance.model_dump(), ("account_id", "minute_bucket"))
+    session.commit()
+
+    rows = session.exec(select(Kis_Minutely_Balance).order_by(Kis_Minutely_Balance.minute_bucket)).all()
+    assert [row.total_assets for row in rows] == [1200.0, 1000.0]
+    assert [row.timestamp.second for row in rows] == [40, 3]
+
+    # minute_bucket 없이 추가해도 INSERT 시 timestamp 로 채움
+    session.add(snapshot(30, minute=3))
+    session.commit()
+    latest = session.exec(select(Kis_Minutely_Balance.minute_bucket).order_by(Kis_Minutely_Balance.timestamp.desc())).first()
+    assert (latest.minute, latest.second) == (3, 0)
+
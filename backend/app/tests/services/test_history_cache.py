@@ -0,0 +1,70 @@
+import uuid
+from decimal import Decimal
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.services.history_cache import History_Cache
+from app.core.json_codec import (
+    Serialized_JSON_Response,
+    Timed_JSON_Response,
+    Timed_Route,
+    dumps,
+    loads,
+    serialization_stats,
+)
+
+
+def test_history_cache_invalidates_per_account() -> None:
+    cache = History_Cache(max_entries=2, ttl_seconds=60)
+    first, second = uuid.uuid4(), uuid.uuid4()
+    cache.put(first, ("KIS", 1), b"[1]")
+    cache.put(second, ("KIS", 1), b"[2]")
+    assert cache.get(first, ("KIS", 1)) == b"[1]"
+
+    cache.invalidate(first)
+    assert cache.get(first, ("KIS", 1)) is None
+    assert cache.get(second, ("KIS", 1)) == b"[2]"
+
+    # 최대 개수를 넘으면 가장 오래 안 쓴 항목부터 제거
+    cache.put(first, ("KIS", 2), b"[3]")
+    cache.put(first, ("KIS", 3), b"[4]")
+    assert cache.get(second, ("KIS", 1)) is None
+    assert len(cache) == 2
+
+    expired = History_Cache(ttl_seconds=-1)
+    expired.put(first, "key", b"[]")
+    assert expired.get(first, "key") is None
+
+
+def test_timed_routes_report_serialization() -> None:
+    assert loads(dumps({"amount": Decimal("1.50"), "qty": Decimal("3"), 1: {"a"}})) == {
+        "amount": 1.5, "qty": 3, "1": ["a"]
+    }
+
+    router = APIRouter(default_response_class=Timed_JSON_Response, route_class=Timed_Route)
+
+    @router.get("/items")
+    def items() -> list[dict]:
+        return [{"id": index} for index in range(3)]
+
+    @router.get("/cached", response_class=Serialized_JSON_Response)
+    def cached() -> Serialized_JSON_Response:
+        return Serialized_JSON_Response(b'{"cached":true}', cache_hit=True)
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    serialization_stats.clear()
+
+    response = client.get("/items")
+    assert response.json() == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert response.headers["server-timing"].startswith("serialize;dur=")
+
+    response = client.get("/cached")
+    assert response.json() == {"cached": True}
+    assert 'cache;desc="hit"' in response.headers["server-timing"]
+
+    summary = serialization_stats.summary()
+    assert summary["GET /items"]["count"] == 1
+    assert summary["GET /cached"]["cache_hits"] == 1
@@ -0,0 +1,58 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.api.services.listing_service import count_rows, decode_cursor, encode_cursor, fetch_page
+from app.models.account import Account
+from app.models.user import User
+
+
+def add_user(session: Session, email: str) -> User:
+    user = User(email=email, hashed_password="x")
+    session.add(user)
+    session.commit()
+    return user
+
+
+def add_accounts(session: Session, owner: User, count: int) -> None:
+    for index in range(count):
+        session.add(Account(
+            owner_id=owner.id, broker="KIS", acnt_name=f"계좌{index}", cano=f"5012{index:04d}",
+            acnt_type="paper", app_key="key", app_secret="secret",
+        ))
+    session.commit()
+
+
+def test_cursor_round_trip_and_rejects_garbage() -> None:
+    account_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(account_id)) == account_id
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor!")
+    assert exc.value.status_code == 400
+
+
+def test_count_rows_reflects_every_write(session: Session) -> None:
+    owner = add_user(session, "owner@example.com")
+    add_accounts(session, owner, 2)
+    assert count_rows(session, Account) == 2
+
+    # 캐시 없이 매번 세므로 flush 를 거치지 않는 쓰기도 바로 반영
+    session.exec(Account.__table__.insert().values(
+        id=uuid.uuid4(), owner_id=owner.id, broker="KIS", acnt_name="직접", cano="1", acnt_type="paper",
+        app_key="k", app_secret="s", is_active=True,
+    ))
+    other = add_user(session, "other@example.com")
+    add_accounts(session, other, 1)
+    assert count_rows(session, Account) == 4
+    assert count_rows(session, Account, Account.owner_id == other.id) == 1
+
+
+def test_fetch_page_stops_at_last_page(session: Session) -> None:
+    add_accounts(session, add_user(session, "owner@example.com"), 3)
+
+    rows, cursor = fetch_page(session, Account, [Account.id, Account.acnt_name], limit=2)
+    assert len(rows) == 2 and cursor is not None
+    rows, cursor = fetch_page(session, Account, [Account.id, Account.acnt_name], limit=2, cursor=cursor)
+    assert len(rows) == 1 and cursor is None
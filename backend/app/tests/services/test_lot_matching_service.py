@@ -0,0 +1,129 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from app.api.services import kis_trade_service, lot_matching_service
+from app.api.services.kis_trade_service import update_account_daily_trades_KIS
+from app.benchmarks.payloads import kis_daily_ccld_payload
+from app.api.services.fill_service import BUY, FEE_BASIS_BROKER, FEE_BASIS_ESTIMATED, SELL, Fill, _kis_fill, fee_basis
+from app.api.services.lot_matching_service import AVERAGE, FIFO, Lot_Book, update_realized_pnl
+from app.constants import KST
+from app.models.account import Account
+from app.models.kis import Kis_Daily_Trade
+
+ACCOUNT_ID = uuid.uuid4()
+START = KST.localize(datetime(2024, 3, 4, 9, 0))
+
+
+def make_fill(side: str, quantity: int, price: float, minute: int, fee: float = 0.0) -> Fill:
+    return Fill(
+        account_id=ACCOUNT_ID,
+        stock_code="005930",
+        stock_name="삼성전자",
+        side=side,
+        quantity=quantity,
+        price=price,
+        fee=fee,
+        executed_at=START + timedelta(minutes=minute),
+        ref=str(minute),
+    )
+
+
+FILLS = [
+    make_fill(BUY, 10, 100.0, 0),
+    make_fill(BUY, 10, 200.0, 1),
+    make_fill(SELL, 15, 300.0, 2),
+]
+
+
+def test_fifo_matches_oldest_lots_first() -> None:
+    lot_book = Lot_Book(FIFO)
+    realized = lot_book.apply_all(FILLS)
+
+    book = lot_book.books["005930"]
+    assert realized == pytest.approx(10 * 200 + 5 * 100)
+    assert book.realized_qty == 15
+    assert book.open_qty == 5
+    assert book.lots[0].unit_cost == pytest.approx(200.0)
+
+
+def test_average_cost_uses_moving_average() -> None:
+    lot_book = Lot_Book(AVERAGE)
+    realized = lot_book.apply_all(FILLS)
+
+    book = lot_book.books["005930"]
+    assert realized == pytest.approx(15 * (300 - 150))
+    assert book.open_qty == 5
+    assert book.open_cost == pytest.approx(5 * 150)
+
+
+def test_fees_reduce_realized_pnl_and_unmatched_sells_are_tracked() -> None:
+    lot_book = Lot_Book(FIFO)
+    lot_book.apply(make_fill(BUY, 10, 100.0, 0, fee=10.0))
+    realized = lot_book.apply(make_fill(SELL, 12, 110.0, 1, fee=12.0))
+
+    book = lot_book.books["005930"]
+    assert realized == pytest.approx(10 * ((110 - 1) - (100 + 1)))
+    assert book.unmatched_sell_qty == 2
+    assert book.fees == pytest.approx(22.0)
+
+
+def test_incremental_apply_matches_full_replay() -> None:
+    full = Lot_Book(FIFO)
+    full.apply_all(FILLS)
+
+    incremental = Lot_Book(FIFO)
+    incremental.apply_all(FILLS[:1])
+    incremental = Lot_Book(FIFO, incremental.books)
+    incremental.apply_all(FILLS[1:])
+
+    assert incremental.books["005930"].realized_pnl == full.books["005930"].realized_pnl
+    assert incremental.books["005930"].open_qty == full.books["005930"].open_qty
+
+
+def test_unknown_method_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        Lot_Book("lifo")
+
+
+def test_kis_fill_fee_is_prorated_from_estimated_cost_summary() -> None:
+    trade = Kis_Daily_Trade(
+        account_id=ACCOUNT_ID, order_date="20240304", stock_code="005930", stock_name="삼성전자",
+        order_no="0000001", order_time="090000", order_type="01", order_price=100.0, order_qty=10,
+        trade_price=100.0, trade_qty=10, trade_amount=1000.0, trade_time="090001",
+        total_trade_amt_sum=4000.0, estimated_tax_amt=40.0,
+    )
+    assert _kis_fill(trade).fee == pytest.approx(10.0)
+
+    trade.estimated_tax_amt = None
+    assert _kis_fill(trade).fee == 0.0
+    assert fee_basis("kis") == FEE_BASIS_ESTIMATED and fee_basis("LS") == FEE_BASIS_BROKER
+
+
+def test_unchanged_resync_does_not_replay_history(session: Session, monkeypatch) -> None:
+    account = Account(
+        owner_id=uuid.uuid4(), broker="KIS", acnt_name="주식계좌1", cano="50123456",
+        acnt_prdt_cd="01", acnt_type="paper", app_key="key", app_secret="secret",
+    )
+    session.add(account)
+    session.commit()
+    payload = kis_daily_ccld_payload(fills=10)
+
+    async def fake_inquire(*args, **kwargs):
+        return payload
+
+    resets = []
+    monkeypatch.setattr(kis_trade_service, "inquire_daily_ccld_from_KIS", fake_inquire)
+    monkeypatch.setattr(lot_matching_service, "reset_lot_book", lambda *args: resets.append(args))
+
+    asyncio.run(update_account_daily_trades_KIS(account.id, "20240304", "20240308", session))
+    assert update_realized_pnl(session, account, FIFO) == 10
+
+    # 야간 재동기화: 체결은 그대로, 조회 기간 합계만 달라짐
+    payload["output2"]["tot_ccld_amt"] = "1"
+    asyncio.run(update_account_daily_trades_KIS(account.id, "20240301", "20240308", session))
+    assert update_realized_pnl(session, account, FIFO) == 0
+    assert resets == []
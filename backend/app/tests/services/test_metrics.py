@@ -0,0 +1,83 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+
+from app.api.services.history_cache import History_Cache
+from app.core.config import Settings
+from app.core.metrics import check_metrics_token, metrics_response, observe_broker_call, record_batch, record_sweep
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_observe_broker_call_records_latency_and_token_refreshes() -> None:
+    @observe_broker_call("TEST", "token")
+    def issue_token(account):
+        if account.acnt_type == "fail":
+            raise RuntimeError("토큰 발급 실패")
+        return "token"
+
+    @observe_broker_call("TEST", "balance")
+    async def inquire_balance(acnt_type, account_no):
+        return account_no
+
+    before = _sample("broker_token_refreshes_total", broker="TEST", acnt_type="paper", status="ok")
+    assert issue_token(SimpleNamespace(acnt_type="paper")) == "token"
+    with pytest.raises(RuntimeError):
+        issue_token(account=SimpleNamespace(acnt_type="fail"))
+    assert asyncio.run(inquire_balance("real", account_no="1")) == "1"
+
+    assert _sample("broker_token_refreshes_total", broker="TEST", acnt_type="paper", status="ok") == before + 1
+    assert _sample("broker_token_refreshes_total", broker="TEST", acnt_type="fail", status="error") >= 1
+    assert _sample(
+        "broker_request_seconds_count", broker="TEST", endpoint="balance", acnt_type="real", status="ok"
+    ) >= 1
+
+
+def test_sweep_batch_and_cache_metrics() -> None:
+    record_sweep("test_loop", time.perf_counter(), lag_seconds=-3, success=2, failed=1)
+    assert _sample("background_sweep_lag_seconds", loop="test_loop") == 0.0
+    assert _sample("background_sweep_accounts_total", loop="test_loop", status="ok") >= 2
+
+    rows_before = _sample("db_batch_rows_sum", operation="test_batch")
+    record_batch("test_batch", time.perf_counter(), 10)
+    assert _sample("db_batch_rows_sum", operation="test_batch") == rows_before + 10
+
+    hits = _sample("cache_requests_total", cache="history", result="hit")
+    misses = _sample("cache_requests_total", cache="history", result="miss")
+    cache = History_Cache()
+    cache.put("account", "key", b"[]")
+    cache.get("account", "key")
+    cache.get("account", "other")
+    assert _sample("cache_requests_total", cache="history", result="hit") == hits + 1
+    assert _sample("cache_requests_total", cache="history", result="miss") == misses + 1
+
+    body = metrics_response().body.decode()
+    assert "broker_request_seconds" in body
+    assert "cache_requests_total" in body
+
+
+def test_metrics_token_is_required_when_configured() -> None:
+    check_metrics_token(None, None)
+    check_metrics_token("Bearer secret", "secret")
+    for authorization in (None, "Bearer wrong", "secret"):
+        with pytest.raises(HTTPException) as exc:
+            check_metrics_token(authorization, "secret")
+        assert exc.value.status_code == 401
+
+
+def test_metrics_settings_require_token_and_multiprocess_dir(monkeypatch) -> None:
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    assert not Settings().METRICS_ENABLED
+    with pytest.raises(ValueError, match="PROMETHEUS_MULTIPROC_DIR"):
+        Settings(METRICS_ENABLED=True, WEB_CONCURRENCY=4)
+    with pytest.raises(ValueError, match="METRICS_TOKEN"):
+        Settings(METRICS_ENABLED=True, ENVIRONMENT="staging")
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+    assert Settings(METRICS_ENABLED=True, WEB_CONCURRENCY=4, METRICS_TOKEN="secret").METRICS_ENABLED
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from app.constants import KST
+from app.api.services.fill_service import BUY, SELL
+from app.api.services.order_schedule_service import (
+    PARENT_RUNNING,
+    SLICE_PENDING,
+    SLICE_SENDING,
+    TWAP,
+    VWAP,
+    Slice_Scheduler,
+    build_schedule,
+    compute_slippage_bps,
+    create_parent_order,
+    recover_stuck_slices,
+    slice_idempotency_key
+)
+from app.models.account import Account
+from app.models.order import Order, Order_Slice, Parent_Order, Parent_Order_Create
+from app.models.user import User
+
+
+def test_twap_spreads_evenly_with_remainder_first() -> None:
+    start = KST.localize(datetime(2024, 3, 4, 10, 0))
+    end = KST.localize(datetime(2024, 3, 4, 10, 10))
+
+    schedule = build_schedule(TWAP, 103, start, end, 10)
+
+    assert [qty for _, qty in schedule] == [11, 11, 11, 10, 10, 10, 10, 10, 10, 10]
+    assert [time.minute for time, _ in schedule] == list(range(10))
+
+
+def test_vwap_follows_intraday_profile() -> None:
+    start = KST.localize(datetime(2024, 3, 4, 9, 0))
+    end = KST.localize(datetime(2024, 3, 4, 11, 0))
+    profile = [0.4, 0.1, 0.1, 0.4]
+
+    schedule = build_schedule(VWAP, 1000, start, end, 4, profile=profile)
+
+    assert [qty for _, qty in schedule] == [400, 100, 100, 400]
+
+
+def test_schedule_never_exceeds_quantity_in_slices() -> None:
+    start = KST.localize(datetime(2024, 3, 4, 13, 0))
+    end = KST.localize(datetime(2024, 3, 4, 15, 0))
+
+    for strategy in (TWAP, VWAP):
+        schedule = build_schedule(strategy, 3, start, end, 10)
+        assert len(schedule) == 3
+        assert sum(qty for _, qty in schedule) == 3
+
+
+def test_slippage_sign_is_adverse_positive() -> None:
+    assert compute_slippage_bps(BUY, 10_000, 10_010) == pytest.approx(10.0)
+    assert compute_slippage_bps(SELL, 10_000, 10_010) == pytest.approx(-10.0)
+    assert compute_slippage_bps(BUY, None, 10_010) is None
+
+
+def test_parent_order_requires_order_capable_broker(engine: Engine) -> None:
+    now = datetime.now(KST)
+    account = Account(
+        owner_id=uuid.uuid4(), broker="ETC", acnt_name="계좌", cano="50120000",
+        acnt_type="paper", app_key="key", app_secret="secret",
+    )
+    parent_in = Parent_Order_Create(
+        account_id=account.id, stock_code="005930", side=BUY, quantity=10,
+        start_time=now, end_time=now + timedelta(hours=1), slice_count=2,
+    )
+    with Session(engine) as session:
+        with pytest.raises(HTTPException) as error:
+            create_parent_order(session, account, parent_in)
+        assert error.value.detail == "Unsupported broker"
+        assert session.exec(select(Parent_Order)).all() == []
+
+
+def test_stuck_sending_slices_are_recovered_without_resending_unknown_outcomes(engine: Engine) -> None:
+    now = datetime.now(KST)
+    with Session(engine) as session:
+        owner = User(email="owner@example.com", hashed_password="x")
+        session.add(owner)
+        session.commit()
+        account = Account(
+            owner_id=owner.id, broker="KIS", acnt_name="계좌", cano="50120000",
+            acnt_type="paper", app_key="key", app_secret="secret",
+        )
+        parent = Parent_Order(
+            account_id=account.id, stock_code="005930", side=BUY, quantity=40, strategy=TWAP,
+            order_type="market", slice_count=4, start_time=now, end_time=now + timedelta(hours=1),
+        )
+        session.add_all([account, parent])
+        slices = [
+            Order_Slice(parent_id=parent.id, sequence=index, scheduled_at=now, quantity=10,
+                        status=SLICE_SENDING, claimed_at=now - timedelta(seconds=claimed_ago))
+            for index, claimed_ago in enumerate((300, 300, 300, 5))
+        ]
+        session.add_all(slices)
+        # 0: 주문 기록 전 중단, 1: 전송 중 중단(결과 모름), 2: 접수 후 상태 기록 전 중단, 3: 전송 중
+        for order_slice, status in ((slices[1], "pending"), (slices[2], "submitted")):
+            session.add(Order(
+                account_id=account.id, broker="KIS", idempotency_key=slice_idempotency_key(order_slice.id),
+                stock_code="005930", side=BUY, quantity=10, price=0, order_type="market", status=status,
+            ))
+        session.commit()
+
+        assert recover_stuck_slices(session, timeout_seconds=60) == 3
+        statuses = [session.get(Order_Slice, order_slice.id).status for order_slice in slices]
+        assert statuses == [SLICE_PENDING, "failed", "submitted", SLICE_SENDING]
+        assert session.get(Parent_Order, parent.id).status == PARENT_RUNNING
+        assert session.get(Parent_Order, parent.id).submitted_qty == 10
+
+
+def test_due_slices_are_dispatched_concurrently_up_to_the_limit(engine: Engine) -> None:
+    lock = threading.Lock()
+    running, peak, done = 0, 0, []
+
+    def slow_execute(slice_id: uuid.UUID) -> str:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.2)  # 느린 증권사 응답
+        with lock:
+            running -= 1
+            done.append(slice_id)
+        return "submitted"
+
+    async def scenario() -> float:
+        scheduler = Slice_Scheduler(bind=engine, execute=slow_execute, max_concurrency=3)
+        due = datetime.now(KST) - timedelta(seconds=1)
+        for _ in range(6):
+            scheduler._push(due, uuid.uuid4())
+        started = time.perf_counter()
+        task = asyncio.create_task(scheduler.run())
+        while len(done) < 6:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(scenario())
+    assert peak == 3
+    assert elapsed < 0.2 * 6 * 0.75  # 직렬이면 1.2초
@@ -0,0 +1,162 @@
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.api.services import order_service
+from app.api.services.order_service import ORDER_FAILED, ORDER_REJECTED, ORDER_SUBMITTED, place_order, sell_proceeds, validate_basket
+from app.constants import KST
+from app.models.account import Account
+from app.models.kis import Kis_Minutely_Balance
+from app.models.order import Order_Create
+
+
+@pytest.fixture()
+def account(session: Session) -> Account:
+    account = Account(
+        owner_id=uuid.uuid4(), broker="KIS", acnt_name="주식계좌1", cano="50123456",
+        acnt_prdt_cd="01", acnt_type="paper", app_key="key", app_secret="secret",
+        access_token="token", access_token_expired=datetime.now(KST) + timedelta(hours=24),
+    )
+    session.add(account)
+    session.add(Kis_Minutely_Balance(
+        account_id=account.id,
+        timestamp=datetime.now(KST) - timedelta(minutes=1),
+        total_balance=1_000_000, available_balance=1_000_000, total_assets=1_700_000,
+        purchase_amount=700_000, eval_amount=700_000, profit_loss=0, profit_loss_rate=0,
+        asset_change_amount=0, asset_change_rate=0,
+        holdings=[{"stock_code": "005930", "stock_name": "삼성전자", "quantity": 10}],
+    ))
+    session.commit()
+    return account
+
+
+@pytest.fixture()
+def submissions(monkeypatch) -> list:
+    calls = []
+
+    def fake_submit(account, order):
+        calls.append(order.idempotency_key)
+        return ORDER_SUBMITTED, f"{len(calls):010d}", "주문 전송 완료"
+
+    monkeypatch.setattr(order_service, "_submit", fake_submit)
+    return calls
+
+
+def test_same_idempotency_key_submits_once(session: Session, account: Account, submissions: list) -> None:
+    order_in = Order_Create(stock_code="005930", side="buy", quantity=1, price=70_000, idempotency_key="retry-1")
+
+    first = place_order(session, account, order_in)
+    second = place_order(session, account, order_in)
+
+    assert first.id == second.id
+    assert first.status == ORDER_SUBMITTED
+    assert submissions == ["retry-1"]
+
+
+def test_prevalidation_counts_orders_since_last_balance(
+    session: Session, account: Account, submissions: list
+) -> None:
+    place_order(session, account, Order_Create(stock_code="005930", side="sell", quantity=6, price=70_000))
+    rejected = place_order(session, account, Order_Create(stock_code="005930", side="sell", quantity=5, price=70_000))
+    too_large = place_order(session, account, Order_Create(stock_code="000660", side="buy", quantity=10, price=150_000))
+
+    assert rejected.status == ORDER_REJECTED
+    assert "매도가능수량" in rejected.message
+    assert too_large.status == ORDER_REJECTED
+    assert len(submissions) == 1
+
+
+def test_basket_buys_are_validated_with_sell_proceeds(
+    session: Session, account: Account, submissions: list
+) -> None:
+    sell = Order_Create(stock_code="005930", side="sell", quantity=10, price=70_000)
+    buy = Order_Create(stock_code="000660", side="buy", quantity=10, price=150_000)
+
+    # 주문가능 1,000,000 + 매도대금 700,000 ≥ 매수 1,500,000 (매수가 앞에 있어도 매도 먼저 검증)
+    assert validate_basket(session, account, [buy, sell]) is None
+    too_large = Order_Create(stock_code="035720", side="buy", quantity=5, price=50_000)
+    assert "035720" in validate_basket(session, account, [sell, buy, too_large])
+    assert "주문가능금액" in validate_basket(session, account, [buy])
+
+    placed_sell = place_order(session, account, sell)
+    assert place_order(session, account, buy).status == ORDER_REJECTED
+    placed_buy = place_order(session, account, buy.model_copy(), credit=sell_proceeds(placed_sell))
+    assert placed_buy.status == ORDER_SUBMITTED
+    assert len(submissions) == 2
+
+
+def test_expired_token_is_refreshed_before_submit(session: Session, account: Account, monkeypatch) -> None:
+    account.access_token = "old-token"
+    account.access_token_expired = datetime.now(KST) - timedelta(minutes=1)
+    session.add(account)
+    session.commit()
+    issued = []
+
+    def fake_issue(app_key, app_secret, acnt_type):
+        issued.append(app_key)
+        return "new-token", datetime.now(KST) + timedelta(hours=24)
+
+    sent_tokens = []
+    monkeypatch.setattr(order_service, "get_access_token_KIS", fake_issue)
+    monkeypatch.setattr(
+        order_service, "_submit",
+        lambda account, order: sent_tokens.append(account.access_token) or (ORDER_SUBMITTED, "0000000001", "완료"),
+    )
+
+    place_order(session, account, Order_Create(stock_code="005930", side="sell", quantity=1, price=70_000))
+    place_order(session, account, Order_Create(stock_code="005930", side="sell", quantity=1, price=70_000))
+
+    assert issued == ["key"]  # 갱신한 토큰은 저장되어 다음 주문에 재사용
+    assert sent_tokens == ["new-token", "new-token"]
+    session.refresh(account)
+    assert account.access_token == "new-token"
+
+
+def test_token_refresh_failure_fails_order_without_submit(
+    session: Session, account: Account, submissions: list, monkeypatch
+) -> None:
+    def failing_issue(app_key, app_secret, acnt_type):
+        raise HTTPException(status_code=500, detail="KIS API 토큰 발급 실패")
+
+    account.access_token = None
+    session.add(account)
+    session.commit()
+    monkeypatch.setattr(order_service, "get_access_token_KIS", failing_issue)
+    order = place_order(session, account, Order_Create(stock_code="005930", side="sell", quantity=1, price=70_000))
+
+    assert order.status == ORDER_FAILED
+    assert "토큰 갱신 실패" in order.message
+    assert submissions == []
+
+
+def test_hashkey_is_cached_per_body(monkeypatch) -> None:
+    calls = []
+    monkeypatch.setattr(order_service, "get_hashkey_KIS", lambda account, body, http: calls.append(body) or "HASH")
+    account = Account(app_key="key-hash-test", acnt_type="paper")
+
+    body = {"PDNO": "005930", "ORD_QTY": "1"}
+    assert order_service._get_hashkey(account, body, None) == "HASH"
+    assert order_service._get_hashkey(account, dict(body), None) == "HASH"
+    assert len(calls) == 1
+
+
+def test_hashkey_cache_is_safe_across_threads(monkeypatch) -> None:
+    monkeypatch.setattr(order_service, "get_hashkey_KIS", lambda account, body, http: body["PDNO"])
+    monkeypatch.setattr(order_service, "ORDER_HASHKEY_CACHE_SIZE", 2)
+    monkeypatch.setattr(order_service, "_hashkey_cache", OrderedDict())
+    account = Account(app_key="key-thread-test", acnt_type="paper")
+    bodies = [{"PDNO": f"00{index}"} for index in range(5)]
+
+    # 작은 캐시에서 조회와 제거가 겹쳐도 오류 없이 본문별 해시키를 반환
+    def send(round_: int) -> list[str]:
+        return [order_service._get_hashkey(account, body, None) for body in bodies[round_ % 5:] + bodies[:round_ % 5]]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(send, range(400)))
+    assert all(sorted(result) == [body["PDNO"] for body in bodies] for result in results)
+    assert len(order_service._hashkey_cache) <= 2
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.constants import KST
+from app.core.config import Settings
+from app.api.services.fill_service import BUY, SELL
+from app.api.services.paper_broker import (
+    Matching_Engine,
+    Paper_Reject,
+    Price_Tick,
+    balance_response,
+    daily_ccld_response,
+    order_KIS,
+    order_LS
+)
+
+
+def test_book_matches_price_time_priority() -> None:
+    engine = Matching_Engine(initial_cash=10_000_000)
+    engine.on_price("005930", 70_000)
+    engine.submit("a", "005930", BUY, 10, 70_000)  # 시세로 즉시 체결
+    first, _ = engine.submit("a", "005930", SELL, 3, 71_000)
+    second, _ = engine.submit("a", "005930", SELL, 3, 71_000)
+    better, _ = engine.submit("a", "005930", SELL, 2, 70_500)
+
+    order, fills = engine.submit("b", "005930", BUY, 4, 71_000)
+
+    # 낮은 가격 먼저, 같은 가격은 먼저 들어온 주문부터
+    assert [(fill.order_no, fill.quantity, fill.price) for fill in fills if fill.side == SELL] == [
+        (better.order_no, 2, 70_500), (first.order_no, 2, 71_000)
+    ]
+    assert order.remaining == 0
+    assert first.remaining == 1 and second.remaining == 3
+
+
+def test_resting_orders_fill_when_feed_reaches_price() -> None:
+    engine = Matching_Engine(initial_cash=1_000_000)
+    engine.on_price("000660", 150_000)
+    order, fills = engine.submit("a", "000660", BUY, 5, 140_000)
+    assert not fills
+
+    with pytest.raises(Paper_Reject):
+        engine.submit("a", "000660", BUY, 3, 140_000)  # 대기 주문이 증거금 점유
+
+    filled = engine.replay([
+        Price_Tick(KST.localize(datetime(2024, 3, 4, 9, 1)), "000660", 145_000),
+        Price_Tick(KST.localize(datetime(2024, 3, 4, 9, 2)), "000660", 139_000),
+    ])
+
+    assert filled == 1
+    assert order.remaining == 0 and order.filled_amount == 5 * 139_000
+    assert engine.account("a").cash == 1_000_000 - 5 * 139_000
+
+
+def test_responses_match_broker_shapes() -> None:
+    engine = Matching_Engine(initial_cash=1_000_000)
+    engine.on_price("005930", 70_000)
+    assert order_KIS("kis", BUY, {"PDNO": "005930", "ORD_DVSN": "01", "ORD_QTY": "10", "ORD_UNPR": "0"}, engine)["rt_cd"] == "0"
+    assert order_KIS("kis", SELL, {"PDNO": "005930", "ORD_DVSN": "00", "ORD_QTY": "11", "ORD_UNPR": "70000"}, engine)["rt_cd"] == "1"
+    ls = order_LS("ls", {"CSPAT00601InBlock1": {"IsuNo": "005930", "OrdQty": 2, "OrdPrc": 0, "BnsTpCode": "2", "OrdprcPtnCode": "03"}}, engine)
+    assert ls["CSPAT00601OutBlock2"]["OrdNo"]
+
+    engine.on_price("005930", 77_000)
+    kis_balance = balance_response("kis", "KIS", engine)
+    assert kis_balance["output1"][0]["hldg_qty"] == "10"
+    assert kis_balance["output2"][0]["evlu_pfls_smtl_amt"] == "70000"
+    assert kis_balance["output2"][0]["tot_evlu_amt"] == str(1_000_000 + 70_000)
+    assert balance_response("ls", "LS", engine)["output2"][0]["pchs_amt_smtl"] == "140000"
+
+    today = datetime.now(KST).strftime("%Y%m%d")
+    kis_trades = daily_ccld_response("kis", "KIS", today, today, engine)
+    assert [row["sll_buy_dvsn_cd"] for row in kis_trades["output1"]] == ["02"]
+    assert kis_trades["output2"]["tot_ccld_amt"] == "700000"
+    ls_trades = daily_ccld_response("ls", "LS", today, today, engine)
+    assert ls_trades["output1"][0]["sll_buy_dvsn_cd"] == "01" and ls_trades["output1"][0]["ord_qty"] == "2"
+
+
+def test_simulator_refuses_multiple_workers() -> None:
+    with pytest.raises(ValidationError):
+        Settings(PAPER_TRADING_SIMULATOR=True, WEB_CONCURRENCY=4)
+    assert Settings(PAPER_TRADING_SIMULATOR=True, WEB_CONCURRENCY=1).PAPER_TRADING_SIMULATOR
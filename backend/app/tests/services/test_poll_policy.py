@@ -0,0 +1,91 @@
+import uuid
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from app.api.services.poll_policy import Poll_Policy, phase_offset
+from app.models.scheduler import Account_View
+
+
+def holdings(*quantities: int) -> list[dict]:
+    return [{"stock_code": f"00{index:04d}", "quantity": quantity} for index, quantity in enumerate(quantities)]
+
+
+def test_dormant_account_backs_off_to_max_interval() -> None:
+    policy = Poll_Policy(min_seconds=60, max_seconds=900)
+    account_id = uuid.uuid4()
+
+    # 스냅샷 전에는 최소 주기
+    assert policy.interval(account_id) == 60
+
+    for _ in range(5):
+        policy.record_snapshot(account_id, 1_000_000, None)
+    assert policy.interval(account_id) == 900
+
+
+def test_activity_signals_shorten_interval() -> None:
+    policy = Poll_Policy(min_seconds=60, max_seconds=900)
+
+    holder = uuid.uuid4()
+    for _ in range(5):
+        policy.record_snapshot(holder, 1_000_000, holdings(*([10] * 20)))
+    # 보유종목만으로는 중간 주기까지만
+    assert policy.interval(holder) == 480
+
+    trader = uuid.uuid4()
+    policy.record_snapshot(trader, 1_000_000, holdings(10))
+    for quantity in (20, 30, 40, 50, 60):
+        policy.record_snapshot(trader, 1_000_000, holdings(quantity))
+    assert policy.interval(trader) == 60
+
+    volatile = uuid.uuid4()
+    for total_assets in (1_000_000, 1_010_000, 990_000, 1_020_000):
+        policy.record_snapshot(volatile, total_assets, holdings(10))
+    assert policy.interval(volatile) == 60
+
+    viewed = uuid.uuid4()
+    policy.record_snapshot(viewed, 1_000_000, None)
+    assert policy.interval(viewed) == 900
+    policy.record_view(viewed)
+    assert policy.interval(viewed) == 60
+
+    status = {item["account_id"]: item for item in policy.status()}
+    assert status[trader]["fills_today"] == 5
+    assert status[viewed]["viewing"]
+
+
+def test_first_polls_are_spread_by_deterministic_phase() -> None:
+    from app.api.services.background_tasks import last_balance_check, should_check_balance
+
+    account_ids = [uuid.UUID(int=index) for index in range(600)]
+    offsets = [phase_offset(account_id, 60) for account_id in account_ids]
+    assert offsets == [phase_offset(account_id, 60) for account_id in account_ids]
+    assert all(0 <= offset < 60 for offset in offsets)
+    # 10초 구간마다 대략 1/6 씩
+    assert all(70 < sum(start <= offset < start + 10 for offset in offsets) < 130 for start in range(0, 60, 10))
+
+    # 처음 보는 계좌는 위상만큼 뒤에 첫 조회 (시작 직후 몰리지 않음)
+    try:
+        due = [should_check_balance(account_id) for account_id in account_ids]
+        assert sum(due) < len(account_ids) * 0.05
+    finally:
+        for account_id in account_ids:
+            last_balance_check.pop(account_id, None)
+
+
+def test_view_recorded_on_one_worker_shortens_interval_on_another(engine: Engine) -> None:
+    api_worker = Poll_Policy(min_seconds=60, max_seconds=900)
+    poller = Poll_Policy(min_seconds=60, max_seconds=900)
+    account_id = uuid.uuid4()
+    poller.record_snapshot(account_id, 1_000_000, None)
+    assert poller.interval(account_id) == 900
+
+    with Session(engine) as session:
+        api_worker.record_view(account_id, session)
+        first_write = session.exec(select(Account_View.last_viewed)).one()
+        api_worker.record_view(account_id, session)  # 기록 간격 안의 재조회는 DB 에 쓰지 않음
+        assert session.exec(select(Account_View.last_viewed)).one() == first_write
+
+        poller.update_views(session)
+    assert poller.interval(account_id) == 60
+    assert {item["account_id"]: item for item in poller.status()}[account_id]["viewing"]
@@ -0,0 +1,79 @@
+import uuid
+
+import pytest
+from sqlmodel import Session, select
+
+from app.api.services.portfolio_service import _get_or_create_portfolio, apply_contribution_delta
+from app.models.portfolio import Portfolio_Contribution, User_Portfolio
+
+OWNER_ID = uuid.uuid4()
+
+
+def make_contribution(account_id: uuid.UUID, holdings: dict) -> Portfolio_Contribution:
+    return Portfolio_Contribution(
+        account_id=account_id,
+        owner_id=OWNER_ID,
+        broker="KIS",
+        total_assets=sum(h["eval_amount"] for h in holdings.values()) + 1000,
+        purchase_amount=sum(h["purchase_amount"] for h in holdings.values()),
+        eval_amount=sum(h["eval_amount"] for h in holdings.values()),
+        profit_loss=sum(h["profit_loss"] for h in holdings.values()),
+        holdings=holdings,
+    )
+
+
+def holding(quantity: int, price: float, current: float) -> dict:
+    return {
+        "stock_name": "삼성전자",
+        "quantity": quantity,
+        "purchase_amount": quantity * price,
+        "eval_amount": quantity * current,
+        "profit_loss": quantity * (current - price),
+    }
+
+
+def test_incremental_updates_match_sum_of_latest_snapshots() -> None:
+    account_a, account_b = uuid.uuid4(), uuid.uuid4()
+    portfolio = User_Portfolio(owner_id=OWNER_ID, exposures={})
+
+    a1 = make_contribution(account_a, {"005930": holding(10, 100, 110)})
+    b1 = make_contribution(account_b, {"005930": holding(5, 90, 110), "000660": holding(2, 50, 40)})
+    apply_contribution_delta(portfolio, None, a1)
+    apply_contribution_delta(portfolio, None, b1)
+
+    # A 계좌의 새 스냅샷: 가격 변동 + 000660 신규 매수
+    a2 = make_contribution(account_a, {"005930": holding(10, 100, 120), "000660": holding(1, 45, 40)})
+    apply_contribution_delta(portfolio, a1, a2)
+
+    assert portfolio.account_count == 2
+    assert portfolio.total_assets == pytest.approx(a2.total_assets + b1.total_assets)
+    assert portfolio.exposures["005930"]["quantity"] == 15
+    assert portfolio.exposures["005930"]["eval_amount"] == pytest.approx(10 * 120 + 5 * 110)
+    assert portfolio.exposures["000660"]["quantity"] == 3
+    assert portfolio.exposures["000660"]["account_count"] == 2
+
+
+def test_removed_account_drops_exposure() -> None:
+    account_a = uuid.uuid4()
+    portfolio = User_Portfolio(owner_id=OWNER_ID, exposures={})
+    contribution = make_contribution(account_a, {"005930": holding(10, 100, 110)})
+
+    apply_contribution_delta(portfolio, None, contribution)
+    apply_contribution_delta(portfolio, contribution, None)
+
+    assert portfolio.account_count == 0
+    assert portfolio.total_assets == 0
+    assert portfolio.exposures == {}
+
+
+def test_portfolio_row_is_created_once_without_overwriting(session: Session) -> None:
+    owner_id = uuid.uuid4()
+    portfolio = _get_or_create_portfolio(session, owner_id)
+    portfolio.total_assets = 1000.0
+    session.add(portfolio)
+    session.commit()
+
+    # 이미 있는 행은 ON CONFLICT DO NOTHING 으로 그대로 두고 잠가서 반환
+    session.expire_all()
+    assert _get_or_create_portfolio(session, owner_id).total_assets == 1000.0
+    assert len(session.exec(select(User_Portfolio).where(User_Portfolio.owner_id == owner_id)).all()) == 1
@@ -0,0 +1,155 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from app.api.services import kis_trade_service
+from app.api.services.kis_trade_service import update_account_daily_trades_KIS
+from app.api.services.fill_service import BUY, SELL, Fill
+from app.api.services.lot_matching_service import AVERAGE, Lot_Book
+from app.api.services.position_ledger_service import (
+    OPENING_FILL_REF,
+    _lot_book_from_snapshot,
+    _positions,
+    _seed_opening_snapshot,
+    check_position_drift,
+    update_position_snapshots,
+)
+from app.benchmarks.payloads import kis_daily_ccld_payload
+from app.constants import KST
+from app.models.account import Account
+from app.models.kis import Kis_Daily_Trade, Kis_Minutely_Balance
+from app.models.ledger import Position_Snapshot
+
+ACCOUNT_ID = uuid.uuid4()
+START = KST.localize(datetime(2024, 3, 4, 9, 0))
+
+
+def make_fill(stock_code: str, side: str, quantity: int, price: float, minute: int) -> Fill:
+    return Fill(
+        account_id=ACCOUNT_ID,
+        stock_code=stock_code,
+        stock_name=stock_code,
+        side=side,
+        quantity=quantity,
+        price=price,
+        fee=0.0,
+        executed_at=START + timedelta(minutes=minute),
+        ref=str(minute),
+    )
+
+
+FILLS = [
+    make_fill("005930", BUY, 10, 100.0, 0),
+    make_fill("000660", BUY, 5, 50.0, 1),
+    make_fill("005930", BUY, 10, 200.0, 2),
+    make_fill("000660", SELL, 5, 60.0, 3),
+    make_fill("005930", SELL, 5, 300.0, 4),
+]
+
+
+@pytest.mark.parametrize("split", range(len(FILLS) + 1))
+def test_snapshot_plus_tail_matches_full_replay(split: int) -> None:
+    full = Lot_Book(AVERAGE)
+    full.apply_all(FILLS)
+
+    head = Lot_Book(AVERAGE)
+    head.apply_all(FILLS[:split])
+    snapshot = Position_Snapshot(
+        account_id=ACCOUNT_ID,
+        as_of=FILLS[split - 1].executed_at if split else START,
+        last_fill_ref=FILLS[split - 1].ref if split else "",
+        fill_count=split,
+        positions=_positions(head),
+    )
+    restored = _lot_book_from_snapshot(snapshot)
+    restored.apply_all(FILLS[split:])
+
+    expected = _positions(full)
+    actual = _positions(restored)
+    assert actual.keys() == expected.keys()
+    for stock_code, position in expected.items():
+        assert actual[stock_code]["quantity"] == position["quantity"]
+        assert actual[stock_code]["avg_cost"] == pytest.approx(position["avg_cost"])
+
+
+def test_closed_positions_are_dropped() -> None:
+    lot_book = Lot_Book(AVERAGE)
+    lot_book.apply_all(FILLS)
+
+    positions = _positions(lot_book)
+    assert list(positions) == ["005930"]
+    assert positions["005930"]["quantity"] == 15
+    assert positions["005930"]["avg_cost"] == pytest.approx(150.0)
+
+
+def add_balance(session: Session, account: Account, timestamp: datetime, holdings: dict[str, int]) -> None:
+    session.add(Kis_Minutely_Balance(
+        account_id=account.id, timestamp=timestamp,
+        total_balance=0, available_balance=0, total_assets=0, purchase_amount=0, eval_amount=0,
+        profit_loss=0, profit_loss_rate=0, asset_change_amount=0, asset_change_rate=0,
+        holdings=[
+            {"stock_code": code, "stock_name": code, "quantity": quantity, "purchase_price": 100.0}
+            for code, quantity in holdings.items()
+        ],
+    ))
+
+
+def add_buy(session: Session, account: Account, executed_at: datetime, quantity: int, order_no: str) -> None:
+    session.add(Kis_Daily_Trade(
+        account_id=account.id, order_date=executed_at.strftime("%Y%m%d"), stock_code="005930",
+        stock_name="삼성전자", order_no=order_no, order_time=executed_at.strftime("%H%M%S"), order_type="02",
+        order_price=100.0, order_qty=quantity, trade_price=100.0, trade_qty=quantity,
+        trade_amount=100.0 * quantity, trade_time=executed_at.strftime("%H%M%S"),
+    ))
+
+
+def test_drift_check_starts_from_opening_balance(session: Session) -> None:
+    account = Account(
+        owner_id=uuid.uuid4(), broker="KIS", acnt_name="주식계좌1", cano="50123456",
+        acnt_prdt_cd="01", acnt_type="paper", app_key="key", app_secret="secret",
+    )
+    session.add(account)
+    # 000660 은 저장된 체결보다 먼저 산 종목, 005930 10주는 첫 잔고 이전 체결로 이미 반영됨
+    add_buy(session, account, START - timedelta(days=1), 10, "0000001")
+    add_balance(session, account, START, {"000660": 7, "005930": 10})
+    add_buy(session, account, START + timedelta(hours=1), 5, "0000002")
+    add_balance(session, account, START + timedelta(hours=2), {"000660": 7, "005930": 15})
+    session.commit()
+
+    drift = check_position_drift(session, account)
+    assert drift["in_sync"], drift["data"]
+
+    # 체결만 재생해 만든 기존 스냅샷은 개시 스냅샷으로 대체
+    session.add(Position_Snapshot(account_id=account.id, as_of=START, last_fill_ref="0000001", fill_count=1))
+    session.commit()
+    _seed_opening_snapshot(session, account)
+    snapshots = session.exec(select(Position_Snapshot).where(Position_Snapshot.account_id == account.id)).all()
+    assert [snapshot.last_fill_ref for snapshot in snapshots] == [OPENING_FILL_REF]
+    assert snapshots[0].positions["000660"]["quantity"] == 7
+
+
+def test_unchanged_resync_keeps_position_snapshots(session: Session, monkeypatch) -> None:
+    account = Account(
+        owner_id=uuid.uuid4(), broker="KIS", acnt_name="주식계좌1", cano="50123456",
+        acnt_prdt_cd="01", acnt_type="paper", app_key="key", app_secret="secret",
+    )
+    session.add(account)
+    session.commit()
+    payload = kis_daily_ccld_payload(fills=10)
+
+    async def fake_inquire(*args, **kwargs):
+        return payload
+
+    monkeypatch.setattr(kis_trade_service, "inquire_daily_ccld_from_KIS", fake_inquire)
+    asyncio.run(update_account_daily_trades_KIS(account.id, "20240304", "20240308", session))
+    assert update_position_snapshots(session, account, interval=3) == 4
+    snapshot_ids = set(session.exec(select(Position_Snapshot.id)).all())
+
+    # 야간 재동기화가 같은 체결을 다시 저장해도 스냅샷을 버리고 처음부터 재생하지 않음
+    payload["output2"]["tot_ccld_amt"] = "1"
+    asyncio.run(update_account_daily_trades_KIS(account.id, "20240301", "20240308", session))
+    assert update_position_snapshots(session, account, interval=3) == 0
+    assert set(session.exec(select(Position_Snapshot.id)).all()) == snapshot_ids
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.services import kis_api, quote_service
+from app.api.services.quote_service import Quote, Quote_Cache, refresh_quotes, remark_exposures
+from app.constants import BROKER_REQUEST_TIMEOUT_SECONDS, KST
+
+NOW = KST.localize(datetime(2024, 3, 4, 10, 0))
+
+
+def make_quote(stock_code: str, price: float, seconds_ago: float = 0) -> Quote:
+    return Quote(
+        stock_code=stock_code,
+        price=price,
+        change_rate=0.0,
+        volume=0,
+        updated_at=NOW - timedelta(seconds=seconds_ago),
+    )
+
+
+def test_cache_ignores_older_and_stale_quotes() -> None:
+    cache = Quote_Cache(stale_seconds=30)
+    cache.update(make_quote("005930", 71000, seconds_ago=5))
+    cache.update(make_quote("005930", 70000, seconds_ago=10))
+    cache.update(make_quote("000660", 150000, seconds_ago=60))
+
+    quotes = cache.get_many(["005930", "000660", "035720"], now=NOW)
+    assert list(quotes) == ["005930"]
+    assert quotes["005930"].price == 71000
+
+
+def test_remark_exposures_adjusts_totals() -> None:
+    portfolio = {
+        "total_assets": 2_000_000.0,
+        "purchase_amount": 1_000_000.0,
+        "eval_amount": 1_100_000.0,
+        "profit_loss": 100_000.0,
+        "profit_loss_rate": 10.0,
+        "data": [
+            {"stock_code": "005930", "quantity": 10, "purchase_amount": 600_000.0,
+             "eval_amount": 700_000.0, "profit_loss": 100_000.0},
+            {"stock_code": "000660", "quantity": 2, "purchase_amount": 400_000.0,
+             "eval_amount": 400_000.0, "profit_loss": 0.0},
+        ],
+    }
+    quotes = {"005930": make_quote("005930", 72_000), "000660": make_quote("000660", 210_000, seconds_ago=600)}
+
+    remarked = remark_exposures(portfolio, quotes, marked_after=NOW - timedelta(seconds=60))
+
+    assert remarked["marked_at"] == NOW
+    assert remarked["data"][0]["eval_amount"] == pytest.approx(720_000)
+    assert remarked["data"][1] == portfolio["data"][1]
+    assert remarked["total_assets"] == pytest.approx(2_020_000)
+    assert remarked["profit_loss"] == pytest.approx(120_000)
+    assert remarked["profit_loss_rate"] == pytest.approx(12.0)
+
+
+def test_price_request_runs_off_the_event_loop_with_timeout(monkeypatch) -> None:
+    calls = []
+
+    class Slow_Response:
+        status_code = 200
+
+        def raise_for_status(self) -> None:
+            pass
+
+        @property
+        def content(self) -> bytes:
+            return b'{"rt_cd": "0", "output": {"stck_prpr": "71000"}}'
+
+    def slow_get(url, **kwargs):
+        calls.append(kwargs.get("timeout"))
+        time.sleep(0.2)  # 응답이 늦은 브로커
+        return Slow_Response()
+
+    monkeypatch.setattr(kis_api.requests, "get", slow_get)
+    account = SimpleNamespace(acnt_type="live", access_token="token", app_key="key", app_secret="secret")
+
+    async def scenario() -> tuple[dict, int]:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        output = await kis_api.inquire_price_from_KIS(account, "005930")
+        task.cancel()
+        return output, ticks
+
+    output, ticks = asyncio.run(scenario())
+    assert output == {"stck_prpr": "71000"}
+    assert calls == [BROKER_REQUEST_TIMEOUT_SECONDS]
+    assert ticks >= 5  # 요청 중에도 다른 코루틴이 실행됨
+
+
+def test_refresh_quotes_fans_out_per_app_key(monkeypatch) -> None:
+    accounts = [
+        SimpleNamespace(acnt_type="live", app_key="first"),
+        SimpleNamespace(acnt_type="paper", app_key="second"),
+    ]
+    requests_by_key: dict[str, list[str]] = {"first": [], "second": []}
+    in_flight = peak = 0
+
+    async def fake_inquire(account, stock_code):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        requests_by_key[account.app_key].append(stock_code)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"stck_prpr": "1000"}
+
+    monkeypatch.setattr(quote_service, "get_held_stock_codes", lambda session: {"000660", "005930", "035720", "051910"})
+    monkeypatch.setattr(quote_service, "get_quote_accounts", lambda session: accounts)
+    monkeypatch.setattr(quote_service, "inquire_price_from_KIS", fake_inquire)
+
+    cache = Quote_Cache()
+    assert asyncio.run(refresh_quotes(None, cache)) == 4
+    assert len(cache) == 4
+    # 앱키마다 절반씩 순서대로 조회하고 두 앱키는 동시에 진행
+    assert requests_by_key == {"first": ["000660", "035720"], "second": ["005930", "051910"]}
+    assert peak == 2
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import threading
+import uuid
+
+from websockets.asyncio.server import serve
+
+from app.api.services import realtime_service
+from app.api.services.realtime_service import (
+    Realtime_Hub,
+    Session_Credential,
+    Subscription_Manager,
+    parse_kis_message,
+)
+
+
+def make_tick_message(stock_code: str, price: int) -> str:
+    fields = ["0"] * 46
+    fields[0], fields[1], fields[2], fields[5], fields[12], fields[13] = (
+        stock_code, "093000", str(price), "1.5", "10", "1000"
+    )
+    return f"0|H0STCNT0|001|{'^'.join(fields)}"
+
+
+def test_parse_kis_message_splits_multiple_records() -> None:
+    first = make_tick_message("005930", 71000).split("|", 3)[3]
+    second = make_tick_message("005930", 71100).split("|", 3)[3]
+    ticks, control = parse_kis_message(f"0|H0STCNT0|002|{first}^{second}")
+
+    assert control is None
+    assert [tick.price for tick in ticks] == [71000, 71100]
+    assert ticks[0].traded_at.hour == 9 and ticks[0].traded_at.minute == 30
+
+    ticks, control = parse_kis_message(json.dumps({"header": {"tr_id": "PINGPONG"}}))
+    assert ticks == [] and control["header"]["tr_id"] == "PINGPONG"
+
+
+async def _run_multiplexer_scenario() -> None:
+    registered: dict[str, set[str]] = {}
+
+    async def broker(websocket) -> None:
+        # 등록 요청마다 해당 종목 체결 1건을 바로 돌려주는 브로커 대역
+        async for raw in websocket:
+            message = json.loads(raw)
+            approval_key = message["header"]["approval_key"]
+            stock_code = message["body"]["input"]["tr_key"]
+            symbols = registered.setdefault(approval_key, set())
+            if message["header"]["tr_type"] == "1":
+                symbols.add(stock_code)
+                await websocket.send(make_tick_message(stock_code, 100))
+            else:
+                symbols.discard(stock_code)
+
+    async with serve(broker, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}"
+        credentials = [Session_Credential(url, "key-1"), Session_Credential(url, "key-2")]
+        manager = Subscription_Manager(lambda: credentials, max_symbols_per_session=2)
+
+        first = await manager.subscribe(["005930", "000660"])
+        second = await manager.subscribe(["000660", "035720"])
+        assert manager.refcounts == {"005930": 1, "000660": 2, "035720": 1}
+        assert len(manager.sessions) == 2
+
+        received = [await asyncio.wait_for(first.get(), 2) for _ in range(2)]
+        assert {tick.stock_code for tick in received} == {"005930", "000660"}
+        assert (await asyncio.wait_for(second.get(), 2)).stock_code in {"000660", "035720"}
+
+        # 035720 구독이 빠지면 두 종목이 한 세션에 들어가므로 세션을 1개로 줄임
+        await second.close()
+        assert manager.refcounts == {"005930": 1, "000660": 1}
+        assert len(manager.sessions) == 1
+        assert manager.stats()["sessions"] == [["000660", "005930"]]
+
+        await asyncio.sleep(0.1)
+        live = {key: symbols for key, symbols in registered.items() if symbols}
+        assert list(live.values()) == [{"005930", "000660"}]
+
+        await first.close()
+        await manager.close()
+
+
+def test_manager_packs_fans_out_and_rebalances() -> None:
+    asyncio.run(_run_multiplexer_scenario())
+
+
+async def _run_hub_scenario() -> None:
+    keys: dict[str, list[str]] = {}
+    loader_threads: set[int] = set()
+    reloads: list[str] = []
+
+    async def broker(websocket) -> None:
+        # 첫 연결은 등록 직후 끊어서 재연결(접속키 갱신)을 유도
+        async for raw in websocket:
+            message = json.loads(raw)
+            approval_key = message["header"]["approval_key"]
+            keys.setdefault(approval_key, []).append(message["body"]["input"]["tr_key"])
+            await websocket.send(make_tick_message(message["body"]["input"]["tr_key"], 100))
+            if approval_key.endswith("-old"):
+                await websocket.close()
+
+    async with serve(broker, "127.0.0.1", 0) as server:
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+
+        def credentials(owner_id):
+            loader_threads.add(threading.get_ident())
+            if owner_id is None:
+                return []
+            return [Session_Credential(url, f"{owner_id}-old", owner_id)]
+
+        def reload(credential):
+            reloads.append(credential.approval_key)
+            return Session_Credential(credential.url, f"{credential.account_id}-new", credential.account_id)
+
+        hub = Realtime_Hub(credentials, reload, shared=lambda: False)
+        first = await hub.subscribe(alice, ["005930"])
+        second = await hub.subscribe(bob, ["005930"])
+        # 사용자마다 본인 접속키로만 세션을 열고, 접속 정보는 이벤트 루프 밖에서 읽음
+        assert set(hub.managers) == {alice, bob}
+        assert [session.credential.account_id for session in hub.managers[alice].sessions] == [alice]
+        assert threading.get_ident() not in loader_threads
+
+        await asyncio.wait_for(first.get(), 2)
+        await asyncio.wait_for(second.get(), 2)
+        await asyncio.sleep(0.3)
+        assert {f"{alice}-old", f"{bob}-old"} <= set(reloads)
+        assert keys.get(f"{alice}-new") == ["005930"]
+
+        await first.close()
+        assert hub.managers[alice].sessions == []  # 구독이 없으면 세션 종료
+        await second.close()
+        await hub.close()
+
+    shared = Realtime_Hub(lambda owner_id: [], None, shared=lambda: True)
+    assert shared.manager_for(uuid.uuid4()) is shared.manager_for(uuid.uuid4())
+
+
+def test_hub_scopes_sessions_per_user_and_refreshes_key_on_reconnect(monkeypatch) -> None:
+    monkeypatch.setattr(realtime_service, "REALTIME_RECONNECT_SECONDS", 0.05)
+    asyncio.run(_run_hub_scenario())
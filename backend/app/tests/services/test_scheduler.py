@@ -0,0 +1,202 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.api.services.scheduler import Job_Scheduler, load_poll_state, save_poll_state
+from app.constants import KST
+from app.models.account import Account
+from app.models.user import User
+
+
+def test_job_records_sweeps_and_account_state() -> None:
+    job = Job_Scheduler().register("balance", "잔고 조회/저장")
+    account_id = uuid.uuid4()
+
+    job.sweep_started()
+    assert job.status()["state"] == "stopped"  # 태스크 없이 직접 기록
+    job.record_account(account_id, "timeout")
+    job.record_account(account_id, "timeout")
+    job.sweep_finished()
+    job.sweep_finished(RuntimeError("무시"))  # 진행 중인 순회가 없으면 기록하지 않음
+
+    status = job.status(include_accounts=True)
+    assert status["run_count"] == 1
+    assert status["error_count"] == 0
+    assert status["last_duration_seconds"] is not None
+    (account,) = status["accounts"]
+    assert account["account_id"] == account_id
+    assert account["consecutive_failures"] == 2
+
+    job.record_account(account_id)
+    assert job.accounts[account_id].consecutive_failures == 0
+    assert job.accounts[account_id].last_error is None
+
+    job.sweep_started()
+    job.sweep_finished(RuntimeError("DB 연결 실패"))
+    assert job.status()["error_count"] == 1
+    assert job.status()["last_error"] == "DB 연결 실패"
+
+
+def test_paused_job_waits_until_resumed() -> None:
+    async def scenario() -> list[str]:
+        job = Job_Scheduler().register("quote", "시세 갱신")
+        events = []
+
+        async def loop() -> None:
+            while True:
+                job.sweep_started()
+                events.append("sweep")
+                job.sweep_finished()
+                await job.sleep(0.01)
+
+        job.start(loop)
+        await asyncio.sleep(0.05)
+        job.pause()
+        assert job.status()["state"] == "paused"
+        await asyncio.sleep(0.03)
+        paused_count = len(events)
+        await asyncio.sleep(0.05)
+        assert len(events) == paused_count
+
+        job.resume()
+        await asyncio.sleep(0.05)
+        assert len(events) > paused_count
+        assert job.status()["next_run"] is not None
+        job.task.cancel()
+        return events
+
+    assert asyncio.run(scenario())
+
+
+def test_unsupported_controls_raise() -> None:
+    scheduler = Job_Scheduler()
+    slices = scheduler.register("order_slices", "분할 주문", pausable=False)
+    with pytest.raises(HTTPException) as exc:
+        slices.pause()
+    assert exc.value.status_code == 409
+    with pytest.raises(HTTPException) as exc:
+        slices.trigger([uuid.uuid4()])
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException) as exc:
+        scheduler.get("unknown")
+    assert exc.value.status_code == 404
+    with pytest.raises(ValueError):
+        scheduler.register("order_slices", "중복")
+
+
+def test_shutdown_drains_in_flight_sweep_and_cancels_stragglers() -> None:
+    async def scenario() -> tuple[dict, list[str]]:
+        scheduler = Job_Scheduler()
+        balance = scheduler.register("balance", "잔고 조회/저장", run_account=lambda session, account: asyncio.sleep(0))
+        slices = scheduler.register("order_slices", "분할 주문", pausable=False, cooperative=False)
+        stuck = scheduler.register("stuck", "끝나지 않는 순회")
+        saved = []
+
+        async def balance_loop() -> None:
+            while True:
+                try:
+                    balance.sweep_started()
+                    for account in ["a", "b", "c"]:
+                        if balance.stopping:
+                            break
+                        await asyncio.sleep(0.02)  # 브로커 호출 ~ commit
+                        saved.append(account)
+                    balance.sweep_finished()
+                    await balance.sleep(60)
+                except Exception as e:  # 실제 루프처럼 오류 기록 후 계속
+                    balance.sweep_finished(e)
+
+        async def stuck_loop() -> None:
+            await asyncio.sleep(60)
+
+        balance.start(balance_loop)
+        slices.start(lambda: asyncio.sleep(60))
+        stuck.start(stuck_loop)
+        await asyncio.sleep(0.03)  # 두 번째 계좌 처리 중
+
+        result = await scheduler.shutdown(timeout=0.1)
+        assert balance.status()["state"] == "finished"
+        assert balance.error_count == 0 and balance.last_error is None
+        with pytest.raises(HTTPException) as exc:
+            balance.trigger([uuid.uuid4()])
+        assert exc.value.status_code == 503
+        return result, saved
+
+    result, saved = asyncio.run(scenario())
+    # 진행 중이던 계좌까지 마치고 다음 계좌는 시작하지 않음
+    assert saved == ["a", "b"]
+    assert result["drained"] == ["balance"]
+    assert sorted(result["cancelled"]) == ["order_slices", "stuck"]
+
+
+def test_poll_state_round_trip(engine: Engine) -> None:
+    first, second = uuid.uuid4(), uuid.uuid4()
+    checked = datetime(2026, 10, 19, 9, 0, tzinfo=KST)
+
+    with Session(engine) as session:
+        assert save_poll_state(session, {first: checked}, {first: checked, second: checked}) == 2
+        assert save_poll_state(session, {}, {second: checked + timedelta(minutes=5)}) == 1
+
+        states = {state.account_id: state for state in load_poll_state(session, [first, second])}
+        assert states[first].last_token_check is not None
+        assert states[second].last_token_check is None
+        assert states[second].last_balance_check.replace(tzinfo=None) == (checked + timedelta(minutes=5)).replace(tzinfo=None)
+        assert load_poll_state(session, []) == []
+
+
+def test_workers_share_pause_state_reports_and_run_requests(engine: Engine) -> None:
+
+    async def scenario() -> None:
+        # 같은 DB 를 쓰는 워커 2개
+        first, second = Job_Scheduler(), Job_Scheduler()
+        for scheduler in (first, second):
+            scheduler.register("balance", "잔고 조회/저장", run_account=lambda session, account: asyncio.sleep(0))
+            scheduler.register("archive", "아카이브")
+
+        with Session(engine) as session:
+            owner = User(email="owner@example.com", hashed_password="x")
+            session.add(owner)
+            session.commit()
+            account = Account(
+                owner_id=owner.id, broker="KIS", acnt_name="계좌", cano="50120000",
+                acnt_type="paper", app_key="key", app_secret="secret",
+            )
+            session.add(account)
+            session.commit()
+
+            # 관리 요청이 첫 워커로 가도 두 번째 워커가 다음 동기화에서 반영
+            first.set_paused(session, "balance", True)
+            assert first.get("balance").paused and not second.get("balance").paused
+            assert second.sync(session, "worker-2") == 0
+            assert second.get("balance").paused
+
+            assert first.request_run(session, "balance", account.id) == 1
+            assert second.sync(session, "worker-2") == 1
+            assert first.sync(session, "worker-1") == 0  # 요청은 워커 하나만 가져감
+            assert len(second.get("balance").pending) == 1
+            for task in second.get("balance").pending:
+                task.cancel()
+
+            reports = first.reports(session, "worker-1", "balance")
+            assert [(report["node_id"], report["state"]) for report in reports] == [
+                ("worker-1", "stopped"), ("worker-2", "stopped")
+            ]
+            assert len(first.reports(session, "worker-1")) == 4
+
+            first.set_paused(session, "balance", False)
+            second.sync(session, "worker-2")
+            assert not second.get("balance").paused
+
+            second.leave(session, "worker-2")
+            assert [report["node_id"] for report in first.reports(session, "worker-1", "balance")] == ["worker-1"]
+
+            with pytest.raises(HTTPException) as exc:
+                first.request_run(session, "archive")
+            assert exc.value.status_code == 400
+
+    asyncio.run(scenario())
@@ -0,0 +1,64 @@
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.api.services.sharding_service import Shard_Membership, assign_owner
+from app.constants import KST
+from app.models.scheduler import Scheduler_Node
+
+
+def test_rendezvous_assignment_is_balanced_and_moves_only_departed_share() -> None:
+    account_ids = [uuid.UUID(int=index) for index in range(3000)]
+    nodes = ["node-a", "node-b", "node-c"]
+
+    owners = {account_id: assign_owner(account_id, nodes) for account_id in account_ids}
+    counts = Counter(owners.values())
+    assert all(800 < count < 1200 for count in counts.values())
+
+    # node-c 이탈 시 node-c 몫만 재배정
+    remaining = {account_id: assign_owner(account_id, nodes[:2]) for account_id in account_ids}
+    moved = [account_id for account_id in account_ids if owners[account_id] != remaining[account_id]]
+    assert {owners[account_id] for account_id in moved} == {"node-c"}
+
+    # 노드 추가 시 새 노드로만 이동
+    joined = {account_id: assign_owner(account_id, nodes + ["node-d"]) for account_id in account_ids}
+    assert {joined[account_id] for account_id in account_ids if joined[account_id] != owners[account_id]} == {"node-d"}
+
+
+def test_heartbeat_partitions_accounts_between_live_nodes(session: Session) -> None:
+    first = Shard_Membership("node-a", enabled=True)
+    second = Shard_Membership("node-b", enabled=True)
+    account_ids = [uuid.uuid4() for _ in range(200)]
+
+    # 첫 heartbeat 전에는 아무 계좌도 맡지 않음
+    assert not any(first.owns(account_id) for account_id in account_ids)
+
+    # 오래전에 끊긴 노드는 heartbeat 시 정리
+    session.add(Scheduler_Node(
+        node_id="node-dead", hostname="old", started_at=datetime.now(KST) - timedelta(hours=1),
+        heartbeat_at=datetime.now(KST) - timedelta(hours=1),
+    ))
+    session.commit()
+
+    first.heartbeat(session)
+    second.heartbeat(session)
+    first.heartbeat(session)
+    assert first.nodes == second.nodes == ["node-a", "node-b"]
+    assert first.is_leader and not second.is_leader
+
+    for account_id in account_ids:
+        assert first.owns(account_id) != second.owns(account_id)
+
+    second.leave(session)
+    first.heartbeat(session)
+    assert first.nodes == ["node-a"]
+    assert all(first.owns(account_id) for account_id in account_ids)
+
+
+def test_disabled_membership_owns_everything() -> None:
+    membership = Shard_Membership("solo", enabled=False)
+    account_id = uuid.uuid4()
+    assert membership.owns(account_id)
+    assert membership.is_leader
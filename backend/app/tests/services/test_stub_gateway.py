@@ -0,0 +1,61 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.constants import KIS_API_ENDPOINTS, LS_API_ENDPOINTS
+from app.api.services.kis_trade_service import process_trade_data_KIS
+from app.stub_gateway import Stub_Config, state, stub_app
+
+client = TestClient(stub_app)
+
+
+def setup_function() -> None:
+    state.config = Stub_Config(latency_ms=0, rate_limit_per_second=0, holdings_per_account=5, fills_per_day=3)
+    state.reset()
+
+
+def test_kis_responses_parse_with_existing_transforms() -> None:
+    token = client.post(KIS_API_ENDPOINTS["token"], json={"appkey": "key"}).json()
+    assert token["access_token"] == "stub-key"
+
+    headers = {"appkey": "key"}
+    balance = client.get(KIS_API_ENDPOINTS["balance"], params={"CANO": "90000001"}, headers=headers).json()
+    assert len(balance["output1"]) == 5
+    summary = balance["output2"][0]
+    assert int(summary["evlu_amt_smtl_amt"]) == sum(int(item["evlu_amt"]) for item in balance["output1"])
+
+    trades = client.get(
+        KIS_API_ENDPOINTS["daily_trades"],
+        params={"CANO": "90000001", "INQR_STRT_DT": "20240304", "INQR_END_DT": "20240310"},
+        headers=headers,
+    ).json()
+    parsed = process_trade_data_KIS(trades, uuid.uuid4())
+    assert len(parsed) == 5 * 3  # 평일 5일
+    # 같은 계좌/기간은 같은 데이터
+    again = client.get(
+        KIS_API_ENDPOINTS["daily_trades"],
+        params={"CANO": "90000001", "INQR_STRT_DT": "20240304", "INQR_END_DT": "20240310"},
+        headers=headers,
+    ).json()
+    assert again["output1"] == trades["output1"]
+
+
+def test_ls_endpoints_and_rate_limit() -> None:
+    assert client.post(LS_API_ENDPOINTS["token"], data={"appkey": "ls"}).json()["access_token"] == "stub-ls"
+
+    state.config.rate_limit_per_second = 2
+    headers = {"authorization": "Bearer stub-ls"}
+    statuses = [client.post(LS_API_ENDPOINTS["balance"], json={}, headers=headers).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    stats = client.get("/stub/stats").json()
+    assert stats["rate_limited"] == 1
+    assert stats["calls"]["LS:balance"] == 3
+    assert stats["calls_per_account"] == 3
+
+
+def test_error_injection() -> None:
+    state.config.error_rate = 1.0
+    response = client.get(KIS_API_ENDPOINTS["balance"], params={"CANO": "1"}, headers={"appkey": "k"})
+    assert response.status_code == 500
+    assert response.json()["rt_cd"] == "1"
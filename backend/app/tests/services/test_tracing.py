@@ -0,0 +1,76 @@
+import json
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.core import tracing
+from app.core.json_codec import decode_response
+from app.core.metrics import observe_broker_call
+from app.core.tracing import _build_exporter, traced
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "tracer", provider.get_tracer("test"))
+    return exporter
+
+
+def test_sweep_spans_nest_broker_call_and_decode(spans) -> None:
+    account = SimpleNamespace(id=uuid.uuid4(), broker="KIS", acnt_type="paper", acnt_name="비공개")
+    response = SimpleNamespace(content=b'{"output1": []}', status_code=200, elapsed=timedelta(milliseconds=42))
+
+    @observe_broker_call("KIS", "balance")
+    def inquire_balance(account):
+        return decode_response(response)
+
+    with traced("sweep.minutely", accounts=1):
+        with traced("minutely.account", account):
+            assert inquire_balance(account) == {"output1": []}
+
+    finished = {span.name: span for span in spans.get_finished_spans()}
+    sweep, per_account = finished["sweep.minutely"], finished["minutely.account"]
+    broker, decode = finished["broker.KIS.balance"], finished["json.decode"]
+
+    assert per_account.parent.span_id == sweep.context.span_id
+    assert broker.parent.span_id == per_account.context.span_id
+    assert decode.parent.span_id == broker.context.span_id
+    assert broker.context.trace_id == sweep.context.trace_id
+
+    assert per_account.attributes["account.id"] == str(account.id)
+    assert "account.name" not in per_account.attributes
+    assert broker.attributes["account.acnt_type"] == "paper"
+    assert broker.attributes["http.status_code"] == 200
+    assert broker.attributes["http.elapsed_ms"] == pytest.approx(42)
+
+
+def test_failed_broker_call_records_error(spans) -> None:
+    @observe_broker_call("LS", "token")
+    def issue_token(app_key, app_secret, acnt_type):
+        raise RuntimeError("토큰 발급 실패")
+
+    with pytest.raises(RuntimeError):
+        issue_token("key", "secret", acnt_type="real")
+
+    (span,) = spans.get_finished_spans()
+    assert not span.status.is_ok
+    assert span.events[0].name == "exception"
+
+
+def test_file_exporter_writes_json_lines(tmp_path) -> None:
+    path = tmp_path / "traces.jsonl"
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(_build_exporter("file", str(path), None)))
+    with provider.get_tracer("test").start_as_current_span("sweep.balance"):
+        pass
+    provider.shutdown()
+
+    (line,) = path.read_text().splitlines()
+    assert json.loads(line)["name"] == "sweep.balance"
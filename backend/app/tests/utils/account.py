@@ -12,9 +12,11 @@ def random_lower_string(length: int = 32) -> str:
     return "".join(random.choices(string.ascii_lowercase, k=length))
 
 
-def create_random_account(db: Session) -> Account:
-    user = create_random_user(db)
+def create_random_account(db: Session, owner_id: uuid.UUID | None = None) -> Account:
+    if owner_id is None:
+        owner_id = create_random_user(db).id
     account = Account(
+        acnt_name=random_lower_string(8),
         app_key=random_lower_string(),
         app_secret=random_lower_string(),
         cano=str(random.randint(50070000, 50079999)),
@@ -22,7 +24,7 @@ def create_random_account(db: Session) -> Account:
         acnt_type=random.choice(["real", "virtual"]),
         hts_id=random_lower_string(8),
         is_active=True,
-        owner_id=user.id,
+        owner_id=owner_id,
     )
     db.add(account)
     db.commit()
@@ -0,0 +1,11 @@
+#! /usr/bin/env bash
+
+set -e
+
+# 워커별 Prometheus 지표 파일은 실행마다 새로 시작 (이전 실행의 값이 /metrics 에 섞이지 않도록)
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+exec fastapi run "$@" app/main.py